@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import logging
+import asyncio
 from collections.abc import Callable
+import logging
+import time
 from datetime import datetime, timedelta
 from functools import partial
 from typing import Any
@@ -10,38 +12,101 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import async_track_point_in_utc_time, async_track_time_interval
-from homeassistant.util import dt as dt_util
-
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import (
+    configure_rate_limit,
+    configure_result_freshness,
+    forget_station,
+    rate_limit_burst,
+    request_priority,
+)
+from .batch_coordinator import async_remove_batch_coordinator, get_batch_coordinator
 from .const import (
+    CONF_ADAPTIVE_REFRESH,
     CONF_CRON_EXPRESSION,
+    CONF_DAILY_PRICE_FILE,
+    CONF_DAILY_REFRESH_BUDGET,
+    CONF_FAST_STARTUP,
+    CONF_JITTER_MINUTES,
+    CONF_RATE_LIMIT_BURST,
+    CONF_RATE_LIMIT_PER_MINUTE,
+    CONF_RESULT_FRESHNESS_SECONDS,
+    CONF_SHARED_REFRESH,
     CONF_STATION_ID,
+    DEFAULT_ADAPTIVE_REFRESH,
     DEFAULT_CRON_EXPRESSION,
+    DEFAULT_DAILY_PRICE_FILE,
+    DEFAULT_DAILY_REFRESH_BUDGET,
+    DEFAULT_FAST_STARTUP,
+    DEFAULT_JITTER_MINUTES,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_RATE_LIMIT_PER_MINUTE,
+    DEFAULT_RESULT_FRESHNESS_SECONDS,
+    DEFAULT_SHARED_REFRESH,
     CSV_UPDATE_INTERVAL,
+    RATE_LIMIT_BURST_OPTIONS,
+    RATE_LIMIT_PER_MINUTE_OPTIONS,
     DOMAIN,
     SERVICE_COMPARE_STATIONS,
     SERVICE_CLEAR_CACHE,
     SERVICE_FORCE_CSV_UPDATE,
     SERVICE_REFRESH_PRICES,
+    SERVICE_SEARCH_NEARBY,
     SERVICE_SEARCH_REGISTRY,
 )
-from .coordinator import CarburantiDataUpdateCoordinator
-from .cron_helper import get_next_run_time
+from .coordinator import CarburantiDataUpdateCoordinator, async_remove_stored_state
+from .cron_scheduler import async_remove_cron_scheduler, get_cron_scheduler
 from .csv_manager import (
     CSV_MANAGER_DATA_KEY,
     CSVStationManager,
     RegistryUnavailableError,
     get_shared_csv_manager,
 )
-from .discovery import find_stations_by_area
+from .discovery import (
+    AreaSearchIndex,
+    NearbyOrigin,
+    NearbySearchIndex,
+    REGISTRY_VOCABULARY_INDEX,
+    RegistryVocabularyIndex,
+    StationCandidate,
+    decode_search_cursor,
+    encode_search_cursor,
+)
+from .http_client import async_remove_http_client
+from .rate_limiter import RequestPriority
+from .refresh_timing import RefreshPlan, describe_plan, iter_planned_run_times
+from .startup import async_remove_startup_queue, get_startup_queue
+from .price_csv_manager import async_remove_price_csv_manager, get_price_csv_manager
+from .zone_refresh import async_refresh_from_zones
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
-CONFIG_SCHEMA = cv.empty_config_schema(DOMAIN)
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_RATE_LIMIT_PER_MINUTE, default=DEFAULT_RATE_LIMIT_PER_MINUTE
+                ): vol.In(RATE_LIMIT_PER_MINUTE_OPTIONS),
+                vol.Optional(CONF_RATE_LIMIT_BURST, default=DEFAULT_RATE_LIMIT_BURST): vol.In(
+                    RATE_LIMIT_BURST_OPTIONS
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 _SERVICES_REGISTERED = f"{DOMAIN}_services_registered"
 _CSV_MANAGER = CSV_MANAGER_DATA_KEY
@@ -52,7 +117,8 @@ _REFRESH_PRICES_SCHEMA = vol.Schema(
         vol.Optional("station_ids"): vol.All(
             cv.ensure_list,
             [str],
-        )
+        ),
+        vol.Optional("use_zone_search", default=False): cv.boolean,
     }
 )
 _SEARCH_REGISTRY_SCHEMA = vol.Schema(
@@ -65,8 +131,44 @@ _SEARCH_REGISTRY_SCHEMA = vol.Schema(
             vol.Coerce(int),
             vol.Range(min=1, max=50),
         ),
+        vol.Optional("cursor", default=""): str,
+    }
+)
+_AREA_SEARCH_INDEX = "area_search"
+_SEARCH_NEARBY_SCHEMA = vol.Schema(
+    {
+        vol.Required("origins"): vol.All(
+            cv.ensure_list,
+            vol.Length(min=1, max=50),
+            [
+                vol.Schema(
+                    {
+                        vol.Optional("id"): vol.Coerce(str),
+                        vol.Required("latitude"): vol.All(
+                            vol.Coerce(float),
+                            vol.Range(min=-90, max=90),
+                        ),
+                        vol.Required("longitude"): vol.All(
+                            vol.Coerce(float),
+                            vol.Range(min=-180, max=180),
+                        ),
+                        vol.Optional("radius_km", default=5): vol.All(
+                            vol.Coerce(float),
+                            vol.Range(min=0.1, max=50),
+                        ),
+                        vol.Optional("limit", default=20): vol.All(
+                            vol.Coerce(int),
+                            vol.Range(min=1, max=50),
+                        ),
+                    }
+                )
+            ],
+        ),
+        vol.Optional("query", default=""): str,
+        vol.Optional("station_type", default=""): str,
     }
 )
+_NEARBY_SEARCH_INDEX = "nearby_search"
 
 _LEGACY_DEFAULT_ENTITY_NAMES = frozenset(
     {
@@ -109,13 +211,23 @@ _LEGACY_REMOVED_ENTITY_UNIQUE_ID_SUFFIXES = frozenset(
 
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
-    """Set up integration-level services."""
+    """Set up integration-level services and the station API rate limit.
+
+    The rate limiter is shared by every entry, so its rate and burst are one
+    integration-wide setting in configuration.yaml rather than entry options.
+    """
+    domain_config = config.get(DOMAIN, {})
+    configure_rate_limit(
+        domain_config.get(CONF_RATE_LIMIT_PER_MINUTE, DEFAULT_RATE_LIMIT_PER_MINUTE) / 60,
+        domain_config.get(CONF_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_BURST),
+    )
     _async_register_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Osservaprezzi Carburanti from a config entry."""
+    setup_started_at = time.monotonic()
     _async_register_services(hass)
 
     domain_data = hass.data.setdefault(DOMAIN, {})
@@ -137,62 +249,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     coordinator = CarburantiDataUpdateCoordinator(hass, entry, csv_manager)
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except ConfigEntryNotReady:
-        await coordinator.async_shutdown()
-        _async_remove_csv_owner_if_unused(hass)
-        raise
+    # Entities start from restored or registry data and refresh through the
+    # startup queue, or setup waits for the first live refresh.
+    if await coordinator.async_restore_state():
+        startup_mode = "restored"
+    elif entry.options.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP):
+        startup_mode = "placeholder"
+        if not csv_manager.is_data_available():
+            await csv_manager.async_load_cached_data()
+        coordinator.async_set_placeholder_data()
+    else:
+        startup_mode = "refreshed"
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await coordinator.async_shutdown()
+            _async_remove_csv_owner_if_unused(hass)
+            raise
 
     cron_expression = entry.options.get(CONF_CRON_EXPRESSION, DEFAULT_CRON_EXPRESSION)
-    _LOGGER.info("Setting up cron schedule for %s with expression: %s", entry.title, cron_expression)
+    jitter_window = timedelta(
+        minutes=entry.options.get(CONF_JITTER_MINUTES, DEFAULT_JITTER_MINUTES)
+    )
+    _LOGGER.info(
+        "Setting up cron schedule for %s with expression: %s (jitter window %s)",
+        entry.title,
+        cron_expression,
+        jitter_window,
+    )
 
     domain_data[entry.entry_id] = {
         "coordinator": coordinator,
         "listener": None,
     }
 
-    def _schedule_next_refresh() -> None:
-        entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
-        if entry_data is None or entry_data.get("coordinator") is not coordinator:
-            return
-
-        try:
-            next_run_time = get_next_run_time(cron_expression)
-        except (ImportError, TypeError, ValueError) as err:
-            _LOGGER.error("Failed to compute next cron schedule for %s: %s", entry.title, err)
-            raise
-
-        _LOGGER.info(
-            "Scheduling next refresh for %s at %s",
-            entry.title,
-            next_run_time,
-        )
-        listener: Callable[[], None] = async_track_point_in_utc_time(
-            hass,
-            _request_refresh,
-            dt_util.as_utc(next_run_time),
-        )
-        entry_data["listener"] = listener
-
-    async def _request_refresh(now: datetime) -> None:
-        _LOGGER.info("Executing scheduled refresh for %s at %s", entry.title, now)
-        try:
-            await coordinator.async_request_refresh()
-        finally:
-            _schedule_next_refresh()
-
     try:
-        _schedule_next_refresh()
-    except (ImportError, TypeError, ValueError):
+        listener = _async_schedule_refreshes(
+            hass, entry, coordinator, cron_expression, jitter_window
+        )
+    except (ImportError, TypeError, ValueError) as err:
+        _LOGGER.error("Failed to compute next cron schedule for %s: %s", entry.title, err)
         await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id, None)
         _async_remove_csv_owner_if_unused(hass)
         return False
+    domain_data[entry.entry_id]["listener"] = listener
+    _async_apply_api_options(hass)
+
+    startup_queue = get_startup_queue(hass)
+    if startup_mode != "refreshed":
+        _LOGGER.info("Set up %s from %s data; first refresh is queued", entry.title, startup_mode)
+        entry.async_on_unload(startup_queue.async_add(coordinator))
 
     _async_cleanup_legacy_entity_registry(hass, entry)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    startup_queue.record_setup(entry.entry_id, startup_mode, setup_started_at)
     return True
 
 
@@ -234,6 +346,34 @@ def _async_cleanup_legacy_entity_registry(hass: HomeAssistant, entry: ConfigEntr
             entity_registry.async_update_entity(entity_id, name=None)
 
 
+def _async_loaded_entries(hass: HomeAssistant) -> list[ConfigEntry]:
+    """Return the config entries whose coordinators are set up."""
+    domain_data = hass.data.get(DOMAIN, {})
+    return [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in domain_data
+    ]
+
+
+def _async_apply_api_options(hass: HomeAssistant) -> None:
+    """Apply the strictest API options of the loaded entries to the shared client.
+
+    The reuse of recent responses is shared by every entry, so the shortest
+    freshness window applies.
+    """
+    options = [entry.options for entry in _async_loaded_entries(hass)]
+    configure_result_freshness(
+        min(
+            (
+                option.get(CONF_RESULT_FRESHNESS_SECONDS, DEFAULT_RESULT_FRESHNESS_SECONDS)
+                for option in options
+            ),
+            default=DEFAULT_RESULT_FRESHNESS_SECONDS,
+        )
+    )
+
+
 def _async_remove_csv_owner_if_unused(hass: HomeAssistant) -> bool:
     """Remove registry-wide resources when no config entries remain."""
     domain_data = hass.data.get(DOMAIN, {})
@@ -246,10 +386,78 @@ def _async_remove_csv_owner_if_unused(hass: HomeAssistant) -> bool:
     listener = domain_data.pop(_CSV_UPDATE_LISTENER, None)
     if listener is not None:
         listener()
+    async_remove_batch_coordinator(hass)
+    async_remove_price_csv_manager(hass)
+    async_remove_cron_scheduler(hass)
+    async_remove_startup_queue(hass)
     domain_data.pop(_CSV_MANAGER, None)
+    async_remove_http_client(hass)
     return True
 
 
+def _async_schedule_refreshes(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: CarburantiDataUpdateCoordinator,
+    cron_expression: str,
+    jitter_window: timedelta,
+) -> Callable[[], None]:
+    """Schedule the refreshes of an entry and return a callback removing them.
+
+    Entries using the daily price file hand their scheduled refreshes to the
+    price manager rather than the shared batch, and the file serves a refresh
+    when it is newer than the station data.
+
+    With adaptive refresh, the entry follows the refresh plan learned from
+    its price publication times, within its daily budget, and is rescheduled
+    whenever the plan changes. Until a plan is learned, or once the learned
+    windows expire, the cron expression applies. Raises the cron helper's
+    errors when the expression cannot be scheduled.
+    """
+    schedule: Callable[..., Callable[[], None]]
+    if entry.options.get(CONF_DAILY_PRICE_FILE, DEFAULT_DAILY_PRICE_FILE):
+        _LOGGER.info("Refreshing %s from the shared daily price file", entry.title)
+        schedule = partial(get_price_csv_manager(hass).async_add, coordinator)
+    elif entry.options.get(CONF_SHARED_REFRESH, DEFAULT_SHARED_REFRESH):
+        _LOGGER.info("Refreshing %s with the shared station batch", entry.title)
+        schedule = partial(get_batch_coordinator(hass).async_add, coordinator)
+    else:
+        schedule = partial(get_cron_scheduler(hass).async_add, coordinator, handler=None)
+    remove_schedule = schedule(cron_expression, jitter_window=jitter_window)
+    if not entry.options.get(CONF_ADAPTIVE_REFRESH, DEFAULT_ADAPTIVE_REFRESH):
+        return remove_schedule
+
+    budget = int(entry.options.get(CONF_DAILY_REFRESH_BUDGET, DEFAULT_DAILY_REFRESH_BUDGET))
+    plan: RefreshPlan = ()
+
+    @callback
+    def _async_follow_plan() -> None:
+        nonlocal plan
+        learned = coordinator.refresh_timing.plan(budget)
+        if learned == plan:
+            return
+        plan = learned
+        if plan:
+            _LOGGER.info("Refreshing %s at learned times: %s", entry.title, describe_plan(plan))
+            schedule(
+                describe_plan(plan),
+                jitter_window=jitter_window,
+                runs=iter_planned_run_times(plan),
+            )
+        else:
+            _LOGGER.info("Refreshing %s on its cron schedule until a plan is learned", entry.title)
+            schedule(cron_expression, jitter_window=jitter_window)
+
+    _async_follow_plan()
+    remove_listener = coordinator.async_add_listener(_async_follow_plan)
+
+    def _async_remove() -> None:
+        remove_listener()
+        remove_schedule()
+
+    return _async_remove
+
+
 def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services once per Home Assistant instance."""
     if hass.data.get(_SERVICES_REGISTERED):
@@ -269,23 +477,74 @@ def _async_register_services(hass: HomeAssistant) -> None:
     async def _async_refresh_coordinators(
         coordinators: list[tuple[str, CarburantiDataUpdateCoordinator]],
         action: str,
-    ) -> None:
-        failed_entry_ids: list[str] = []
-        for entry_id, coordinator in coordinators:
-            try:
-                await coordinator.async_request_refresh()
-            except Exception:  # noqa: BLE001 - service must attempt every configured station
-                failed_entry_ids.append(entry_id)
-                _LOGGER.exception("Station refresh failed for entry %s after %s", entry_id, action)
-            else:
-                _LOGGER.info("%s completed for entry %s", action, entry_id)
-
-        if failed_entry_ids:
+        call: ServiceCall,
+    ) -> dict[str, Any]:
+        """Refresh stations concurrently and report each outcome and latency.
+
+        At most one rate-limiter burst of refreshes is in flight, each
+        waiting for its turn at the rate limiter in the service lane, so one
+        slow or failing station does not hold up the others. Refreshes bypass
+        the debouncer, so a second call within its cooldown still fetches.
+        Unless the caller asked for the response, failures raise once every
+        station was tried.
+        """
+        budget = asyncio.Semaphore(rate_limit_burst())
+        finished = 0
+
+        async def _async_refresh(
+            entry_id: str, coordinator: CarburantiDataUpdateCoordinator
+        ) -> dict[str, Any]:
+            nonlocal finished
+            async with budget:
+                started_at = time.monotonic()
+                error: str | None = None
+                # Not the debounced request: every station is fetched now, and
+                # its outcome and latency are those of that fetch.
+                with request_priority(RequestPriority.SERVICE):
+                    await coordinator.async_refresh()
+                if not coordinator.last_update_success:
+                    last_exception = getattr(coordinator, "last_exception", None)
+                    error = (
+                        type(last_exception).__name__
+                        if last_exception is not None
+                        else "UpdateFailed"
+                    )
+                latency_ms = round((time.monotonic() - started_at) * 1000, 1)
+            finished += 1
+            _LOGGER.info(
+                "%s %s for entry %s in %.0f ms (%d/%d)",
+                action,
+                "completed" if error is None else "failed",
+                entry_id,
+                latency_ms,
+                finished,
+                len(coordinators),
+            )
+            result: dict[str, Any] = {
+                "entry_id": entry_id,
+                "station_id": str(coordinator.config_entry.data.get(CONF_STATION_ID)),
+                "outcome": "refreshed" if error is None else "failed",
+                "latency_ms": latency_ms,
+            }
+            if error is not None:
+                result["error"] = error
+            return result
+
+        stations = await asyncio.gather(
+            *(_async_refresh(entry_id, coordinator) for entry_id, coordinator in coordinators)
+        )
+        failed_count = sum(station["outcome"] == "failed" for station in stations)
+        if failed_count and not getattr(call, "return_response", False):
             raise HomeAssistantError(
-                f"{action} succeeded, but {len(failed_entry_ids)} station refresh(es) failed"
+                f"{action} succeeded, but {failed_count} station refresh(es) failed"
             )
+        return {
+            "stations": stations,
+            "refreshed_count": len(stations) - failed_count,
+            "failed_count": failed_count,
+        }
 
-    async def _handle_force_csv_update(call: ServiceCall) -> None:
+    async def _handle_force_csv_update(call: ServiceCall) -> ServiceResponse:
         _LOGGER.info("Service force_csv_update triggered")
         coordinators = _iter_coordinators()
         if not coordinators:
@@ -301,9 +560,9 @@ def _async_register_services(hass: HomeAssistant) -> None:
             _LOGGER.warning("CSV update failed for entry %s", entry_id)
             raise HomeAssistantError("Unable to update the station cache")
 
-        await _async_refresh_coordinators(coordinators, "CSV update")
+        return await _async_refresh_coordinators(coordinators, "CSV update", call)
 
-    async def _handle_clear_cache(call: ServiceCall) -> None:
+    async def _handle_clear_cache(call: ServiceCall) -> ServiceResponse:
         _LOGGER.info("Service clear_cache triggered")
         coordinators = _iter_coordinators()
         if not coordinators:
@@ -323,7 +582,7 @@ def _async_register_services(hass: HomeAssistant) -> None:
             _LOGGER.warning("Cache cleared but CSV re-initialization failed; skipping station refresh")
             raise HomeAssistantError("Unable to reset the station cache")
 
-        await _async_refresh_coordinators(coordinators, "Cache reset")
+        return await _async_refresh_coordinators(coordinators, "Cache reset", call)
 
     async def _handle_compare_stations(call: ServiceCall) -> ServiceResponse:
         _LOGGER.info("Service compare_stations triggered")
@@ -368,55 +627,195 @@ def _async_register_services(hass: HomeAssistant) -> None:
         if not coordinators:
             raise HomeAssistantError("No matching active Osservaprezzi entries")
 
-        await _async_refresh_coordinators(coordinators, "Price refresh")
+        response: dict[str, Any] = {}
+        per_station = coordinators
+        if call.data.get("use_zone_search"):
+            with request_priority(RequestPriority.SERVICE):
+                zone_refresh = await async_refresh_from_zones(hass, coordinators)
+            per_station = zone_refresh.fallback
+            response["zone_search"] = {
+                "query_count": zone_refresh.query_count,
+                "failed_query_count": zone_refresh.failed_query_count,
+                "zone_refreshed_count": len(zone_refresh.refreshed),
+                "fallback_count": len(zone_refresh.fallback),
+            }
+        failed_station_ids: set[str] = set()
+        if per_station:
+            report = await _async_refresh_coordinators(per_station, "Price refresh", call)
+            failed_station_ids = {
+                station["station_id"]
+                for station in report["stations"]
+                if station["outcome"] == "failed"
+            }
+            response["stations"] = report["stations"]
         refreshed_station_ids = [
-            str(coordinator.config_entry.data.get(CONF_STATION_ID))
+            station_id
             for _, coordinator in coordinators
+            if (station_id := str(coordinator.config_entry.data.get(CONF_STATION_ID)))
+            not in failed_station_ids
         ]
         return {
             "refreshed_station_ids": refreshed_station_ids,
             "refreshed_count": len(refreshed_station_ids),
+            "failed_count": len(coordinators) - len(refreshed_station_ids),
+            **response,
+        }
+
+    def _configured_station_ids() -> set[str]:
+        return {
+            str(coordinator.config_entry.data.get(CONF_STATION_ID))
+            for _, coordinator in _iter_coordinators()
+        }
+
+    def _candidate_response(
+        candidate: StationCandidate,
+        configured_station_ids: set[str],
+    ) -> dict[str, Any]:
+        response: dict[str, Any] = {
+            "station_id": candidate.station_id,
+            "name": candidate.name,
+            "brand": candidate.brand,
+            "address": candidate.address,
+            "municipality": candidate.municipality,
+            "province": candidate.province,
+            "station_type": candidate.station_type,
+            "configured": candidate.station_id in configured_station_ids,
         }
+        if candidate.distance_km is not None:
+            response["distance_km"] = round(candidate.distance_km, 3)
+        return response
 
     async def _handle_search_registry(call: ServiceCall) -> ServiceResponse:
         """Search the shared official station registry without location data."""
+        csv_manager = get_shared_csv_manager(hass)
         try:
-            snapshot = await get_shared_csv_manager(hass).async_ensure_registry(
-                allow_stale=True
-            )
+            snapshot = await csv_manager.async_ensure_registry(allow_stale=True)
         except RegistryUnavailableError as err:
             raise HomeAssistantError("The station registry is unavailable") from err
 
-        candidates = await hass.async_add_executor_job(
+        cursor = str(call.data.get("cursor", "")).strip()
+        after = None
+        if cursor:
+            try:
+                cursor_generation, after = decode_search_cursor(cursor)
+            except ValueError as err:
+                raise HomeAssistantError("The search cursor is invalid") from err
+            if cursor_generation != snapshot.generation:
+                raise HomeAssistantError(
+                    "The station registry changed since this search started; "
+                    "repeat the search without a cursor"
+                )
+
+        index = await csv_manager.async_registry_index(
+            snapshot, _AREA_SEARCH_INDEX, AreaSearchIndex
+        )
+        page = await hass.async_add_executor_job(
             partial(
-                find_stations_by_area,
-                snapshot.stations,
+                index.search,
                 municipality=str(call.data.get("municipality", "")),
                 province=str(call.data.get("province", "")),
                 text_filter=str(call.data.get("query", "")),
                 station_type=str(call.data.get("station_type", "")),
                 limit=int(call.data.get("limit", 20)),
+                after=after,
             )
         )
-        configured_station_ids = {
-            str(coordinator.config_entry.data.get(CONF_STATION_ID))
-            for _, coordinator in _iter_coordinators()
-        }
+        candidates = page.candidates
+        suggestions: dict[str, list[dict[str, Any]]] = {}
+        if not candidates and after is None:
+            vocabulary = await csv_manager.async_registry_index(
+                snapshot, REGISTRY_VOCABULARY_INDEX, RegistryVocabularyIndex
+            )
+            matches = await hass.async_add_executor_job(
+                partial(
+                    vocabulary.suggest,
+                    municipality=str(call.data.get("municipality", "")),
+                    province=str(call.data.get("province", "")),
+                    brand=str(call.data.get("query", "")),
+                )
+            )
+            suggestions = {
+                field: [
+                    {
+                        "value": match.value,
+                        "distance": match.distance,
+                        "station_count": match.station_count,
+                    }
+                    for match in field_matches
+                ]
+                for field, field_matches in matches.items()
+            }
+        configured_station_ids = _configured_station_ids()
         return {
             "results": [
-                {
-                    "station_id": candidate.station_id,
-                    "name": candidate.name,
-                    "brand": candidate.brand,
-                    "address": candidate.address,
-                    "municipality": candidate.municipality,
-                    "province": candidate.province,
-                    "station_type": candidate.station_type,
-                    "configured": candidate.station_id in configured_station_ids,
-                }
+                _candidate_response(candidate, configured_station_ids)
                 for candidate in candidates
             ],
             "result_count": len(candidates),
+            "suggestions": suggestions,
+            "next_cursor": (
+                encode_search_cursor(snapshot.generation, page.next_key)
+                if page.next_key is not None
+                else None
+            ),
+            "registry_updated": (
+                snapshot.updated_at.isoformat()
+                if snapshot.updated_at is not None
+                else None
+            ),
+            "registry_is_stale": snapshot.is_stale,
+        }
+
+    async def _handle_search_nearby(call: ServiceCall) -> ServiceResponse:
+        """Answer several nearby-station searches in one registry pass."""
+        try:
+            origins = [
+                NearbyOrigin(
+                    latitude=float(origin["latitude"]),
+                    longitude=float(origin["longitude"]),
+                    radius_km=float(origin.get("radius_km", 5)),
+                    limit=int(origin.get("limit", 20)),
+                )
+                for origin in call.data["origins"]
+            ]
+        except (KeyError, TypeError, ValueError) as err:
+            raise HomeAssistantError("Each origin needs a latitude and longitude") from err
+        origin_ids = [
+            str(origin.get("id", position))
+            for position, origin in enumerate(call.data["origins"])
+        ]
+
+        csv_manager = get_shared_csv_manager(hass)
+        try:
+            snapshot = await csv_manager.async_ensure_registry(allow_stale=True)
+        except RegistryUnavailableError as err:
+            raise HomeAssistantError("The station registry is unavailable") from err
+
+        index = await csv_manager.async_registry_index(
+            snapshot, _NEARBY_SEARCH_INDEX, NearbySearchIndex
+        )
+        results = await hass.async_add_executor_job(
+            partial(
+                index.search_many,
+                origins,
+                text_filter=str(call.data.get("query", "")),
+                station_type=str(call.data.get("station_type", "")),
+            )
+        )
+        configured_station_ids = _configured_station_ids()
+        return {
+            "origins": [
+                {
+                    "id": origin_id,
+                    "results": [
+                        _candidate_response(candidate, configured_station_ids)
+                        for candidate in candidates
+                    ],
+                    "result_count": len(candidates),
+                }
+                for origin_id, candidates in zip(origin_ids, results)
+            ],
+            "origin_count": len(origins),
             "registry_updated": (
                 snapshot.updated_at.isoformat()
                 if snapshot.updated_at is not None
@@ -427,9 +826,11 @@ def _async_register_services(hass: HomeAssistant) -> None:
 
     hass.services.async_register(
         DOMAIN, SERVICE_FORCE_CSV_UPDATE, _handle_force_csv_update,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN, SERVICE_CLEAR_CACHE, _handle_clear_cache,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN, SERVICE_COMPARE_STATIONS, _handle_compare_stations,
@@ -449,6 +850,13 @@ def _async_register_services(hass: HomeAssistant) -> None:
         schema=_SEARCH_REGISTRY_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_NEARBY,
+        _handle_search_nearby,
+        schema=_SEARCH_NEARBY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -462,6 +870,18 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         hass.config_entries.async_update_entry(config_entry, data=new_data, version=2)
         _LOGGER.info("Migrated config entry from version 1 to 2, removed config_type")
 
+    if config_entry.version == 2:
+        # Entries created before the jitter window keep refreshing at the cron time.
+        new_options = {CONF_JITTER_MINUTES: 0, **config_entry.options}
+
+        hass.config_entries.async_update_entry(
+            config_entry, options=new_options, version=3
+        )
+        _LOGGER.info(
+            "Migrated config entry from version 2 to 3, kept a %s minute jitter window",
+            new_options[CONF_JITTER_MINUTES],
+        )
+
     return True
 
 
@@ -473,6 +893,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if listener is not None:
             listener()
         await entry_data["coordinator"].async_shutdown()
+        _async_apply_api_options(hass)
+        station_id = getattr(entry, "data", {}).get(CONF_STATION_ID)
+        if station_id is not None and not any(
+            other.data.get(CONF_STATION_ID) == station_id
+            for other in _async_loaded_entries(hass)
+        ):
+            forget_station(station_id)
 
         if _async_remove_csv_owner_if_unused(hass):
             hass.services.async_remove(DOMAIN, SERVICE_FORCE_CSV_UPDATE)
@@ -480,10 +907,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass.services.async_remove(DOMAIN, SERVICE_COMPARE_STATIONS)
             hass.services.async_remove(DOMAIN, SERVICE_REFRESH_PRICES)
             hass.services.async_remove(DOMAIN, SERVICE_SEARCH_REGISTRY)
+            hass.services.async_remove(DOMAIN, SERVICE_SEARCH_NEARBY)
             hass.data.pop(_SERVICES_REGISTERED, None)
 
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted station data of a removed entry."""
+    await async_remove_stored_state(hass, entry.entry_id)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload a config entry when options change."""
     _LOGGER.info("Reloading entry %s to apply new cron schedule", entry.title)
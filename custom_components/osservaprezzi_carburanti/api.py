@@ -2,33 +2,139 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import hashlib
+import json
 import logging
 import time
-from typing import Any
+from functools import partial
+from typing import Any, NoReturn
 
 import aiohttp
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .const import (
-    API_REQUEST_INTERVAL_SECONDS,
+    API_CIRCUIT_COOLDOWN_SECONDS,
+    API_CIRCUIT_FAILURE_THRESHOLD,
+    API_METRICS_WINDOW,
+    API_PRIORITY_STARVATION_SECONDS,
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_MIN_PER_SECOND,
+    API_RATE_LIMIT_PER_SECOND,
+    API_RESULT_FRESHNESS_SECONDS,
+    API_RETRY_AFTER_MAX_SECONDS,
     BASE_URL,
     DEFAULT_HEADERS,
     STATION_ENDPOINT,
+    ZONE_SEARCH_ENDPOINT,
 )
+from .http_client import async_get_session
+from .metrics import RequestMetrics, RequestTiming
+from .models import FuelPayload, ScheduleDay, StationPayload, freeze_service
+from .rate_limiter import RequestPriority, TokenBucketRateLimiter, parse_retry_after
 
 _LOGGER = logging.getLogger(__name__)
-_REQUEST_LOCK = asyncio.Lock()
-_NEXT_ALLOWED_REQUEST_AT = 0.0
+_RATE_LIMITER = TokenBucketRateLimiter(
+    API_RATE_LIMIT_PER_SECOND,
+    API_RATE_LIMIT_BURST,
+    min_rate=API_RATE_LIMIT_MIN_PER_SECOND,
+    starvation_seconds=API_PRIORITY_STARVATION_SECONDS,
+)
+_CIRCUIT_BREAKER = CircuitBreaker(
+    API_CIRCUIT_FAILURE_THRESHOLD,
+    API_CIRCUIT_COOLDOWN_SECONDS,
+)
+_REQUEST_METRICS = RequestMetrics(API_METRICS_WINDOW)
+_REQUEST_PRIORITY: ContextVar[RequestPriority] = ContextVar(
+    "osservaprezzi_request_priority", default=RequestPriority.SCHEDULED
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Queue the API requests made inside this block in the given lane.
+
+    Requests default to the scheduled lane. The priority follows tasks created
+    inside the block, including a shared in-flight station request.
+    """
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
 
 
 class InvalidStationPayloadError(aiohttp.ClientError):
     """Raised when a successful station response has an unusable structure."""
 
 
-def normalize_station_data(data: Any, station_id: str) -> dict[str, Any]:
-    """Validate and normalize the station fields consumed by the integration."""
+@dataclass(frozen=True)
+class StationResponse:
+    """A normalized station payload and how it was obtained."""
+
+    data: StationPayload
+    revision: str
+    unchanged: bool
+    bytes_received: int
+    bytes_saved: int
+
+
+@dataclass
+class _CachedStation:
+    """Validators and normalized payload of the last station response."""
+
+    etag: str | None
+    last_modified: str | None
+    revision: str
+    size: int
+    data: StationPayload
+
+
+@dataclass(eq=False)
+class _SharedRequest:
+    """A station request shared by concurrent callers.
+
+    The request waits at the rate limiter in the lane of its most urgent
+    caller, so a caller joining from a higher lane raises it.
+    """
+
+    priority: RequestPriority
+    future: asyncio.Future[StationResponse] = field(init=False)
+
+
+_IN_FLIGHT: dict[str, _SharedRequest] = {}
+_SHARED_REQUEST: ContextVar[_SharedRequest | None] = ContextVar(
+    "osservaprezzi_shared_request", default=None
+)
+_RECENT_RESULTS: dict[str, tuple[float, StationResponse]] = {}
+_RESULT_FRESHNESS = {"seconds": float(API_RESULT_FRESHNESS_SECONDS)}
+_RESPONSE_CACHE: dict[str, _CachedStation] = {}
+_REQUIRED_FUEL_FIELDS = frozenset({"name", "price", "fuelId", "isSelf", "serviceAreaId"})
+_RESPONSE_CACHE_STATS = {
+    "requests": 0,
+    "not_modified": 0,
+    "unchanged_bodies": 0,
+    "normalizations_skipped": 0,
+    "bytes_received": 0,
+    "bytes_saved": 0,
+}
+# Counters when the current scheduled cycle started, and the deltas of the
+# last complete cycle.
+_RESPONSE_CACHE_CYCLE_START = dict.fromkeys(_RESPONSE_CACHE_STATS, 0)
+_RESPONSE_CACHE_LAST_CYCLE: dict[str, int] = {}
+
+
+def normalize_station_data(data: Any, station_id: str) -> StationPayload:
+    """Validate a station response and parse it into a typed payload.
+
+    Each collection is walked once, validating and converting its items
+    together. A missing collection is treated as empty.
+    """
     if not isinstance(data, dict):
         raise InvalidStationPayloadError("station response is not a mapping")
 
@@ -39,127 +145,489 @@ def normalize_station_data(data: Any, station_id: str) -> dict[str, Any]:
         or str(response_id) != str(station_id)
     ):
         raise InvalidStationPayloadError("station response has an invalid id")
-    if not isinstance(data.get("name"), str) or not data["name"].strip():
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
         raise InvalidStationPayloadError("station response has an invalid name")
 
-    normalized = dict(data)
-    for key in ("fuels", "services", "orariapertura"):
-        value = data.get(key)
-        if value is None:
-            normalized[key] = []
-        elif not isinstance(value, list):
-            raise InvalidStationPayloadError(f"station response {key} is not a list")
-
-    required_fuel_fields = {"name", "price", "fuelId", "isSelf", "serviceAreaId"}
-    for fuel in normalized["fuels"]:
-        if not isinstance(fuel, dict) or not required_fuel_fields <= fuel.keys():
+    fuels: list[FuelPayload] = []
+    for fuel in _payload_list(data, "fuels"):
+        if not isinstance(fuel, dict) or not _REQUIRED_FUEL_FIELDS <= fuel.keys():
             raise InvalidStationPayloadError("station response contains an invalid fuel")
-    if not all(isinstance(item, dict) for item in normalized["orariapertura"]):
-        raise InvalidStationPayloadError("station response contains invalid opening hours")
-    if not all(
-        isinstance(item, (dict, int, str)) and not isinstance(item, bool)
-        for item in normalized["services"]
+        fuels.append(FuelPayload.from_api(fuel))
+
+    services: list[Any] = []
+    for service in _payload_list(data, "services"):
+        if not isinstance(service, (dict, int, str)) or isinstance(service, bool):
+            raise InvalidStationPayloadError("station response contains an invalid service")
+        services.append(freeze_service(service))
+
+    opening_hours: list[ScheduleDay] = []
+    for day in _payload_list(data, "orariapertura"):
+        if not isinstance(day, dict):
+            raise InvalidStationPayloadError("station response contains invalid opening hours")
+        opening_hours.append(ScheduleDay.from_api(day))
+
+    return StationPayload(
+        id=response_id,
+        name=name,
+        plant_name=data.get("nomeImpianto"),
+        address=data.get("address"),
+        brand=data.get("brand"),
+        company=data.get("company"),
+        phone_number=data.get("phoneNumber"),
+        email=data.get("email"),
+        website=data.get("website"),
+        fuels=tuple(fuels),
+        services=tuple(services),
+        opening_hours=tuple(opening_hours),
+    )
+
+
+def _payload_list(data: dict[str, Any], key: str) -> list[Any]:
+    """Return a list field of a station response, treating a missing one as empty."""
+    value = data.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise InvalidStationPayloadError(f"station response {key} is not a list")
+    return value
+
+
+def normalize_zone_results(data: Any) -> dict[str, dict[str, Any]]:
+    """Return usable zone-search results keyed by station ID.
+
+    Malformed entries are skipped so that their stations can be fetched
+    individually; a malformed envelope raises InvalidStationPayloadError.
+    """
+    if (
+        not isinstance(data, dict)
+        or data.get("success") is False
+        or not isinstance(data.get("results"), list)
     ):
-        raise InvalidStationPayloadError("station response contains an invalid service")
+        raise InvalidStationPayloadError("zone response has no result list")
 
-    return normalized
+    required_fuel_fields = {"name", "price", "fuelId", "isSelf"}
+    results: dict[str, dict[str, Any]] = {}
+    for result in data["results"]:
+        if not isinstance(result, dict):
+            continue
+        station_id = result.get("id")
+        fuels = result.get("fuels")
+        if (
+            isinstance(station_id, bool)
+            or not isinstance(station_id, (int, str))
+            or not str(station_id).strip()
+            or not isinstance(fuels, list)
+            or not all(
+                isinstance(fuel, dict) and required_fuel_fields <= fuel.keys()
+                for fuel in fuels
+            )
+        ):
+            continue
+        results[str(station_id).strip()] = result
+    return results
 
 
 async def fetch_station_data(
     hass: HomeAssistant,
     station_id: str,
     timeout: int = 30,
-) -> dict[str, Any]:
+    max_age: float | None = None,
+) -> StationPayload:
     """Fetch station data from the API.
 
     Args:
         hass: Home Assistant instance
         station_id: The station ID to fetch
         timeout: Request timeout in seconds
+        max_age: Seconds a successful result may be reused, by default the
+            configured freshness window; 0 disables reuse
 
     Returns:
-        The station data as a dictionary
+        The validated station payload
 
     Raises:
         aiohttp.ClientResponseError: If the API returns an error status
         aiohttp.ClientError: If there's a connection error
     """
-    session = async_get_clientsession(hass)
+    response = await async_fetch_station(hass, station_id, timeout, max_age)
+    return response.data
+
+
+async def async_fetch_station(
+    hass: HomeAssistant,
+    station_id: str,
+    timeout: int = 30,
+    max_age: float | None = None,
+) -> StationResponse:
+    """Fetch a station payload together with its revision and cache outcome.
+
+    Concurrent calls for the same station share one in-flight request, which
+    moves to the lane of a caller with a higher priority if it is still
+    waiting at the rate limiter. A result younger than ``max_age`` seconds, by
+    default the configured freshness window, is returned without a new
+    request. Payloads are immutable, so callers share them without copying.
+    """
+    if max_age is None:
+        max_age = _RESULT_FRESHNESS["seconds"]
+    key = str(station_id)
+    recent = _RECENT_RESULTS.get(key)
+    if recent is not None and time.monotonic() - recent[0] <= max_age:
+        _LOGGER.debug("Reusing station %s data from the last %ss", key, max_age)
+        return recent[1]
+
+    priority = _REQUEST_PRIORITY.get()
+    shared = _IN_FLIGHT.get(key)
+    if shared is None:
+        shared = _SharedRequest(priority)
+        token = _SHARED_REQUEST.set(shared)
+        try:
+            shared.future = asyncio.ensure_future(
+                _async_request_station_data(hass, key, timeout)
+            )
+        finally:
+            _SHARED_REQUEST.reset(token)
+        _IN_FLIGHT[key] = shared
+        shared.future.add_done_callback(partial(_finish_station_request, key, shared))
+    else:
+        _LOGGER.debug("Joining in-flight request for station %s", key)
+        if priority < shared.priority:
+            shared.priority = priority
+            _RATE_LIMITER.raise_priority(shared, priority)
+    # Shield the shared request so one cancelled caller does not cancel the others.
+    return await asyncio.shield(shared.future)
+
+
+def _finish_station_request(
+    station_id: str,
+    shared: _SharedRequest,
+    future: asyncio.Future[StationResponse],
+) -> None:
+    """Forget a finished request and remember its result when it succeeded.
+
+    Results past the freshness window are evicted. A request whose station
+    was forgotten meanwhile is not remembered.
+    """
+    if _IN_FLIGHT.get(station_id) is not shared:
+        return
+    del _IN_FLIGHT[station_id]
+    now = time.monotonic()
+    for key, (finished_at, _) in list(_RECENT_RESULTS.items()):
+        if now - finished_at > _RESULT_FRESHNESS["seconds"]:
+            del _RECENT_RESULTS[key]
+    if not future.cancelled() and future.exception() is None:
+        _RECENT_RESULTS[station_id] = (now, future.result())
+
+
+def configure_result_freshness(seconds: float) -> None:
+    """Set how many seconds a successful station response is reused."""
+    _RESULT_FRESHNESS["seconds"] = float(seconds)
+
+
+def forget_station(station_id: str) -> None:
+    """Drop the shared request, recent result and cached response of a station.
+
+    A running request is left to finish for its callers, but its result is
+    not kept.
+    """
+    key = str(station_id)
+    _IN_FLIGHT.pop(key, None)
+    _RECENT_RESULTS.pop(key, None)
+    _RESPONSE_CACHE.pop(key, None)
+
+
+def _conditional_headers(cached: _CachedStation | None) -> dict[str, str]:
+    """Return request headers, adding validators from a cached response."""
+    headers = dict(DEFAULT_HEADERS)
+    if cached is not None and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached is not None and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _cached_response(
+    station_id: str,
+    cached: _CachedStation,
+    *,
+    bytes_received: int,
+) -> StationResponse:
+    """Return an unchanged cached payload and count the work it saved."""
+    bytes_saved = cached.size if bytes_received == 0 else 0
+    _RESPONSE_CACHE_STATS["normalizations_skipped"] += 1
+    _RESPONSE_CACHE_STATS["bytes_saved"] += bytes_saved
+    _LOGGER.debug(
+        "Station %s is unchanged (%s); reusing the cached payload",
+        station_id,
+        "not modified" if bytes_received == 0 else "same body",
+    )
+    return StationResponse(
+        data=cached.data,
+        revision=cached.revision,
+        unchanged=True,
+        bytes_received=bytes_received,
+        bytes_saved=bytes_saved,
+    )
+
+
+async def _async_request_station_data(
+    hass: HomeAssistant,
+    station_id: str,
+    timeout: int,
+) -> StationResponse:
+    """Request one station payload, revalidating any cached response."""
+    session = async_get_session(hass)
     url = f"{BASE_URL}{STATION_ENDPOINT.format(station_id=station_id)}"
+    cached = _RESPONSE_CACHE.get(station_id)
 
     _LOGGER.debug("Fetching station data from: %s", url)
 
+    timing = RequestTiming()
+    outcome: int | str = "connection_error"
+    measured = False
     try:
-        async with _REQUEST_LOCK:
-            await _wait_for_request_slot(station_id)
-            async with session.get(
-                url,
-                headers=DEFAULT_HEADERS,
-                timeout=aiohttp.ClientTimeout(total=timeout),
-            ) as response:
+        timing.queue_wait = await _async_acquire_request_slot(f"station {station_id}")
+        async with session.get(
+            url,
+            headers=_conditional_headers(cached),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            trace_request_ctx=timing,
+        ) as response:
+            outcome = response.status
+            measured = True
+            _LOGGER.debug(
+                "Station API response for %s: status=%s", station_id, response.status
+            )
+            _record_response_feedback(response)
+            _RESPONSE_CACHE_STATS["requests"] += 1
+
+            if response.status == 304 and cached is not None:
+                _RESPONSE_CACHE_STATS["not_modified"] += 1
+                return _cached_response(station_id, cached, bytes_received=0)
+            if response.status == 200:
+                download_started_at = time.monotonic()
+                body = await response.read()
+                timing.download = time.monotonic() - download_started_at
+                _RESPONSE_CACHE_STATS["bytes_received"] += len(body)
+                revision = hashlib.blake2b(body, digest_size=16).hexdigest()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if cached is not None and cached.revision == revision:
+                    _RESPONSE_CACHE_STATS["unchanged_bodies"] += 1
+                    cached.etag = etag
+                    cached.last_modified = last_modified
+                    return _cached_response(station_id, cached, bytes_received=len(body))
+
+                normalize_started_at = time.monotonic()
+                try:
+                    data = json.loads(body)
+                except ValueError as err:
+                    _LOGGER.warning("Station API response for %s is not valid JSON", station_id)
+                    raise InvalidStationPayloadError("station response is not JSON") from err
+                values = data.values() if isinstance(data, dict) else (data,)
+                collection_counts = {
+                    "lists": sum(isinstance(value, list) for value in values),
+                    "mappings": sum(isinstance(value, dict) for value in values),
+                }
                 _LOGGER.debug(
-                    "Station API response for %s: status=%s", station_id, response.status
+                    "Station API response for %s: status=%s, payload_type=%s, "
+                    "field_count=%s, collection_counts=%s",
+                    station_id,
+                    response.status,
+                    type(data).__name__,
+                    len(data) if isinstance(data, dict) else "n/a",
+                    collection_counts,
                 )
-
-                if response.status == 200:
-                    data = await response.json()
-                    values = data.values() if isinstance(data, dict) else (data,)
-                    collection_counts = {
-                        "lists": sum(isinstance(value, list) for value in values),
-                        "mappings": sum(isinstance(value, dict) for value in values),
-                    }
-                    _LOGGER.debug(
-                        "Station API response for %s: status=%s, payload_type=%s, "
-                        "field_count=%s, collection_counts=%s",
-                        station_id,
-                        response.status,
-                        type(data).__name__,
-                        len(data) if isinstance(data, dict) else "n/a",
-                        collection_counts,
-                    )
-                    try:
-                        return normalize_station_data(data, station_id)
-                    except InvalidStationPayloadError as err:
-                        _LOGGER.warning("Invalid station API response structure: %s", err)
-                        raise
-                if response.status == 404:
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status,
-                        message=f"Station with ID {station_id} not found",
-                        headers=response.headers,
-                    )
-                if response.status == 429:
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status,
-                        message="Rate limit exceeded. Please try again later.",
-                        headers=response.headers,
-                    )
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=f"Service error: {response.status} - {response.reason}",
-                    headers=response.headers,
+                try:
+                    normalized = normalize_station_data(data, station_id)
+                except InvalidStationPayloadError as err:
+                    _LOGGER.warning("Invalid station API response structure: %s", err)
+                    raise
+                timing.normalize = time.monotonic() - normalize_started_at
+                _RESPONSE_CACHE[station_id] = _CachedStation(
+                    etag=etag,
+                    last_modified=last_modified,
+                    revision=revision,
+                    size=len(body),
+                    data=normalized,
+                )
+                return StationResponse(
+                    data=normalized,
+                    revision=revision,
+                    unchanged=False,
+                    bytes_received=len(body),
+                    bytes_saved=0,
                 )
-    except (aiohttp.ClientError, asyncio.TimeoutError):
+            _raise_response_error(response, f"Station with ID {station_id} not found")
+    except CircuitOpenError:
+        outcome = "circuit_open"
+        raise
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+        _CIRCUIT_BREAKER.record_failure()
+        outcome = "timeout" if isinstance(err, asyncio.TimeoutError) else "connection_error"
+        measured = False
+        raise
+    finally:
+        _REQUEST_METRICS.record(outcome, timing if measured else None)
+
+
+async def fetch_zone_prices(
+    hass: HomeAssistant,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    timeout: int = 30,
+) -> dict[str, dict[str, Any]]:
+    """Fetch fuel prices for every station within a radius of a point.
+
+    Returns:
+        Zone results keyed by station ID. They carry fuels, name, brand and
+        location, but not services, opening hours or contact details.
+
+    Raises:
+        aiohttp.ClientResponseError: If the API returns an error status
+        aiohttp.ClientError: If there's a connection error or unusable payload
+    """
+    session = async_get_session(hass)
+    url = f"{BASE_URL}{ZONE_SEARCH_ENDPOINT}"
+    payload = {
+        "points": [{"lat": latitude, "lng": longitude}],
+        "radius": radius_km,
+    }
+
+    await _async_acquire_request_slot("a zone search")
+    try:
+        async with session.post(
+            url,
+            json=payload,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            _LOGGER.debug("Zone search response: status=%s", response.status)
+            _record_response_feedback(response)
+            if response.status == 200:
+                results = normalize_zone_results(await response.json())
+                _LOGGER.debug("Zone search returned %d usable stations", len(results))
+                return results
+            _raise_response_error(response, "Zone search endpoint not found")
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+        _CIRCUIT_BREAKER.record_failure()
         raise
 
 
-async def _wait_for_request_slot(station_id: str) -> None:
-    """Serialize outbound station requests to avoid API bursts."""
-    global _NEXT_ALLOWED_REQUEST_AT
+async def _async_acquire_request_slot(target: str) -> float:
+    """Wait for the shared rate limiter, then fail fast during an outage.
 
-    wait_time = _NEXT_ALLOWED_REQUEST_AT - time.monotonic()
-    if wait_time > 0:
+    The circuit is checked after the wait, since it may have opened meanwhile,
+    and so that a half-open probe is only claimed right before it is sent.
+    Returns the seconds spent waiting for the rate limiter.
+    """
+    shared = _SHARED_REQUEST.get()
+    priority = _REQUEST_PRIORITY.get() if shared is None else shared.priority
+    waited = await _RATE_LIMITER.acquire(priority, key=shared)
+    _CIRCUIT_BREAKER.before_request()
+    if waited:
         _LOGGER.debug(
-            "Waiting %.2fs before requesting station %s to avoid API bursts",
-            wait_time,
-            station_id,
+            "Waited %.2fs in the %s lane before requesting %s to avoid API bursts",
+            waited,
+            (priority if shared is None else shared.priority).name.lower(),
+            target,
+        )
+    return waited
+
+
+def _record_response_feedback(response: aiohttp.ClientResponse) -> None:
+    """Feed a response status back to the rate limiter and circuit breaker.
+
+    Throttled responses slow the rate limiter and release a half-open probe;
+    server errors count as outage failures and any other response proves the
+    API is reachable.
+    """
+    if response.status == 429:
+        _RATE_LIMITER.record_throttle(
+            parse_retry_after(
+                response.headers.get("Retry-After"),
+                API_RETRY_AFTER_MAX_SECONDS,
+            )
         )
-        await asyncio.sleep(wait_time)
+        _CIRCUIT_BREAKER.record_throttle()
+        return
+    _RATE_LIMITER.record_success()
+    if response.status >= 500:
+        _CIRCUIT_BREAKER.record_failure()
+    else:
+        _CIRCUIT_BREAKER.record_success()
+
+
+def _raise_response_error(
+    response: aiohttp.ClientResponse,
+    not_found_message: str,
+) -> NoReturn:
+    """Raise the client error matching an unsuccessful API response."""
+    if response.status == 404:
+        message = not_found_message
+    elif response.status == 429:
+        message = "Rate limit exceeded. Please try again later."
+    else:
+        message = f"Service error: {response.status} - {response.reason}"
+    raise aiohttp.ClientResponseError(
+        request_info=response.request_info,
+        history=response.history,
+        status=response.status,
+        message=message,
+        headers=response.headers,
+    )
+
+
+def configure_rate_limit(rate: float, burst: int) -> None:
+    """Apply a requests-per-second rate and a burst to the shared rate limiter."""
+    _RATE_LIMITER.configure(rate, burst)
+
+
+def rate_limit_burst() -> int:
+    """Return the burst of the shared rate limiter."""
+    return _RATE_LIMITER.burst
 
-    _NEXT_ALLOWED_REQUEST_AT = time.monotonic() + API_REQUEST_INTERVAL_SECONDS
+
+def rate_limiter_status() -> dict[str, Any]:
+    """Return the shared station API rate limiter state for diagnostics."""
+    return _RATE_LIMITER.status()
+
+
+def circuit_breaker_status() -> dict[str, Any]:
+    """Return the shared station API circuit breaker state for diagnostics."""
+    return _CIRCUIT_BREAKER.status()
+
+
+def request_metrics_status() -> dict[str, Any]:
+    """Return station request timing metrics for diagnostics."""
+    return _REQUEST_METRICS.status()
+
+
+def start_response_cache_cycle() -> None:
+    """Close the response cache counters of a scheduled cycle and start the next."""
+    _RESPONSE_CACHE_LAST_CYCLE.clear()
+    _RESPONSE_CACHE_LAST_CYCLE.update(_response_cache_cycle_deltas())
+    _RESPONSE_CACHE_CYCLE_START.update(_RESPONSE_CACHE_STATS)
+
+
+def _response_cache_cycle_deltas() -> dict[str, int]:
+    """Return the response cache counters since the current cycle started."""
+    return {
+        key: value - _RESPONSE_CACHE_CYCLE_START.get(key, 0)
+        for key, value in _RESPONSE_CACHE_STATS.items()
+    }
+
+
+def response_cache_status() -> dict[str, Any]:
+    """Return station response cache counters for diagnostics.
+
+    Totals count since startup; the cycle counters cover the scheduled cycle
+    in progress and the last complete one.
+    """
+    return {
+        "cached_stations": len(_RESPONSE_CACHE),
+        **_RESPONSE_CACHE_STATS,
+        "current_cycle": _response_cache_cycle_deltas(),
+        "last_cycle": dict(_RESPONSE_CACHE_LAST_CYCLE) or None,
+    }
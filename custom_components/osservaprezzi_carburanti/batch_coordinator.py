@@ -0,0 +1,181 @@
+"""Shared batch refresh for stations that opt out of per-entry schedules."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import async_fetch_station
+from .const import CONF_STATION_ID, DOMAIN
+from .coordinator import CarburantiDataUpdateCoordinator
+from .cron_scheduler import CronScheduler, get_cron_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_COORDINATOR_DATA_KEY = "batch_coordinator"
+
+
+class StationBatchCoordinator:
+    """Refresh every member station with one task.
+
+    Members keep their own cron expressions and are scheduled by the shared
+    cron scheduler, which hands members to the batch as they fall due within
+    their jitter window. Queued members are fetched one after another in one
+    background task, each request taking its turn at the shared rate limiter
+    without a per-station retry loop. Results are published to each station's
+    own coordinator, so entities keep listening to the coordinator they
+    already use.
+    """
+
+    def __init__(self, hass: HomeAssistant, scheduler: CronScheduler) -> None:
+        """Initialize an empty batch."""
+        self.hass = hass
+        self._scheduler = scheduler
+        self._members: dict[str, CarburantiDataUpdateCoordinator] = {}
+        self._due: set[str] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._batches = 0
+        self._last_batch: dict[str, Any] | None = None
+
+    @property
+    def member_count(self) -> int:
+        """Return the number of stations refreshed by the batch."""
+        return len(self._members)
+
+    def async_add(
+        self,
+        coordinator: CarburantiDataUpdateCoordinator,
+        cron_expression: str,
+        jitter_window: timedelta = timedelta(0),
+        runs: Iterator[datetime] | None = None,
+    ) -> Callable[[], None]:
+        """Add a station to the batch and return a callback removing it.
+
+        Raises the cron helper's errors when the expression cannot be scheduled.
+        """
+        entry_id = coordinator.config_entry.entry_id
+        self._scheduler.async_add(
+            coordinator, cron_expression, self.async_queue, jitter_window, runs
+        )
+        self._members[entry_id] = coordinator
+        return partial(self.async_remove, entry_id)
+
+    def async_remove(self, entry_id: str) -> None:
+        """Remove a station from the batch and from the schedule."""
+        if self._members.pop(entry_id, None) is not None:
+            self._scheduler.async_remove(entry_id)
+        self._due.discard(entry_id)
+
+    def async_queue(self, coordinators: list[CarburantiDataUpdateCoordinator]) -> None:
+        """Queue due members and start the batch task if it is idle."""
+        self._due.update(
+            coordinator.config_entry.entry_id
+            for coordinator in coordinators
+            if coordinator.config_entry.entry_id in self._members
+        )
+        if self._due and (self._task is None or self._task.done()):
+            self._task = self.hass.async_create_background_task(
+                self._async_refresh_due(),
+                f"{DOMAIN} batch refresh",
+            )
+
+    async def _async_refresh_due(self) -> None:
+        """Refresh queued members until none are left, including late arrivals."""
+        while self._due:
+            entry_ids = sorted(self._due)
+            self._due.clear()
+            await self.async_refresh(entry_ids)
+
+    async def async_refresh(self, entry_ids: list[str]) -> None:
+        """Fetch the given member stations in one pass and publish each result."""
+        coordinators = [
+            self._members[entry_id] for entry_id in entry_ids if entry_id in self._members
+        ]
+        if not coordinators:
+            return
+
+        csv_manager = coordinators[0].csv_manager
+        if not csv_manager.is_data_available() and not await csv_manager.async_initialize():
+            _LOGGER.warning(
+                "CSV station data initialization failed; continuing without CSV enrichment"
+            )
+
+        started_at = time.monotonic()
+        started = dt_util.utcnow()
+        failed = 0
+        for coordinator in coordinators:
+            station_id = coordinator.config_entry.data[CONF_STATION_ID]
+            # Each member publishes its own outcome, so one failing station,
+            # including a malformed payload, does not abort the batch.
+            try:
+                response = await async_fetch_station(self.hass, station_id)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                failed += 1
+                coordinator.async_apply_station_error(err)
+            else:
+                if not coordinator.async_apply_station_response(response):
+                    failed += 1
+
+        self._batches += 1
+        self._last_batch = {
+            "started_at": started.isoformat(),
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+            "stations": len(coordinators),
+            "refreshed": len(coordinators) - failed,
+            "failed": failed,
+        }
+        _LOGGER.info(
+            "Batch refresh of %d station(s) finished in %.1fs with %d failure(s)",
+            len(coordinators),
+            self._last_batch["duration_seconds"],
+            failed,
+        )
+
+    def status(self) -> dict[str, Any]:
+        """Return batch state for diagnostics."""
+        next_runs = [
+            next_run
+            for entry_id in self._members
+            if (next_run := self._scheduler.next_run(entry_id)) is not None
+        ]
+        return {
+            "members": len(self._members),
+            "next_run": min(next_runs).isoformat() if next_runs else None,
+            "running": self._task is not None and not self._task.done(),
+            "batches": self._batches,
+            "last_batch": self._last_batch,
+        }
+
+    def async_shutdown(self) -> None:
+        """Unschedule every member and cancel a running batch."""
+        for entry_id in list(self._members):
+            self.async_remove(entry_id)
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+
+def get_batch_coordinator(hass: HomeAssistant) -> StationBatchCoordinator:
+    """Return the integration-wide batch coordinator."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    batch = domain_data.get(BATCH_COORDINATOR_DATA_KEY)
+    if not isinstance(batch, StationBatchCoordinator):
+        batch = StationBatchCoordinator(hass, get_cron_scheduler(hass))
+        domain_data[BATCH_COORDINATOR_DATA_KEY] = batch
+    return batch
+
+
+def async_remove_batch_coordinator(hass: HomeAssistant) -> None:
+    """Shut down and forget the batch coordinator, if any."""
+    batch = hass.data.get(DOMAIN, {}).pop(BATCH_COORDINATOR_DATA_KEY, None)
+    if isinstance(batch, StationBatchCoordinator):
+        batch.async_shutdown()
@@ -16,7 +16,6 @@ from .entity import (
     OsservaprezziBaseEntity,
     ScheduleAwareEntity,
     _find_schedule_for_day,
-    _get_available_service_ids,
     _has_valid_opening_hours,
     _schedule_intervals_for_date,
 )
@@ -48,11 +47,11 @@ async def async_setup_entry(
 
     @callback
     def _async_discover_entities() -> None:
-        data = coordinator.data or {}
+        data = coordinator.data
         entities: list[BinarySensorEntity] = []
         if _has_valid_opening_hours(data):
             entities.append(StationOpenClosedBinarySensor(coordinator, entry))
-        available_service_ids = _get_available_service_ids(data.get("services", []))
+        available_service_ids = data.service_ids if data else frozenset()
         for service_id, service_info in ADDITIONAL_SERVICES.items():
             if service_id in available_service_ids:
                 entities.append(StationServiceBinarySensor(coordinator, entry, service_id, service_info))
@@ -62,7 +61,11 @@ async def async_setup_entry(
         if not new_entities:
             return
         known_unique_ids.update(entity._attr_unique_id for entity in new_entities)
-        async_add_entities(new_entities, update_before_add=initial_discovery)
+        async_add_entities(
+            new_entities,
+            update_before_add=initial_discovery
+            and not getattr(coordinator, "data_is_restored", False),
+        )
 
     _async_discover_entities()
     initial_discovery = False
@@ -74,6 +77,7 @@ class StationOpenClosedBinarySensor(ScheduleAwareEntity, BinarySensorEntity):
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:storefront"
+    _update_keys = frozenset({"opening_hours"})
 
     def __init__(self, coordinator: CarburantiDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the open/closed binary sensor."""
@@ -83,7 +87,7 @@ class StationOpenClosedBinarySensor(ScheduleAwareEntity, BinarySensorEntity):
 
     def _is_currently_open(self) -> bool:
         """Check if the station is currently open."""
-        opening_hours = self.coordinator.data.get("opening_hours", []) if self.coordinator.data else []
+        opening_hours = self.coordinator.data.opening_hours if self.coordinator.data else ()
         if not opening_hours:
             return False
 
@@ -120,6 +124,7 @@ class StationServiceBinarySensor(OsservaprezziBaseEntity, BinarySensorEntity):
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_has_entity_name = True
+    _update_keys = frozenset({"services"})
 
     def __init__(
         self,
@@ -141,7 +146,7 @@ class StationServiceBinarySensor(OsservaprezziBaseEntity, BinarySensorEntity):
         """Return True if the service is available at the station."""
         if not self.coordinator.data:
             return False
-        return self._service_id in _get_available_service_ids(self.coordinator.data.get("services", []))
+        return self._service_id in self.coordinator.data.service_ids
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -0,0 +1,120 @@
+"""Integration-wide circuit breaker for Osservaprezzi API outages."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of sending a request while the API is considered down."""
+
+
+class CircuitBreaker:
+    """Stop sending requests after consecutive outage failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast for ``cooldown_seconds``. The first request after the
+    cooldown is let through as a single half-open probe: success closes the
+    circuit, failure opens it for another cooldown. A throttled probe proves
+    nothing either way, so it reopens the circuit for another cooldown without
+    counting a failure. A probe that never reports back is replaced after
+    another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float) -> None:
+        """Initialize a closed circuit."""
+        if failure_threshold < 1 or cooldown_seconds <= 0:
+            raise ValueError("Circuit breaker needs a positive threshold and cooldown")
+        self._failure_threshold = failure_threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._probe_started_at: float | None = None
+        self._open_events = 0
+        self._rejected_requests = 0
+
+    @property
+    def state(self) -> str:
+        """Return the current circuit state."""
+        return self._state
+
+    def before_request(self) -> None:
+        """Allow a request or raise CircuitOpenError while the circuit is open."""
+        if self._state == STATE_CLOSED:
+            return
+        now = time.monotonic()
+        started_at = (
+            self._opened_at if self._state == STATE_OPEN else self._probe_started_at
+        )
+        if started_at is not None and now - started_at >= self._cooldown_seconds:
+            self._state = STATE_HALF_OPEN
+            self._probe_started_at = now
+            _LOGGER.info("Station API circuit half-open; sending one probe request")
+            return
+        self._rejected_requests += 1
+        raise CircuitOpenError("Station API is unavailable; retrying after the cooldown")
+
+    def record_success(self) -> None:
+        """Close the circuit after a response from a reachable API."""
+        if self._state != STATE_CLOSED:
+            _LOGGER.info("Station API reachable again; circuit closed")
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Count an outage failure and open the circuit when needed."""
+        self._consecutive_failures += 1
+        if self._state == STATE_HALF_OPEN or (
+            self._state == STATE_CLOSED
+            and self._consecutive_failures >= self._failure_threshold
+        ):
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+            self._open_events += 1
+            _LOGGER.warning(
+                "Station API failed %d consecutive time(s); pausing requests for %.0fs",
+                self._consecutive_failures,
+                self._cooldown_seconds,
+            )
+
+    def record_throttle(self) -> None:
+        """Release the half-open probe slot after a throttled response."""
+        if self._state != STATE_HALF_OPEN:
+            return
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started_at = None
+        _LOGGER.info(
+            "Station API probe was throttled; pausing requests for %.0fs",
+            self._cooldown_seconds,
+        )
+
+    def status(self) -> dict[str, Any]:
+        """Return circuit state for diagnostics."""
+        retry_in = None
+        if self._state == STATE_OPEN and self._opened_at is not None:
+            retry_in = round(
+                max(0.0, self._opened_at + self._cooldown_seconds - time.monotonic()), 1
+            )
+        return {
+            "state": self._state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self._failure_threshold,
+            "cooldown_seconds": self._cooldown_seconds,
+            "retry_in_seconds": retry_in,
+            "open_events": self._open_events,
+            "rejected_requests": self._rejected_requests,
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 from functools import partial
 from typing import Any
@@ -12,19 +13,43 @@ from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .api import fetch_station_data
+from .api import fetch_station_data, request_priority
 from .const import (
     DOMAIN,
+    CONF_ADAPTIVE_REFRESH,
     CONF_CRON_EXPRESSION,
+    CONF_DAILY_PRICE_FILE,
+    CONF_DAILY_REFRESH_BUDGET,
+    CONF_FAST_STARTUP,
+    CONF_JITTER_MINUTES,
     CONF_PRICE_STALE_HOURS,
+    CONF_RESULT_FRESHNESS_SECONDS,
+    CONF_SHARED_REFRESH,
     CONF_STATION_ID,
+    DAILY_REFRESH_BUDGET_OPTIONS,
+    DEFAULT_ADAPTIVE_REFRESH,
     DEFAULT_CRON_EXPRESSION,
+    DEFAULT_DAILY_PRICE_FILE,
+    DEFAULT_DAILY_REFRESH_BUDGET,
+    DEFAULT_FAST_STARTUP,
+    DEFAULT_JITTER_MINUTES,
     DEFAULT_PRICE_STALE_HOURS,
+    DEFAULT_RESULT_FRESHNESS_SECONDS,
+    DEFAULT_SHARED_REFRESH,
+    JITTER_MINUTE_OPTIONS,
     PRICE_STALE_HOUR_OPTIONS,
+    RESULT_FRESHNESS_SECOND_OPTIONS,
 )
 from .cron_helper import get_next_run_time, validate_cron_expression
 from .csv_manager import RegistrySnapshot, RegistryUnavailableError, get_shared_csv_manager
-from .discovery import StationCandidate, find_nearby_stations, find_stations_by_area
+from .discovery import (
+    REGISTRY_VOCABULARY_INDEX,
+    RegistryVocabularyIndex,
+    StationCandidate,
+    find_nearby_stations,
+    find_stations_by_area,
+)
+from .rate_limiter import RequestPriority
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,7 +82,8 @@ async def _validate_station(hass: HomeAssistant, station_id: str) -> dict[str, A
         raise InvalidStation("Station ID is empty")
 
     try:
-        data = await fetch_station_data(hass, normalized_station_id)
+        with request_priority(RequestPriority.INTERACTIVE):
+            data = await fetch_station_data(hass, normalized_station_id)
         if not data.get("id") or not data.get("name"):
             raise InvalidStation("Invalid station data received")
         return {"name": data["name"]}
@@ -72,7 +98,7 @@ async def _validate_station(hass: HomeAssistant, station_id: str) -> dict[str, A
 class OsservaprezziCarburantiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
     """Handle the config flow for Osservaprezzi Carburanti."""
 
-    VERSION = 2
+    VERSION = 3
 
     @staticmethod
     @callback
@@ -206,11 +232,11 @@ class OsservaprezziCarburantiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
     ) -> ConfigFlowResult:
         """Find stations by municipality and optional province."""
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
         if user_input is not None:
             try:
-                snapshot = await get_shared_csv_manager(
-                    self.hass
-                ).async_ensure_registry(allow_stale=True)
+                csv_manager = get_shared_csv_manager(self.hass)
+                snapshot = await csv_manager.async_ensure_registry(allow_stale=True)
                 limit, text_filter, station_type = self._search_filters(user_input)
                 candidates = await self.hass.async_add_executor_job(
                     partial(
@@ -226,7 +252,28 @@ class OsservaprezziCarburantiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
                 if candidates:
                     self._store_search_results(candidates, snapshot, "area")
                     return await self._async_step_select_station()
-                errors["base"] = "no_stations_found"
+                vocabulary = await csv_manager.async_registry_index(
+                    snapshot, REGISTRY_VOCABULARY_INDEX, RegistryVocabularyIndex
+                )
+                suggestions = await self.hass.async_add_executor_job(
+                    partial(
+                        vocabulary.suggest,
+                        municipality=str(user_input[CONF_MUNICIPALITY]),
+                        province=str(user_input.get(CONF_PROVINCE, "")),
+                        brand=text_filter,
+                    )
+                )
+                if suggestions:
+                    errors["base"] = "no_stations_did_you_mean"
+                    placeholders["suggestions"] = ", ".join(
+                        dict.fromkeys(
+                            match.value
+                            for matches in suggestions.values()
+                            for match in matches
+                        )
+                    )
+                else:
+                    errors["base"] = "no_stations_found"
             except RegistryUnavailableError:
                 errors["base"] = "registry_unavailable"
             except (KeyError, TypeError, ValueError) as err:
@@ -237,6 +284,7 @@ class OsservaprezziCarburantiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
             step_id="area",
             data_schema=self._area_search_schema(),
             errors=errors,
+            description_placeholders=placeholders,
         )
 
     async def _async_search_nearby(
@@ -466,6 +514,15 @@ class OsservaprezziCarburantiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN
         )
 
 
+def _supported_option(value: Any, options: tuple[int, ...]) -> int | None:
+    """Return an integer option value if it is one of the supported choices."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number in options else None
+
+
 class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
     """Handle an options flow for Osservaprezzi Carburanti."""
 
@@ -477,47 +534,80 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         if user_input is not None:
             cron_expr = user_input[CONF_CRON_EXPRESSION]
             old_cron_expr = self.options.get(CONF_CRON_EXPRESSION, DEFAULT_CRON_EXPRESSION)
-            try:
-                stale_hours = int(
-                    user_input.get(
-                        CONF_PRICE_STALE_HOURS,
-                        DEFAULT_PRICE_STALE_HOURS,
-                    )
-                )
-            except (TypeError, ValueError):
+            stale_hours = _supported_option(
+                user_input.get(CONF_PRICE_STALE_HOURS, DEFAULT_PRICE_STALE_HOURS),
+                PRICE_STALE_HOUR_OPTIONS,
+            )
+            jitter_minutes = _supported_option(
+                user_input.get(CONF_JITTER_MINUTES, DEFAULT_JITTER_MINUTES),
+                JITTER_MINUTE_OPTIONS,
+            )
+            refresh_budget = _supported_option(
+                user_input.get(CONF_DAILY_REFRESH_BUDGET, DEFAULT_DAILY_REFRESH_BUDGET),
+                DAILY_REFRESH_BUDGET_OPTIONS,
+            )
+            result_freshness = _supported_option(
+                user_input.get(CONF_RESULT_FRESHNESS_SECONDS, DEFAULT_RESULT_FRESHNESS_SECONDS),
+                RESULT_FRESHNESS_SECOND_OPTIONS,
+            )
+
+            if stale_hours is None:
                 errors["base"] = "invalid_stale_hours"
-            else:
-                if stale_hours not in PRICE_STALE_HOUR_OPTIONS:
-                    errors["base"] = "invalid_stale_hours"
-                elif validate_cron_expression(cron_expr):
-                    if cron_expr != old_cron_expr:
-                        _LOGGER.info(
-                            "Cron expression updated from '%s' to '%s' for %s",
-                            old_cron_expr,
-                            cron_expr,
-                            self.config_entry.title,
-                        )
-                    return self.async_create_entry(
-                        title="",
-                        data={
-                            CONF_CRON_EXPRESSION: cron_expr,
-                            CONF_PRICE_STALE_HOURS: stale_hours,
-                        },
-                    )
-                else:
-                    _LOGGER.warning(
-                        "Invalid cron expression submitted: '%s' for %s",
+            elif jitter_minutes is None:
+                errors["base"] = "invalid_jitter_minutes"
+            elif refresh_budget is None:
+                errors["base"] = "invalid_refresh_budget"
+            elif result_freshness is None:
+                errors["base"] = "invalid_result_freshness"
+            elif validate_cron_expression(cron_expr):
+                if cron_expr != old_cron_expr:
+                    _LOGGER.info(
+                        "Cron expression updated from '%s' to '%s' for %s",
+                        old_cron_expr,
                         cron_expr,
                         self.config_entry.title,
                     )
-                    errors["base"] = "invalid_cron_expression"
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        CONF_CRON_EXPRESSION: cron_expr,
+                        CONF_PRICE_STALE_HOURS: stale_hours,
+                        CONF_JITTER_MINUTES: jitter_minutes,
+                        CONF_SHARED_REFRESH: bool(
+                            user_input.get(CONF_SHARED_REFRESH, DEFAULT_SHARED_REFRESH)
+                        ),
+                        CONF_FAST_STARTUP: bool(
+                            user_input.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP)
+                        ),
+                        CONF_DAILY_PRICE_FILE: bool(
+                            user_input.get(CONF_DAILY_PRICE_FILE, DEFAULT_DAILY_PRICE_FILE)
+                        ),
+                        CONF_ADAPTIVE_REFRESH: bool(
+                            user_input.get(CONF_ADAPTIVE_REFRESH, DEFAULT_ADAPTIVE_REFRESH)
+                        ),
+                        CONF_DAILY_REFRESH_BUDGET: refresh_budget,
+                        CONF_RESULT_FRESHNESS_SECONDS: result_freshness,
+                    },
+                )
+            else:
+                _LOGGER.warning(
+                    "Invalid cron expression submitted: '%s' for %s",
+                    cron_expr,
+                    self.config_entry.title,
+                )
+                errors["base"] = "invalid_cron_expression"
 
         preview_expression = self.options.get(
             CONF_CRON_EXPRESSION,
             DEFAULT_CRON_EXPRESSION,
         )
+        jitter_minutes = self.options.get(CONF_JITTER_MINUTES, DEFAULT_JITTER_MINUTES)
         try:
-            next_run = get_next_run_time(preview_expression).isoformat()
+            next_run = get_next_run_time(
+                preview_expression,
+                jitter_seed=self.config_entry.entry_id,
+                jitter_window=timedelta(minutes=jitter_minutes),
+            ).isoformat()
         except (ImportError, TypeError, ValueError):
             next_run = "—"
 
@@ -534,6 +624,40 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                         DEFAULT_PRICE_STALE_HOURS,
                     ),
                 ): vol.In(PRICE_STALE_HOUR_OPTIONS),
+                vol.Required(
+                    CONF_JITTER_MINUTES,
+                    default=jitter_minutes,
+                ): vol.In(JITTER_MINUTE_OPTIONS),
+                vol.Required(
+                    CONF_SHARED_REFRESH,
+                    default=self.options.get(CONF_SHARED_REFRESH, DEFAULT_SHARED_REFRESH),
+                ): bool,
+                vol.Required(
+                    CONF_FAST_STARTUP,
+                    default=self.options.get(CONF_FAST_STARTUP, DEFAULT_FAST_STARTUP),
+                ): bool,
+                vol.Required(
+                    CONF_DAILY_PRICE_FILE,
+                    default=self.options.get(CONF_DAILY_PRICE_FILE, DEFAULT_DAILY_PRICE_FILE),
+                ): bool,
+                vol.Required(
+                    CONF_ADAPTIVE_REFRESH,
+                    default=self.options.get(CONF_ADAPTIVE_REFRESH, DEFAULT_ADAPTIVE_REFRESH),
+                ): bool,
+                vol.Required(
+                    CONF_DAILY_REFRESH_BUDGET,
+                    default=self.options.get(
+                        CONF_DAILY_REFRESH_BUDGET,
+                        DEFAULT_DAILY_REFRESH_BUDGET,
+                    ),
+                ): vol.In(DAILY_REFRESH_BUDGET_OPTIONS),
+                vol.Required(
+                    CONF_RESULT_FRESHNESS_SECONDS,
+                    default=self.options.get(
+                        CONF_RESULT_FRESHNESS_SECONDS,
+                        DEFAULT_RESULT_FRESHNESS_SECONDS,
+                    ),
+                ): vol.In(RESULT_FRESHNESS_SECOND_OPTIONS),
             }
         )
         return self.async_show_form(
@@ -8,19 +8,80 @@ CONF_STATION_ID = "station_id"
 # Options
 CONF_CRON_EXPRESSION = "cron_expression"
 CONF_PRICE_STALE_HOURS = "price_stale_hours"
+CONF_SHARED_REFRESH = "shared_refresh"
+CONF_FAST_STARTUP = "fast_startup"
+CONF_DAILY_PRICE_FILE = "daily_price_file"
+CONF_JITTER_MINUTES = "jitter_minutes"
+CONF_ADAPTIVE_REFRESH = "adaptive_refresh"
+CONF_DAILY_REFRESH_BUDGET = "daily_refresh_budget"
+CONF_RATE_LIMIT_PER_MINUTE = "rate_limit_per_minute"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
+CONF_RESULT_FRESHNESS_SECONDS = "result_freshness_seconds"
 DEFAULT_CRON_EXPRESSION = "30 8 * * *"  # Daily at 08:30
 DEFAULT_PRICE_STALE_HOURS = 24
+DEFAULT_SHARED_REFRESH = False
+DEFAULT_DAILY_PRICE_FILE = False
+DEFAULT_FAST_STARTUP = False
 PRICE_STALE_HOUR_OPTIONS = (6, 12, 24, 48, 72, 168)
+# Scheduled refreshes run at a per-entry offset within this many minutes of
+# the cron time, so that entries sharing an expression do not all call the API
+# at once.
+DEFAULT_JITTER_MINUTES = 10
+JITTER_MINUTE_OPTIONS = (0, 5, 10, 15, 30, 60)
+DEFAULT_ADAPTIVE_REFRESH = False
+DEFAULT_DAILY_REFRESH_BUDGET = 3
+DAILY_REFRESH_BUDGET_OPTIONS = (1, 2, 3, 4, 6, 8)
+# The station API rate limiter is shared by every entry and configured once
+# for the integration in configuration.yaml. The default keeps the long-run
+# pace of the former fixed 2-second gap between requests.
+DEFAULT_RATE_LIMIT_PER_MINUTE = 30
+RATE_LIMIT_PER_MINUTE_OPTIONS = (15, 30, 60, 120, 240)
+DEFAULT_RATE_LIMIT_BURST = 2
+RATE_LIMIT_BURST_OPTIONS = (1, 2, 4, 8)
+# A successful station response is reused for this many seconds; the shortest
+# window among the loaded entries applies.
+DEFAULT_RESULT_FRESHNESS_SECONDS = 10
+RESULT_FRESHNESS_SECOND_OPTIONS = (0, 10, 30, 60, 300)
+
+# Adaptive refresh timing
+ADAPTIVE_HISTORY_DAYS = 28
+ADAPTIVE_HISTORY_SIZE = 200
+ADAPTIVE_WINDOW_MINUTES = 30
+ADAPTIVE_MIN_WINDOW_OBSERVATIONS = 2
+ADAPTIVE_REFRESH_DELAY_MINUTES = 15
 
 # API
 BASE_URL = "https://carburanti.mise.gov.it/ospzApi"
 STATION_ENDPOINT = "/registry/servicearea/{station_id}"
-API_REQUEST_INTERVAL_SECONDS = 2
+ZONE_SEARCH_ENDPOINT = "/search/zone"
+ZONE_SEARCH_MAX_RADIUS_KM = 10.0
+API_RATE_LIMIT_PER_SECOND = DEFAULT_RATE_LIMIT_PER_MINUTE / 60
+API_RATE_LIMIT_BURST = DEFAULT_RATE_LIMIT_BURST
+API_RATE_LIMIT_MIN_PER_SECOND = 0.1
+API_RETRY_AFTER_MAX_SECONDS = 300
+API_RESULT_FRESHNESS_SECONDS = DEFAULT_RESULT_FRESHNESS_SECONDS
+API_PRIORITY_STARVATION_SECONDS = 30
+API_CIRCUIT_FAILURE_THRESHOLD = 5
+API_CIRCUIT_COOLDOWN_SECONDS = 120
+API_METRICS_WINDOW = 500
+
+# Persisted coordinator state
+STATE_STORAGE_VERSION = 1
+STATE_SAVE_DELAY_SECONDS = 30
+STARTUP_REFRESH_CONCURRENCY = 2
+STARTUP_REFRESH_INTERVAL_SECONDS = 1.0
 
 # CSV data source
 CSV_URL = "https://www.mimit.gov.it/images/exportCSV/anagrafica_impianti_attivi.csv"
 CSV_UPDATE_INTERVAL = 24  # hours
 
+# Daily price CSV data source ("Prezzo alle 8 di mattina")
+PRICE_CSV_URL = "https://www.mimit.gov.it/images/exportCSV/prezzo_alle_8.csv"
+PRICE_CSV_CHECK_INTERVAL = 1  # hours between conditional downloads
+PRICE_CSV_EXTRACTION_HOUR = 8  # local hour the prices are extracted at
+PRICE_CSV_CHUNK_SIZE = 64 * 1024  # bytes parsed per streamed chunk
+PRICE_CSV_TIME_ZONE = "Europe/Rome"
+
 # Additional services mapping
 ADDITIONAL_SERVICES = {
     "1": {
@@ -130,9 +191,11 @@ ATTR_PRICE_DELTA = "price_delta"
 ATTR_PRICE_DIRECTION = "price_direction"
 ATTR_PRICE_AGE_MINUTES = "price_age_minutes"
 ATTR_PRICE_IS_STALE = "price_is_stale"
+ATTR_DATA_RESTORED = "data_restored"
 
 SERVICE_FORCE_CSV_UPDATE = "force_csv_update"
 SERVICE_CLEAR_CACHE = "clear_cache"
 SERVICE_COMPARE_STATIONS = "compare_stations"
 SERVICE_REFRESH_PRICES = "refresh_prices"
 SERVICE_SEARCH_REGISTRY = "search_registry"
+SERVICE_SEARCH_NEARBY = "search_nearby"
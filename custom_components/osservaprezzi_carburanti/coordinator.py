@@ -1,29 +1,51 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import replace
+import hashlib
 import logging
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Any
 
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
-from .api import fetch_station_data
+from .api import StationResponse, async_fetch_station
+from .circuit_breaker import CircuitOpenError
 from .const import (
-    ATTR_LATITUDE,
-    ATTR_LONGITUDE,
     CONF_STATION_ID,
     DOMAIN,
+    STATE_SAVE_DELAY_SECONDS,
+    STATE_STORAGE_VERSION,
 )
 from .csv_manager import CSVStationManager
+from .models import FuelPayload, FuelQuote, StationData, StationInfo, StationPayload
+from .refresh_timing import RefreshTiming
 
 _LOGGER = logging.getLogger(__name__)
 
 RETRY_DELAYS: list[int] = [30, 60, 120]
+RETRY_JITTER_FRACTION = 0.2
+
+
+def _state_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the last processed data of one config entry."""
+    return Store(hass, STATE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def async_remove_stored_state(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the persisted data of a removed config entry."""
+    await _state_store(hass, entry_id).async_remove()
 
 
 class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
@@ -38,6 +60,20 @@ class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
         """Initialize the coordinator."""
         self.config_entry = entry
         self.csv_manager = csv_manager
+        self.last_fetch_stats: dict[str, Any] = {}
+        self._payload_fingerprint: tuple[str, str] | None = None
+        self._body_fingerprint: tuple[str, str] | None = None
+        self._retries_used = 0
+        self._retry_at: datetime | None = None
+        self._unsub_retry: Callable[[], None] | None = None
+        self._last_error: str | None = None
+        self.data_changes: frozenset[str] | None = None
+        self._published_data: StationData | None = None
+        self._published_state: tuple[bool, bool] | None = None
+        self.data_is_restored = False
+        self.restored_at: str | None = None
+        self.refresh_timing = RefreshTiming()
+        self._store = _state_store(hass, entry.entry_id)
 
         super().__init__(
             hass,
@@ -46,7 +82,7 @@ class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=None,
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> StationData:
         """Fetch and enrich the latest station payload."""
         if not self.csv_manager.is_data_available():
             _LOGGER.info("Initializing CSV station data")
@@ -57,52 +93,315 @@ class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
 
         return await self._async_fetch_station_data()
 
-    async def _async_fetch_station_data(self) -> dict[str, Any]:
-        """Fetch station data with retry handling."""
+    async def _async_fetch_station_data(self) -> StationData:
+        """Fetch station data once, scheduling a retry after a transient failure."""
         station_id = self.config_entry.data[CONF_STATION_ID]
-        last_err: Exception | None = None
+        try:
+            response = await async_fetch_station(self.hass, station_id)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            return self._handle_fetch_error(err)
 
-        for attempt in range(len(RETRY_DELAYS) + 1):
-            try:
-                data = await fetch_station_data(self.hass, station_id)
-                return self._process_station_data(data)
-            except aiohttp.ClientResponseError as err:
-                if err.status == 404:
-                    _LOGGER.error("Station with ID %s not found", station_id)
-                    raise UpdateFailed(f"Station with ID {station_id} not found") from err
-                last_err = err
-            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-                last_err = err
-
-            if attempt < len(RETRY_DELAYS):
-                delay = self._get_retry_delay(last_err, RETRY_DELAYS[attempt])
+        self._reset_retries()
+        return self._process_station_response(response)
+
+    def _handle_fetch_error(self, err: aiohttp.ClientError | asyncio.TimeoutError) -> StationData:
+        """Keep last known data or raise UpdateFailed for a failed fetch.
+
+        Transient failures schedule a retry, while an open circuit does not.
+        """
+        station_id = self.config_entry.data[CONF_STATION_ID]
+        if isinstance(err, CircuitOpenError):
+            # The API is down for every station; retrying now only adds load.
+            if self.data:
                 _LOGGER.warning(
-                    "Attempt %d/%d failed for station %s, retrying in %ds: %s",
-                    attempt + 1,
-                    len(RETRY_DELAYS) + 1,
+                    "Keeping last known data for station %s while the API is unavailable",
                     station_id,
-                    delay,
-                    last_err,
                 )
-                await asyncio.sleep(delay)
+                return self.data
+            raise UpdateFailed(str(err)) from err
+        if not self._is_transient_error(err):
+            self._reset_retries()
+            _LOGGER.error("Station with ID %s not found", station_id)
+            raise UpdateFailed(f"Station with ID {station_id} not found") from err
+        return self._handle_transient_failure(err)
+
+    def _handle_transient_failure(self, err: Exception) -> StationData:
+        """Schedule a retry, then keep last known data or report the failure.
+
+        The retry runs from a timer outside this update, so the update ends at
+        once and later refresh requests are not held up by the retry delays.
+        Returning the last known data makes the update count as successful, so
+        ``last_update_success`` stays True while retries are pending; the
+        pending retry and its error are reported by the diagnostics instead.
+        """
+        station_id = self.config_entry.data[CONF_STATION_ID]
+        self._last_error = self._describe_error(err)
+        if self._retries_used < len(RETRY_DELAYS):
+            base_delay = self._get_retry_delay(err, RETRY_DELAYS[self._retries_used])
+            delay = base_delay + random.uniform(0, base_delay * RETRY_JITTER_FRACTION)
+            self._retries_used += 1
+            self._schedule_retry(delay)
+            _LOGGER.warning(
+                "Attempt %d/%d failed for station %s, retrying in %ds: %s",
+                self._retries_used,
+                len(RETRY_DELAYS) + 1,
+                station_id,
+                delay,
+                err,
+            )
+        else:
+            _LOGGER.error(
+                "All %d attempts failed for station %s: %s",
+                len(RETRY_DELAYS) + 1,
+                station_id,
+                err,
+            )
+            # The next scheduled refresh starts a new round of retries.
+            self._retries_used = 0
 
-        if self.data and self._is_transient_error(last_err):
+        if self.data:
             _LOGGER.warning(
                 "Keeping last known data for station %s after transient update failure: %s",
                 station_id,
-                last_err,
+                err,
             )
             return self.data
+        raise UpdateFailed(f"Error fetching station data: {err}") from err
+
+    def _schedule_retry(self, delay: float) -> None:
+        """Refresh again after ``delay`` seconds, replacing a pending retry."""
+        self._cancel_retry()
+        self._retry_at = dt_util.utcnow() + timedelta(seconds=delay)
+        self._unsub_retry = async_call_later(self.hass, delay, self._async_retry)
+
+    async def _async_retry(self, now: datetime) -> None:
+        """Run a scheduled retry through the regular refresh path."""
+        self._unsub_retry = None
+        self._retry_at = None
+        await self.async_request_refresh()
+
+    def _cancel_retry(self) -> None:
+        """Cancel a pending retry, if any."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        self._retry_at = None
+
+    def _reset_retries(self) -> None:
+        """Forget retry state after a conclusive response."""
+        self._cancel_retry()
+        self._retries_used = 0
+        self._last_error = None
+
+    @staticmethod
+    def _describe_error(err: Exception) -> str:
+        """Return an error summary without the request URL or station ID."""
+        if isinstance(err, aiohttp.ClientResponseError):
+            return f"HTTP {err.status}"
+        return type(err).__name__
+
+    def retry_status(self) -> dict[str, Any]:
+        """Return pending retry state for diagnostics."""
+        return {
+            "pending": self._unsub_retry is not None,
+            "retries_used": self._retries_used,
+            "max_retries": len(RETRY_DELAYS),
+            "next_retry_at": self._retry_at.isoformat() if self._retry_at else None,
+            "last_error": self._last_error,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending retry and shut down the coordinator."""
+        self._cancel_retry()
+        await super().async_shutdown()
+
+    def async_update_listeners(self) -> None:
+        """Record what changed since the last notification, then notify listeners.
+
+        Live data that changed is also persisted, so the next startup can
+        restore it before the first request. Its price publication times feed
+        the learned refresh timing.
+        """
+        success = bool(getattr(self, "last_update_success", True))
+        state = (success, self.data_is_restored)
+        if state != self._published_state:
+            self.data_changes = None
+        else:
+            self.data_changes = self._compute_data_changes(self._published_data, self.data)
+        if success and self.data and not self.data_is_restored:
+            self.refresh_timing.observe(self.data.fuels.values(), dt_util.utcnow())
+        self._published_data = self.data
+        self._published_state = state
+        if success and self.data and not self.data_is_restored and self.data_changes != frozenset():
+            self._store.async_delay_save(self._data_to_store, STATE_SAVE_DELAY_SECONDS)
+        super().async_update_listeners()
+
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the persisted form of the current station data."""
+        return {
+            "station_id": self.config_entry.data[CONF_STATION_ID],
+            "saved_at": dt_util.utcnow().replace(microsecond=0).isoformat(),
+            "data": self.data.as_dict(),
+            "refresh_timing": self.refresh_timing.as_list(),
+        }
 
-        _LOGGER.error(
-            "All %d attempts failed for station %s: %s",
-            len(RETRY_DELAYS) + 1,
-            station_id,
-            last_err,
+    async def async_restore_state(self) -> bool:
+        """Load the last persisted data of this station, if there is any.
+
+        Restored data keeps price history, is marked as restored on the
+        sensors, and is replaced by the next live refresh.
+        """
+        station_id = self.config_entry.data[CONF_STATION_ID]
+        try:
+            stored = await self._store.async_load()
+        except HomeAssistantError as err:
+            _LOGGER.warning("Ignoring unreadable stored data for station %s: %s", station_id, err)
+            return False
+        if (
+            not isinstance(stored, dict)
+            or stored.get("station_id") != station_id
+            or not isinstance(stored.get("data"), dict)
+        ):
+            return False
+        try:
+            self.data = StationData.from_dict(stored["data"])
+        except (AttributeError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring malformed stored data for station %s: %s", station_id, err)
+            return False
+        self.data_is_restored = True
+        self.restored_at = stored.get("saved_at")
+        self.refresh_timing = RefreshTiming.from_list(stored.get("refresh_timing"))
+        _LOGGER.debug("Restored station %s data saved at %s", station_id, self.restored_at)
+        return True
+
+    def async_set_placeholder_data(self) -> None:
+        """Start from the station's registry details until the first live refresh.
+
+        Prices, services, and opening hours stay empty until then. The data is
+        marked like restored data and is not persisted.
+        """
+        station_id = str(self.config_entry.data[CONF_STATION_ID])
+        csv_station = self.csv_manager.get_station_by_id(station_id) or {}
+        self.data = self._process_station_data(
+            StationPayload(
+                id=station_id,
+                name=csv_station.get("name"),
+                address=csv_station.get("address"),
+                brand=csv_station.get("brand"),
+            )
         )
-        raise UpdateFailed(
-            f"Error fetching station data after {len(RETRY_DELAYS) + 1} attempts: {last_err}"
+        self.data_is_restored = True
+
+    @staticmethod
+    def _compute_data_changes(
+        old: StationData | None,
+        new: StationData | None,
+    ) -> frozenset[str] | None:
+        """Return the keys that differ between two processed payloads.
+
+        Fuels and station info changes are reported per key, as
+        ``fuels.<fuel_key>`` and ``station_info.<field>``; services and opening
+        hours are reported as a whole. ``None`` means everything may have
+        changed, for example on the first payload.
+        """
+        if not old or not new:
+            return None
+        changes: set[str] = set()
+        sections: tuple[tuple[str, Mapping[str, Any], Mapping[str, Any]], ...] = (
+            ("fuels", old.fuels, new.fuels),
+            ("station_info", old.station_info, new.station_info),
         )
+        for section, old_section, new_section in sections:
+            changes.update(
+                f"{section}.{key}"
+                for key in old_section.keys() | new_section.keys()
+                if old_section.get(key) != new_section.get(key)
+            )
+        if old.service_ids != new.service_ids:
+            changes.add("services")
+        if old.opening_hours != new.opening_hours:
+            changes.add("opening_hours")
+        return frozenset(changes)
+
+    def has_changes(self, keys: frozenset[str]) -> bool:
+        """Return True when the last notification may have changed any of keys."""
+        return self.data_changes is None or not self.data_changes.isdisjoint(keys)
+
+    def _fingerprint_payload(self, response: StationResponse) -> str:
+        """Return a stable fingerprint of the normalized station payload.
+
+        The typed payload's repr lists its fields in a fixed order, so bodies
+        that differ only in key order, formatting, or unused fields share a
+        fingerprint. The last fingerprint is reused while the body revision is
+        unchanged, so revalidated responses are not hashed again.
+        """
+        if self._body_fingerprint is not None and self._body_fingerprint[0] == response.revision:
+            return self._body_fingerprint[1]
+        fingerprint = hashlib.blake2b(
+            repr(response.data).encode(), digest_size=16
+        ).hexdigest()
+        self._body_fingerprint = (response.revision, fingerprint)
+        return fingerprint
+
+    def _process_station_response(self, response: StationResponse) -> StationData:
+        """Process a station response unless neither its payload nor the registry changed."""
+        fingerprint = (self._fingerprint_payload(response), self.csv_manager.registry_generation)
+        skipped = bool(self.data) and fingerprint == self._payload_fingerprint
+        self.data_is_restored = False
+        self.last_fetch_stats = {
+            "unchanged": response.unchanged,
+            "processing_skipped": skipped,
+            "bytes_received": response.bytes_received,
+            "bytes_saved": response.bytes_saved,
+        }
+        _LOGGER.debug(
+            "Station %s fetch: %d bytes received, %d bytes saved, processing %s",
+            self.config_entry.data[CONF_STATION_ID],
+            response.bytes_received,
+            response.bytes_saved,
+            "skipped" if skipped else "done",
+        )
+        if skipped:
+            return replace(
+                self.data, last_update=dt_util.now().replace(microsecond=0).isoformat()
+            )
+        processed = self._process_station_data(response.data)
+        self._payload_fingerprint = fingerprint
+        return processed
+
+    def async_apply_station_response(self, response: StationResponse) -> bool:
+        """Publish a station response fetched by the shared batch refresh.
+
+        Returns False, after publishing the error, when the payload is malformed.
+        """
+        self._reset_retries()
+        try:
+            data = self._process_station_response(response)
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.error(
+                "Malformed batch payload for station %s: %s",
+                self.config_entry.data[CONF_STATION_ID],
+                err,
+            )
+            self.async_set_update_error(UpdateFailed(f"Error processing station data: {err}"))
+            return False
+        self.async_set_updated_data(data)
+        return True
+
+    def async_apply_station_error(
+        self, err: aiohttp.ClientError | asyncio.TimeoutError
+    ) -> None:
+        """Publish a failed batch fetch like a failed refresh of this entry.
+
+        Transient failures schedule the entry's own retries and keep last known
+        data; other failures are published as update errors.
+        """
+        try:
+            data = self._handle_fetch_error(err)
+        except UpdateFailed as update_error:
+            self.async_set_update_error(update_error)
+        else:
+            self.async_set_updated_data(data)
 
     @staticmethod
     def _get_retry_delay(err: Exception | None, default_delay: int) -> int:
@@ -120,20 +419,26 @@ class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
 
     @staticmethod
     def _is_transient_error(err: Exception | None) -> bool:
-        """Return True for recoverable request failures."""
+        """Return True for recoverable request failures.
+
+        Only a missing station (HTTP 404) is permanent.
+        """
         if isinstance(err, asyncio.TimeoutError):
             return True
         if isinstance(err, aiohttp.ClientResponseError):
             return err.status != 404
         return isinstance(err, aiohttp.ClientError)
 
-    def _get_station_coordinates(self, station_id: str | None) -> dict[str, float | str] | None:
-        """Get station coordinates using CSV data only."""
+    def _get_station_coordinates(
+        self,
+        station_id: str | None,
+        csv_station: Mapping[str, Any] | None,
+    ) -> dict[str, float | str] | None:
+        """Get station coordinates from the station's CSV registry row."""
         if not station_id:
             _LOGGER.warning("No station ID provided for coordinate lookup")
             return None
 
-        csv_station = self.csv_manager.get_station_by_id(str(station_id))
         if not csv_station:
             _LOGGER.warning("Station %s not found in CSV data", station_id)
             return None
@@ -166,63 +471,105 @@ class CarburantiDataUpdateCoordinator(DataUpdateCoordinator):
 
         return parsed_dt.replace(microsecond=0).isoformat()
 
-    def _process_station_data(self, data: dict[str, Any]) -> dict[str, Any]:
-        """Process the raw data from a single station API call."""
-        station_id = data.get("id")
-        coordinates = self._get_station_coordinates(str(station_id) if station_id is not None else None)
-        csv_station = self.csv_manager.get_station_by_id(str(station_id)) if station_id is not None else None
+    def _process_station_data(self, payload: StationPayload) -> StationData:
+        """Process a parsed station payload into the published models."""
+        station_id = str(payload.id) if payload.id is not None else None
+        csv_station = self.csv_manager.get_station_by_id(station_id) if station_id else None
+        coordinates = self._get_station_coordinates(station_id, csv_station)
         now_iso = dt_util.now().replace(microsecond=0).isoformat()
 
-        processed_data = {
-            "station_info": {
-                "id": station_id,
-                "name": data.get("name"),
-                "nomeImpianto": data.get("nomeImpianto"),
-                "address": data.get("address"),
-                "brand": data.get("brand"),
-                "company": data.get("company"),
-                "phoneNumber": data.get("phoneNumber"),
-                "email": data.get("email"),
-                "website": data.get("website"),
-                ATTR_LATITUDE: coordinates["latitude"] if coordinates else None,
-                ATTR_LONGITUDE: coordinates["longitude"] if coordinates else None,
-                "operator": csv_station.get("operator") if csv_station else None,
-                "station_type": csv_station.get("station_type") if csv_station else None,
-                "municipality": csv_station.get("municipality") if csv_station else None,
-                "province": csv_station.get("province") if csv_station else None,
-                "coordinate_source": coordinates.get("source") if coordinates else None,
-            },
-            "fuels": {},
-            "services": data.get("services", []),
-            "opening_hours": data.get("orariapertura", []),
-            "last_update": now_iso,
-        }
+        return StationData(
+            station_info=StationInfo(
+                id=payload.id,
+                name=payload.name,
+                plant_name=payload.plant_name,
+                address=payload.address,
+                brand=payload.brand,
+                company=payload.company,
+                phone_number=payload.phone_number,
+                email=payload.email,
+                website=payload.website,
+                latitude=float(coordinates["latitude"]) if coordinates else None,
+                longitude=float(coordinates["longitude"]) if coordinates else None,
+                operator=csv_station.get("operator") if csv_station else None,
+                station_type=csv_station.get("station_type") if csv_station else None,
+                municipality=csv_station.get("municipality") if csv_station else None,
+                province=csv_station.get("province") if csv_station else None,
+                coordinate_source=str(coordinates["source"]) if coordinates else None,
+            ),
+            fuels=self._process_fuels(payload.fuels, now_iso),
+            services=payload.services,
+            opening_hours=payload.opening_hours,
+            last_update=now_iso,
+        )
 
-        for fuel in data.get("fuels", []):
-            fuel_name = fuel.get("name", "Unknown")
-            service_type = "self" if fuel.get("isSelf") else "servito"
-            fuel_key = f"{fuel_name}_{service_type}"
-            new_price = fuel.get("price")
-            existing_fuel = (self.data or {}).get("fuels", {}).get(fuel_key)
-            if existing_fuel and new_price == existing_fuel.get("price"):
-                previous_price = existing_fuel.get("previous_price")
-                price_changed_at = existing_fuel.get("price_changed_at")
+    def _process_fuels(
+        self,
+        fuels: Iterable[FuelPayload],
+        now_iso: str,
+    ) -> Mapping[str, FuelQuote]:
+        """Process fuel prices, tracking changes against the previous data."""
+        previous_fuels = self.data.fuels if self.data else {}
+        # Fuels of one station usually share their timestamps.
+        timestamps: dict[str | None, str | None] = {}
+        processed: dict[str, FuelQuote] = {}
+        for fuel in fuels:
+            fuel_key = fuel.key
+            new_price = fuel.price
+            existing_fuel = previous_fuels.get(fuel_key)
+            if existing_fuel and new_price == existing_fuel.price:
+                previous_price = existing_fuel.previous_price
+                price_changed_at = existing_fuel.price_changed_at
             else:
-                previous_price = existing_fuel.get("price") if existing_fuel else None
+                previous_price = existing_fuel.price if existing_fuel else None
                 price_changed_at = now_iso if previous_price is not None else None
 
-            processed_data["fuels"][fuel_key] = {
-                "price": new_price,
-                "last_update": self._parse_iso_datetime(fuel.get("insertDate")),
-                "validity_date": self._parse_iso_datetime(fuel.get("validityDate")),
-                "fuel_id": fuel.get("fuelId"),
-                "is_self": fuel.get("isSelf"),
-                "service_area_id": fuel.get("serviceAreaId"),
-                "previous_price": previous_price,
-                "price_changed_at": price_changed_at,
-            }
-
-        return processed_data
+            for value in (fuel.insert_date, fuel.validity_date):
+                if value not in timestamps:
+                    timestamps[value] = self._parse_iso_datetime(value)
+            processed[fuel_key] = FuelQuote(
+                price=new_price,
+                last_update=timestamps[fuel.insert_date],
+                validity_date=timestamps[fuel.validity_date],
+                fuel_id=fuel.fuel_id,
+                is_self=fuel.is_self,
+                service_area_id=fuel.service_area_id,
+                previous_price=previous_price,
+                price_changed_at=price_changed_at,
+            )
+        return MappingProxyType(processed)
+
+    def async_apply_zone_prices(self, result: dict[str, Any]) -> bool:
+        """Update fuel prices from a zone-search or daily price file result.
+
+        Station details are kept. These fuels carry no validity date or
+        service area ID, and price file fuels no fuel ID, so those keep the
+        previous values for the same fuel. Returns False when there is no
+        earlier full station payload to update.
+        """
+        if not self.data:
+            return False
+        now_iso = dt_util.now().replace(microsecond=0).isoformat()
+        fuels = []
+        for fuel in result.get("fuels", []):
+            quote = FuelPayload.from_api({"insertDate": result.get("insertDate"), **fuel})
+            previous = self.data.fuels.get(quote.key)
+            if previous is not None:
+                quote = replace(
+                    quote,
+                    validity_date=fuel.get("validityDate", previous.validity_date),
+                    service_area_id=fuel.get("serviceAreaId", previous.service_area_id),
+                    fuel_id=fuel.get("fuelId", previous.fuel_id),
+                )
+            fuels.append(quote)
+        data = replace(
+            self.data, fuels=self._process_fuels(fuels, now_iso), last_update=now_iso
+        )
+        # The next station payload must be processed again to replace these prices.
+        self._payload_fingerprint = None
+        self.data_is_restored = False
+        self.async_set_updated_data(data)
+        return True
 
     async def async_force_csv_update(self) -> bool:
         """Force an immediate CSV update."""
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+import hashlib
 from typing import TYPE_CHECKING
 
 from homeassistant.util import dt as dt_util
@@ -26,13 +28,46 @@ def validate_cron_expression(cron_expr: str) -> bool:
         return False
 
 
-def get_next_run_time(cron_expr: str, base_time: datetime | None = None) -> datetime:
-    """Get the next run time for a cron expression."""
+def iter_run_times(cron_expr: str, base_time: datetime | None = None) -> Iterator[datetime]:
+    """Return an iterator over the run times of a cron expression after base_time."""
     if CronSim is None:
         raise ImportError("cronsim is required for cron scheduling")
 
     if base_time is None:
         base_time = dt_util.now()
 
-    cron = CronSim(cron_expr, base_time)
-    return next(cron)
+    return CronSim(cron_expr, base_time)
+
+
+def get_jitter_offset(seed: str, window: timedelta) -> timedelta:
+    """Return a deterministic offset of seed within window.
+
+    Like the ``H`` field of Jenkins schedules, the offset comes from a hash
+    of the seed, so one entry always runs at the same point of the window
+    while different entries spread evenly across it.
+    """
+    seconds = int(window.total_seconds())
+    if seconds <= 0:
+        return timedelta(0)
+    digest = hashlib.blake2b(seed.encode(), digest_size=8).digest()
+    return timedelta(seconds=int.from_bytes(digest, "big") % seconds)
+
+
+def get_jitter_window(run: datetime, following: datetime, window: timedelta) -> timedelta:
+    """Return the jitter window of a run, capped so it ends before the following run."""
+    return min(window, following - run)
+
+
+def get_next_run_time(
+    cron_expr: str,
+    base_time: datetime | None = None,
+    jitter_seed: str | None = None,
+    jitter_window: timedelta = timedelta(0),
+) -> datetime:
+    """Get the next run time for a cron expression, offset by the seed's jitter."""
+    runs = iter_run_times(cron_expr, base_time)
+    run = next(runs)
+    if jitter_seed is None or jitter_window <= timedelta(0):
+        return run
+    window = get_jitter_window(run, next(runs), jitter_window)
+    return run + get_jitter_offset(jitter_seed, window)
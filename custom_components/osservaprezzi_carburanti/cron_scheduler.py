@@ -0,0 +1,269 @@
+"""One timer for the cron schedules of every entry, grouped by expression."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from operator import itemgetter
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .api import start_response_cache_cycle
+from .const import DOMAIN
+from .coordinator import CarburantiDataUpdateCoordinator
+from .cron_helper import get_jitter_offset, get_jitter_window, iter_run_times
+
+_LOGGER = logging.getLogger(__name__)
+
+CRON_SCHEDULER_DATA_KEY = "cron_scheduler"
+
+GroupHandler = Callable[[list[CarburantiDataUpdateCoordinator]], None]
+_GroupKey = tuple[str, timedelta]
+
+
+@dataclass
+class _CronGroup:
+    """Entries sharing one cron expression and jitter window.
+
+    The group keeps one run-time iterator and looks one run ahead, so that
+    the jitter window of a run can be capped at the gap to the following one.
+    ``pending`` holds the entries of the current run that are still waiting
+    for their offset, earliest first.
+    """
+
+    runs: Iterator[datetime]
+    next_run: datetime
+    following: datetime
+    window: timedelta
+    members: dict[str, tuple[CarburantiDataUpdateCoordinator, GroupHandler]] = field(
+        default_factory=dict
+    )
+    run: datetime | None = None
+    pending: deque[tuple[timedelta, str]] = field(default_factory=deque)
+    fired: int = 0
+
+    @property
+    def due(self) -> datetime:
+        """Return when the next pending entry, or the next run, is due."""
+        if self.run is not None and self.pending:
+            return self.run + self.pending[0][0]
+        return self.next_run
+
+    def start_run(self, now: datetime) -> None:
+        """Start the latest run due at now and queue its entries by offset."""
+        # Runs missed while Home Assistant was busy or suspended are skipped.
+        while self.following <= now:
+            self.next_run, self.following = self.following, next(self.runs)
+        self.run = self.next_run
+        window = get_jitter_window(self.run, self.following, self.window)
+        self.pending = deque(
+            sorted(
+                (
+                    (get_jitter_offset(entry_id, window), entry_id)
+                    for entry_id in self.members
+                ),
+                key=itemgetter(0),
+            )
+        )
+        self.next_run, self.following = self.following, next(self.runs)
+        self.fired += 1
+
+
+class CronScheduler:
+    """Fire the cron schedules of every entry from one timer.
+
+    Entries with the same cron expression and jitter window form a group
+    that keeps one run-time iterator, so run times are computed once per
+    group rather than once per entry and run. When a run starts, each entry
+    of the group is due at a deterministic offset within the window, so their
+    requests are spread across it instead of all hitting the API at the cron
+    time. One timer is armed for whatever is due first. Entries due together
+    are handed to their handler in a single call: the shared batch queues
+    them, and other entries are refreshed together in one background task,
+    their requests taking turns at the shared rate limiter.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a scheduler without groups."""
+        self.hass = hass
+        self._groups: dict[_GroupKey, _CronGroup] = {}
+        self._keys: dict[str, _GroupKey] = {}
+        self._unsub_timer: Callable[[], None] | None = None
+        self._armed_for: datetime | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def async_add(
+        self,
+        coordinator: CarburantiDataUpdateCoordinator,
+        cron_expression: str,
+        handler: GroupHandler | None = None,
+        jitter_window: timedelta = timedelta(0),
+        runs: Iterator[datetime] | None = None,
+    ) -> Callable[[], None]:
+        """Schedule a coordinator and return a callback removing it.
+
+        Without a handler, the scheduler refreshes the coordinator itself.
+        Run times come from the cron expression unless ``runs`` is given, in
+        which case the expression only labels the group, such as a learned
+        refresh plan. An entry joining a group mid-run is first due at the
+        group's next run. Raises the cron helper's errors when the expression
+        cannot be scheduled.
+        """
+        entry_id = coordinator.config_entry.entry_id
+        self.async_remove(entry_id)
+        key = (cron_expression, max(jitter_window, timedelta(0)))
+        group = self._groups.get(key)
+        if group is None:
+            if runs is None:
+                runs = iter_run_times(cron_expression)
+            group = _CronGroup(
+                runs=runs, next_run=next(runs), following=next(runs), window=key[1]
+            )
+            self._groups[key] = group
+        group.members[entry_id] = (coordinator, handler or self._async_refresh_group)
+        self._keys[entry_id] = key
+        self._schedule()
+        return partial(self.async_remove, entry_id)
+
+    def async_remove(self, entry_id: str) -> None:
+        """Stop scheduling an entry, dropping its group once it is empty."""
+        key = self._keys.pop(entry_id, None)
+        if key is None:
+            return
+        group = self._groups[key]
+        del group.members[entry_id]
+        group.pending = deque(item for item in group.pending if item[1] != entry_id)
+        if not group.members:
+            del self._groups[key]
+        self._schedule()
+
+    def next_run(self, entry_id: str) -> datetime | None:
+        """Return when an entry is next due, if it is scheduled."""
+        key = self._keys.get(entry_id)
+        if key is None:
+            return None
+        group = self._groups[key]
+        for offset, pending_id in group.pending:
+            if pending_id == entry_id and group.run is not None:
+                return group.run + offset
+        window = get_jitter_window(group.next_run, group.following, group.window)
+        return group.next_run + get_jitter_offset(entry_id, window)
+
+    def _schedule(self) -> None:
+        """Arm the timer for what is due first unless it is already armed for it."""
+        next_run = min((group.due for group in self._groups.values()), default=None)
+        if next_run == self._armed_for:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_for = next_run
+        if next_run is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self.hass,
+                self._async_timer_fired,
+                dt_util.as_utc(next_run),
+            )
+
+    @callback
+    def _async_timer_fired(self, now: datetime) -> None:
+        """Start due runs and hand every due entry to its handler.
+
+        Starting runs also starts a new cycle of the response cache counters.
+        """
+        self._unsub_timer = None
+        self._armed_for = None
+        cycle_started = False
+        for (cron_expression, _), group in list(self._groups.items()):
+            due: dict[str, tuple[CarburantiDataUpdateCoordinator, GroupHandler]] = {}
+            while group.due <= now:
+                if not group.pending:
+                    if not cycle_started:
+                        start_response_cache_cycle()
+                        cycle_started = True
+                    group.start_run(now)
+                    continue
+                _, entry_id = group.pending.popleft()
+                due[entry_id] = group.members[entry_id]
+            if not due:
+                continue
+            batches: dict[GroupHandler, list[CarburantiDataUpdateCoordinator]] = {}
+            for coordinator, handler in due.values():
+                batches.setdefault(handler, []).append(coordinator)
+            _LOGGER.debug("Cron group %s is due for %d entries", cron_expression, len(due))
+            for handler, coordinators in batches.items():
+                handler(coordinators)
+        self._schedule()
+
+    def _async_refresh_group(self, coordinators: list[CarburantiDataUpdateCoordinator]) -> None:
+        """Refresh the due coordinators of a group in one background task."""
+        task = self.hass.async_create_background_task(
+            self._async_refresh(coordinators),
+            f"{DOMAIN} scheduled refresh",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_refresh(self, coordinators: list[CarburantiDataUpdateCoordinator]) -> None:
+        """Request a refresh of every coordinator and wait for all of them."""
+        _LOGGER.info("Executing scheduled refresh of %d station(s)", len(coordinators))
+        results = await asyncio.gather(
+            *(coordinator.async_request_refresh() for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        for coordinator, result in zip(coordinators, results):
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Scheduled refresh of %s failed: %s", coordinator.config_entry.title, result
+                )
+
+    def status(self) -> dict[str, Any]:
+        """Return the groups and the armed timer for diagnostics."""
+        return {
+            "next_run": self._armed_for.isoformat() if self._armed_for is not None else None,
+            "groups": [
+                {
+                    "cron_expression": cron_expression,
+                    "jitter_window_seconds": int(window.total_seconds()),
+                    "entries": len(group.members),
+                    "pending": len(group.pending),
+                    "next_run": group.next_run.isoformat(),
+                    "fired": group.fired,
+                }
+                for (cron_expression, window), group in sorted(self._groups.items())
+            ],
+            "running_refreshes": len(self._tasks),
+        }
+
+    def async_shutdown(self) -> None:
+        """Stop the timer and cancel running scheduled refreshes."""
+        self._groups.clear()
+        self._keys.clear()
+        self._schedule()
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+
+
+def get_cron_scheduler(hass: HomeAssistant) -> CronScheduler:
+    """Return the integration-wide cron scheduler."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get(CRON_SCHEDULER_DATA_KEY)
+    if not isinstance(scheduler, CronScheduler):
+        scheduler = CronScheduler(hass)
+        domain_data[CRON_SCHEDULER_DATA_KEY] = scheduler
+    return scheduler
+
+
+def async_remove_cron_scheduler(hass: HomeAssistant) -> None:
+    """Shut down and forget the cron scheduler, if any."""
+    scheduler = hass.data.get(DOMAIN, {}).pop(CRON_SCHEDULER_DATA_KEY, None)
+    if isinstance(scheduler, CronScheduler):
+        scheduler.async_shutdown()
@@ -4,24 +4,25 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import csv
+import hashlib
 import io
 import json
 import logging
 import os
 import tempfile
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from types import MappingProxyType
-from typing import Any
+from typing import Any, TypeVar
 
 import aiohttp
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import dt as dt_util
 
 from .const import CSV_UPDATE_INTERVAL, CSV_URL, DEFAULT_HEADERS, DOMAIN
+from .http_client import get_http_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +42,8 @@ CSV_COLUMNS = {
 }
 REQUIRED_CSV_COLUMNS = ("id", "latitude", "longitude")
 
+_IndexT = TypeVar("_IndexT")
+
 
 class RegistryUnavailableError(Exception):
     """Raised when no usable station registry is available."""
@@ -53,6 +56,20 @@ class RegistrySnapshot:
     stations: tuple[Mapping[str, Any], ...]
     updated_at: datetime | None
     is_stale: bool
+    generation: str = ""
+
+
+def registry_generation_of(stations: Mapping[str, Mapping[str, Any]]) -> str:
+    """Return a short hash of the registry content.
+
+    The same registry always has the same generation, across restarts and
+    reloads, and any change to its stations gives a new one. An empty
+    registry has the empty generation.
+    """
+    if not stations:
+        return ""
+    content = json.dumps(stations, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
 
 def _load_json_file_sync(path: str) -> dict[str, Any]:
@@ -64,7 +81,11 @@ def _load_json_file_sync(path: str) -> dict[str, Any]:
     return data
 
 
-def _write_json_file_atomic_sync(path: str, data: dict[str, Any]) -> None:
+def _write_json_file_atomic_sync(
+    path: str,
+    data: dict[str, Any],
+    indent: int | None = 2,
+) -> None:
     """Encode and atomically replace a JSON document synchronously."""
     temp_path: str | None = None
     try:
@@ -77,7 +98,7 @@ def _write_json_file_atomic_sync(path: str, data: dict[str, Any]) -> None:
             suffix=".tmp",
         ) as file_handle:
             temp_path = file_handle.name
-            json.dump(data, file_handle, ensure_ascii=False, indent=2)
+            json.dump(data, file_handle, ensure_ascii=False, indent=indent)
         os.replace(temp_path, path)
         temp_path = None
     finally:
@@ -86,13 +107,31 @@ def _write_json_file_atomic_sync(path: str, data: dict[str, Any]) -> None:
                 os.remove(temp_path)
 
 
+def detect_csv_separator(header_line: str) -> str:
+    """Return the separator of a MIMIT CSV export from its header line."""
+    pipe_count = header_line.count("|")
+    semicolon_count = header_line.count(";")
+
+    if pipe_count > semicolon_count:
+        separator = "|"
+        _LOGGER.debug("Detected pipe (|) separator in CSV file")
+    elif semicolon_count > pipe_count:
+        separator = ";"
+        _LOGGER.debug("Detected semicolon (;) separator in CSV file")
+    else:
+        separator = "|"
+        _LOGGER.debug("Separator count equal or none detected, defaulting to pipe (|)")
+
+    return separator
+
+
 class CSVStationManager:
     """Manager for CSV station data."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the CSV manager."""
         self.hass = hass
-        self.session = async_get_clientsession(hass)
+        self.http_client = get_http_client(hass)
         self._stations_cache: dict[str, dict[str, Any]] = {}
         self._last_update: datetime | None = None
         self._csv_etag: str | None = None
@@ -105,6 +144,9 @@ class CSVStationManager:
         self._detected_separator = "|"
         self._operation_lock = asyncio.Lock()
         self._cache_generation = 0
+        self._registry_generation = ""
+        self._registry_stations: tuple[Mapping[str, Any], ...] | None = None
+        self._registry_indexes: dict[str, tuple[str, Any]] = {}
         self._initialized = False
 
     async def _async_migrate_legacy_files(self) -> None:
@@ -156,7 +198,7 @@ class CSVStationManager:
             cache_generation = self._cache_generation
             _LOGGER.info("Downloading station data from CSV: %s", CSV_URL)
 
-            async with self.session.get(
+            async with self.http_client.session.get(
                 CSV_URL,
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=60),
@@ -171,6 +213,7 @@ class CSVStationManager:
                         separator=self._detected_separator,
                         csv_etag=self._csv_etag,
                         csv_last_modified=self._csv_last_modified,
+                        registry_generation=self._registry_generation,
                     )
                     if not await self._async_save_cache_data(data):
                         _LOGGER.error("Failed to persist CSV 304 refresh metadata")
@@ -195,6 +238,9 @@ class CSVStationManager:
                 _LOGGER.error("Failed to parse CSV data")
                 return False
 
+            registry_generation = await self.hass.async_add_executor_job(
+                registry_generation_of, stations_cache
+            )
             if cache_generation != self._cache_generation:
                 _LOGGER.info("Discarding downloaded CSV because cache was cleared")
                 return False
@@ -205,6 +251,7 @@ class CSVStationManager:
                 separator=separator,
                 csv_etag=csv_etag,
                 csv_last_modified=csv_last_modified,
+                registry_generation=registry_generation,
             )
             if not await self._async_save_cache_data(data):
                 _LOGGER.error("Failed to persist downloaded CSV station data")
@@ -212,7 +259,7 @@ class CSVStationManager:
             self._csv_etag = csv_etag
             self._csv_last_modified = csv_last_modified
             self._detected_separator = separator
-            self._stations_cache = stations_cache
+            self._set_stations_cache(stations_cache, registry_generation)
             self._last_update = now
 
             _LOGGER.info("Successfully updated CSV station data")
@@ -315,23 +362,7 @@ class CSVStationManager:
             return False, separator, {}
         return True, separator, stations_cache
 
-    @staticmethod
-    def _get_separator(header_line: str) -> str:
-        """Return the detected CSV separator without mutating manager state."""
-        pipe_count = header_line.count("|")
-        semicolon_count = header_line.count(";")
-
-        if pipe_count > semicolon_count:
-            separator = "|"
-            _LOGGER.debug("Detected pipe (|) separator in CSV file")
-        elif semicolon_count > pipe_count:
-            separator = ";"
-            _LOGGER.debug("Detected semicolon (;) separator in CSV file")
-        else:
-            separator = "|"
-            _LOGGER.debug("Separator count equal or none detected, defaulting to pipe (|)")
-
-        return separator
+    _get_separator = staticmethod(detect_csv_separator)
 
     @staticmethod
     def _parse_coordinate(value: str) -> float | None:
@@ -363,6 +394,7 @@ class CSVStationManager:
                 separator = data.get("csv_separator", "|")
                 csv_etag = data.get("csv_etag")
                 csv_last_modified = data.get("csv_last_modified")
+                registry_generation = data.get("registry_generation")
                 if not isinstance(cache_version, str):
                     raise ValueError("Cache version must be a string")
                 if not isinstance(stations, dict) or not all(
@@ -378,6 +410,8 @@ class CSVStationManager:
                     raise ValueError("Cache csv_etag must be a string or null")
                 if csv_last_modified is not None and not isinstance(csv_last_modified, str):
                     raise ValueError("Cache csv_last_modified must be a string or null")
+                if registry_generation is not None and not isinstance(registry_generation, str):
+                    raise ValueError("Cache registry_generation must be a string or null")
                 if cache_version != CACHE_VERSION:
                     _LOGGER.info(
                         "Cache version %s is outdated (expected %s), forcing update",
@@ -387,7 +421,12 @@ class CSVStationManager:
                     return False
 
                 parsed_last_update = self._parse_cached_datetime(last_update)
-                self._stations_cache = stations
+                if registry_generation is None:
+                    # Caches written before the generation was persisted.
+                    registry_generation = await self.hass.async_add_executor_job(
+                        registry_generation_of, stations
+                    )
+                self._set_stations_cache(stations, registry_generation)
                 self._last_update = parsed_last_update
                 self._detected_separator = separator
                 self._csv_etag = csv_etag
@@ -434,6 +473,7 @@ class CSVStationManager:
                 separator=self._detected_separator,
                 csv_etag=self._csv_etag,
                 csv_last_modified=self._csv_last_modified,
+                registry_generation=self._registry_generation,
             )
             return await self._async_save_cache_data(data)
 
@@ -445,6 +485,7 @@ class CSVStationManager:
         separator: str,
         csv_etag: str | None,
         csv_last_modified: str | None,
+        registry_generation: str,
     ) -> dict[str, Any]:
         """Build a complete cache document from staged values."""
         return {
@@ -454,6 +495,7 @@ class CSVStationManager:
             "csv_separator": separator,
             "csv_etag": csv_etag,
             "csv_last_modified": csv_last_modified,
+            "registry_generation": registry_generation,
         }
 
     async def _async_save_cache_data(self, data: dict[str, Any]) -> bool:
@@ -472,6 +514,15 @@ class CSVStationManager:
             _LOGGER.error("Error saving cached data: %s", err)
             return False
 
+    def _set_stations_cache(
+        self, stations: dict[str, dict[str, Any]], generation: str
+    ) -> None:
+        """Replace the station cache with a registry of the given generation."""
+        self._stations_cache = stations
+        self._registry_generation = generation
+        self._registry_stations = None
+        self._registry_indexes.clear()
+
     def get_station_by_id(self, station_id: str) -> dict[str, Any] | None:
         """Get station data by ID."""
         return self._stations_cache.get(station_id)
@@ -480,6 +531,11 @@ class CSVStationManager:
         """Check if station data is available."""
         return bool(self._stations_cache)
 
+    @property
+    def registry_generation(self) -> str:
+        """Return the content hash that changes whenever the registry content does."""
+        return self._registry_generation
+
     def registry_status(self) -> dict[str, Any]:
         """Return a privacy-safe summary of the registry cache."""
         last_update = self._last_update
@@ -490,6 +546,7 @@ class CSVStationManager:
         return {
             "initialized": self._initialized,
             "station_count": len(self._stations_cache),
+            "generation": self._registry_generation,
             "last_update": last_update.isoformat() if last_update else None,
             "is_stale": is_stale,
             "separator": self._detected_separator,
@@ -508,15 +565,34 @@ class CSVStationManager:
             last_update is None
             or dt_util.now() - last_update >= timedelta(hours=CSV_UPDATE_INTERVAL)
         )
-        stations = tuple(
-            MappingProxyType(dict(station)) for station in self._stations_cache.values()
-        )
+        if self._registry_stations is None:
+            self._registry_stations = tuple(
+                MappingProxyType(dict(station)) for station in self._stations_cache.values()
+            )
         return RegistrySnapshot(
-            stations=stations,
+            stations=self._registry_stations,
             updated_at=last_update,
             is_stale=is_stale,
+            generation=self._registry_generation,
         )
 
+    async def async_registry_index(
+        self,
+        snapshot: RegistrySnapshot,
+        name: str,
+        builder: Callable[[tuple[Mapping[str, Any], ...]], _IndexT],
+    ) -> _IndexT:
+        """Return a derived search index, building it once per registry generation."""
+        cached = self._registry_indexes.get(name)
+        if cached is not None and cached[0] == snapshot.generation:
+            index: _IndexT = cached[1]
+            return index
+
+        index = await self.hass.async_add_executor_job(builder, snapshot.stations)
+        if snapshot.generation == self._registry_generation:
+            self._registry_indexes[name] = (snapshot.generation, index)
+        return index
+
     async def async_initialize(self) -> bool:
         """Initialize the CSV manager."""
         async with self._operation_lock:
@@ -567,7 +643,7 @@ class CSVStationManager:
         async with self._operation_lock:
             self._cache_generation += 1
             self._initialized = False
-            self._stations_cache.clear()
+            self._set_stations_cache({}, "")
             self._last_update = None
             self._csv_etag = None
             self._csv_last_modified = None
@@ -1,14 +1,26 @@
 """Privacy-safe diagnostics for Osservaprezzi Carburanti."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from .api import (
+    circuit_breaker_status,
+    rate_limiter_status,
+    request_metrics_status,
+    response_cache_status,
+)
+from .batch_coordinator import BATCH_COORDINATOR_DATA_KEY, StationBatchCoordinator
+from .cron_scheduler import CRON_SCHEDULER_DATA_KEY, CronScheduler
 from .const import CONF_STATION_ID, DOMAIN
 from .coordinator import CarburantiDataUpdateCoordinator
+from .http_client import HTTP_CLIENT_DATA_KEY, HttpClient
+from .price_csv_manager import PRICE_CSV_MANAGER_DATA_KEY, PriceCSVManager
+from .startup import STARTUP_QUEUE_DATA_KEY, StartupRefreshQueue
 
 
 async def async_get_config_entry_diagnostics(
@@ -29,10 +41,13 @@ async def async_get_config_entry_diagnostics(
             "loaded": False,
         }
 
-    data = coordinator.data or {}
-    fuels = data.get("fuels", {})
-    services = data.get("services", [])
-    opening_hours = data.get("opening_hours", [])
+    http_client = hass.data[DOMAIN].get(HTTP_CLIENT_DATA_KEY)
+    batch = hass.data[DOMAIN].get(BATCH_COORDINATOR_DATA_KEY)
+    scheduler = hass.data[DOMAIN].get(CRON_SCHEDULER_DATA_KEY)
+    price_manager = hass.data[DOMAIN].get(PRICE_CSV_MANAGER_DATA_KEY)
+    startup_queue = hass.data[DOMAIN].get(STARTUP_QUEUE_DATA_KEY)
+    # Counts are read through the mapping view of the processed station data.
+    data: Mapping[str, Any] = coordinator.data or {}
     return {
         "entry": {
             "data": async_redact_data(dict(entry.data), {CONF_STATION_ID}),
@@ -42,11 +57,35 @@ async def async_get_config_entry_diagnostics(
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
             "has_data": bool(coordinator.data),
-            "fuel_count": len(fuels) if isinstance(fuels, dict) else 0,
-            "service_count": len(services) if isinstance(services, list) else 0,
-            "opening_hours_count": (
-                len(opening_hours) if isinstance(opening_hours, list) else 0
-            ),
+            "fuel_count": len(data.get("fuels", ())),
+            "service_count": len(data.get("services", ())),
+            "opening_hours_count": len(data.get("opening_hours", ())),
+            "last_fetch": dict(coordinator.last_fetch_stats),
+            "retry": coordinator.retry_status(),
+            "data_restored": coordinator.data_is_restored,
+            "restored_at": coordinator.restored_at,
+            "refresh_timing": coordinator.refresh_timing.status(),
         },
         "registry": coordinator.csv_manager.registry_status(),
+        "api_rate_limiter": rate_limiter_status(),
+        "api_circuit_breaker": circuit_breaker_status(),
+        "api_request_metrics": request_metrics_status(),
+        "api_response_cache": response_cache_status(),
+        "http_client": (
+            http_client.status() if isinstance(http_client, HttpClient) else None
+        ),
+        "batch_refresh": (
+            batch.status() if isinstance(batch, StationBatchCoordinator) else None
+        ),
+        "cron_scheduler": (
+            scheduler.status() if isinstance(scheduler, CronScheduler) else None
+        ),
+        "daily_prices": (
+            price_manager.status() if isinstance(price_manager, PriceCSVManager) else None
+        ),
+        "startup": (
+            startup_queue.status(entry.entry_id)
+            if isinstance(startup_queue, StartupRefreshQueue)
+            else None
+        ),
     }
@@ -1,13 +1,38 @@
 """Pure helpers for discovering nearby fuel stations."""
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+import re
 import unicodedata
+from bisect import bisect_right
+from collections import Counter
 from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
-from math import asin, cos, radians, sin, sqrt
+from math import asin, ceil, cos, degrees, floor, pi, radians, sin, sqrt
 from typing import Any
 
 EARTH_RADIUS_KM = 6371.0088
+NEARBY_GRID_CELL_DEGREES = 0.1
+_SEARCHABLE_FIELDS = (
+    "name",
+    "brand",
+    "address",
+    "operator",
+    "municipality",
+    "province",
+)
+
+SUGGESTION_FIELDS = ("municipality", "province", "brand")
+SUGGESTION_LIMIT = 5
+REGISTRY_VOCABULARY_INDEX = "registry_vocabulary"
+ZONE_RADIUS_MARGIN_KM = 0.1
+_FUZZY_PREFIX_LENGTH = 7
+_FUZZY_MAX_DISTANCE = 2
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+AreaSortKey = tuple[str, tuple[int, int | str]]
 
 
 @dataclass(frozen=True)
@@ -62,6 +87,11 @@ def _station_sort_id(station_id: str) -> tuple[int, int | str]:
     return 1, station_id.casefold()
 
 
+def _area_sort_key(candidate: StationCandidate) -> AreaSortKey:
+    """Return the stable ordering used for registry area results."""
+    return candidate.name.casefold(), _station_sort_id(candidate.station_id)
+
+
 def _normalize_text(value: Any) -> str:
     """Normalize text for accent-insensitive local matching."""
     text = unicodedata.normalize("NFKD", str(value or ""))
@@ -70,6 +100,11 @@ def _normalize_text(value: Any) -> str:
     ).casefold()
 
 
+def _searchable_text(station: Mapping[str, Any]) -> str:
+    """Return the normalized text matched by free-text registry filters."""
+    return " ".join(_normalize_text(station.get(field)) for field in _SEARCHABLE_FIELDS)
+
+
 def _station_matches_filters(
     station: Mapping[str, Any],
     *,
@@ -79,18 +114,7 @@ def _station_matches_filters(
     """Return whether a station matches optional registry filters."""
     if text_filter:
         needle = _normalize_text(text_filter).strip()
-        searchable = " ".join(
-            _normalize_text(station.get(field))
-            for field in (
-                "name",
-                "brand",
-                "address",
-                "operator",
-                "municipality",
-                "province",
-            )
-        )
-        if needle not in searchable:
+        if needle not in _searchable_text(station):
             return False
 
     if station_type:
@@ -175,16 +199,264 @@ def find_nearby_stations(
         if candidate is not None:
             candidates.append(candidate)
 
-    candidates.sort(
-        key=lambda station: (
-            station.distance_km if station.distance_km is not None else float("inf"),
-            station.name.casefold(),
-            _station_sort_id(station.station_id),
-        )
-    )
+    candidates.sort(key=_nearby_sort_key)
     return tuple(candidates[:limit])
 
 
+def _nearby_sort_key(candidate: StationCandidate) -> tuple[float, str, tuple[int, int | str]]:
+    """Return the stable ordering used for nearby results."""
+    return (
+        candidate.distance_km if candidate.distance_km is not None else float("inf"),
+        candidate.name.casefold(),
+        _station_sort_id(candidate.station_id),
+    )
+
+
+@dataclass(frozen=True)
+class NearbyOrigin:
+    """One origin of a batch nearby search."""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    limit: int
+
+
+@dataclass(frozen=True)
+class _NearbyIndexEntry:
+    """A registry station with coordinates and pre-normalized search fields."""
+
+    station: Mapping[str, Any]
+    latitude: float
+    longitude: float
+    searchable: str
+    station_type: str
+
+
+class NearbySearchIndex:
+    """Registry stations bucketed into a fixed latitude/longitude grid."""
+
+    def __init__(
+        self,
+        stations: Iterable[Mapping[str, Any]],
+        cell_degrees: float = NEARBY_GRID_CELL_DEGREES,
+    ) -> None:
+        """Bucket every station with valid coordinates once."""
+        self._cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], list[_NearbyIndexEntry]] = {}
+        for station in stations:
+            latitude = _as_coordinate(station.get("latitude"), -90, 90)
+            longitude = _as_coordinate(station.get("longitude"), -180, 180)
+            if latitude is None or longitude is None:
+                continue
+            self._cells.setdefault(
+                (self._cell(latitude), self._cell(longitude)), []
+            ).append(
+                _NearbyIndexEntry(
+                    station=station,
+                    latitude=latitude,
+                    longitude=longitude,
+                    searchable=_searchable_text(station),
+                    station_type=_normalize_text(station.get("station_type")),
+                )
+            )
+
+    def _cell(self, degrees_value: float) -> int:
+        """Return the grid row or column holding a coordinate."""
+        return floor(degrees_value / self._cell_degrees)
+
+    def _cell_range(self, low: float, high: float) -> range:
+        """Return the grid rows or columns covering a closed degree interval."""
+        return range(self._cell(low), self._cell(high) + 1)
+
+    def _longitude_cells(self, longitude: float, delta: float | None) -> set[int]:
+        """Return grid columns within ``delta`` degrees, wrapping at the antimeridian."""
+        if delta is None:
+            return set(self._cell_range(-180, 180))
+        low, high = longitude - delta, longitude + delta
+        intervals: tuple[tuple[float, float], ...]
+        if low < -180:
+            intervals = ((low + 360, 180.0), (-180.0, high))
+        elif high > 180:
+            intervals = ((low, 180.0), (-180.0, high - 360))
+        else:
+            intervals = ((low, high),)
+        return {
+            column
+            for interval_low, interval_high in intervals
+            for column in self._cell_range(interval_low, interval_high)
+        }
+
+    def _entries_near(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> Iterable[_NearbyIndexEntry]:
+        """Yield stations in grid cells that can intersect the search circle."""
+        angular_radius = radius_km / EARTH_RADIUS_KM
+        origin_latitude = radians(latitude)
+        min_latitude = origin_latitude - angular_radius
+        max_latitude = origin_latitude + angular_radius
+        longitude_delta: float | None = None
+        if -pi / 2 < min_latitude and max_latitude < pi / 2:
+            longitude_delta = degrees(
+                asin(min(1.0, sin(angular_radius) / cos(origin_latitude)))
+            )
+
+        columns = self._longitude_cells(longitude, longitude_delta)
+        for row in self._cell_range(
+            max(-90.0, degrees(min_latitude)),
+            min(90.0, degrees(max_latitude)),
+        ):
+            for column in columns:
+                yield from self._cells.get((row, column), ())
+
+    def search(
+        self,
+        origin: NearbyOrigin,
+        *,
+        text_filter: str | None = None,
+        station_type: str | None = None,
+    ) -> tuple[StationCandidate, ...]:
+        """Return the same results as find_nearby_stations for one origin."""
+        return self.search_many(
+            (origin,),
+            text_filter=text_filter,
+            station_type=station_type,
+        )[0]
+
+    def search_many(
+        self,
+        origins: Iterable[NearbyOrigin],
+        *,
+        text_filter: str | None = None,
+        station_type: str | None = None,
+    ) -> tuple[tuple[StationCandidate, ...], ...]:
+        """Answer several nearby searches against the shared grid."""
+        text_needle = _normalize_text(text_filter).strip()
+        type_needle = _normalize_text(station_type).strip()
+        results: list[tuple[StationCandidate, ...]] = []
+        for origin in origins:
+            origin_latitude = _as_coordinate(origin.latitude, -90, 90)
+            origin_longitude = _as_coordinate(origin.longitude, -180, 180)
+            if (
+                origin_latitude is None
+                or origin_longitude is None
+                or isinstance(origin.radius_km, bool)
+                or origin.radius_km <= 0
+                or origin.limit <= 0
+            ):
+                results.append(())
+                continue
+
+            candidates: list[StationCandidate] = []
+            for entry in self._entries_near(
+                origin_latitude, origin_longitude, origin.radius_km
+            ):
+                if text_needle and text_needle not in entry.searchable:
+                    continue
+                if type_needle and type_needle not in entry.station_type:
+                    continue
+                distance_km = _haversine_distance_km(
+                    origin_latitude,
+                    origin_longitude,
+                    entry.latitude,
+                    entry.longitude,
+                )
+                if distance_km > origin.radius_km:
+                    continue
+                candidate = _candidate_from_station(entry.station, distance_km=distance_km)
+                if candidate is not None:
+                    candidates.append(candidate)
+
+            candidates.sort(key=_nearby_sort_key)
+            results.append(tuple(candidates[: origin.limit]))
+        return tuple(results)
+
+
+@dataclass(frozen=True)
+class ZoneQuery:
+    """One zone-search circle and the stations it is expected to cover."""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+    station_ids: tuple[str, ...]
+
+
+def plan_zone_queries(
+    coordinates: Mapping[str, tuple[float, float]],
+    *,
+    max_radius_km: float,
+) -> tuple[ZoneQuery, ...]:
+    """Cover station coordinates with few zone-search circles.
+
+    Candidate centers are the stations themselves and the midpoints of station
+    pairs close enough to share a circle. A greedy set cover picks the center
+    covering the most uncovered stations, preferring the smaller radius, until
+    every station is covered. Each circle is shrunk to its farthest assigned
+    station plus a small margin.
+    """
+    if max_radius_km <= 0:
+        return ()
+    station_ids = sorted(coordinates, key=_station_sort_id)
+    centers = [coordinates[station_id] for station_id in station_ids]
+    for position, first in enumerate(station_ids):
+        for second in station_ids[position + 1:]:
+            first_latitude, first_longitude = coordinates[first]
+            second_latitude, second_longitude = coordinates[second]
+            if _haversine_distance_km(
+                first_latitude, first_longitude, second_latitude, second_longitude
+            ) <= 2 * max_radius_km:
+                centers.append(
+                    (
+                        (first_latitude + second_latitude) / 2,
+                        (first_longitude + second_longitude) / 2,
+                    )
+                )
+
+    reach: list[dict[str, float]] = []
+    for center_latitude, center_longitude in centers:
+        distances: dict[str, float] = {}
+        for station_id in station_ids:
+            latitude, longitude = coordinates[station_id]
+            distance = _haversine_distance_km(
+                center_latitude, center_longitude, latitude, longitude
+            )
+            if distance <= max_radius_km:
+                distances[station_id] = distance
+        reach.append(distances)
+
+    uncovered = set(station_ids)
+    queries: list[ZoneQuery] = []
+    while uncovered:
+        best_score: tuple[int, float] | None = None
+        best_index = 0
+        for index, distances in enumerate(reach):
+            covered = uncovered.intersection(distances)
+            if not covered:
+                continue
+            score = (len(covered), -max(distances[station_id] for station_id in covered))
+            if best_score is None or score > best_score:
+                best_score, best_index = score, index
+        covered = uncovered.intersection(reach[best_index])
+        needed_radius = max(reach[best_index][station_id] for station_id in covered)
+        latitude, longitude = centers[best_index]
+        queries.append(
+            ZoneQuery(
+                latitude=round(latitude, 6),
+                longitude=round(longitude, 6),
+                radius_km=min(
+                    max_radius_km,
+                    ceil((needed_radius + ZONE_RADIUS_MARGIN_KM) * 10) / 10,
+                ),
+                station_ids=tuple(
+                    station_id for station_id in station_ids if station_id in covered
+                ),
+            )
+        )
+        uncovered -= covered
+    return tuple(queries)
+
+
 def find_stations_by_area(
     stations: Iterable[Mapping[str, Any]],
     *,
@@ -228,13 +500,319 @@ def find_stations_by_area(
         if candidate is not None:
             candidates.append(candidate)
 
-    candidates.sort(
-        key=lambda station: (
-            station.name.casefold(),
-            _station_sort_id(station.station_id),
+    candidates.sort(key=_area_sort_key)
+    return tuple(candidates[:limit])
+
+
+@dataclass(frozen=True)
+class AreaSearchPage:
+    """One page of registry area results."""
+
+    candidates: tuple[StationCandidate, ...]
+    next_key: AreaSortKey | None
+
+
+@dataclass(frozen=True)
+class _AreaIndexEntry:
+    """A registry station with its pre-normalized search fields."""
+
+    candidate: StationCandidate
+    municipality: str
+    province: str
+    searchable: str
+    station_type: str
+
+
+class AreaSearchIndex:
+    """Registry stations pre-sorted and pre-normalized for paged area searches."""
+
+    def __init__(self, stations: Iterable[Mapping[str, Any]]) -> None:
+        """Sort the registry once so pages resume from an indexed position."""
+        entries: list[tuple[AreaSortKey, _AreaIndexEntry]] = []
+        for station in stations:
+            candidate = _candidate_from_station(station, distance_km=None)
+            if candidate is None:
+                continue
+            entry = _AreaIndexEntry(
+                candidate=candidate,
+                municipality=_normalize_text(station.get("municipality")),
+                province=_normalize_text(station.get("province")),
+                searchable=_searchable_text(station),
+                station_type=_normalize_text(station.get("station_type")),
+            )
+            entries.append((_area_sort_key(candidate), entry))
+        entries.sort(key=lambda item: item[0])
+        self._keys = [key for key, _ in entries]
+        self._entries = [entry for _, entry in entries]
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._entries)
+
+    def search(
+        self,
+        *,
+        municipality: str,
+        province: str | None = None,
+        text_filter: str | None = None,
+        station_type: str | None = None,
+        limit: int,
+        after: AreaSortKey | None = None,
+    ) -> AreaSearchPage:
+        """Return up to ``limit`` matches ordered after an optional sort key."""
+        municipality_filter = _normalize_text(municipality).strip()
+        province_filter = _normalize_text(province).strip()
+        text_needle = _normalize_text(text_filter).strip()
+        type_needle = _normalize_text(station_type).strip()
+        if limit <= 0 or not any(
+            (municipality_filter, province_filter, text_needle, type_needle)
+        ):
+            return AreaSearchPage(candidates=(), next_key=None)
+
+        start = bisect_right(self._keys, after) if after is not None else 0
+        matches: list[int] = []
+        for position in range(start, len(self._entries)):
+            entry = self._entries[position]
+            if municipality_filter and municipality_filter not in entry.municipality:
+                continue
+            if province_filter and province_filter not in entry.province:
+                continue
+            if text_needle and text_needle not in entry.searchable:
+                continue
+            if type_needle and type_needle not in entry.station_type:
+                continue
+            if len(matches) == limit:
+                return AreaSearchPage(
+                    candidates=tuple(self._entries[index].candidate for index in matches),
+                    next_key=self._keys[matches[-1]],
+                )
+            matches.append(position)
+
+        return AreaSearchPage(
+            candidates=tuple(self._entries[index].candidate for index in matches),
+            next_key=None,
         )
+
+
+def encode_search_cursor(generation: str, key: AreaSortKey) -> str:
+    """Encode an opaque continuation cursor bound to a registry generation."""
+    name, (id_kind, id_value) = key
+    payload = json.dumps(
+        [generation, name, id_kind, id_value],
+        ensure_ascii=False,
+        separators=(",", ":"),
     )
-    return tuple(candidates[:limit])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[str, AreaSortKey]:
+    """Decode a continuation cursor, raising ValueError when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise ValueError("Search cursor is not valid") from err
+
+    if not isinstance(payload, list) or len(payload) != 4:
+        raise ValueError("Search cursor is not valid")
+    generation, name, id_kind, id_value = payload
+    if (
+        not isinstance(generation, str)
+        or not isinstance(name, str)
+        or not (
+            (id_kind == 0 and isinstance(id_value, int) and not isinstance(id_value, bool))
+            or (id_kind == 1 and isinstance(id_value, str))
+        )
+    ):
+        raise ValueError("Search cursor is not valid")
+    return generation, (name, (id_kind, id_value))
+
+
+def _max_edit_distance(word: str) -> int:
+    """Return how many typos are tolerated for a word of this length."""
+    if len(word) < 3:
+        return 0
+    if len(word) < 6:
+        return 1
+    return _FUZZY_MAX_DISTANCE
+
+
+def _prefix_deletes(word: str, distance: int) -> set[str]:
+    """Return every string reachable by deleting up to ``distance`` prefix characters."""
+    variants = {word[:_FUZZY_PREFIX_LENGTH]}
+    frontier = set(variants)
+    for _ in range(distance):
+        frontier = {
+            variant[:position] + variant[position + 1:]
+            for variant in frontier
+            for position in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(first: str, second: str, limit: int) -> int | None:
+    """Return the optimal string alignment distance, or None above ``limit``."""
+    if abs(len(first) - len(second)) > limit:
+        return None
+    previous_previous: list[int] = []
+    previous = list(range(len(second) + 1))
+    for row, first_character in enumerate(first, start=1):
+        current = [row]
+        for column, second_character in enumerate(second, start=1):
+            cost = first_character != second_character
+            value = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + cost,
+            )
+            if (
+                row > 1
+                and column > 1
+                and first_character == second[column - 2]
+                and first[row - 2] == second_character
+            ):
+                value = min(value, previous_previous[column - 2] + 1)
+            current.append(value)
+        if min(current) > limit:
+            return None
+        previous_previous, previous = previous, current
+    distance = previous[-1]
+    return distance if distance <= limit else None
+
+
+@dataclass(frozen=True)
+class VocabularySuggestion:
+    """A registry value close to a search term that matched nothing."""
+
+    value: str
+    distance: int
+    station_count: int
+
+
+class _SymmetricDeleteDictionary:
+    """Find words within a bounded edit distance using precomputed deletes."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        """Index the prefix deletes of every word."""
+        self._deletes: dict[str, list[str]] = {}
+        for word in set(words):
+            for variant in _prefix_deletes(word, _FUZZY_MAX_DISTANCE):
+                self._deletes.setdefault(variant, []).append(word)
+
+    def lookup(self, query: str, max_distance: int) -> dict[str, int]:
+        """Return indexed words within ``max_distance`` edits of ``query``."""
+        matches: dict[str, int] = {}
+        checked: set[str] = set()
+        for variant in _prefix_deletes(query, max_distance):
+            for word in self._deletes.get(variant, ()):
+                if word in checked:
+                    continue
+                checked.add(word)
+                distance = _edit_distance(query, word, max_distance)
+                if distance is not None:
+                    matches[word] = distance
+        return matches
+
+
+class _FieldVocabulary:
+    """Distinct values of one registry field with a word-level fuzzy index."""
+
+    def __init__(self, values: Iterable[Any]) -> None:
+        """Count spellings and index the words of each distinct value."""
+        spellings: dict[str, Counter[str]] = {}
+        for value in values:
+            display = _optional_text(value)
+            if display is None:
+                continue
+            term = " ".join(_WORD_PATTERN.findall(_normalize_text(display)))
+            if term:
+                spellings.setdefault(term, Counter())[display] += 1
+
+        self._display = {
+            term: counter.most_common(1)[0][0] for term, counter in spellings.items()
+        }
+        self._station_count = {
+            term: sum(counter.values()) for term, counter in spellings.items()
+        }
+        self._terms_by_word: dict[str, set[str]] = {}
+        for term in spellings:
+            for word in term.split():
+                self._terms_by_word.setdefault(word, set()).add(term)
+        self._dictionary = _SymmetricDeleteDictionary(self._terms_by_word)
+
+    def suggest(self, query: str, limit: int) -> tuple[VocabularySuggestion, ...]:
+        """Return values whose words all approximately match the query words."""
+        words = _WORD_PATTERN.findall(_normalize_text(query))
+        if not words or limit <= 0 or " ".join(words) in self._display:
+            return ()
+
+        scores: dict[str, int] = {}
+        for position, word in enumerate(words):
+            word_scores: dict[str, int] = {}
+            for match, distance in self._dictionary.lookup(
+                word, _max_edit_distance(word)
+            ).items():
+                for term in self._terms_by_word[match]:
+                    if position and term not in scores:
+                        continue
+                    word_scores[term] = min(word_scores.get(term, distance), distance)
+            scores = {
+                term: distance + scores.get(term, 0)
+                for term, distance in word_scores.items()
+            }
+            if not scores:
+                return ()
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (
+                item[1],
+                -self._station_count[item[0]],
+                self._display[item[0]].casefold(),
+            ),
+        )
+        return tuple(
+            VocabularySuggestion(
+                value=self._display[term],
+                distance=distance,
+                station_count=self._station_count[term],
+            )
+            for term, distance in ranked[:limit]
+        )
+
+
+class RegistryVocabularyIndex:
+    """Typo-tolerant suggestions for registry municipalities, provinces and brands."""
+
+    def __init__(self, stations: Iterable[Mapping[str, Any]]) -> None:
+        """Build one fuzzy vocabulary per suggestion field."""
+        columns: dict[str, list[Any]] = {field: [] for field in SUGGESTION_FIELDS}
+        for station in stations:
+            for field, column in columns.items():
+                column.append(station.get(field))
+        self._fields = {
+            field: _FieldVocabulary(column) for field, column in columns.items()
+        }
+
+    def suggest(
+        self,
+        *,
+        municipality: str | None = None,
+        province: str | None = None,
+        brand: str | None = None,
+        limit: int = SUGGESTION_LIMIT,
+    ) -> dict[str, tuple[VocabularySuggestion, ...]]:
+        """Return ranked "did you mean" values for each non-empty search term."""
+        queries = {"municipality": municipality, "province": province, "brand": brand}
+        suggestions: dict[str, tuple[VocabularySuggestion, ...]] = {}
+        for field, query in queries.items():
+            if not query:
+                continue
+            matches = self._fields[field].suggest(query, limit)
+            if matches:
+                suggestions[field] = matches
+        return suggestions
 
 
 def _optional_text(value: Any) -> str | None:
@@ -1,22 +1,29 @@
 from __future__ import annotations
 
-import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import date, datetime, time, timedelta, tzinfo
-from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CONF_STATION_ID, DOMAIN
 from .coordinator import CarburantiDataUpdateCoordinator
-
-_LOGGER = logging.getLogger(__name__)
+from .models import ScheduleDay, StationData, StationInfo
 
 HOLIDAY_SCHEDULE_ID = 8
 SCHEDULE_REFRESH_INTERVAL = timedelta(minutes=1)
+STATION_NAME_KEYS = frozenset(
+    {
+        "station_info.name",
+        "station_info.nomeImpianto",
+        "station_info.address",
+        "station_info.brand",
+    }
+)
+_NO_STATION_INFO = StationInfo()
 
 
 def _is_italian_holiday(check_date: date) -> bool:
@@ -59,128 +66,62 @@ def _compute_easter(year: int) -> date:
     return date(year, month, day)
 
 
-def _parse_time(time_str: str | None) -> time | None:
-    """Parse time strings used by the opening-hours API payload."""
-    if not time_str:
-        return None
-
-    try:
-        time_str_clean = str(time_str).strip()
-        if ":" in time_str_clean:
-            return time.fromisoformat(time_str_clean)
-        if "." in time_str_clean:
-            hour_str, minute_str = time_str_clean.split(".")
-            hour = int(hour_str)
-            minute = int(minute_str) if minute_str else 0
-            return time(0 if hour == 24 else hour, minute)
-
-        hour = int(time_str_clean)
-        return time(0 if hour == 24 else hour, 0)
-    except (TypeError, ValueError) as err:
-        _LOGGER.warning("Failed to parse time string '%s': %s", time_str, err)
-        return None
-
-
-def _has_valid_opening_hours(data: dict[str, Any] | None) -> bool:
+def _has_valid_opening_hours(data: StationData | None) -> bool:
     """Check if opening hours data contains valid schedule information."""
     if not data:
         return False
 
-    for day in data.get("opening_hours", []):
-        if day.get("flagChiusura") or day.get("flagNonComunicato"):
+    for day in data.opening_hours:
+        if day.closed or day.not_communicated:
             continue
-        if day.get("flagH24"):
-            return True
-        if day.get("flagOrarioContinuato"):
-            if day.get("oraAperturaOrarioContinuato") and day.get("oraChiusuraOrarioContinuato"):
-                return True
-            continue
-        if (
-            day.get("oraAperturaMattina") and day.get("oraChiusuraMattina")
-        ) or (
-            day.get("oraAperturaPomeriggio") and day.get("oraChiusuraPomeriggio")
-        ):
+        if day.h24 or day.intervals:
             return True
     return False
 
 
-def _get_available_service_ids(services: list[Any]) -> set[str]:
-    """Normalize available service ids from the API payload."""
-    available_ids: set[str] = set()
-    for service in services:
-        if isinstance(service, dict) and service.get("id") is not None:
-            available_ids.add(str(service["id"]))
-        elif isinstance(service, (int, str)):
-            available_ids.add(str(service))
-    return available_ids
-
-
 def _find_schedule_for_day(
-    opening_hours: list[dict[str, Any]],
+    opening_hours: Sequence[ScheduleDay],
     weekday: int,
     check_date: date,
-) -> dict[str, Any] | None:
+) -> ScheduleDay | None:
     """Find the schedule entry for a given weekday, considering holidays."""
     if _is_italian_holiday(check_date):
         for day in opening_hours:
-            if day.get("giornoSettimanaId") == HOLIDAY_SCHEDULE_ID:
+            if day.weekday == HOLIDAY_SCHEDULE_ID:
                 return day
 
     for day in opening_hours:
-        if day.get("giornoSettimanaId") == weekday:
+        if day.weekday == weekday:
             return day
     return None
 
 
-def _is_schedule_open(schedule: dict[str, Any], current_time: time) -> bool:
+def _is_schedule_open(schedule: ScheduleDay, current_time: time) -> bool:
     """Check if a station is open based on a schedule entry and current time."""
-    if schedule.get("flagOrarioContinuato"):
-        open_time = _parse_time(schedule.get("oraAperturaOrarioContinuato"))
-        close_time = _parse_time(schedule.get("oraChiusuraOrarioContinuato"))
-        if open_time and close_time:
-            if open_time <= close_time:
-                return open_time <= current_time <= close_time
-            return current_time >= open_time or current_time <= close_time
-        return False
-
-    morning_open = _parse_time(schedule.get("oraAperturaMattina"))
-    morning_close = _parse_time(schedule.get("oraChiusuraMattina"))
-    afternoon_open = _parse_time(schedule.get("oraAperturaPomeriggio"))
-    afternoon_close = _parse_time(schedule.get("oraChiusuraPomeriggio"))
-    if morning_open and morning_close and morning_open <= current_time <= morning_close:
-        return True
-    if afternoon_open and afternoon_close and afternoon_open <= current_time <= afternoon_close:
-        return True
+    for open_time, close_time in schedule.intervals:
+        if open_time <= close_time:
+            if open_time <= current_time <= close_time:
+                return True
+        elif current_time >= open_time or current_time <= close_time:
+            return True
     return False
 
 
 def _schedule_intervals_for_date(
-    schedule: dict[str, Any] | None,
+    schedule: ScheduleDay | None,
     local_date: date,
     timezone: tzinfo | None,
 ) -> list[tuple[datetime, datetime]]:
     """Convert one schedule row into local, date-aware opening intervals."""
-    if not schedule or schedule.get("flagChiusura") or schedule.get("flagNonComunicato"):
+    if not schedule or schedule.closed or schedule.not_communicated:
         return []
 
     day_start = datetime.combine(local_date, time.min, timezone)
-    if schedule.get("flagH24"):
+    if schedule.h24:
         return [(day_start, datetime.combine(local_date + timedelta(days=1), time.min, timezone))]
 
-    pairs = (
-        (("oraAperturaOrarioContinuato", "oraChiusuraOrarioContinuato"),)
-        if schedule.get("flagOrarioContinuato")
-        else (
-            ("oraAperturaMattina", "oraChiusuraMattina"),
-            ("oraAperturaPomeriggio", "oraChiusuraPomeriggio"),
-        )
-    )
     intervals: list[tuple[datetime, datetime]] = []
-    for open_key, close_key in pairs:
-        open_time = _parse_time(schedule.get(open_key))
-        close_time = _parse_time(schedule.get(close_key))
-        if open_time is None or close_time is None:
-            continue
+    for open_time, close_time in schedule.intervals:
         opens_at = datetime.combine(local_date, open_time, timezone)
         close_date = local_date + timedelta(days=close_time <= open_time)
         closes_at = datetime.combine(close_date, close_time, timezone)
@@ -189,7 +130,14 @@ def _schedule_intervals_for_date(
 
 
 class OsservaprezziBaseEntity(CoordinatorEntity):
-    """Shared entity helpers for this integration."""
+    """Shared entity helpers for this integration.
+
+    ``_update_keys`` lists the coordinator change keys an entity renders, so
+    updates that change none of them skip the state write. ``None`` writes
+    state on every update.
+    """
+
+    _update_keys: frozenset[str] | None = None
 
     def __init__(self, coordinator: CarburantiDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the shared entity base."""
@@ -197,21 +145,30 @@ class OsservaprezziBaseEntity(CoordinatorEntity):
         self._entry = entry
         self._station_id = entry.data[CONF_STATION_ID]
 
+    def _should_write_state(self) -> bool:
+        """Return True when the last coordinator update affects this entity."""
+        return self._update_keys is None or self.coordinator.has_changes(self._update_keys)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the keys this entity renders changed."""
+        if self._should_write_state():
+            self.async_write_ha_state()
+
     @property
-    def station_info(self) -> dict[str, Any]:
+    def station_info(self) -> StationInfo:
         """Return cached station info."""
-        return self.coordinator.data.get("station_info", {}) if self.coordinator.data else {}
+        return self.coordinator.data.station_info if self.coordinator.data else _NO_STATION_INFO
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info shared by all station entities."""
         station_info = self.station_info
-        station_name = station_info.get("nomeImpianto") or station_info.get("name") or self._station_id
         return DeviceInfo(
             identifiers={(DOMAIN, self._station_id)},
-            name=station_name,
-            manufacturer=station_info.get("brand"),
-            model=station_info.get("station_type") or "Fuel Station",
+            name=station_info.display_name or self._station_id,
+            manufacturer=station_info.brand,
+            model=station_info.station_type or "Fuel Station",
         )
 
 
@@ -0,0 +1,172 @@
+"""Traced HTTP client for the Osservaprezzi endpoints."""
+from __future__ import annotations
+
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import DOMAIN
+from .metrics import RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTP_CLIENT_DATA_KEY = "http_client"
+
+
+class HttpClient:
+    """Lazily created session with connection reuse statistics.
+
+    The session is created by Home Assistant on its shared keep-alive
+    connector, with trace configs counting requests and connection reuse.
+    Connection limits, including the per-host limit, and the DNS cache and
+    its TTL are those of that connector, so the DNS counters mirror Home
+    Assistant's settings. Home Assistant closes the session on shutdown; a
+    closed session is replaced on the next request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the client without opening a session."""
+        self.hass = hass
+        self._session: aiohttp.ClientSession | None = None
+        self._stats = dict.fromkeys(
+            (
+                "requests",
+                "connections_created",
+                "connections_reused",
+                "dns_cache_hits",
+                "dns_cache_misses",
+            ),
+            0,
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the open session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = async_create_clientsession(
+                self.hass, trace_configs=[self._trace_config()]
+            )
+            _LOGGER.debug("Opened integration HTTP session")
+        return self._session
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Return a trace config that counts requests and connection reuse.
+
+        Requests passing a RequestTiming as ``trace_request_ctx`` also get
+        their connect and time-to-first-byte phases filled in.
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(_trace_request_start)
+        trace_config.on_connection_create_start.append(_trace_connection_start)
+        trace_config.on_connection_create_end.append(_trace_connection_end)
+        trace_config.on_request_end.append(_trace_request_end)
+        for signal, counter in (
+            (trace_config.on_request_start, "requests"),
+            (trace_config.on_connection_create_end, "connections_created"),
+            (trace_config.on_connection_reuseconn, "connections_reused"),
+            (trace_config.on_dns_cache_hit, "dns_cache_hits"),
+            (trace_config.on_dns_cache_miss, "dns_cache_misses"),
+        ):
+            signal.append(self._counter(counter))
+        return trace_config
+
+    def _counter(self, name: str) -> Any:
+        """Return a trace callback that increments one statistic."""
+
+        async def _count(
+            session: aiohttp.ClientSession,
+            context: SimpleNamespace,
+            params: Any,
+        ) -> None:
+            self._stats[name] += 1
+
+        return _count
+
+    def async_shutdown(self) -> None:
+        """Close the open session, leaving the shared connector to Home Assistant."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            self.hass.async_create_background_task(
+                session.close(), f"{DOMAIN} close HTTP session"
+            )
+
+    def status(self) -> dict[str, Any]:
+        """Return connection reuse statistics for diagnostics."""
+        connections = self._stats["connections_created"] + self._stats["connections_reused"]
+        return {
+            "open": self._session is not None and not self._session.closed,
+            **self._stats,
+            "reuse_ratio": (
+                round(self._stats["connections_reused"] / connections, 3)
+                if connections
+                else None
+            ),
+        }
+
+
+async def _trace_request_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestStartParams,
+) -> None:
+    """Remember when a request started."""
+    context.started_at = time.monotonic()
+    context.connect = 0.0
+
+
+async def _trace_connection_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionCreateStartParams,
+) -> None:
+    """Remember when a new connection started."""
+    context.connect_started_at = time.monotonic()
+
+
+async def _trace_connection_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceConnectionCreateEndParams,
+) -> None:
+    """Store how long opening a new connection took."""
+    context.connect = time.monotonic() - context.connect_started_at
+
+
+async def _trace_request_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    """Fill in connect and time-to-first-byte once response headers arrived."""
+    timing = context.trace_request_ctx
+    if isinstance(timing, RequestTiming):
+        timing.connect = context.connect
+        timing.time_to_first_byte = time.monotonic() - context.started_at - context.connect
+
+
+def get_http_client(hass: HomeAssistant) -> HttpClient:
+    """Return the integration-wide HTTP client."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    client = domain_data.get(HTTP_CLIENT_DATA_KEY)
+    if not isinstance(client, HttpClient):
+        client = HttpClient(hass)
+        domain_data[HTTP_CLIENT_DATA_KEY] = client
+    return client
+
+
+def async_remove_http_client(hass: HomeAssistant) -> None:
+    """Shut down and forget the HTTP client, if any."""
+    client = hass.data.get(DOMAIN, {}).pop(HTTP_CLIENT_DATA_KEY, None)
+    if isinstance(client, HttpClient):
+        client.async_shutdown()
+
+
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the traced session for Osservaprezzi requests."""
+    return get_http_client(hass).session
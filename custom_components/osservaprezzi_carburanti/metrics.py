@@ -0,0 +1,98 @@
+"""Rolling request timing metrics for the Osservaprezzi station API."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+HISTOGRAM_BOUNDS: tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class RequestTiming:
+    """Seconds one station request spent in each phase."""
+
+    queue_wait: float = 0.0
+    connect: float = 0.0
+    time_to_first_byte: float = 0.0
+    download: float = 0.0
+    normalize: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """Return the sum of all phases."""
+        return (
+            self.queue_wait
+            + self.connect
+            + self.time_to_first_byte
+            + self.download
+            + self.normalize
+        )
+
+
+class RollingHistogram:
+    """Histogram and percentiles over the most recent ``window`` samples."""
+
+    def __init__(self, window: int) -> None:
+        """Initialize an empty histogram."""
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        """Add one sample, dropping the oldest when the window is full."""
+        self._samples.append(value)
+
+    def summary(self) -> dict[str, Any]:
+        """Return count, percentiles and cumulative bucket counts."""
+        ordered = sorted(self._samples)
+
+        def percentile(fraction: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+        buckets: dict[str, int] = {}
+        index = 0
+        for bound in HISTOGRAM_BOUNDS:
+            while index < len(ordered) and ordered[index] <= bound:
+                index += 1
+            buckets[f"le_{bound:g}"] = index
+        buckets["le_inf"] = len(ordered)
+        return {
+            "count": len(ordered),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": round(ordered[-1], 4) if ordered else None,
+            "buckets": buckets,
+        }
+
+
+class RequestMetrics:
+    """Per-phase timing histograms and outcome counters for station requests."""
+
+    def __init__(self, window: int) -> None:
+        """Initialize empty metrics keeping ``window`` samples per phase."""
+        self._window = window
+        self._phases = {
+            phase: RollingHistogram(window) for phase in (*asdict(RequestTiming()), "total")
+        }
+        self._outcomes: Counter[str] = Counter()
+
+    def record(self, outcome: int | str, timing: RequestTiming | None = None) -> None:
+        """Count a request outcome and add its phase timings, if measured."""
+        self._outcomes[str(outcome)] += 1
+        if timing is None:
+            return
+        for phase, seconds in asdict(timing).items():
+            self._phases[phase].add(seconds)
+        self._phases["total"].add(timing.total)
+
+    def status(self) -> dict[str, Any]:
+        """Return metrics for diagnostics."""
+        return {
+            "window": self._window,
+            "requests": sum(self._outcomes.values()),
+            "by_outcome": dict(sorted(self._outcomes.items())),
+            "phases_seconds": {
+                phase: histogram.summary() for phase, histogram in self._phases.items()
+            },
+        }
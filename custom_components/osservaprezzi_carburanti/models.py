@@ -0,0 +1,409 @@
+"""Immutable models of station payloads and processed station data.
+
+Station responses are parsed once into ``StationPayload`` and processed into
+``StationData``, so the coordinator and entities read typed attributes
+instead of walking nested dicts. Every model is also a read-only mapping
+under the keys of its payload or of the previous dict layout, for consumers
+such as diagnostics, services, and persisted data.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import time
+import logging
+from types import MappingProxyType
+from typing import Any, ClassVar
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_time(time_str: str | None) -> time | None:
+    """Parse time strings used by the opening-hours API payload."""
+    if not time_str:
+        return None
+
+    try:
+        time_str_clean = str(time_str).strip()
+        if ":" in time_str_clean:
+            return time.fromisoformat(time_str_clean)
+        if "." in time_str_clean:
+            hour_str, minute_str = time_str_clean.split(".")
+            hour = int(hour_str)
+            minute = int(minute_str) if minute_str else 0
+            return time(0 if hour == 24 else hour, minute)
+
+        hour = int(time_str_clean)
+        return time(0 if hour == 24 else hour, 0)
+    except (TypeError, ValueError) as err:
+        _LOGGER.warning("Failed to parse time string '%s': %s", time_str, err)
+        return None
+
+
+def _get_available_service_ids(services: Iterable[Any]) -> set[str]:
+    """Normalize available service ids from the API payload."""
+    available_ids: set[str] = set()
+    for service in services:
+        if isinstance(service, Mapping) and service.get("id") is not None:
+            available_ids.add(str(service["id"]))
+        elif isinstance(service, (int, str)):
+            available_ids.add(str(service))
+    return available_ids
+
+
+def freeze_service(service: Any) -> Any:
+    """Return a read-only copy of a ``services`` payload item.
+
+    Dict items are copied with sorted keys, so equal services compare and
+    print alike whatever the key order of the response.
+    """
+    if isinstance(service, Mapping):
+        return MappingProxyType(dict(sorted(service.items())))
+    return service
+
+
+def _plain(value: Any) -> Any:
+    """Return a JSON-serializable copy of a model value."""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _MappingView(Mapping[str, Any]):
+    """Read-only mapping access to a model under its original payload keys.
+
+    ``_KEYS`` maps each mapping key to the attribute holding its value.
+    """
+
+    __slots__ = ()
+    _KEYS: ClassVar[Mapping[str, str]]
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value stored under a payload key."""
+        try:
+            attribute = self._KEYS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        value = getattr(self, attribute)
+        return value.strftime("%H:%M") if isinstance(value, time) else value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the payload keys."""
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        """Return the number of payload keys."""
+        return len(self._KEYS)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the model as plain, JSON-serializable data."""
+        return {key: _plain(value) for key, value in self.items()}
+
+    @classmethod
+    def _attributes(cls, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Return constructor arguments for the known keys of a mapping."""
+        return {
+            attribute: data[key] for key, attribute in cls._KEYS.items() if key in data
+        }
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StationInfo(_MappingView):
+    """Station identity, contacts, and registry details."""
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "id": "id",
+            "name": "name",
+            "nomeImpianto": "plant_name",
+            "address": "address",
+            "brand": "brand",
+            "company": "company",
+            "phoneNumber": "phone_number",
+            "email": "email",
+            "website": "website",
+            "latitude": "latitude",
+            "longitude": "longitude",
+            "operator": "operator",
+            "station_type": "station_type",
+            "municipality": "municipality",
+            "province": "province",
+            "coordinate_source": "coordinate_source",
+        }
+    )
+
+    id: Any = None
+    name: str | None = None
+    plant_name: str | None = None
+    address: str | None = None
+    brand: str | None = None
+    company: str | None = None
+    phone_number: str | None = None
+    email: str | None = None
+    website: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    operator: str | None = None
+    station_type: str | None = None
+    municipality: str | None = None
+    province: str | None = None
+    coordinate_source: str | None = None
+
+    @property
+    def display_name(self) -> str | None:
+        """Return the plant name, falling back to the station name."""
+        return self.plant_name or self.name
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> StationInfo:
+        """Build station info from its mapping form."""
+        return cls(**cls._attributes(data))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FuelQuote(_MappingView):
+    """The current price of one fuel and service type, with its history."""
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            name: name
+            for name in (
+                "price",
+                "last_update",
+                "validity_date",
+                "fuel_id",
+                "is_self",
+                "service_area_id",
+                "previous_price",
+                "price_changed_at",
+            )
+        }
+    )
+
+    price: float | None = None
+    last_update: str | None = None
+    validity_date: str | None = None
+    fuel_id: Any = None
+    is_self: bool | None = None
+    service_area_id: Any = None
+    previous_price: float | None = None
+    price_changed_at: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> FuelQuote:
+        """Build a fuel quote from its mapping form."""
+        return cls(**cls._attributes(data))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class ScheduleDay(_MappingView):
+    """One weekday, or the holiday row, of a station's opening hours.
+
+    Times are parsed once when the payload is processed. The mapping form
+    uses the API keys, with times formatted as ``HH:MM``.
+    """
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "giornoSettimanaId": "weekday",
+            "flagChiusura": "closed",
+            "flagNonComunicato": "not_communicated",
+            "flagH24": "h24",
+            "flagOrarioContinuato": "continuous",
+            "oraAperturaOrarioContinuato": "continuous_open",
+            "oraChiusuraOrarioContinuato": "continuous_close",
+            "oraAperturaMattina": "morning_open",
+            "oraChiusuraMattina": "morning_close",
+            "oraAperturaPomeriggio": "afternoon_open",
+            "oraChiusuraPomeriggio": "afternoon_close",
+        }
+    )
+
+    weekday: int | None = None
+    closed: bool = False
+    not_communicated: bool = False
+    h24: bool = False
+    continuous: bool = False
+    continuous_open: time | None = None
+    continuous_close: time | None = None
+    morning_open: time | None = None
+    morning_close: time | None = None
+    afternoon_open: time | None = None
+    afternoon_close: time | None = None
+
+    @property
+    def intervals(self) -> tuple[tuple[time, time], ...]:
+        """Return the complete opening and closing time pairs of the day."""
+        pairs = (
+            ((self.continuous_open, self.continuous_close),)
+            if self.continuous
+            else (
+                (self.morning_open, self.morning_close),
+                (self.afternoon_open, self.afternoon_close),
+            )
+        )
+        return tuple(
+            (open_time, close_time)
+            for open_time, close_time in pairs
+            if open_time is not None and close_time is not None
+        )
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> ScheduleDay:
+        """Build a schedule row from an ``orariapertura`` payload entry."""
+        get = raw.get
+        return cls(
+            weekday=get("giornoSettimanaId"),
+            closed=bool(get("flagChiusura")),
+            not_communicated=bool(get("flagNonComunicato")),
+            h24=bool(get("flagH24")),
+            continuous=bool(get("flagOrarioContinuato")),
+            continuous_open=_parse_time(get("oraAperturaOrarioContinuato")),
+            continuous_close=_parse_time(get("oraChiusuraOrarioContinuato")),
+            morning_open=_parse_time(get("oraAperturaMattina")),
+            morning_close=_parse_time(get("oraChiusuraMattina")),
+            afternoon_open=_parse_time(get("oraAperturaPomeriggio")),
+            afternoon_close=_parse_time(get("oraChiusuraPomeriggio")),
+        )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FuelPayload(_MappingView):
+    """One fuel entry of a station or zone-search response."""
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "name": "name",
+            "price": "price",
+            "fuelId": "fuel_id",
+            "isSelf": "is_self",
+            "serviceAreaId": "service_area_id",
+            "insertDate": "insert_date",
+            "validityDate": "validity_date",
+        }
+    )
+
+    name: str | None = None
+    price: float | None = None
+    fuel_id: Any = None
+    is_self: bool | None = None
+    service_area_id: Any = None
+    insert_date: str | None = None
+    validity_date: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Return the fuel entity key, such as ``Benzina_self``."""
+        name = "Unknown" if self.name is None else self.name
+        return f"{name}_{'self' if self.is_self else 'servito'}"
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> FuelPayload:
+        """Build a fuel entry from a ``fuels`` payload item."""
+        get = raw.get
+        return cls(
+            name=get("name"),
+            price=get("price"),
+            fuel_id=get("fuelId"),
+            is_self=get("isSelf"),
+            service_area_id=get("serviceAreaId"),
+            insert_date=get("insertDate"),
+            validity_date=get("validityDate"),
+        )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StationPayload(_MappingView):
+    """A validated station response, as parsed by ``api.normalize_station_data``.
+
+    Services are the items of the response, with service dicts frozen. The
+    mapping form uses the API keys; fields the integration does not read are
+    dropped.
+    """
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "id": "id",
+            "name": "name",
+            "nomeImpianto": "plant_name",
+            "address": "address",
+            "brand": "brand",
+            "company": "company",
+            "phoneNumber": "phone_number",
+            "email": "email",
+            "website": "website",
+            "fuels": "fuels",
+            "services": "services",
+            "orariapertura": "opening_hours",
+        }
+    )
+
+    id: Any = None
+    name: str | None = None
+    plant_name: str | None = None
+    address: str | None = None
+    brand: str | None = None
+    company: str | None = None
+    phone_number: str | None = None
+    email: str | None = None
+    website: str | None = None
+    fuels: tuple[FuelPayload, ...] = ()
+    services: tuple[Any, ...] = ()
+    opening_hours: tuple[ScheduleDay, ...] = ()
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class StationData(_MappingView):
+    """Processed station payload published by the coordinator.
+
+    ``services`` keeps the service items of the payload, as in the previous
+    dict layout; ``service_ids`` holds the available service IDs parsed once.
+    """
+
+    _KEYS: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "station_info": "station_info",
+            "fuels": "fuels",
+            "services": "services",
+            "opening_hours": "opening_hours",
+            "last_update": "last_update",
+        }
+    )
+
+    station_info: StationInfo = field(default_factory=StationInfo)
+    fuels: Mapping[str, FuelQuote] = field(default_factory=lambda: MappingProxyType({}))
+    services: tuple[Any, ...] = ()
+    opening_hours: tuple[ScheduleDay, ...] = ()
+    last_update: str | None = None
+    service_ids: frozenset[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Parse the available service IDs."""
+        object.__setattr__(
+            self, "service_ids", frozenset(_get_available_service_ids(self.services))
+        )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> StationData:
+        """Build station data from its mapping form, such as persisted data.
+
+        Raises AttributeError, TypeError, or ValueError for malformed data.
+        """
+        return cls(
+            station_info=StationInfo.from_dict(data.get("station_info") or {}),
+            fuels=MappingProxyType(
+                {
+                    key: FuelQuote.from_dict(value)
+                    for key, value in (data.get("fuels") or {}).items()
+                }
+            ),
+            services=tuple(freeze_service(item) for item in data.get("services") or ()),
+            opening_hours=tuple(
+                day if isinstance(day, ScheduleDay) else ScheduleDay.from_api(day)
+                for day in data.get("opening_hours") or ()
+            ),
+            last_update=data.get("last_update"),
+        )
+
@@ -0,0 +1,526 @@
+"""Daily price file manager: the prices of every station from one download."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+import codecs
+import csv
+from datetime import date, datetime, time, timedelta
+from functools import partial
+import json
+import logging
+import re
+from time import monotonic
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_STATION_ID,
+    DEFAULT_HEADERS,
+    DOMAIN,
+    PRICE_CSV_CHECK_INTERVAL,
+    PRICE_CSV_CHUNK_SIZE,
+    PRICE_CSV_EXTRACTION_HOUR,
+    PRICE_CSV_TIME_ZONE,
+    PRICE_CSV_URL,
+)
+from .coordinator import CarburantiDataUpdateCoordinator
+from .cron_scheduler import CronScheduler, get_cron_scheduler
+from .csv_manager import (
+    _load_json_file_sync,
+    _write_json_file_atomic_sync,
+    detect_csv_separator,
+)
+from .http_client import get_http_client
+
+_LOGGER = logging.getLogger(__name__)
+
+PRICE_CACHE_VERSION = "1.1"
+PRICE_CSV_MANAGER_DATA_KEY = "price_csv_manager"
+PRICE_CSV_COLUMNS = {
+    "idImpianto": "id",
+    "descCarburante": "name",
+    "prezzo": "price",
+    "isSelf": "is_self",
+    "dtComu": "insert_date",
+}
+REQUIRED_PRICE_CSV_COLUMNS = ("id", "name", "price", "is_self")
+
+_EXTRACTION_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_SOURCE_TIME_ZONE = ZoneInfo(PRICE_CSV_TIME_ZONE)
+
+# One fuel of a station: name, price, self service, and communication time.
+PriceRow = tuple[str, float, bool, str | None]
+
+
+def _parse_extraction_date(line: str) -> date | None:
+    """Parse the extraction date line, such as ``Estrazione del 2026-02-11``."""
+    match = _EXTRACTION_DATE.search(line)
+    if match is None:
+        return None
+    try:
+        return date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def _parse_communication_time(value: str) -> str | None:
+    """Return a ``dtComu`` value, in Italian local time, as an ISO timestamp."""
+    try:
+        parsed = datetime.strptime(value.strip(), "%d/%m/%Y %H:%M:%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=_SOURCE_TIME_ZONE).isoformat()
+
+
+class _PriceCSVParser:
+    """Incremental parser of the daily price file, fed decoded text chunks.
+
+    Line 0 holds the extraction date and line 1 the header, whose separator
+    is detected like the registry's. Rows are parsed as their lines complete,
+    so the file is never held in memory as a whole, and only the rows of the
+    given stations are converted and kept.
+    """
+
+    def __init__(self, station_ids: frozenset[str]) -> None:
+        """Initialize a parser of the given stations' rows before the first line."""
+        self.extracted_on: date | None = None
+        self.separator = "|"
+        self.prices: dict[str, list[PriceRow]] = {}
+        self.rows = 0
+        self.skipped = 0
+        self.error: str | None = None
+        self._columns: dict[str, int] | None = None
+        self._line_count = 0
+        self._partial = ""
+        self._station_ids = station_ids
+
+    def feed(self, text: str) -> None:
+        """Parse the complete lines of a chunk, keeping a trailing partial line."""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        self._parse_lines(lines)
+
+    def close(self) -> None:
+        """Parse the last line and check for the extraction date and a usable header."""
+        if self._partial:
+            self._parse_lines([self._partial])
+            self._partial = ""
+        if self.error is not None:
+            return
+        if self._columns is None:
+            self.error = "insufficient data"
+        elif self.extracted_on is None:
+            self.error = "missing extraction date"
+
+    def _parse_lines(self, lines: list[str]) -> None:
+        """Parse complete lines, reading the extraction date and header first."""
+        rows: list[str] = []
+        for line in lines:
+            line = line.rstrip("\r")
+            self._line_count += 1
+            if self._line_count == 1:
+                self.extracted_on = _parse_extraction_date(line)
+            elif self._line_count == 2:
+                self._read_header(line)
+            elif self._columns is not None and line:
+                rows.append(line)
+        if self._columns is not None:
+            for values in csv.reader(rows, delimiter=self.separator):
+                self._add_row(values, self._columns)
+
+    def _read_header(self, header_line: str) -> None:
+        """Detect the separator and find the columns of the header line."""
+        self.separator = detect_csv_separator(header_line)
+        headers = [header.strip().strip('"') for header in header_line.split(self.separator)]
+        columns = {
+            internal: headers.index(column) if column in headers else -1
+            for column, internal in PRICE_CSV_COLUMNS.items()
+        }
+        missing = [column for column in REQUIRED_PRICE_CSV_COLUMNS if columns[column] < 0]
+        if missing:
+            self.error = f"missing required columns: {', '.join(missing)}"
+            return
+        self._columns = columns
+
+    def _add_row(self, values: list[str], columns: dict[str, int]) -> None:
+        """Add the fuel price of a member row, counting rows that cannot be used."""
+        self.rows += 1
+        try:
+            station_id = values[columns["id"]].strip()
+            if station_id not in self._station_ids:
+                return
+            name = values[columns["name"]].strip()
+            price = float(values[columns["price"]].strip().replace(",", "."))
+            is_self = values[columns["is_self"]].strip() == "1"
+        except (IndexError, ValueError):
+            self.skipped += 1
+            return
+        if not name:
+            self.skipped += 1
+            return
+        index = columns["insert_date"]
+        insert_date = (
+            _parse_communication_time(values[index]) if 0 <= index < len(values) else None
+        )
+        self.prices.setdefault(station_id, []).append((name, price, is_self, insert_date))
+
+
+class PriceCSVManager:
+    """Manager for the daily price file of every station.
+
+    The file is downloaded with conditional requests at most once per
+    ``PRICE_CSV_CHECK_INTERVAL`` and cached atomically in ``.storage``, keeping
+    only the prices of member stations. Members are scheduled by the shared
+    cron scheduler, which hands due members to ``async_queue``: a station is
+    refreshed from the file when the file was extracted after the station's
+    data was last refreshed. Otherwise the file has nothing newer, for
+    example for intra-day refreshes, and the station API is used.
+    """
+
+    def __init__(self, hass: HomeAssistant, scheduler: CronScheduler) -> None:
+        """Initialize the price manager without members or prices."""
+        self.hass = hass
+        self.http_client = get_http_client(hass)
+        self._scheduler = scheduler
+        self._members: dict[str, CarburantiDataUpdateCoordinator] = {}
+        self._prices: dict[str, tuple[PriceRow, ...]] = {}
+        self._station_ids: frozenset[str] = frozenset()
+        self._extracted_at: datetime | None = None
+        self._last_update: datetime | None = None
+        self._last_check: datetime | None = None
+        self._csv_etag: str | None = None
+        self._csv_last_modified: str | None = None
+        self._detected_separator = "|"
+        self._cache_path = hass.config.path(".storage", f"{DOMAIN}_prices.json")
+        self._operation_lock = asyncio.Lock()
+        self._cache_loaded = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._last_refresh: dict[str, Any] | None = None
+
+    def async_add(
+        self,
+        coordinator: CarburantiDataUpdateCoordinator,
+        cron_expression: str,
+        jitter_window: timedelta = timedelta(0),
+        runs: Iterator[datetime] | None = None,
+    ) -> Callable[[], None]:
+        """Add a station to the file refreshes and return a callback removing it.
+
+        Raises the cron helper's errors when the expression cannot be scheduled.
+        """
+        entry_id = coordinator.config_entry.entry_id
+        self._scheduler.async_add(
+            coordinator, cron_expression, self.async_queue, jitter_window, runs
+        )
+        self._members[entry_id] = coordinator
+        return partial(self.async_remove, entry_id)
+
+    def async_remove(self, entry_id: str) -> None:
+        """Remove a station from the file refreshes and from the schedule."""
+        if self._members.pop(entry_id, None) is not None:
+            self._scheduler.async_remove(entry_id)
+
+    def _member_station_ids(self) -> frozenset[str]:
+        """Return the station IDs of the members."""
+        return frozenset(
+            str(coordinator.config_entry.data[CONF_STATION_ID])
+            for coordinator in self._members.values()
+        )
+
+    async def async_update_prices(self, force_update: bool = False) -> bool:
+        """Load the cached prices once, then download the file if it may have changed."""
+        async with self._operation_lock:
+            if not self._cache_loaded:
+                self._cache_loaded = True
+                await self._async_load_cached_data()
+            return await self._async_update_prices(force_update)
+
+    async def _async_update_prices(self, force_update: bool) -> bool:
+        """Download and parse the price file while the operation lock is held.
+
+        The file is downloaded again, unconditionally, when a member joined
+        after the last download, whose prices were filtered out of it.
+        """
+        now = dt_util.now()
+        station_ids = self._member_station_ids()
+        force_update = force_update or not station_ids <= self._station_ids
+        if (
+            not force_update
+            and self._last_check
+            and now - self._last_check < timedelta(hours=PRICE_CSV_CHECK_INTERVAL)
+        ):
+            _LOGGER.debug("Daily price file was checked recently, skipping download")
+            return True
+
+        parser = _PriceCSVParser(station_ids)
+        try:
+            _LOGGER.info("Downloading daily prices from CSV: %s", PRICE_CSV_URL)
+            async with self.http_client.session.get(
+                PRICE_CSV_URL,
+                headers=self._build_csv_request_headers(force_update),
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as response:
+                if response.status == 304:
+                    self._last_check = now
+                    _LOGGER.debug("Daily price file not modified, keeping cached prices")
+                    return True
+                if response.status != 200:
+                    _LOGGER.error("Failed to download daily price file: HTTP %s", response.status)
+                    return False
+
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                async for chunk in response.content.iter_chunked(PRICE_CSV_CHUNK_SIZE):
+                    await self.hass.async_add_executor_job(parser.feed, decoder.decode(chunk))
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+                csv_etag = response.headers.get("ETag")
+                csv_last_modified = response.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+            _LOGGER.error("Error downloading daily price file: %s", err)
+            return False
+
+        if parser.error is not None or parser.extracted_on is None or not parser.rows:
+            _LOGGER.error("Failed to parse daily price file: %s", parser.error or "no prices")
+            return False
+        if parser.skipped:
+            _LOGGER.warning("Skipped %d unusable daily price rows", parser.skipped)
+
+        extracted_at = datetime.combine(
+            parser.extracted_on, time(PRICE_CSV_EXTRACTION_HOUR), tzinfo=_SOURCE_TIME_ZONE
+        )
+        prices = {station_id: tuple(rows) for station_id, rows in parser.prices.items()}
+        data = self._build_cache_data(
+            prices=prices,
+            station_ids=station_ids,
+            extracted_at=extracted_at,
+            last_update=now,
+            separator=parser.separator,
+            csv_etag=csv_etag,
+            csv_last_modified=csv_last_modified,
+        )
+        try:
+            await self.hass.async_add_executor_job(
+                _write_json_file_atomic_sync, self._cache_path, data, None
+            )
+        except (OSError, TypeError, ValueError) as err:
+            _LOGGER.error("Error saving daily price cache: %s", err)
+            return False
+
+        self._prices = prices
+        self._station_ids = station_ids
+        self._extracted_at = extracted_at
+        self._last_update = now
+        self._last_check = now
+        self._detected_separator = parser.separator
+        self._csv_etag = csv_etag
+        self._csv_last_modified = csv_last_modified
+        _LOGGER.info(
+            "Loaded daily prices of %d stations extracted at %s",
+            len(prices),
+            extracted_at.isoformat(),
+        )
+        return True
+
+    def _build_csv_request_headers(self, force_update: bool) -> dict[str, str]:
+        """Build request headers for the price file download."""
+        headers = {
+            **DEFAULT_HEADERS,
+            "Accept": "text/csv,application/csv,text/plain,*/*",
+        }
+        if not force_update:
+            if self._csv_etag:
+                headers["If-None-Match"] = self._csv_etag
+            if self._csv_last_modified:
+                headers["If-Modified-Since"] = self._csv_last_modified
+        return headers
+
+    @staticmethod
+    def _build_cache_data(
+        *,
+        prices: dict[str, tuple[PriceRow, ...]],
+        station_ids: frozenset[str],
+        extracted_at: datetime,
+        last_update: datetime,
+        separator: str,
+        csv_etag: str | None,
+        csv_last_modified: str | None,
+    ) -> dict[str, Any]:
+        """Build a complete price cache document."""
+        return {
+            "version": PRICE_CACHE_VERSION,
+            "extracted_at": extracted_at.isoformat(),
+            "last_update": last_update.isoformat(),
+            "csv_separator": separator,
+            "csv_etag": csv_etag,
+            "csv_last_modified": csv_last_modified,
+            "station_ids": sorted(station_ids),
+            "stations": prices,
+        }
+
+    async def _async_load_cached_data(self) -> bool:
+        """Load the cached prices while the operation lock is held."""
+        try:
+            data = await self.hass.async_add_executor_job(
+                _load_json_file_sync, self._cache_path
+            )
+            if data.get("version") != PRICE_CACHE_VERSION:
+                _LOGGER.info("Daily price cache is outdated, waiting for a download")
+                return False
+            stations = data["stations"]
+            if not isinstance(stations, dict):
+                raise ValueError("Cache stations must be an object")
+            prices = {
+                str(station_id): tuple(
+                    (str(name), float(price), bool(is_self), insert_date)
+                    for name, price, is_self, insert_date in rows
+                )
+                for station_id, rows in stations.items()
+            }
+            station_ids = frozenset(str(station_id) for station_id in data["station_ids"])
+            extracted_at = datetime.fromisoformat(data["extracted_at"])
+            last_update = datetime.fromisoformat(data["last_update"])
+            separator = data.get("csv_separator", "|")
+            csv_etag = data.get("csv_etag")
+            csv_last_modified = data.get("csv_last_modified")
+        except FileNotFoundError:
+            _LOGGER.debug("No cached daily prices found")
+            return False
+        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as err:
+            _LOGGER.error("Error loading cached daily prices: %s", err)
+            return False
+
+        self._prices = prices
+        self._station_ids = station_ids
+        self._extracted_at = extracted_at
+        self._last_update = last_update
+        self._detected_separator = separator
+        self._csv_etag = csv_etag
+        self._csv_last_modified = csv_last_modified
+        _LOGGER.info("Loaded cached daily prices of %d stations", len(prices))
+        return True
+
+    def get_station_prices(self, station_id: str) -> dict[str, Any] | None:
+        """Return the prices of a station in the shape of a zone-search result."""
+        rows = self._prices.get(station_id)
+        if not rows:
+            return None
+        return {
+            "fuels": [
+                {"name": name, "price": price, "isSelf": is_self, "insertDate": insert_date}
+                for name, price, is_self, insert_date in rows
+            ]
+        }
+
+    def has_prices_newer_than(self, last_update: str | None) -> bool:
+        """Return True when the file was extracted after a station's last refresh."""
+        if self._extracted_at is None:
+            return False
+        if not last_update:
+            return True
+        try:
+            refreshed = datetime.fromisoformat(last_update)
+        except ValueError:
+            return True
+        if refreshed.tzinfo is None:
+            refreshed = refreshed.replace(tzinfo=self._extracted_at.tzinfo)
+        return self._extracted_at > refreshed
+
+    def async_queue(self, coordinators: list[CarburantiDataUpdateCoordinator]) -> None:
+        """Refresh due coordinators from the price file in one background task."""
+        task = self.hass.async_create_background_task(
+            self.async_refresh(coordinators),
+            f"{DOMAIN} daily price refresh",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def async_refresh(self, coordinators: list[CarburantiDataUpdateCoordinator]) -> None:
+        """Apply file prices where they are newer and refresh the rest from the API."""
+        started_at = monotonic()
+        started = dt_util.utcnow()
+        await self.async_update_prices()
+
+        fallback: list[CarburantiDataUpdateCoordinator] = []
+        for coordinator in coordinators:
+            station_id = str(coordinator.config_entry.data[CONF_STATION_ID])
+            prices = self.get_station_prices(station_id)
+            if (
+                prices is None
+                or not coordinator.data
+                or not self.has_prices_newer_than(coordinator.data.last_update)
+                or not coordinator.async_apply_zone_prices(prices)
+            ):
+                fallback.append(coordinator)
+
+        # A scheduled run fetches even within the debouncer's cooldown. The
+        # coordinator records a failed fetch rather than raising it.
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in fallback))
+        failed = 0
+        for coordinator in fallback:
+            if not coordinator.last_update_success:
+                failed += 1
+                _LOGGER.error(
+                    "Refresh of %s from the station API failed: %s",
+                    coordinator.config_entry.title,
+                    coordinator.last_exception,
+                )
+
+        self._last_refresh = {
+            "started_at": started.isoformat(),
+            "duration_seconds": round(monotonic() - started_at, 3),
+            "stations": len(coordinators),
+            "from_file": len(coordinators) - len(fallback),
+            "from_api": len(fallback),
+            "failed": failed,
+        }
+        _LOGGER.info(
+            "Refreshed %d station(s) from the daily price file and %d from the station API",
+            len(coordinators) - len(fallback),
+            len(fallback),
+        )
+
+    def status(self) -> dict[str, Any]:
+        """Return a privacy-safe summary of the price file for diagnostics."""
+        return {
+            "members": len(self._members),
+            "station_count": len(self._prices),
+            "extracted_at": self._extracted_at.isoformat() if self._extracted_at else None,
+            "last_update": self._last_update.isoformat() if self._last_update else None,
+            "last_check": self._last_check.isoformat() if self._last_check else None,
+            "separator": self._detected_separator,
+            "has_etag": self._csv_etag is not None,
+            "has_last_modified": self._csv_last_modified is not None,
+            "running_refreshes": len(self._tasks),
+            "last_refresh": self._last_refresh,
+        }
+
+    def async_shutdown(self) -> None:
+        """Unschedule every member and cancel running price refreshes."""
+        for entry_id in list(self._members):
+            self.async_remove(entry_id)
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+
+
+def get_price_csv_manager(hass: HomeAssistant) -> PriceCSVManager:
+    """Return the integration-wide daily price manager."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    manager = domain_data.get(PRICE_CSV_MANAGER_DATA_KEY)
+    if not isinstance(manager, PriceCSVManager):
+        manager = PriceCSVManager(hass, get_cron_scheduler(hass))
+        domain_data[PRICE_CSV_MANAGER_DATA_KEY] = manager
+    return manager
+
+
+def async_remove_price_csv_manager(hass: HomeAssistant) -> None:
+    """Shut down and forget the daily price manager, if any."""
+    manager = hass.data.get(DOMAIN, {}).pop(PRICE_CSV_MANAGER_DATA_KEY, None)
+    if isinstance(manager, PriceCSVManager):
+        manager.async_shutdown()
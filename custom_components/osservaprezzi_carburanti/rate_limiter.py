@@ -0,0 +1,308 @@
+"""Adaptive request pacing for the Osservaprezzi station API."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from itertools import count
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Request classes served in order, lowest value first."""
+
+    INTERACTIVE = 0
+    SERVICE = 1
+    SCHEDULED = 2
+
+
+@dataclass
+class _Waiter:
+    """A queued request waiting for its turn at the token bucket."""
+
+    future: asyncio.Future[None]
+    priority: RequestPriority
+    enqueued_at: float
+    sequence: int
+
+
+def parse_retry_after(value: str | None, maximum: float) -> float | None:
+    """Return a Retry-After delay in seconds, capped at ``maximum``."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    if delay != delay:  # NaN
+        return None
+    return min(max(delay, 0.0), maximum)
+
+
+class TokenBucketRateLimiter:
+    """Token bucket that slows down on throttling and recovers gradually.
+
+    Requests take one token each. Tokens refill at ``rate`` per second up to
+    ``burst``. A throttled response multiplies the rate by ``backoff_factor``
+    (never below ``min_rate``) and empties the bucket. With a Retry-After delay,
+    nothing is sent until it expires and then a single request may go. Every
+    later successful response adds ``recovery_fraction`` of the configured rate
+    back.
+
+    Requests queue in one FIFO lane per RequestPriority and the highest lane
+    goes first. A request that has waited ``starvation_seconds`` is served
+    before any newer request, whatever its lane. A request queued with a key
+    can be moved to a higher lane while it waits.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        min_rate: float,
+        backoff_factor: float = 0.5,
+        recovery_fraction: float = 0.1,
+        starvation_seconds: float = 30.0,
+    ) -> None:
+        """Initialize a full bucket at the configured rate."""
+        if rate <= 0 or burst < 1 or not 0 < min_rate <= rate:
+            raise ValueError("Rate limiter needs a positive rate, burst and min_rate")
+        if not 0 < backoff_factor < 1 or recovery_fraction <= 0:
+            raise ValueError("Rate limiter backoff and recovery must be positive fractions")
+        if starvation_seconds <= 0:
+            raise ValueError("Rate limiter starvation limit must be positive")
+        self._configured_rate = float(rate)
+        self._burst = float(burst)
+        self._min_rate = float(min_rate)
+        self._backoff_factor = backoff_factor
+        self._recovery_fraction = recovery_fraction
+        self._recovery_step = self._configured_rate * recovery_fraction
+        self._rate = self._configured_rate
+        self._tokens = self._burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._starvation_seconds = starvation_seconds
+        self._busy = False
+        self._sequence = count()
+        self._lanes: dict[RequestPriority, deque[_Waiter]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._keyed_waiters: dict[Hashable, _Waiter] = {}
+        self._lane_stats = {
+            priority: {"granted": 0, "last_wait": 0.0, "max_wait": 0.0, "total_wait": 0.0}
+            for priority in RequestPriority
+        }
+        self._throttle_events = 0
+        self._last_throttle_at: float | None = None
+        self._last_wait_seconds = 0.0
+        self._total_wait_seconds = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Return the current refill rate in requests per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """Return the configured burst size."""
+        return int(self._burst)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        if now <= self._updated_at:
+            return
+        elapsed = now - self._updated_at
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+        self._updated_at = now
+
+    def _delay(self, now: float) -> float:
+        """Return how long the next request must wait, refilling first."""
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    async def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.SCHEDULED,
+        key: Hashable | None = None,
+    ) -> float:
+        """Wait for a token in priority order and return the seconds waited.
+
+        While it waits, a request queued with ``key`` can be moved to a higher
+        lane with raise_priority; its wait then counts in that lane.
+        """
+        started_at = time.monotonic()
+        if self._busy or any(self._lanes.values()):
+            waiter = _Waiter(
+                asyncio.get_running_loop().create_future(),
+                priority,
+                started_at,
+                next(self._sequence),
+            )
+            self._lanes[priority].append(waiter)
+            if key is not None:
+                self._keyed_waiters[key] = waiter
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if not waiter.future.cancelled():
+                    self._release()
+                elif waiter in self._lanes[waiter.priority]:
+                    self._lanes[waiter.priority].remove(waiter)
+                raise
+            finally:
+                if key is not None and self._keyed_waiters.get(key) is waiter:
+                    del self._keyed_waiters[key]
+            priority = waiter.priority
+        else:
+            self._busy = True
+        try:
+            while (delay := self._delay(time.monotonic())) > 0:
+                await asyncio.sleep(delay)
+            self._tokens -= 1
+        finally:
+            self._release()
+        waited = time.monotonic() - started_at
+        self._last_wait_seconds = waited
+        self._total_wait_seconds += waited
+        stats = self._lane_stats[priority]
+        stats["granted"] += 1
+        stats["last_wait"] = waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+        stats["total_wait"] += waited
+        return waited
+
+    def raise_priority(self, key: Hashable, priority: RequestPriority) -> bool:
+        """Move the request queued with ``key`` to a higher lane.
+
+        The request keeps its place in time among the requests of its new
+        lane. Returns False when no request with ``key`` is queued or its lane
+        is already as high.
+        """
+        waiter = self._keyed_waiters.get(key)
+        if waiter is None or waiter.future.done() or waiter.priority <= priority:
+            return False
+        self._lanes[waiter.priority].remove(waiter)
+        waiter.priority = priority
+        lane = self._lanes[priority]
+        index = next(
+            (
+                position
+                for position, queued in enumerate(lane)
+                if queued.sequence > waiter.sequence
+            ),
+            len(lane),
+        )
+        lane.insert(index, waiter)
+        return True
+
+    def _release(self) -> None:
+        """Hand the token bucket to the next waiter, if any."""
+        while heads := [lane[0] for lane in self._lanes.values() if lane]:
+            now = time.monotonic()
+            starving = [
+                waiter for waiter in heads if now - waiter.enqueued_at >= self._starvation_seconds
+            ]
+            if starving:
+                waiter = min(starving, key=lambda waiter: waiter.sequence)
+            else:
+                waiter = min(heads, key=lambda waiter: waiter.priority)
+            self._lanes[waiter.priority].popleft()
+            # A cancelled waiter may still be queued until its task runs.
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self._busy = False
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Apply a new configured rate and burst, keeping queued requests.
+
+        A rate still backed off after throttling stays at or below the new rate.
+        """
+        if burst < 1 or not self._min_rate <= rate:
+            raise ValueError("Rate limiter needs a burst of one and a rate above min_rate")
+        self._refill(time.monotonic())
+        if self._rate >= self._configured_rate:
+            self._rate = float(rate)
+        else:
+            self._rate = min(self._rate, float(rate))
+        self._configured_rate = float(rate)
+        self._recovery_step = self._configured_rate * self._recovery_fraction
+        self._burst = float(burst)
+        self._tokens = min(self._tokens, self._burst)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Back off multiplicatively after a throttled response."""
+        now = time.monotonic()
+        self._refill(now)
+        self._rate = max(self._min_rate, self._rate * self._backoff_factor)
+        self._tokens = 0.0
+        if retry_after is not None:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._updated_at = self._blocked_until
+            self._tokens = 1.0
+        self._throttle_events += 1
+        self._last_throttle_at = now
+        _LOGGER.warning(
+            "Station API throttled requests; slowing to %.2f requests/s%s",
+            self._rate,
+            f" for at least {retry_after:.0f}s" if retry_after else "",
+        )
+
+    def record_success(self) -> None:
+        """Recover the rate additively after an unthrottled response."""
+        if self._rate < self._configured_rate:
+            self._refill(time.monotonic())
+            self._rate = min(self._configured_rate, self._rate + self._recovery_step)
+
+    def status(self) -> dict[str, Any]:
+        """Return limiter state for diagnostics."""
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "rate_per_second": round(self._rate, 3),
+            "configured_rate_per_second": self._configured_rate,
+            "burst": int(self._burst),
+            "available_tokens": round(self._tokens, 3),
+            "wait_seconds": round(self._delay(now), 3),
+            "last_wait_seconds": round(self._last_wait_seconds, 3),
+            "total_wait_seconds": round(self._total_wait_seconds, 3),
+            "throttle_events": self._throttle_events,
+            "seconds_since_throttle": (
+                round(now - self._last_throttle_at, 1)
+                if self._last_throttle_at is not None
+                else None
+            ),
+            "lanes": {
+                priority.name.lower(): {
+                    "queued": len(self._lanes[priority]),
+                    "granted": stats["granted"],
+                    "last_wait_seconds": round(stats["last_wait"], 3),
+                    "max_wait_seconds": round(stats["max_wait"], 3),
+                    "average_wait_seconds": (
+                        round(stats["total_wait"] / stats["granted"], 3)
+                        if stats["granted"]
+                        else 0.0
+                    ),
+                }
+                for priority, stats in self._lane_stats.items()
+            },
+        }
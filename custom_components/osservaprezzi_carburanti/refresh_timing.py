@@ -0,0 +1,133 @@
+"""Learned refresh times from the price publication history of a station."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_HISTORY_DAYS,
+    ADAPTIVE_HISTORY_SIZE,
+    ADAPTIVE_MIN_WINDOW_OBSERVATIONS,
+    ADAPTIVE_REFRESH_DELAY_MINUTES,
+    ADAPTIVE_WINDOW_MINUTES,
+)
+from .models import FuelQuote
+
+_MINUTES_PER_DAY = 24 * 60
+
+RefreshPlan = tuple[time, ...]
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    """Parse a stored or payload timestamp, reading naive values as UTC."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class RefreshTiming:
+    """When a station published new prices, and when to refresh after it.
+
+    Publication times come from the ``insertDate`` of each fuel, falling back
+    to ``price_changed_at`` for fuels without one. Identical timestamps count
+    once, so fuels updated together are one observation. Observations older
+    than ``ADAPTIVE_HISTORY_DAYS`` are forgotten, so windows where a station
+    stopped publishing are no longer polled.
+    """
+
+    observed: list[datetime] = field(default_factory=list)
+
+    def observe(self, fuels: Iterable[FuelQuote], now: datetime) -> bool:
+        """Record fuel publication times and return whether the history changed."""
+        known = set(self.observed)
+        oldest = now - timedelta(days=ADAPTIVE_HISTORY_DAYS)
+        for fuel in fuels:
+            published = _parse_timestamp(fuel.last_update or fuel.price_changed_at)
+            if published is not None and oldest <= published <= now:
+                known.add(published)
+        observed = sorted(value for value in known if value >= oldest)[-ADAPTIVE_HISTORY_SIZE:]
+        if observed == self.observed:
+            return False
+        self.observed = observed
+        return True
+
+    def plan(self, budget: int) -> RefreshPlan:
+        """Return up to ``budget`` daily refresh times, empty without a learned window.
+
+        The day is split into ``ADAPTIVE_WINDOW_MINUTES`` windows of local
+        time. Windows with at least ``ADAPTIVE_MIN_WINDOW_OBSERVATIONS``
+        publications are ranked by how often the station published in them,
+        and each chosen window is refreshed ``ADAPTIVE_REFRESH_DELAY_MINUTES``
+        after its latest publication time.
+        """
+        windows: dict[int, list[int]] = {}
+        for published in self.observed:
+            local = dt_util.as_local(published)
+            minute = local.hour * 60 + local.minute
+            windows.setdefault(minute // ADAPTIVE_WINDOW_MINUTES, []).append(minute)
+        ranked = sorted(
+            (
+                (-len(minutes), window, max(minutes))
+                for window, minutes in windows.items()
+                if len(minutes) >= ADAPTIVE_MIN_WINDOW_OBSERVATIONS
+            )
+        )
+        refresh_minutes = {
+            (latest + ADAPTIVE_REFRESH_DELAY_MINUTES) % _MINUTES_PER_DAY
+            for _, _, latest in ranked[: max(budget, 0)]
+        }
+        return tuple(time(minute // 60, minute % 60) for minute in sorted(refresh_minutes))
+
+    def status(self) -> dict[str, Any]:
+        """Return the learned history for diagnostics."""
+        return {
+            "observations": len(self.observed),
+            "last_observed": self.observed[-1].isoformat() if self.observed else None,
+        }
+
+    def as_list(self) -> list[str]:
+        """Return the observations in their persisted form."""
+        return [value.isoformat() for value in self.observed]
+
+    @classmethod
+    def from_list(cls, values: Any) -> RefreshTiming:
+        """Build the history from its persisted form, skipping malformed values."""
+        if not isinstance(values, list):
+            return cls()
+        parsed = (_parse_timestamp(value) for value in values)
+        return cls(sorted({value for value in parsed if value is not None}))
+
+
+def describe_plan(times: RefreshPlan) -> str:
+    """Return the scheduler label of a refresh plan, such as ``adaptive 07:45,13:15``."""
+    return "adaptive " + ",".join(value.strftime("%H:%M") for value in times)
+
+
+def iter_planned_run_times(
+    times: RefreshPlan,
+    base_time: datetime | None = None,
+) -> Iterator[datetime]:
+    """Return an iterator over the daily refresh times of a plan after base_time."""
+    if not times:
+        raise ValueError("A refresh plan needs at least one time")
+    base = dt_util.now() if base_time is None else base_time
+
+    def runs() -> Iterator[datetime]:
+        day = base.date()
+        while True:
+            for value in times:
+                run = datetime.combine(day, value, tzinfo=base.tzinfo)
+                if run > base:
+                    yield run
+            day += timedelta(days=1)
+
+    return runs()
@@ -12,6 +12,7 @@ from homeassistant.helpers.typing import StateType
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_DATA_RESTORED,
     ATTR_FUEL_TYPE_NAME,
     ATTR_IS_SELF,
     ATTR_LAST_UPDATE,
@@ -33,22 +34,25 @@ from .const import (
 )
 from .coordinator import CarburantiDataUpdateCoordinator
 from .entity import (
+    STATION_NAME_KEYS,
     OsservaprezziBaseEntity,
     ScheduleAwareEntity,
     _find_schedule_for_day,
     _has_valid_opening_hours,
     _schedule_intervals_for_date,
 )
-
-INFO_SENSOR_DESCRIPTORS: tuple[tuple[str, str, str], ...] = (
-    ("name", "Nome", "mdi:gas-station"),
-    ("nomeImpianto", "Nome impianto", "mdi:gas-station"),
-    ("id", "ID Osservaprezzi", "mdi:identifier"),
-    ("brand", "Marchio", "mdi:tag"),
-    ("company", "Società", "mdi:office-building"),
-    ("phoneNumber", "Telefono", "mdi:phone"),
-    ("email", "Email", "mdi:email"),
-    ("website", "Sito web", "mdi:web"),
+from .models import FuelQuote
+
+# Info key (used in unique IDs), StationInfo attribute, name, and icon.
+INFO_SENSOR_DESCRIPTORS: tuple[tuple[str, str, str, str], ...] = (
+    ("name", "name", "Nome", "mdi:gas-station"),
+    ("nomeImpianto", "plant_name", "Nome impianto", "mdi:gas-station"),
+    ("id", "id", "ID Osservaprezzi", "mdi:identifier"),
+    ("brand", "brand", "Marchio", "mdi:tag"),
+    ("company", "company", "Società", "mdi:office-building"),
+    ("phoneNumber", "phone_number", "Telefono", "mdi:phone"),
+    ("email", "email", "Email", "mdi:email"),
+    ("website", "website", "Sito web", "mdi:web"),
 )
 
 
@@ -122,19 +126,18 @@ async def async_setup_entry(
 
     @callback
     def _async_discover_entities() -> None:
-        data = coordinator.data or {}
+        data = coordinator.data
         entities: list[SensorEntity] = []
-        fuels = data.get("fuels", {})
-        if isinstance(fuels, dict):
-            for fuel_key in fuels:
-                if not isinstance(fuel_key, str) or "_" not in fuel_key:
+        if data:
+            for fuel_key in data.fuels:
+                if "_" not in fuel_key:
                     continue
                 entities.append(OsservaprezziStationSensor(coordinator, entry, fuel_key))
-        station_info = data.get("station_info", {})
-        if isinstance(station_info, dict):
-            for info_key, name, icon in INFO_SENSOR_DESCRIPTORS:
-                if station_info.get(info_key):
-                    entities.append(StationInfoSensor(coordinator, entry, info_key, name, icon))
+            for info_key, attribute, name, icon in INFO_SENSOR_DESCRIPTORS:
+                if getattr(data.station_info, attribute):
+                    entities.append(
+                        StationInfoSensor(coordinator, entry, info_key, attribute, name, icon)
+                    )
         entities.append(StationLocationSensor(coordinator, entry))
         if _has_valid_opening_hours(data):
             entities.append(StationNextChangeSensor(coordinator, entry))
@@ -144,7 +147,11 @@ async def async_setup_entry(
         if not new_entities:
             return
         known_unique_ids.update(entity._attr_unique_id for entity in new_entities)
-        async_add_entities(new_entities, update_before_add=initial_discovery)
+        async_add_entities(
+            new_entities,
+            update_before_add=initial_discovery
+            and not getattr(coordinator, "data_is_restored", False),
+        )
 
     _async_discover_entities()
     initial_discovery = False
@@ -172,41 +179,59 @@ class OsservaprezziStationSensor(OsservaprezziBaseEntity, SensorEntity):
         self._attr_name = f"{fuel_name.replace('_', ' ').title()} {service_type.title()}"
         self._attr_unique_id = f"{self._station_id}_{fuel_key}"
         self._attr_icon = _get_fuel_icon(fuel_name)
+        self._update_keys = STATION_NAME_KEYS | {f"fuels.{fuel_key}"}
+        self._written_price_age: tuple[Any, Any] | None = None
+
+    def _should_write_state(self) -> bool:
+        """Also write state when the price age or staleness changed."""
+        attributes = self.extra_state_attributes
+        price_age = (
+            attributes.get(ATTR_PRICE_AGE_MINUTES),
+            attributes.get(ATTR_PRICE_IS_STALE),
+        )
+        age_changed = price_age != self._written_price_age
+        self._written_price_age = price_age
+        return super()._should_write_state() or age_changed
 
     @property
-    def native_value(self) -> StateType:
-        """Return the sensor state."""
+    def _fuel(self) -> FuelQuote | None:
+        """Return the current quote of this sensor's fuel."""
         if not self.coordinator.data:
             return None
-        return self.coordinator.data.get("fuels", {}).get(self._fuel_key, {}).get("price")
+        return self.coordinator.data.fuels.get(self._fuel_key)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the sensor state."""
+        fuel = self._fuel
+        return fuel.price if fuel else None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return fuel-specific state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        fuel_info = self.coordinator.data.get("fuels", {}).get(self._fuel_key)
-        if not fuel_info:
+        fuel = self._fuel
+        if not fuel:
             return {}
 
+        station_info = self.station_info
         fuel_name, service_type = self._fuel_key.rsplit("_", 1)
         attributes = {
             ATTR_FUEL_TYPE_NAME: fuel_name.replace("_", " ").title(),
             ATTR_IS_SELF: service_type == "self",
-            ATTR_LAST_UPDATE: fuel_info.get("last_update"),
-            ATTR_VALIDITY_DATE: fuel_info.get("validity_date"),
-            ATTR_STATION_NAME: self.station_info.get("nomeImpianto") or self.station_info.get("name"),
-            ATTR_STATION_ADDRESS: self.station_info.get("address"),
-            ATTR_STATION_BRAND: self.station_info.get("brand"),
-            ATTR_PREVIOUS_PRICE: fuel_info.get("previous_price"),
-            ATTR_PRICE_CHANGED_AT: fuel_info.get("price_changed_at"),
+            ATTR_LAST_UPDATE: fuel.last_update,
+            ATTR_VALIDITY_DATE: fuel.validity_date,
+            ATTR_STATION_NAME: station_info.display_name,
+            ATTR_STATION_ADDRESS: station_info.address,
+            ATTR_STATION_BRAND: station_info.brand,
+            ATTR_PREVIOUS_PRICE: fuel.previous_price,
+            ATTR_PRICE_CHANGED_AT: fuel.price_changed_at,
+            ATTR_DATA_RESTORED: getattr(self.coordinator, "data_is_restored", False),
         }
         attributes.update(
             _price_metadata(
-                price=fuel_info.get("price"),
-                previous_price=fuel_info.get("previous_price"),
-                last_update=fuel_info.get("last_update"),
+                price=fuel.price,
+                previous_price=fuel.previous_price,
+                last_update=fuel.last_update,
                 stale_hours=int(
                     getattr(self._entry, "options", {}).get(
                         CONF_PRICE_STALE_HOURS,
@@ -229,20 +254,23 @@ class StationInfoSensor(OsservaprezziBaseEntity, SensorEntity):
         coordinator: CarburantiDataUpdateCoordinator,
         entry: ConfigEntry,
         info_key: str,
+        attribute: str,
         name: str,
         icon: str,
     ) -> None:
         """Initialize the info sensor."""
         super().__init__(coordinator, entry)
         self._info_key = info_key
+        self._attribute = attribute
         self._attr_name = name
         self._attr_unique_id = f"{self._station_id}_{info_key}"
         self._attr_icon = icon
+        self._update_keys = frozenset({f"station_info.{info_key}"})
 
     @property
     def native_value(self) -> StateType:
         """Return the station info value."""
-        return self.station_info.get(self._info_key)
+        return getattr(self.station_info, self._attribute)
 
 
 class StationLocationSensor(OsservaprezziBaseEntity, SensorEntity):
@@ -251,6 +279,18 @@ class StationLocationSensor(OsservaprezziBaseEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_has_entity_name = True
     _attr_icon = "mdi:map-marker"
+    _update_keys = STATION_NAME_KEYS | {
+        f"station_info.{key}"
+        for key in (
+            ATTR_LATITUDE,
+            ATTR_LONGITUDE,
+            "municipality",
+            "province",
+            "station_type",
+            "operator",
+            "coordinate_source",
+        )
+    }
 
     def __init__(self, coordinator: CarburantiDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize location sensor."""
@@ -261,31 +301,30 @@ class StationLocationSensor(OsservaprezziBaseEntity, SensorEntity):
     @property
     def native_value(self) -> StateType:
         """Return the station address for map cards and diagnostics."""
-        return self.station_info.get("address") or self.station_info.get("nomeImpianto") or self.station_info.get("name")
+        station_info = self.station_info
+        return station_info.address or station_info.display_name
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes including coordinates for map cards."""
+        station_info = self.station_info
         return {
-            ATTR_STATION_NAME: self.station_info.get("nomeImpianto") or self.station_info.get("name"),
-            ATTR_STATION_ADDRESS: self.station_info.get("address"),
-            ATTR_STATION_BRAND: self.station_info.get("brand"),
-            ATTR_LATITUDE: self.station_info.get(ATTR_LATITUDE),
-            ATTR_LONGITUDE: self.station_info.get(ATTR_LONGITUDE),
-            "municipality": self.station_info.get("municipality"),
-            "province": self.station_info.get("province"),
-            "station_type": self.station_info.get("station_type"),
-            "operator": self.station_info.get("operator"),
-            "coordinate_source": self.station_info.get("coordinate_source"),
+            ATTR_STATION_NAME: station_info.display_name,
+            ATTR_STATION_ADDRESS: station_info.address,
+            ATTR_STATION_BRAND: station_info.brand,
+            ATTR_LATITUDE: station_info.latitude,
+            ATTR_LONGITUDE: station_info.longitude,
+            "municipality": station_info.municipality,
+            "province": station_info.province,
+            "station_type": station_info.station_type,
+            "operator": station_info.operator,
+            "coordinate_source": station_info.coordinate_source,
         }
 
     @property
     def available(self) -> bool:
         """Return True if coordinates are available."""
-        return (
-            self.station_info.get(ATTR_LATITUDE) is not None
-            and self.station_info.get(ATTR_LONGITUDE) is not None
-        )
+        return self.station_info.latitude is not None and self.station_info.longitude is not None
 
 
 class StationNextChangeSensor(ScheduleAwareEntity, SensorEntity):
@@ -293,6 +332,7 @@ class StationNextChangeSensor(ScheduleAwareEntity, SensorEntity):
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:clock-time-eight"
+    _update_keys = frozenset({"opening_hours"})
 
     def __init__(self, coordinator: CarburantiDataUpdateCoordinator, entry: ConfigEntry) -> None:
         """Initialize the next-change sensor."""
@@ -302,7 +342,7 @@ class StationNextChangeSensor(ScheduleAwareEntity, SensorEntity):
 
     def _compute_next_change(self) -> tuple[str, datetime | None]:
         """Compute the next opening or closing time and type."""
-        opening_hours = self.coordinator.data.get("opening_hours", []) if self.coordinator.data else []
+        opening_hours = self.coordinator.data.opening_hours if self.coordinator.data else ()
         if not opening_hours:
             return "no_schedule", None
 
@@ -0,0 +1,213 @@
+"""Paced first refreshes for entries set up without waiting for the API."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.start import async_at_started
+
+from .const import DOMAIN, STARTUP_REFRESH_CONCURRENCY, STARTUP_REFRESH_INTERVAL_SECONDS
+from .coordinator import CarburantiDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STARTUP_QUEUE_DATA_KEY = "startup_queue"
+
+
+@dataclass
+class _StartupTiming:
+    """Setup and first-refresh timestamps of one config entry."""
+
+    mode: str | None = None
+    setup_seconds: float | None = None
+    queued_at: float | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    success: bool | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing in seconds for diagnostics."""
+        return {
+            "mode": self.mode,
+            "setup_seconds": _round(self.setup_seconds),
+            "queue_wait_seconds": _elapsed(self.queued_at, self.started_at),
+            "refresh_seconds": _elapsed(self.started_at, self.finished_at),
+            "success": self.success,
+        }
+
+
+def _round(value: float | None) -> float | None:
+    """Round a duration for diagnostics."""
+    return None if value is None else round(value, 3)
+
+
+def _elapsed(start: float | None, end: float | None) -> float | None:
+    """Return the seconds between two monotonic timestamps, if both are known."""
+    return None if start is None or end is None else round(end - start, 3)
+
+
+def _summary(values: list[float]) -> dict[str, Any]:
+    """Return the count, average, and maximum of durations."""
+    return {
+        "count": len(values),
+        "average": round(sum(values) / len(values), 3) if values else None,
+        "max": round(max(values), 3) if values else None,
+    }
+
+
+class StartupRefreshQueue:
+    """Run the first live refresh of deferred entries after Home Assistant starts.
+
+    Entries that start from restored or registry data register here instead
+    of refreshing during setup. Once Home Assistant has started, at most
+    ``concurrency`` refreshes run at a time and new ones start at least
+    ``interval`` seconds apart, so a restart does not send every station
+    request at once. Setup and refresh timings are kept for diagnostics.
+    """
+
+    def __init__(self, hass: HomeAssistant, concurrency: int, interval: float) -> None:
+        """Initialize an empty queue."""
+        self.hass = hass
+        self._concurrency = concurrency
+        self._interval = interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._next_start = 0.0
+        self._ready = asyncio.Event()
+        self._unsub_started: Callable[[], None] | None = None
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._timings: dict[str, _StartupTiming] = {}
+
+    def record_setup(self, entry_id: str, mode: str, started_at: float) -> None:
+        """Record how an entry was set up and how long setup took."""
+        timing = self._timings.setdefault(entry_id, _StartupTiming())
+        timing.mode = mode
+        timing.setup_seconds = time.monotonic() - started_at
+
+    def async_add(self, coordinator: CarburantiDataUpdateCoordinator) -> Callable[[], None]:
+        """Queue the first refresh of a coordinator and return a callback cancelling it."""
+        entry_id = coordinator.config_entry.entry_id
+        timing = self._timings.setdefault(entry_id, _StartupTiming())
+        timing.queued_at = time.monotonic()
+        if self._unsub_started is None and not self._ready.is_set():
+            self._unsub_started = async_at_started(self.hass, self._async_hass_started)
+        self._tasks[entry_id] = self.hass.async_create_background_task(
+            self._async_refresh(entry_id, coordinator, timing),
+            f"{DOMAIN} startup refresh",
+        )
+        return partial(self.async_remove, entry_id)
+
+    @callback
+    def _async_hass_started(self, hass: HomeAssistant) -> None:
+        """Release queued refreshes once Home Assistant has started."""
+        self._unsub_started = None
+        self._ready.set()
+
+    async def _async_refresh(
+        self,
+        entry_id: str,
+        coordinator: CarburantiDataUpdateCoordinator,
+        timing: _StartupTiming,
+    ) -> None:
+        """Wait for startup, a free slot, and the pacing interval, then refresh."""
+        await self._ready.wait()
+        async with self._semaphore:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            started_at = time.monotonic()
+            timing.started_at = started_at
+            await coordinator.async_refresh()
+            timing.finished_at = time.monotonic()
+            timing.success = coordinator.last_update_success
+        self._tasks.pop(entry_id, None)
+        _LOGGER.debug(
+            "Startup refresh of %s took %.1fs",
+            coordinator.config_entry.title,
+            timing.finished_at - started_at,
+        )
+
+    def async_remove(self, entry_id: str) -> None:
+        """Cancel the queued first refresh of an unloaded entry."""
+        self._timings.pop(entry_id, None)
+        task = self._tasks.pop(entry_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    def status(self, entry_id: str | None = None) -> dict[str, Any]:
+        """Return the startup timing report, including one entry's timing."""
+        timings = list(self._timings.values())
+        modes: dict[str, int] = {}
+        for timing in timings:
+            if timing.mode is not None:
+                modes[timing.mode] = modes.get(timing.mode, 0) + 1
+        entry_timing = self._timings.get(entry_id) if entry_id is not None else None
+        return {
+            "concurrency": self._concurrency,
+            "interval_seconds": self._interval,
+            "started": self._ready.is_set(),
+            "queued": sum(
+                timing.queued_at is not None and timing.started_at is None
+                for timing in timings
+            ),
+            "running": sum(
+                timing.started_at is not None and timing.finished_at is None
+                for timing in timings
+            ),
+            "completed": sum(timing.finished_at is not None for timing in timings),
+            "failed": sum(timing.success is False for timing in timings),
+            "modes": dict(sorted(modes.items())),
+            "setup_seconds": _summary(
+                [timing.setup_seconds for timing in timings if timing.setup_seconds is not None]
+            ),
+            "queue_wait_seconds": _summary(
+                [
+                    timing.started_at - timing.queued_at
+                    for timing in timings
+                    if timing.queued_at is not None and timing.started_at is not None
+                ]
+            ),
+            "refresh_seconds": _summary(
+                [
+                    timing.finished_at - timing.started_at
+                    for timing in timings
+                    if timing.started_at is not None and timing.finished_at is not None
+                ]
+            ),
+            "entry": entry_timing.as_dict() if entry_timing is not None else None,
+        }
+
+    def async_shutdown(self) -> None:
+        """Cancel every queued refresh and the startup listener."""
+        if self._unsub_started is not None:
+            self._unsub_started()
+            self._unsub_started = None
+        for entry_id in list(self._tasks):
+            self.async_remove(entry_id)
+        self._timings.clear()
+
+
+def get_startup_queue(hass: HomeAssistant) -> StartupRefreshQueue:
+    """Return the integration-wide startup queue."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    queue = domain_data.get(STARTUP_QUEUE_DATA_KEY)
+    if not isinstance(queue, StartupRefreshQueue):
+        queue = StartupRefreshQueue(
+            hass, STARTUP_REFRESH_CONCURRENCY, STARTUP_REFRESH_INTERVAL_SECONDS
+        )
+        domain_data[STARTUP_QUEUE_DATA_KEY] = queue
+    return queue
+
+
+def async_remove_startup_queue(hass: HomeAssistant) -> None:
+    """Shut down and forget the startup queue, if any."""
+    queue = hass.data.get(DOMAIN, {}).pop(STARTUP_QUEUE_DATA_KEY, None)
+    if isinstance(queue, StartupRefreshQueue):
+        queue.async_shutdown()
@@ -0,0 +1,118 @@
+"""Batch price refresh through the zone-search endpoint."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import partial
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .api import fetch_zone_prices
+from .const import CONF_STATION_ID, ZONE_SEARCH_MAX_RADIUS_KM
+from .coordinator import CarburantiDataUpdateCoordinator
+from .discovery import plan_zone_queries
+
+_LOGGER = logging.getLogger(__name__)
+
+CoordinatorItem = tuple[str, CarburantiDataUpdateCoordinator]
+
+
+@dataclass
+class ZoneRefreshResult:
+    """Outcome of a zone-search batch refresh."""
+
+    query_count: int = 0
+    failed_query_count: int = 0
+    refreshed: list[CoordinatorItem] = field(default_factory=list)
+    fallback: list[CoordinatorItem] = field(default_factory=list)
+
+
+def _registry_coordinates(
+    coordinator: CarburantiDataUpdateCoordinator,
+    station_id: str,
+) -> tuple[float, float] | None:
+    """Return the registry coordinates of a station, if usable."""
+    station = coordinator.csv_manager.get_station_by_id(station_id)
+    if not station:
+        return None
+    try:
+        latitude = float(station["latitude"])
+        longitude = float(station["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+async def async_refresh_from_zones(
+    hass: HomeAssistant,
+    coordinators: list[CoordinatorItem],
+) -> ZoneRefreshResult:
+    """Refresh prices with as few zone searches as possible.
+
+    Stations are clustered by registry coordinates and each cluster is covered
+    by zone searches. Zone results only carry prices, so stations without an
+    earlier full payload, without registry coordinates, or missing from every
+    zone response are returned as ``fallback`` for per-station refreshes.
+    """
+    result = ZoneRefreshResult()
+    located: list[CoordinatorItem] = []
+    coordinates: dict[str, tuple[float, float]] = {}
+    for item in coordinators:
+        _, coordinator = item
+        station_id = str(coordinator.config_entry.data.get(CONF_STATION_ID))
+        station_coordinates = (
+            _registry_coordinates(coordinator, station_id) if coordinator.data else None
+        )
+        if station_coordinates is None:
+            result.fallback.append(item)
+        else:
+            located.append(item)
+            coordinates[station_id] = station_coordinates
+
+    queries = await hass.async_add_executor_job(
+        partial(
+            plan_zone_queries,
+            coordinates,
+            max_radius_km=ZONE_SEARCH_MAX_RADIUS_KM,
+        )
+    )
+    zone_results: dict[str, dict[str, Any]] = {}
+    for query in queries:
+        result.query_count += 1
+        try:
+            zone_results.update(
+                await fetch_zone_prices(
+                    hass, query.latitude, query.longitude, query.radius_km
+                )
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            result.failed_query_count += 1
+            _LOGGER.warning(
+                "Zone search for %d station(s) failed; falling back to per-station "
+                "requests: %s",
+                len(query.station_ids),
+                err,
+            )
+
+    for item in located:
+        _, coordinator = item
+        station_id = str(coordinator.config_entry.data.get(CONF_STATION_ID))
+        zone_result = zone_results.get(station_id)
+        if zone_result is not None and coordinator.async_apply_zone_prices(zone_result):
+            result.refreshed.append(item)
+        else:
+            result.fallback.append(item)
+
+    _LOGGER.info(
+        "Zone refresh used %d search(es) for %d station(s); %d need per-station requests",
+        result.query_count,
+        len(result.refreshed),
+        len(result.fallback),
+    )
+    return result
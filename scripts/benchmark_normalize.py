@@ -0,0 +1,114 @@
+"""Micro-benchmark station payload normalization and processing.
+
+Times ``api.normalize_station_data``, the coordinator's payload fingerprint,
+and its processing of the normalized payload over the saved real payload
+``tests/fixtures/mimit_station_54233.json``: the work done for every changed
+station response. Run it where the Home
+Assistant test requirements are installed, for example:
+
+    python scripts/benchmark_normalize.py --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import sys
+import timeit
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from custom_components.osservaprezzi_carburanti import api  # noqa: E402
+from custom_components.osservaprezzi_carburanti.api import StationResponse  # noqa: E402
+from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID  # noqa: E402
+from custom_components.osservaprezzi_carburanti.coordinator import (  # noqa: E402
+    CarburantiDataUpdateCoordinator,
+)
+
+FIXTURE = Path(__file__).parents[1] / "tests" / "fixtures" / "mimit_station_54233.json"
+STATION_ID = "54233"
+# Registry row of the fixture station, as the CSV manager returns it.
+REGISTRY_ROW = {
+    "id": STATION_ID,
+    "operator": "UNION GESTIONI SOCIETA' A RESPONSABILITA' LIMITATA",
+    "brand": "Pompe Bianche",
+    "station_type": "Stradale",
+    "name": "UNION - BORGHESANO LUCCHESE",
+    "address": "BORGHESANO LUCCHESE 2 00146",
+    "municipality": "ROMA",
+    "province": "RM",
+    "latitude": 41.8947,
+    "longitude": 12.49348,
+}
+
+
+@dataclass
+class BenchmarkReport:
+    """Best per-call timings, in microseconds, of one benchmark run."""
+
+    iterations: int
+    normalize_us: float
+    fingerprint_us: float
+    process_us: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as JSON-serializable data."""
+        return {
+            "iterations": self.iterations,
+            "normalize_us": round(self.normalize_us, 2),
+            "fingerprint_us": round(self.fingerprint_us, 2),
+            "process_us": round(self.process_us, 2),
+            "total_us": round(self.normalize_us + self.fingerprint_us + self.process_us, 2),
+        }
+
+
+def _coordinator() -> CarburantiDataUpdateCoordinator:
+    """Return a coordinator able to process payloads without Home Assistant."""
+    coordinator = object.__new__(CarburantiDataUpdateCoordinator)
+    coordinator.config_entry = SimpleNamespace(data={CONF_STATION_ID: STATION_ID})
+    coordinator.csv_manager = SimpleNamespace(get_station_by_id=lambda station_id: REGISTRY_ROW)
+    coordinator.data = None
+    coordinator._body_fingerprint = None
+    return coordinator
+
+
+def run_benchmark(iterations: int, repeat: int = 5) -> BenchmarkReport:
+    """Time normalization, fingerprinting, and processing of the fixture payload."""
+    payload = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    coordinator = _coordinator()
+    normalized = api.normalize_station_data(payload, STATION_ID)
+    response = StationResponse(
+        data=normalized, revision="", unchanged=False, bytes_received=0, bytes_saved=0
+    )
+
+    def fingerprint() -> str:
+        # Forget the last body revision so that every call hashes the payload.
+        coordinator._body_fingerprint = None
+        return coordinator._fingerprint_payload(response)
+
+    def best(statement: Any) -> float:
+        seconds = min(timeit.repeat(statement, number=iterations, repeat=repeat))
+        return seconds / iterations * 1_000_000
+
+    return BenchmarkReport(
+        iterations=iterations,
+        normalize_us=best(lambda: api.normalize_station_data(payload, STATION_ID)),
+        fingerprint_us=best(fingerprint),
+        process_us=best(lambda: coordinator._process_station_data(normalized)),
+    )
+
+
+def main() -> None:
+    """Run the benchmark from the command line and print its report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.iterations, args.repeat).as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
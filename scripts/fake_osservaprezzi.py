@@ -0,0 +1,337 @@
+"""Local stand-in for the Osservaprezzi station API and registry export.
+
+The server replays the fixtures in ``tests/fixtures`` and any number of
+synthetic stations, and can inject latency, throttling, server errors and
+hung requests. Point the integration at it by overriding ``api.BASE_URL``
+and ``csv_manager.CSV_URL`` with ``api_url`` and ``csv_url``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from collections import Counter
+from dataclasses import dataclass
+import hashlib
+import io
+import json
+import math
+from pathlib import Path
+import random
+from typing import Any
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parents[1] / "tests" / "fixtures"
+STATION_FIXTURE = FIXTURES / "mimit_station_54233.json"
+REGISTRY_FIXTURE = FIXTURES / "mimit_anagrafica_sample.csv"
+API_PREFIX = "/ospzApi"
+CSV_PATH = "/images/exportCSV/anagrafica_impianti_attivi.csv"
+SYNTHETIC_FIRST_ID = 900000
+REGISTRY_COLUMNS = (
+    "idImpianto",
+    "Gestore",
+    "Bandiera",
+    "Tipo Impianto",
+    "Nome Impianto",
+    "Indirizzo",
+    "Comune",
+    "Provincia",
+    "Latitudine",
+    "Longitudine",
+)
+SYNTHETIC_FUELS = ((1, "Benzina", 1.80), (2, "Gasolio", 1.70), (3, "Metano", 1.40))
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failures injected into every API response.
+
+    Rates are probabilities between 0 and 1, drawn independently per request
+    in the order throttle, server error, hang. A hung request sleeps for
+    ``hang_seconds`` so that clients with a shorter timeout give up.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: int | None = 1
+    server_error_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+    price_change_rate: float = 0.0
+
+
+def synthetic_station(station_id: int, rng: random.Random) -> dict[str, Any]:
+    """Return a station payload shaped like the real API response."""
+    fuels = [
+        {
+            "id": station_id * 10 + index,
+            "price": round(base_price + rng.uniform(-0.1, 0.1), 3),
+            "name": name,
+            "fuelId": fuel_id,
+            "isSelf": is_self,
+            "serviceAreaId": station_id,
+            "insertDate": "2026-06-06T08:00:00Z",
+            "validityDate": "2026-06-06T08:00:00Z",
+        }
+        for index, (fuel_id, name, base_price) in enumerate(SYNTHETIC_FUELS[: rng.randint(1, 3)])
+        for is_self in (True, False)
+    ]
+    latitude = round(41.9 + rng.uniform(-0.5, 0.5), 5)
+    longitude = round(12.5 + rng.uniform(-0.5, 0.5), 5)
+    return {
+        "id": station_id,
+        "name": f"Synthetic station {station_id}",
+        "nomeImpianto": f"SYNTHETIC {station_id}",
+        "address": f"VIA DI PROVA {station_id % 1000} ROMA",
+        "brand": rng.choice(("Agip Eni", "Q8", "Tamoil", "Pompe Bianche")),
+        "fuels": fuels,
+        "phoneNumber": None,
+        "email": None,
+        "website": None,
+        "company": "SYNTHETIC S.R.L.",
+        "services": [],
+        "orariapertura": [],
+        "location": {"lat": latitude, "lng": longitude},
+    }
+
+
+def _distance_km(first: tuple[float, float], second: tuple[float, float]) -> float:
+    """Return the great-circle distance between two points in kilometres."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (*first, *second))
+    hav = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 6371.0 * 2 * math.asin(math.sqrt(hav))
+
+
+class FakeOsservaprezziServer:
+    """aiohttp server serving station, zone-search and registry endpoints."""
+
+    def __init__(
+        self,
+        *,
+        synthetic_stations: int = 0,
+        faults: FaultProfile | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Load the fixtures and generate synthetic stations."""
+        self.faults = faults or FaultProfile()
+        self._rng = random.Random(seed)
+        self.stations: dict[str, dict[str, Any]] = {}
+        self.registry: list[dict[str, str]] = []
+        self.responses: Counter[str] = Counter()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+        fixture = json.loads(STATION_FIXTURE.read_text(encoding="utf-8"))
+        self.stations[str(fixture["id"])] = fixture
+        lines = REGISTRY_FIXTURE.read_text(encoding="utf-8").splitlines()
+        self._extraction_line = lines[0]
+        for row in csv.DictReader(lines[1:], delimiter="|"):
+            self.registry.append(row)
+            if row["idImpianto"] in self.stations:
+                self.stations[row["idImpianto"]]["location"] = {
+                    "lat": float(row["Latitudine"]),
+                    "lng": float(row["Longitudine"]),
+                }
+        for station_id in self.synthetic_ids(synthetic_stations):
+            station = synthetic_station(station_id, self._rng)
+            self.stations[str(station_id)] = station
+            self.registry.append(
+                {
+                    "idImpianto": str(station_id),
+                    "Gestore": station["company"],
+                    "Bandiera": station["brand"],
+                    "Tipo Impianto": "Stradale",
+                    "Nome Impianto": station["nomeImpianto"],
+                    "Indirizzo": station["address"],
+                    "Comune": "ROMA",
+                    "Provincia": "RM",
+                    "Latitudine": str(station["location"]["lat"]),
+                    "Longitudine": str(station["location"]["lng"]),
+                }
+            )
+
+    @staticmethod
+    def synthetic_ids(count: int) -> range:
+        """Return the IDs of the first ``count`` synthetic stations."""
+        return range(SYNTHETIC_FIRST_ID, SYNTHETIC_FIRST_ID + count)
+
+    @property
+    def api_url(self) -> str:
+        """Return the URL replacing the integration's BASE_URL."""
+        return f"{self.base_url}{API_PREFIX}"
+
+    @property
+    def csv_url(self) -> str:
+        """Return the URL replacing the integration's CSV_URL."""
+        return f"{self.base_url}{CSV_PATH}"
+
+    def build_app(self) -> web.Application:
+        """Return the aiohttp application with every fake endpoint."""
+        app = web.Application()
+        app.router.add_get(f"{API_PREFIX}/registry/servicearea/{{station_id}}", self._station)
+        app.router.add_post(f"{API_PREFIX}/search/zone", self._zone)
+        app.router.add_get(CSV_PATH, self._registry_csv)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.build_app(), shutdown_timeout=0.1)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving, abandoning hung requests."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _inject_faults(self) -> web.Response | None:
+        """Sleep for the configured latency and return an injected failure, if any."""
+        faults = self.faults
+        delay = faults.latency + self._rng.uniform(0, faults.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < faults.throttle_rate:
+            headers = {} if faults.retry_after is None else {"Retry-After": str(faults.retry_after)}
+            return web.Response(status=429, headers=headers)
+        if self._rng.random() < faults.server_error_rate:
+            return web.Response(status=503)
+        if self._rng.random() < faults.hang_rate:
+            self.responses["hung"] += 1
+            await asyncio.sleep(faults.hang_seconds)
+        return None
+
+    def _respond(self, response: web.Response) -> web.Response:
+        """Count a response by status and return it."""
+        self.responses[str(response.status)] += 1
+        return response
+
+    def _maybe_change_prices(self, station: dict[str, Any]) -> None:
+        """Move every price of a station by a small random step, sometimes."""
+        if self._rng.random() >= self.faults.price_change_rate:
+            return
+        for fuel in station["fuels"]:
+            fuel["price"] = round(fuel["price"] + self._rng.choice((-0.01, 0.01)), 3)
+
+    async def _station(self, request: web.Request) -> web.Response:
+        """Serve one station, honouring If-None-Match."""
+        if (failure := await self._inject_faults()) is not None:
+            return self._respond(failure)
+        station = self.stations.get(request.match_info["station_id"])
+        if station is None:
+            return self._respond(web.Response(status=404))
+        self._maybe_change_prices(station)
+        body = json.dumps({key: value for key, value in station.items() if key != "location"})
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return self._respond(web.Response(status=304, headers={"ETag": etag}))
+        return self._respond(
+            web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+        )
+
+    async def _zone(self, request: web.Request) -> web.Response:
+        """Serve prices for every station within the requested radius."""
+        if (failure := await self._inject_faults()) is not None:
+            return self._respond(failure)
+        query = await request.json()
+        radius = float(query["radius"])
+        centres = [(float(point["lat"]), float(point["lng"])) for point in query["points"]]
+        results = []
+        for station in self.stations.values():
+            location = station.get("location")
+            if location is None:
+                continue
+            position = (location["lat"], location["lng"])
+            if any(_distance_km(centre, position) <= radius for centre in centres):
+                results.append(
+                    {
+                        "id": station["id"],
+                        "name": station["name"],
+                        "brand": station["brand"],
+                        "address": station["address"],
+                        "fuels": station["fuels"],
+                        "location": location,
+                    }
+                )
+        return self._respond(web.json_response({"success": True, "results": results}))
+
+    async def _registry_csv(self, request: web.Request) -> web.Response:
+        """Serve the registry export with the fixture and synthetic stations."""
+        output = io.StringIO()
+        output.write(f"{self._extraction_line}\n")
+        writer = csv.DictWriter(
+            output, fieldnames=REGISTRY_COLUMNS, delimiter="|", lineterminator="\n"
+        )
+        writer.writeheader()
+        writer.writerows(self.registry)
+        return self._respond(web.Response(text=output.getvalue(), content_type="text/csv"))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line parser shared with the load-test harness."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--synthetic-stations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds")
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--price-change-rate", type=float, default=0.0)
+    return parser
+
+
+def faults_from_args(args: argparse.Namespace) -> FaultProfile:
+    """Return the fault profile selected on the command line."""
+    return FaultProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        server_error_rate=args.server_error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        price_change_rate=args.price_change_rate,
+    )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    server = FakeOsservaprezziServer(
+        synthetic_stations=args.synthetic_stations,
+        faults=faults_from_args(args),
+        seed=args.seed,
+    )
+    await server.start(args.host, args.port)
+    print(f"Station API: {server.api_url}")
+    print(f"Registry CSV: {server.csv_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> int:
+    """Run the fake server from the command line."""
+    try:
+        asyncio.run(_serve(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""Drive many station refreshes against the fake Osservaprezzi server.
+
+Each simulated config entry refreshes its station through the integration's
+real request path: rate limiter, circuit breaker, single-flight sharing,
+revalidation and the integration HTTP session. All entries refresh at once
+in every round, as they do when a shared schedule fires. Run it where the
+Home Assistant test requirements are installed, for example:
+
+    python scripts/load_test.py --entries 300 --rounds 3 --latency 0.05
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from fake_osservaprezzi import (  # noqa: E402
+    FakeOsservaprezziServer,
+    build_parser,
+    faults_from_args,
+)
+
+from custom_components.osservaprezzi_carburanti import api  # noqa: E402
+from custom_components.osservaprezzi_carburanti.circuit_breaker import (  # noqa: E402
+    CircuitBreaker,
+)
+from custom_components.osservaprezzi_carburanti.const import (  # noqa: E402
+    API_CIRCUIT_COOLDOWN_SECONDS,
+    API_CIRCUIT_FAILURE_THRESHOLD,
+    API_METRICS_WINDOW,
+    API_PRIORITY_STARVATION_SECONDS,
+    API_RATE_LIMIT_BURST,
+    API_RATE_LIMIT_MIN_PER_SECOND,
+    API_RATE_LIMIT_PER_SECOND,
+)
+from custom_components.osservaprezzi_carburanti.http_client import (  # noqa: E402
+    get_http_client,
+)
+from custom_components.osservaprezzi_carburanti.metrics import RequestMetrics  # noqa: E402
+from custom_components.osservaprezzi_carburanti.rate_limiter import (  # noqa: E402
+    TokenBucketRateLimiter,
+)
+
+
+@dataclass
+class LoadTestReport:
+    """Throughput, latency and outcomes of one load-test run."""
+
+    entries: int
+    rounds: int
+    elapsed_seconds: float
+    latencies: list[float] = field(default_factory=list)
+    outcomes: Counter[str] = field(default_factory=Counter)
+    integration: dict[str, Any] = field(default_factory=dict)
+    server_responses: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def refreshes(self) -> int:
+        """Return the number of station refreshes attempted."""
+        return sum(self.outcomes.values())
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a nearest-rank refresh latency percentile in seconds."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as JSON-serializable data."""
+        return {
+            "entries": self.entries,
+            "rounds": self.rounds,
+            "refreshes": self.refreshes,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "refreshes_per_second": (
+                round(self.refreshes / self.elapsed_seconds, 2) if self.elapsed_seconds else None
+            ),
+            "latency_seconds": {
+                name: None if value is None else round(value, 4)
+                for name, value in (
+                    ("p50", self.percentile(0.5)),
+                    ("p95", self.percentile(0.95)),
+                    ("p99", self.percentile(0.99)),
+                    ("max", max(self.latencies, default=None)),
+                )
+            },
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "server_responses": dict(sorted(self.server_responses.items())),
+            "integration": self.integration,
+        }
+
+
+def reset_integration_state(rate: float, burst: int) -> None:
+    """Give the run a fresh rate limiter, circuit breaker, caches and metrics."""
+    api._RATE_LIMITER = TokenBucketRateLimiter(
+        rate,
+        burst,
+        min_rate=min(API_RATE_LIMIT_MIN_PER_SECOND, rate),
+        starvation_seconds=API_PRIORITY_STARVATION_SECONDS,
+    )
+    api._CIRCUIT_BREAKER = CircuitBreaker(
+        API_CIRCUIT_FAILURE_THRESHOLD, API_CIRCUIT_COOLDOWN_SECONDS
+    )
+    api._REQUEST_METRICS = RequestMetrics(API_METRICS_WINDOW)
+    api._IN_FLIGHT.clear()
+    api._RECENT_RESULTS.clear()
+    api._RESPONSE_CACHE.clear()
+    for key in api._RESPONSE_CACHE_STATS:
+        api._RESPONSE_CACHE_STATS[key] = 0
+
+
+def _outcome(err: BaseException) -> str:
+    """Return the report bucket of a failed refresh."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return str(err.status)
+    if isinstance(err, asyncio.TimeoutError):
+        return "timeout"
+    return type(err).__name__
+
+
+async def run_load_test(
+    api_url: str,
+    station_ids: list[str],
+    *,
+    rounds: int = 1,
+    request_timeout: float = 10.0,
+    rate: float = API_RATE_LIMIT_PER_SECOND,
+    burst: int = API_RATE_LIMIT_BURST,
+) -> LoadTestReport:
+    """Refresh every station once per round and report the results.
+
+    ``station_ids`` holds one entry per simulated config entry, so repeating
+    an ID models several entries for the same station.
+    """
+    hass = SimpleNamespace(data={}, bus=SimpleNamespace(async_listen_once=lambda *_: None))
+    reset_integration_state(rate, burst)
+    original_url = api.BASE_URL
+    api.BASE_URL = api_url
+    report = LoadTestReport(entries=len(station_ids), rounds=rounds, elapsed_seconds=0.0)
+
+    async def refresh(station_id: str) -> None:
+        started_at = time.monotonic()
+        try:
+            await api.async_fetch_station(hass, station_id, request_timeout, max_age=0)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            report.outcomes[_outcome(err)] += 1
+        else:
+            report.outcomes["ok"] += 1
+        report.latencies.append(time.monotonic() - started_at)
+
+    started_at = time.monotonic()
+    try:
+        for _ in range(rounds):
+            await asyncio.gather(*(refresh(station_id) for station_id in station_ids))
+        report.elapsed_seconds = time.monotonic() - started_at
+        report.integration = {
+            "http_client": get_http_client(hass).status(),  # type: ignore[arg-type]
+            "rate_limiter": api.rate_limiter_status(),
+            "circuit_breaker": api.circuit_breaker_status(),
+            "response_cache": api.response_cache_status(),
+            "request_metrics": api.request_metrics_status(),
+        }
+    finally:
+        api.BASE_URL = original_url
+        await get_http_client(hass).session.close()  # type: ignore[arg-type]
+    return report
+
+
+async def _run(args: Any) -> LoadTestReport:
+    """Start the fake server, unless one is given, and run the load test."""
+    server = None
+    api_url = args.api_url
+    if api_url is None:
+        server = FakeOsservaprezziServer(
+            synthetic_stations=args.entries,
+            faults=faults_from_args(args),
+            seed=args.seed,
+        )
+        await server.start(args.host, 0)
+        api_url = server.api_url
+    station_ids = [
+        str(station_id) for station_id in FakeOsservaprezziServer.synthetic_ids(args.entries)
+    ]
+    try:
+        report = await run_load_test(
+            api_url,
+            station_ids,
+            rounds=args.rounds,
+            request_timeout=args.request_timeout,
+            rate=args.rate,
+            burst=args.burst,
+        )
+    finally:
+        if server is not None:
+            await server.stop()
+    if server is not None:
+        report.server_responses = dict(server.responses)
+    return report
+
+
+def main() -> int:
+    """Run the load test from the command line and print a JSON report."""
+    parser = build_parser()
+    parser.description = __doc__
+    parser.add_argument("--api-url", help="use a fake server that is already running")
+    parser.add_argument("--entries", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--request-timeout", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=API_RATE_LIMIT_PER_SECOND)
+    parser.add_argument("--burst", type=int, default=API_RATE_LIMIT_BURST)
+    report = asyncio.run(_run(parser.parse_args()))
+    print(json.dumps(report.as_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
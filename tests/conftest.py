@@ -1,9 +1,16 @@
 """Shared test fixtures and mock helpers."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 import sys
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock
 
+import aiohttp
+import pytest
+
 
 class _MockEntity:
     """Minimal Home Assistant entity test double."""
@@ -37,6 +44,9 @@ class _MockCoordinatorEntity(_MockEntity):
     async def async_shutdown(self):
         """Mock shutdown hook."""
 
+    def async_update_listeners(self):
+        """Mock listener notification."""
+
 
 class _MockConfigFlow:
     """Minimal config flow test double."""
@@ -74,6 +84,8 @@ def _mock_ha_modules():
         "homeassistant.helpers.typing",
         "homeassistant.helpers.aiohttp_client",
         "homeassistant.helpers.event",
+        "homeassistant.helpers.start",
+        "homeassistant.helpers.storage",
         "homeassistant.util",
         "homeassistant.util.dt",
         "homeassistant.const",
@@ -131,6 +143,9 @@ def _mock_ha_modules():
     sys.modules["homeassistant.helpers"].aiohttp_client = sys.modules[
         "homeassistant.helpers.aiohttp_client"
     ]
+    sys.modules["homeassistant.helpers.aiohttp_client"].async_create_clientsession = (
+        lambda hass, **kwargs: aiohttp.ClientSession(**kwargs)
+    )
     sys.modules["homeassistant.helpers"].config_validation = sys.modules[
         "homeassistant.helpers.config_validation"
     ]
@@ -144,3 +159,33 @@ def _mock_ha_modules():
 
 
 _mock_ha_modules()
+
+
+@pytest.fixture
+def hass() -> MagicMock:
+    """Return a hass mock running background tasks on the current event loop."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_create_background_task = MagicMock(
+        side_effect=lambda coro, name: asyncio.ensure_future(coro)
+    )
+    return hass
+
+
+@pytest.fixture
+def make_coordinator() -> Callable[..., SimpleNamespace]:
+    """Return a factory of coordinator doubles for a config entry.
+
+    The entry is titled by its ID and, given a station ID, stores it in its
+    data; keyword arguments become coordinator attributes.
+    """
+    from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID
+
+    def _make(entry_id: str, station_id: str | None = None, **attributes: Any) -> SimpleNamespace:
+        data = {} if station_id is None else {CONF_STATION_ID: station_id}
+        return SimpleNamespace(
+            config_entry=SimpleNamespace(entry_id=entry_id, title=entry_id, data=data),
+            **attributes,
+        )
+
+    return _make
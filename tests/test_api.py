@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import sys
+from datetime import time
 from types import SimpleNamespace
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import pytest
@@ -17,7 +19,24 @@ from custom_components.osservaprezzi_carburanti import api  # noqa: E402
 from custom_components.osservaprezzi_carburanti.api import (  # noqa: E402
     InvalidStationPayloadError,
     fetch_station_data,
+    fetch_zone_prices,
     normalize_station_data,
+    normalize_zone_results,
+)
+from custom_components.osservaprezzi_carburanti.circuit_breaker import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from custom_components.osservaprezzi_carburanti.metrics import RequestMetrics  # noqa: E402
+from custom_components.osservaprezzi_carburanti.models import (  # noqa: E402
+    FuelPayload,
+    ScheduleDay,
+    StationData,
+    StationPayload,
+)
+from custom_components.osservaprezzi_carburanti.rate_limiter import (  # noqa: E402
+    RequestPriority,
+    TokenBucketRateLimiter,
 )
 
 
@@ -42,17 +61,23 @@ class _FakeResponse:
         status: int,
         payload: Any = None,
         reason: str = "reason",
+        headers: dict[str, str] | None = None,
     ) -> None:
         self.status = status
         self._payload = payload
         self.reason = reason
         self.request_info = None
         self.history = ()
-        self.headers = {"X-Test": "yes"}
+        self.headers = {"X-Test": "yes", **(headers or {})}
 
     async def json(self) -> Any:
         return self._payload
 
+    async def read(self) -> bytes:
+        if isinstance(self._payload, bytes):
+            return self._payload
+        return json.dumps(self._payload).encode()
+
 
 class _FakeSession:
     """Session double returning a configured response or raising an error."""
@@ -67,12 +92,31 @@ class _FakeSession:
             raise self.response
         return _ResponseContext(self.response)
 
+    def post(self, url: str, **kwargs: Any) -> _ResponseContext:
+        return self.get(url, **kwargs)
+
 
 @pytest.fixture(autouse=True)
 def reset_request_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Disable inter-test sleeps from the module-level API throttle."""
-    monkeypatch.setattr(api, "_NEXT_ALLOWED_REQUEST_AT", 0.0)
-    monkeypatch.setattr(api, "API_REQUEST_INTERVAL_SECONDS", 0)
+    """Give each test a fresh, effectively unlimited API throttle."""
+    monkeypatch.setattr(
+        api,
+        "_RATE_LIMITER",
+        TokenBucketRateLimiter(1000, 1000, min_rate=1),
+    )
+    monkeypatch.setattr(api, "_IN_FLIGHT", {})
+    monkeypatch.setattr(api, "_CIRCUIT_BREAKER", CircuitBreaker(3, 60))
+    monkeypatch.setattr(api, "_REQUEST_METRICS", RequestMetrics(10))
+    monkeypatch.setattr(api, "_RECENT_RESULTS", {})
+    monkeypatch.setattr(api, "_RESULT_FRESHNESS", {"seconds": 10.0})
+    monkeypatch.setattr(api, "_RESPONSE_CACHE", {})
+    monkeypatch.setattr(
+        api, "_RESPONSE_CACHE_STATS", dict.fromkeys(api._RESPONSE_CACHE_STATS, 0)
+    )
+    monkeypatch.setattr(
+        api, "_RESPONSE_CACHE_CYCLE_START", dict.fromkeys(api._RESPONSE_CACHE_STATS, 0)
+    )
+    monkeypatch.setattr(api, "_RESPONSE_CACHE_LAST_CYCLE", {})
 
 
 def test_fetch_station_data_success(
@@ -87,22 +131,14 @@ def test_fetch_station_data_success(
         "prices": [{"fuel": "PrivateFuel", "price": 9.876}],
     }
     session = _FakeSession(_FakeResponse(200, payload))
-    monkeypatch.setattr(api, "async_get_clientsession", MagicMock(return_value=session))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
 
     with caplog.at_level(logging.DEBUG, logger=api.__name__):
         result = asyncio.run(fetch_station_data(MagicMock(), "123", timeout=7))
 
-    assert result == {
-        "id": "123",
-        "name": "Distinctive Secret Station",
-        "address": "Private Street 987",
-        "latitude": 41.123456,
-        "longitude": 12.654321,
-        "prices": [{"fuel": "PrivateFuel", "price": 9.876}],
-        "fuels": [],
-        "services": [],
-        "orariapertura": [],
-    }
+    assert result == StationPayload(
+        id="123", name="Distinctive Secret Station", address="Private Street 987"
+    )
     assert "/123" in session.get_calls[0]["url"]
     assert session.get_calls[0]["headers"] == api.DEFAULT_HEADERS
     assert isinstance(session.get_calls[0]["timeout"], aiohttp.ClientTimeout)
@@ -127,7 +163,7 @@ def test_fetch_station_data_does_not_log_malformed_payload(
 ) -> None:
     payload = ["Distinctive malformed station data"]
     session = _FakeSession(_FakeResponse(200, payload))
-    monkeypatch.setattr(api, "async_get_clientsession", MagicMock(return_value=session))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
 
     with caplog.at_level(logging.DEBUG, logger=api.__name__), pytest.raises(
         InvalidStationPayloadError
@@ -138,53 +174,114 @@ def test_fetch_station_data_does_not_log_malformed_payload(
     assert "Distinctive malformed station data" not in caplog.text
 
 
-def test_normalize_station_data_defaults_collections_and_preserves_unknowns() -> None:
+def test_normalize_station_data_defaults_collections_and_drops_unknowns() -> None:
     payload = {"id": 123, "name": "Station", "unknown": {"future": True}, "fuels": None}
 
     result = normalize_station_data(payload, "123")
 
-    assert result == {
-        "id": 123,
+    assert result == StationPayload(id=123, name="Station")
+    assert "unknown" not in result
+    assert result["fuels"] == ()
+    assert payload["fuels"] is None
+
+
+def test_normalize_station_data_parses_typed_payload() -> None:
+    payload = {
+        "id": "123",
         "name": "Station",
-        "unknown": {"future": True},
-        "fuels": [],
-        "services": [],
-        "orariapertura": [],
+        "nomeImpianto": "Plant",
+        "phoneNumber": "06 123",
+        "fuels": [
+            {
+                "id": 1,
+                "name": "Benzina",
+                "price": 1.8,
+                "fuelId": 1,
+                "isSelf": True,
+                "serviceAreaId": 55,
+                "insertDate": "2025-03-01T10:11:12Z",
+            }
+        ],
+        "services": [{"id": 4}, "1"],
+        "orariapertura": [
+            {
+                "giornoSettimanaId": 1,
+                "flagOrarioContinuato": True,
+                "oraAperturaOrarioContinuato": "7.30",
+                "oraChiusuraOrarioContinuato": "19:00",
+            }
+        ],
     }
-    assert payload["fuels"] is None
+
+    result = normalize_station_data(payload, "123")
+
+    assert (result.plant_name, result.phone_number) == ("Plant", "06 123")
+    assert result.fuels == (
+        FuelPayload(
+            name="Benzina",
+            price=1.8,
+            fuel_id=1,
+            is_self=True,
+            service_area_id=55,
+            insert_date="2025-03-01T10:11:12Z",
+        ),
+    )
+    assert result.fuels[0].key == "Benzina_self"
+    assert result.services == ({"id": 4}, "1")
+    assert result.opening_hours == (
+        ScheduleDay(
+            weekday=1,
+            continuous=True,
+            continuous_open=time(7, 30),
+            continuous_close=time(19, 0),
+        ),
+    )
+    assert result["orariapertura"][0]["oraAperturaOrarioContinuato"] == "07:30"
 
 
 @pytest.mark.parametrize(
-    "payload",
+    ("payload", "message"),
     [
-        None,
-        [],
-        "maintenance",
-        {},
-        {"id": "other", "name": "Station"},
-        {"id": "123", "name": ""},
-        {"id": "123", "name": "Station", "fuels": {}},
-        {"id": "123", "name": "Station", "services": {}},
-        {"id": "123", "name": "Station", "orariapertura": {}},
-        {"id": "123", "name": "Station", "fuels": ["bad"]},
-        {"id": "123", "name": "Station", "fuels": [{"name": "Benzina"}]},
-        {"id": "123", "name": "Station", "services": [None]},
-        {"id": "123", "name": "Station", "orariapertura": [1]},
+        (None, "is not a mapping"),
+        ([], "is not a mapping"),
+        ("maintenance", "is not a mapping"),
+        ({}, "has an invalid id"),
+        ({"id": "other", "name": "Station"}, "has an invalid id"),
+        ({"id": "123", "name": ""}, "has an invalid name"),
+        ({"id": "123", "name": "Station", "fuels": {}}, "fuels is not a list"),
+        ({"id": "123", "name": "Station", "services": {}}, "services is not a list"),
+        ({"id": "123", "name": "Station", "orariapertura": {}}, "orariapertura is not a list"),
+        ({"id": "123", "name": "Station", "fuels": ["bad"]}, "an invalid fuel"),
+        ({"id": "123", "name": "Station", "fuels": [{"name": "Benzina"}]}, "an invalid fuel"),
+        ({"id": "123", "name": "Station", "services": [None]}, "an invalid service"),
+        ({"id": "123", "name": "Station", "services": [True]}, "an invalid service"),
+        ({"id": "123", "name": "Station", "orariapertura": [1]}, "invalid opening hours"),
     ],
 )
-def test_normalize_station_data_rejects_invalid_payloads(payload: Any) -> None:
-    with pytest.raises(InvalidStationPayloadError):
+def test_normalize_station_data_rejects_invalid_payloads(payload: Any, message: str) -> None:
+    with pytest.raises(InvalidStationPayloadError, match=message):
         normalize_station_data(payload, "123")
 
 
-@pytest.mark.parametrize("service", [{"name": "bar"}, 7, "car-wash"])
-def test_normalize_station_data_accepts_supported_service_forms(service: Any) -> None:
+@pytest.mark.parametrize(
+    ("service", "expected"),
+    [
+        ({"name": "bar"}, ()),
+        ({"id": 3, "name": "bar"}, ("3",)),
+        (7, ("7",)),
+        ("car-wash", ("car-wash",)),
+    ],
+)
+def test_normalize_station_data_accepts_supported_service_forms(
+    service: Any, expected: tuple[str, ...]
+) -> None:
     result = normalize_station_data(
         {"id": "123", "name": "Station", "services": [service]},
         "123",
     )
 
-    assert result["services"] == [service]
+    assert result.services == (service,)
+    assert StationData(services=result.services).service_ids == frozenset(expected)
 
 
 def test_fetch_station_data_warns_without_logging_bad_record(
@@ -193,7 +290,7 @@ def test_fetch_station_data_warns_without_logging_bad_record(
 ) -> None:
     secret_record = "must-not-be-logged"
     session = _FakeSession(_FakeResponse(200, {"record": secret_record}))
-    monkeypatch.setattr(api, "async_get_clientsession", MagicMock(return_value=session))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
 
     with pytest.raises(InvalidStationPayloadError):
         asyncio.run(fetch_station_data(MagicMock(), "123"))
@@ -216,7 +313,7 @@ def test_fetch_station_data_raises_response_errors(
     message: str,
 ) -> None:
     session = _FakeSession(_FakeResponse(status))
-    monkeypatch.setattr(api, "async_get_clientsession", MagicMock(return_value=session))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
 
     with pytest.raises(aiohttp.ClientResponseError) as exc_info:
         asyncio.run(fetch_station_data(MagicMock(), "123"))
@@ -228,7 +325,7 @@ def test_fetch_station_data_raises_response_errors(
 def test_fetch_station_data_reraises_client_errors(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         api,
-        "async_get_clientsession",
+        "async_get_session",
         MagicMock(return_value=_FakeSession(aiohttp.ClientError("boom"))),
     )
 
@@ -236,22 +333,475 @@ def test_fetch_station_data_reraises_client_errors(monkeypatch: pytest.MonkeyPat
         asyncio.run(fetch_station_data(MagicMock(), "123"))
 
 
-def test_wait_for_request_slot_sleeps_when_throttled(monkeypatch: pytest.MonkeyPatch) -> None:
-    slept: list[float] = []
-    monotonic_values = iter([10.0, 20.0])
+def test_fetch_station_data_feeds_throttling_back_to_the_rate_limiter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    throttled = _FakeResponse(429)
+    throttled.headers = {"Retry-After": "7"}
+    session = _FakeSession(throttled)
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch_station_data(MagicMock(), "123"))
+
+    status = api.rate_limiter_status()
+    assert status["throttle_events"] == 1
+    assert status["rate_per_second"] == 500
+    assert 6 < status["wait_seconds"] <= 7
+
+    api._RATE_LIMITER._blocked_until = 0.0
+    session.response = _FakeResponse(404)
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch_station_data(MagicMock(), "123"))
+
+    assert api.rate_limiter_status()["rate_per_second"] == 600
+
+
+def test_configure_rate_limit_updates_the_shared_limiter() -> None:
+    api.configure_rate_limit(2, 3)
+
+    assert api.rate_limit_burst() == 3
+    assert api.rate_limiter_status()["configured_rate_per_second"] == 2
+
+
+def test_fetch_station_data_logs_rate_limiter_waits(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock(return_value=1.5)
+    monkeypatch.setattr(api, "_RATE_LIMITER", limiter)
+    monkeypatch.setattr(
+        api,
+        "async_get_session",
+        MagicMock(return_value=_FakeSession(_FakeResponse(500))),
+    )
+
+    with caplog.at_level(logging.DEBUG), pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch_station_data(MagicMock(), "123"))
+
+    assert "Waited 1.50s in the scheduled lane before requesting station 123" in caplog.text
+    limiter.record_success.assert_called_once_with()
+    limiter.acquire.assert_awaited_once()
+    assert limiter.acquire.await_args.args == (RequestPriority.SCHEDULED,)
+
+
+def test_request_priority_applies_to_requests_in_the_block(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock(return_value=0)
+    monkeypatch.setattr(api, "_RATE_LIMITER", limiter)
+    monkeypatch.setattr(
+        api,
+        "async_get_session",
+        MagicMock(return_value=_FakeSession(_FakeResponse(200, {"id": 1, "name": "A"}))),
+    )
+
+    async def fetch() -> None:
+        with api.request_priority(RequestPriority.INTERACTIVE):
+            await fetch_station_data(MagicMock(), "1")
+        await fetch_station_data(MagicMock(), "1", max_age=0)
+
+    asyncio.run(fetch())
+
+    assert [call.args for call in limiter.acquire.await_args_list] == [
+        (RequestPriority.INTERACTIVE,),
+        (RequestPriority.SCHEDULED,),
+    ]
+
+
+def test_interactive_caller_raises_a_joined_scheduled_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter = TokenBucketRateLimiter(100, 1, min_rate=1)
+    monkeypatch.setattr(api, "_RATE_LIMITER", limiter)
+
+    class _StationSession(_FakeSession):
+        def get(self, url: str, **kwargs: Any) -> _ResponseContext:
+            self.response = _FakeResponse(200, {"id": int(url.rsplit("/", 1)[-1]), "name": "A"})
+            return super().get(url, **kwargs)
+
+    session = _StationSession(_FakeResponse(500))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    async def run() -> None:
+        await limiter.acquire()
+        scheduled = [
+            asyncio.create_task(fetch_station_data(MagicMock(), station_id))
+            for station_id in ("1", "2", "3")
+        ]
+        while limiter.status()["lanes"]["scheduled"]["queued"] < 2:
+            await asyncio.sleep(0)
+        # Joining the queued request of station 3 moves it ahead of station 2.
+        with api.request_priority(RequestPriority.INTERACTIVE):
+            await fetch_station_data(MagicMock(), "3")
+        await asyncio.gather(*scheduled)
+
+    asyncio.run(run())
+
+    assert [call["url"].rsplit("/", 1)[-1] for call in session.get_calls] == ["1", "3", "2"]
+    lanes = limiter.status()["lanes"]
+    assert lanes["interactive"]["granted"] == 1
+    assert lanes["scheduled"]["granted"] == 3
+
+
+def test_normalize_zone_results_keeps_usable_stations() -> None:
+    fuel = {"name": "Benzina", "price": 1.8, "fuelId": 1, "isSelf": True}
+
+    assert normalize_zone_results(
+        {
+            "success": True,
+            "results": [
+                {"id": 37021, "fuels": [fuel]},
+                {"id": "42 ", "fuels": []},
+                {"id": True, "fuels": [fuel]},
+                {"id": " ", "fuels": [fuel]},
+                {"id": 1, "fuels": None},
+                {"id": 2, "fuels": [{"name": "Benzina"}]},
+                "bad",
+            ],
+        }
+    ) == {
+        "37021": {"id": 37021, "fuels": [fuel]},
+        "42": {"id": "42 ", "fuels": []},
+    }
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [[], {"success": False, "results": []}, {"results": None}],
+)
+def test_normalize_zone_results_rejects_invalid_envelopes(payload: Any) -> None:
+    with pytest.raises(InvalidStationPayloadError):
+        normalize_zone_results(payload)
+
+
+def test_fetch_zone_prices_posts_one_point_and_radius(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(
+        _FakeResponse(200, {"results": [{"id": 7, "fuels": []}]})
+    )
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    result = asyncio.run(fetch_zone_prices(MagicMock(), 41.9, 12.5, 2.5))
+
+    assert result == {"7": {"id": 7, "fuels": []}}
+    assert session.get_calls[0]["url"].endswith("/ospzApi/search/zone")
+    assert session.get_calls[0]["json"] == {
+        "points": [{"lat": 41.9, "lng": 12.5}],
+        "radius": 2.5,
+    }
+
+    session.response = _FakeResponse(404)
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        asyncio.run(fetch_zone_prices(MagicMock(), 41.9, 12.5, 2.5))
+    assert exc_info.value.message == "Zone search endpoint not found"
+
+
+class _GatedSession(_FakeSession):
+    """Session whose responses wait until the test releases them."""
+
+    def __init__(self, response: _FakeResponse | BaseException) -> None:
+        super().__init__(response)
+        self.release = asyncio.Event()
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        context = super().get(url, **kwargs)
+        session = self
+
+        class _Gated:
+            async def __aenter__(self) -> _FakeResponse:
+                await session.release.wait()
+                return await context.__aenter__()
+
+            async def __aexit__(self, *args: object) -> None:
+                return None
+
+        return _Gated()
+
+
+def test_fetch_station_data_coalesces_concurrent_callers_and_reuses_fresh_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payload = {"id": 123, "name": "Station", "fuels": [], "services": [], "orariapertura": []}
+    session = _GatedSession(_FakeResponse(200, payload))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+    clock = [100.0]
+    monkeypatch.setattr(api, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    async def run() -> list[StationPayload]:
+        callers = [
+            asyncio.create_task(fetch_station_data(MagicMock(), station_id))
+            for station_id in ("123", 123, "123")
+        ]
+        await asyncio.sleep(0)
+        session.release.set()
+        return list(await asyncio.gather(*callers))
+
+    results = asyncio.run(run())
+
+    assert len(session.get_calls) == 1
+    # The payload is immutable, so every caller shares the same object.
+    assert results[0] is results[1] is results[2]
+    assert api._IN_FLIGHT == {}
+
+    clock[0] = 105.0
+    assert asyncio.run(fetch_station_data(MagicMock(), "123")) == results[0]
+    assert len(session.get_calls) == 1
+
+    assert asyncio.run(fetch_station_data(MagicMock(), "123", max_age=0)) == results[0]
+    assert len(session.get_calls) == 2
+
+    clock[0] = 120.0
+    asyncio.run(fetch_station_data(MagicMock(), "123"))
+    assert len(session.get_calls) == 3
+
+
+def test_recent_results_follow_the_configured_window_and_are_evicted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(_FakeResponse(200, {"id": 1, "name": "Station"}))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+    clock = [100.0]
+    monkeypatch.setattr(api, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    api.configure_result_freshness(30)
+
+    asyncio.run(fetch_station_data(MagicMock(), "1"))
+    clock[0] = 125.0
+    asyncio.run(fetch_station_data(MagicMock(), "1"))
+    assert len(session.get_calls) == 1
+
+    # Finishing another request evicts results past the window.
+    clock[0] = 140.0
+    session.response = _FakeResponse(200, {"id": 2, "name": "Other"})
+    asyncio.run(fetch_station_data(MagicMock(), "2"))
+    assert list(api._RECENT_RESULTS) == ["2"]
+    assert set(api._RESPONSE_CACHE) == {"1", "2"}
+
+    api.forget_station("2")
+    assert api._RECENT_RESULTS == {}
+    assert set(api._RESPONSE_CACHE) == {"1"}
+
+
+def test_forgotten_station_requests_are_not_remembered(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _GatedSession(_FakeResponse(200, {"id": 1, "name": "Station"}))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    async def run() -> StationPayload:
+        request = asyncio.create_task(fetch_station_data(MagicMock(), "1"))
+        await asyncio.sleep(0)
+        api.forget_station(1)
+        assert api._IN_FLIGHT == {}
+        session.release.set()
+        return await request
+
+    assert asyncio.run(run()).name == "Station"
+    assert api._RECENT_RESULTS == {}
 
-    async def fake_sleep(delay: float) -> None:
-        slept.append(delay)
 
-    def fake_monotonic() -> float:
-        return next(monotonic_values, 20.0)
+def test_fetch_station_data_shares_failures_and_survives_caller_cancellation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _GatedSession(_FakeResponse(500))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    async def run() -> list[Any]:
+        cancelled = asyncio.create_task(fetch_station_data(MagicMock(), "123"))
+        waiting = asyncio.create_task(fetch_station_data(MagicMock(), "123"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        session.release.set()
+        return list(await asyncio.gather(cancelled, waiting, return_exceptions=True))
 
-    monkeypatch.setattr(api, "time", SimpleNamespace(monotonic=fake_monotonic))
-    monkeypatch.setattr(api.asyncio, "sleep", fake_sleep)
-    monkeypatch.setattr(api, "_NEXT_ALLOWED_REQUEST_AT", 12.5)
-    monkeypatch.setattr(api, "API_REQUEST_INTERVAL_SECONDS", 4)
+    cancelled_result, waiting_result = asyncio.run(run())
 
-    asyncio.run(api._wait_for_request_slot("123"))
+    assert isinstance(cancelled_result, asyncio.CancelledError)
+    assert isinstance(waiting_result, aiohttp.ClientResponseError)
+    assert waiting_result.status == 500
+    assert len(session.get_calls) == 1
+    assert api._IN_FLIGHT == {}
+    assert api._RECENT_RESULTS == {}
 
-    assert slept == [2.5]
-    assert api._NEXT_ALLOWED_REQUEST_AT == 24.0
+
+def test_fetch_station_revalidates_cached_responses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payload = {"id": 5, "name": "Station", "fuels": []}
+    session = _FakeSession(
+        _FakeResponse(200, payload, headers={"ETag": '"v1"', "Last-Modified": "Mon"})
+    )
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+    normalize = MagicMock(wraps=normalize_station_data)
+    monkeypatch.setattr(api, "normalize_station_data", normalize)
+    size = len(json.dumps(payload).encode())
+
+    async def fetch() -> api.StationResponse:
+        return await api.async_fetch_station(MagicMock(), "5", max_age=0)
+
+    first = asyncio.run(fetch())
+    assert (first.unchanged, first.bytes_received, first.bytes_saved) == (False, size, 0)
+    assert "If-None-Match" not in session.get_calls[0]["headers"]
+
+    session.response = _FakeResponse(304)
+    second = asyncio.run(fetch())
+    assert session.get_calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert session.get_calls[1]["headers"]["If-Modified-Since"] == "Mon"
+    assert second.data is first.data
+    assert (second.unchanged, second.revision) == (True, first.revision)
+    assert (second.bytes_received, second.bytes_saved) == (0, size)
+
+    session.response = _FakeResponse(200, payload)
+    third = asyncio.run(fetch())
+    assert (third.unchanged, third.bytes_received, third.bytes_saved) == (True, size, 0)
+    assert "If-None-Match" in session.get_calls[2]["headers"]
+
+    session.response = _FakeResponse(200, {**payload, "name": "Renamed"})
+    fourth = asyncio.run(fetch())
+    assert (fourth.unchanged, fourth.data["name"]) == (False, "Renamed")
+    assert fourth.revision != first.revision
+
+    assert normalize.call_count == 2
+    totals = {
+        "requests": 4,
+        "not_modified": 1,
+        "unchanged_bodies": 1,
+        "normalizations_skipped": 2,
+        "bytes_received": 2 * size + len(json.dumps({**payload, "name": "Renamed"})),
+        "bytes_saved": size,
+    }
+    assert api.response_cache_status() == {
+        "cached_stations": 1,
+        **totals,
+        "current_cycle": totals,
+        "last_cycle": None,
+    }
+
+    # A scheduled cycle closes the counters and starts counting again.
+    api.start_response_cache_cycle()
+    session.response = _FakeResponse(304)
+    asyncio.run(fetch())
+    status = api.response_cache_status()
+    assert status["last_cycle"] == totals
+    assert status["current_cycle"] == {
+        "requests": 1,
+        "not_modified": 1,
+        "unchanged_bodies": 0,
+        "normalizations_skipped": 1,
+        "bytes_received": 0,
+        "bytes_saved": size,
+    }
+    assert status["requests"] == 5
+
+
+def test_fetch_station_rejects_bodies_that_are_not_json(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(_FakeResponse(200, b"<html>"))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    with pytest.raises(InvalidStationPayloadError, match="not JSON"):
+        asyncio.run(fetch_station_data(MagicMock(), "5"))
+    assert api._RESPONSE_CACHE == {}
+
+
+def test_fetch_station_data_fails_fast_while_the_circuit_is_open(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(aiohttp.ClientConnectionError("down"))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    async def fetch(station_id: str) -> dict[str, Any]:
+        return await fetch_station_data(MagicMock(), station_id, max_age=0)
+
+    for station_id in ("1", "2"):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            asyncio.run(fetch(station_id))
+    session.response = _FakeResponse(503)
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch("3"))
+    assert api.circuit_breaker_status()["state"] == "open"
+
+    session.response = _FakeResponse(200, {"id": 4, "name": "Station"})
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(fetch("4"))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(fetch_zone_prices(MagicMock(), 41.9, 12.5, 5))
+    assert len(session.get_calls) == 3
+    assert api.circuit_breaker_status()["rejected_requests"] == 2
+
+
+def test_zone_and_station_responses_feed_the_circuit_breaker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    breaker = MagicMock()
+    monkeypatch.setattr(api, "_CIRCUIT_BREAKER", breaker)
+    session = _FakeSession(asyncio.TimeoutError())
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(fetch_zone_prices(MagicMock(), 41.9, 12.5, 5))
+    session.response = _FakeResponse(404)
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch_station_data(MagicMock(), "1"))
+    session.response = _FakeResponse(429)
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(fetch_station_data(MagicMock(), "1"))
+
+    assert breaker.before_request.call_count == 3
+    breaker.record_failure.assert_called_once_with()
+    breaker.record_success.assert_called_once_with()
+    breaker.record_throttle.assert_called_once_with()
+
+
+def test_circuit_is_checked_after_the_rate_limiter_wait(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    breaker = CircuitBreaker(1, 60)
+    monkeypatch.setattr(api, "_CIRCUIT_BREAKER", breaker)
+
+    async def acquire(priority: Any, key: Any = None) -> float:
+        # The circuit opens while the request waits for its slot.
+        breaker.record_failure()
+        return 0.5
+
+    monkeypatch.setattr(api._RATE_LIMITER, "acquire", acquire)
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(api._async_acquire_request_slot("station 1"))
+    assert breaker.status()["rejected_requests"] == 1
+
+
+def test_station_requests_are_timed_by_phase_and_counted_by_outcome(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(_FakeResponse(200, {"id": 1, "name": "Station"}))
+    monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
+    monkeypatch.setattr(api, "_CIRCUIT_BREAKER", CircuitBreaker(2, 60))
+
+    async def fetch() -> dict[str, Any]:
+        return await fetch_station_data(MagicMock(), "1", max_age=0)
+
+    asyncio.run(fetch())
+    assert isinstance(session.get_calls[0]["trace_request_ctx"], api.RequestTiming)
+    for response in (_FakeResponse(404), asyncio.TimeoutError(), aiohttp.ServerDisconnectedError()):
+        session.response = response
+        with pytest.raises((aiohttp.ClientError, asyncio.TimeoutError)):
+            asyncio.run(fetch())
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(fetch())
+
+    status = api.request_metrics_status()
+    assert status["by_outcome"] == {
+        "200": 1,
+        "404": 1,
+        "circuit_open": 1,
+        "connection_error": 1,
+        "timeout": 1,
+    }
+    phases = status["phases_seconds"]
+    assert phases["download"]["count"] == phases["normalize"]["count"] == 2
+    assert phases["normalize"]["max"] >= 0
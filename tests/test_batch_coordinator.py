@@ -0,0 +1,211 @@
+"""Tests for the shared station batch refresh."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.osservaprezzi_carburanti import batch_coordinator, cron_scheduler
+from custom_components.osservaprezzi_carburanti.batch_coordinator import (
+    BATCH_COORDINATOR_DATA_KEY,
+    StationBatchCoordinator,
+    async_remove_batch_coordinator,
+    get_batch_coordinator,
+)
+from custom_components.osservaprezzi_carburanti.const import DOMAIN
+from custom_components.osservaprezzi_carburanti.cron_scheduler import CronScheduler
+
+_START = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+# Hourly and half-hourly schedules starting from _START.
+_PERIODS = {"hourly": timedelta(hours=1), "half_hourly": timedelta(minutes=30)}
+
+
+class _Timers:
+    """Records armed timers and their cancellations."""
+
+    def __init__(self) -> None:
+        self.armed: list[tuple[Any, datetime]] = []
+        self.cancelled = 0
+
+    def track(self, hass: Any, action: Any, when: datetime) -> Any:
+        self.armed.append((action, when))
+
+        def _cancel() -> None:
+            self.cancelled += 1
+
+        return _cancel
+
+
+@pytest.fixture
+def timers(monkeypatch: pytest.MonkeyPatch) -> _Timers:
+    fake = _Timers()
+    monkeypatch.setattr(cron_scheduler, "async_track_point_in_utc_time", fake.track)
+    monkeypatch.setattr(
+        cron_scheduler,
+        "iter_run_times",
+        lambda cron: (_START + _PERIODS[cron] * step for step in count(1)),
+    )
+    monkeypatch.setattr(cron_scheduler.dt_util, "as_utc", lambda value: value)
+    monkeypatch.setattr(batch_coordinator.dt_util, "utcnow", lambda: _START)
+    return fake
+
+
+@pytest.fixture
+def coordinator_factory(make_coordinator: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a factory of batch members whose responses apply successfully."""
+
+    def _make(entry_id: str, station_id: str, csv_manager: Any = None) -> Any:
+        if csv_manager is None:
+            csv_manager = MagicMock()
+            csv_manager.is_data_available.return_value = True
+        return make_coordinator(
+            entry_id,
+            station_id,
+            csv_manager=csv_manager,
+            async_apply_station_response=MagicMock(return_value=True),
+            async_apply_station_error=MagicMock(),
+        )
+
+    return _make
+
+
+def test_batch_refreshes_due_members_with_one_timer_and_task(
+    monkeypatch: pytest.MonkeyPatch,
+    timers: _Timers,
+    hass: MagicMock,
+    coordinator_factory: Callable[..., Any],
+) -> None:
+    error = aiohttp.ClientError("boom")
+
+    async def fetch_result(hass: Any, station_id: str) -> str:
+        if station_id == "2":
+            raise error
+        return station_id
+
+    fetch = AsyncMock(side_effect=fetch_result)
+    monkeypatch.setattr(batch_coordinator, "async_fetch_station", fetch)
+    batch = StationBatchCoordinator(hass, CronScheduler(hass))
+    members = [
+        coordinator_factory("entry_1", "1"),
+        coordinator_factory("entry_2", "2"),
+        coordinator_factory("entry_3", "3"),
+        coordinator_factory("entry_4", "4"),
+    ]
+    # A malformed payload fails its member only.
+    members[3].async_apply_station_response.return_value = False
+
+    async def run() -> None:
+        batch.async_add(members[0], "half_hourly")
+        batch.async_add(members[1], "half_hourly")
+        remove_third = batch.async_add(members[2], "hourly")
+        batch.async_add(members[3], "half_hourly")
+        assert batch.member_count == 4
+        fire, when = timers.armed[-1]
+        assert when == _START + timedelta(minutes=30)
+
+        fire(when)
+        await asyncio.sleep(0)
+        await batch._task
+        remove_third()
+
+    asyncio.run(run())
+
+    assert [call.args[1] for call in fetch.await_args_list] == ["1", "2", "4"]
+    members[0].async_apply_station_response.assert_called_once_with("1")
+    members[1].async_apply_station_error.assert_called_once_with(error)
+    members[2].async_apply_station_response.assert_not_called()
+    hass.async_create_background_task.assert_called_once()
+    assert timers.armed[-1][1] == _START + timedelta(hours=1)
+    status = batch.status()
+    assert status["members"] == 3
+    assert status["next_run"] == (_START + timedelta(hours=1)).isoformat()
+    assert status["running"] is False
+    assert status["batches"] == 1
+    assert status["last_batch"]["stations"] == 3
+    assert status["last_batch"]["refreshed"] == 1
+    assert status["last_batch"]["failed"] == 2
+
+
+def test_batch_task_picks_up_members_due_while_it_runs(
+    monkeypatch: pytest.MonkeyPatch,
+    timers: _Timers,
+    hass: MagicMock,
+    coordinator_factory: Callable[..., Any],
+) -> None:
+    release = asyncio.Event()
+    fetched: list[str] = []
+
+    async def fetch(hass: Any, station_id: str) -> str:
+        fetched.append(station_id)
+        if station_id == "1":
+            await release.wait()
+        return station_id
+
+    monkeypatch.setattr(batch_coordinator, "async_fetch_station", fetch)
+    csv_manager = MagicMock()
+    csv_manager.is_data_available.return_value = False
+    csv_manager.async_initialize = AsyncMock(return_value=False)
+    batch = StationBatchCoordinator(hass, CronScheduler(hass))
+
+    async def run() -> None:
+        batch.async_add(coordinator_factory("entry_1", "1", csv_manager), "half_hourly")
+        batch.async_add(coordinator_factory("entry_2", "2", csv_manager), "hourly")
+        fire, when = timers.armed[-1]
+        fire(when)
+        await asyncio.sleep(0)
+        assert batch.status()["running"] is True
+
+        # Both members are due at the hour while the first batch still waits.
+        fire, when = timers.armed[-1]
+        fire(when)
+        release.set()
+        await batch._task
+
+    asyncio.run(run())
+
+    assert fetched == ["1", "1", "2"]
+    assert hass.async_create_background_task.call_count == 1
+    assert batch.status()["batches"] == 2
+    assert csv_manager.async_initialize.await_count == 2
+
+
+def test_batch_shutdown_cancels_timer_and_running_task(
+    monkeypatch: pytest.MonkeyPatch,
+    timers: _Timers,
+    hass: MagicMock,
+    coordinator_factory: Callable[..., Any],
+) -> None:
+    started = asyncio.Event()
+
+    async def fetch(hass: Any, station_id: str) -> str:
+        started.set()
+        await asyncio.Event().wait()
+        return station_id
+
+    monkeypatch.setattr(batch_coordinator, "async_fetch_station", fetch)
+
+    async def run() -> asyncio.Task[None]:
+        batch = get_batch_coordinator(hass)
+        assert get_batch_coordinator(hass) is batch
+        batch.async_add(coordinator_factory("entry_1", "1"), "hourly")
+        await batch.async_refresh(["missing"])
+        fire, when = timers.armed[-1]
+        fire(when)
+        await started.wait()
+        task = batch._task
+        async_remove_batch_coordinator(hass)
+        async_remove_batch_coordinator(hass)
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert timers.cancelled == 1
+    assert BATCH_COORDINATOR_DATA_KEY not in hass.data[DOMAIN]
@@ -13,10 +13,14 @@ from custom_components.osservaprezzi_carburanti.binary_sensor import (
     async_setup_entry,
 )
 from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID, DOMAIN
+from custom_components.osservaprezzi_carburanti.coordinator import (
+    CarburantiDataUpdateCoordinator,
+)
+from custom_components.osservaprezzi_carburanti.models import StationData
 
 
 def _sample_station_data():
-    return {
+    return StationData.from_dict({
         "station_info": {
             "id": "12345",
             "name": "Station Alpha",
@@ -34,7 +38,7 @@ def _sample_station_data():
             }
         ],
         "services": [{"id": 1}, "8"],
-    }
+    })
 
 
 class TestBinarySensorSetup:
@@ -69,7 +73,7 @@ class TestBinarySensorSetup:
         listeners = []
         unload_callbacks = []
         coordinator = SimpleNamespace(
-            data={"station_info": {}, "opening_hours": [], "services": []}, hass=SimpleNamespace(),
+            data=StationData(), hass=SimpleNamespace(),
             async_add_listener=lambda listener: listeners.append(listener)
             or (lambda: listeners.remove(listener)),
         )
@@ -89,8 +93,7 @@ class TestBinarySensorSetup:
         }
         batch_count = len(batches)
         listeners[0]()
-        coordinator.data["services"] = []
-        coordinator.data["opening_hours"] = []
+        coordinator.data = StationData()
         listeners[0]()
         coordinator.data = _sample_station_data()
         listeners[0]()
@@ -110,7 +113,9 @@ class TestOpenClosedSensor:
     def test_closed_day_is_off(self, monkeypatch):
         sensor = StationOpenClosedBinarySensor.__new__(StationOpenClosedBinarySensor)
         sensor.coordinator = SimpleNamespace(
-            data={"opening_hours": [{"giornoSettimanaId": 1, "flagChiusura": True}]}
+            data=StationData.from_dict(
+                {"opening_hours": [{"giornoSettimanaId": 1, "flagChiusura": True}]}
+            )
         )
         monkeypatch.setattr(
             binary_sensor_module.dt_util,
@@ -123,7 +128,9 @@ class TestOpenClosedSensor:
     def test_h24_day_is_on(self, monkeypatch):
         sensor = StationOpenClosedBinarySensor.__new__(StationOpenClosedBinarySensor)
         sensor.coordinator = SimpleNamespace(
-            data={"opening_hours": [{"giornoSettimanaId": 1, "flagH24": True}]}
+            data=StationData.from_dict(
+                {"opening_hours": [{"giornoSettimanaId": 1, "flagH24": True}]}
+            )
         )
         monkeypatch.setattr(
             binary_sensor_module.dt_util,
@@ -136,16 +143,18 @@ class TestOpenClosedSensor:
     def test_regular_schedule_delegates_to_schedule_open(self, monkeypatch):
         sensor = StationOpenClosedBinarySensor.__new__(StationOpenClosedBinarySensor)
         sensor.coordinator = SimpleNamespace(
-            data={
-                "opening_hours": [
-                    {
-                        "giornoSettimanaId": 1,
-                        "flagOrarioContinuato": True,
-                        "oraAperturaOrarioContinuato": "08:00",
-                        "oraChiusuraOrarioContinuato": "20:00",
-                    }
-                ]
-            }
+            data=StationData.from_dict(
+                {
+                    "opening_hours": [
+                        {
+                            "giornoSettimanaId": 1,
+                            "flagOrarioContinuato": True,
+                            "oraAperturaOrarioContinuato": "08:00",
+                            "oraChiusuraOrarioContinuato": "20:00",
+                        }
+                    ]
+                }
+            )
         )
         monkeypatch.setattr(
             binary_sensor_module.dt_util,
@@ -158,12 +167,12 @@ class TestOpenClosedSensor:
     def test_yesterday_overnight_spill_is_open_until_close_boundary(self, monkeypatch):
         timezone = ZoneInfo("Europe/Rome")
         sensor = StationOpenClosedBinarySensor.__new__(StationOpenClosedBinarySensor)
-        sensor.coordinator = SimpleNamespace(data={"opening_hours": [{
+        sensor.coordinator = SimpleNamespace(data=StationData.from_dict({"opening_hours": [{
             "giornoSettimanaId": 7,
             "flagOrarioContinuato": True,
             "oraAperturaOrarioContinuato": "22:00",
             "oraChiusuraOrarioContinuato": "02:00",
-        }]})
+        }]}))
 
         monkeypatch.setattr(
             binary_sensor_module.dt_util,
@@ -181,12 +190,12 @@ class TestOpenClosedSensor:
 
     def test_today_overnight_is_open_at_open_boundary(self, monkeypatch):
         sensor = StationOpenClosedBinarySensor.__new__(StationOpenClosedBinarySensor)
-        sensor.coordinator = SimpleNamespace(data={"opening_hours": [{
+        sensor.coordinator = SimpleNamespace(data=StationData.from_dict({"opening_hours": [{
             "giornoSettimanaId": 1,
             "flagOrarioContinuato": True,
             "oraAperturaOrarioContinuato": "22:00",
             "oraChiusuraOrarioContinuato": "02:00",
-        }]})
+        }]}))
         monkeypatch.setattr(
             binary_sensor_module.dt_util,
             "now",
@@ -220,7 +229,7 @@ class TestServiceBinarySensor:
         assert entity.is_on is True
 
     def test_service_entity_falls_back_to_name_for_unknown_service(self):
-        coordinator = SimpleNamespace(data={"services": ["99"], "station_info": {}}, hass=SimpleNamespace())
+        coordinator = SimpleNamespace(data=StationData.from_dict({"services": ["99"]}), hass=SimpleNamespace())
         entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
 
         entity = StationServiceBinarySensor(
@@ -239,6 +248,32 @@ class TestServiceBinarySensor:
         assert not hasattr(entity, "_attr_translation_key")
         assert entity.is_on is True
 
+    def test_service_and_schedule_entities_skip_unrelated_updates(self):
+        coordinator = SimpleNamespace(data=_sample_station_data(), hass=SimpleNamespace())
+        coordinator.has_changes = lambda keys: CarburantiDataUpdateCoordinator.has_changes(
+            coordinator, keys
+        )
+        entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
+        service = StationServiceBinarySensor(
+            coordinator, entry, "8", {"name": "Wi-Fi", "icon": "mdi:wifi"}
+        )
+        open_closed = StationOpenClosedBinarySensor(coordinator, entry)
+        writes = []
+        service.async_write_ha_state = lambda: writes.append("service")
+        open_closed.async_write_ha_state = lambda: writes.append("open_closed")
+
+        for changes in (
+            frozenset({"fuels.gasolio_self", "station_info.brand"}),
+            frozenset({"services"}),
+            frozenset({"opening_hours"}),
+            None,
+        ):
+            coordinator.data_changes = changes
+            service._handle_coordinator_update()
+            open_closed._handle_coordinator_update()
+
+        assert writes == ["service", "open_closed", "service", "open_closed"]
+
     def test_service_sensor_without_data_is_off_and_has_metadata(self):
         coordinator = SimpleNamespace(data=None, hass=SimpleNamespace())
         entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
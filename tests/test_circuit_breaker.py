@@ -0,0 +1,108 @@
+"""Tests for the station API circuit breaker."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti import circuit_breaker
+from custom_components.osservaprezzi_carburanti.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class _Clock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_circuit_opens_after_consecutive_failures_and_probes_once(clock: _Clock) -> None:
+    breaker = CircuitBreaker(3, 60)
+
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    breaker.record_success()
+    for _ in range(3):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 59
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.status()["retry_in_seconds"] == 1.0
+
+    clock.now += 1
+    breaker.before_request()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 60
+    breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.status() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "failure_threshold": 3,
+        "cooldown_seconds": 60,
+        "retry_in_seconds": None,
+        "open_events": 2,
+        "rejected_requests": 2,
+    }
+
+
+def test_circuit_replaces_a_probe_that_never_reports_back(clock: _Clock) -> None:
+    breaker = CircuitBreaker(1, 10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.now += 1
+    breaker.before_request()
+    assert breaker.state == "half_open"
+
+
+def test_throttled_probe_reopens_the_circuit_without_a_failure(clock: _Clock) -> None:
+    breaker = CircuitBreaker(1, 10)
+    breaker.record_throttle()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+
+    breaker.record_throttle()
+
+    assert breaker.state == "open"
+    assert breaker.status()["retry_in_seconds"] == 10.0
+    assert breaker.status()["open_events"] == 1
+    assert breaker.status()["consecutive_failures"] == 1
+    clock.now += 10
+    breaker.before_request()
+    assert breaker.state == "half_open"
+
+
+@pytest.mark.parametrize(("threshold", "cooldown"), [(0, 10), (1, 0)])
+def test_circuit_rejects_invalid_settings(threshold: int, cooldown: float) -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(threshold, cooldown)
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import sys
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock
 
@@ -12,6 +12,7 @@ import pytest
 
 sys.path.insert(0, ".")
 
+from custom_components.osservaprezzi_carburanti import api  # noqa: E402
 from custom_components.osservaprezzi_carburanti.config_flow import (  # noqa: E402
     CannotConnect,
     CONF_LATITUDE,
@@ -34,12 +35,25 @@ from custom_components.osservaprezzi_carburanti.csv_manager import (  # noqa: E4
 from custom_components.osservaprezzi_carburanti.discovery import (  # noqa: E402
     StationCandidate,
 )
+from custom_components.osservaprezzi_carburanti.rate_limiter import (  # noqa: E402
+    RequestPriority,
+)
 from custom_components.osservaprezzi_carburanti.const import (  # noqa: E402
+    CONF_ADAPTIVE_REFRESH,
     CONF_CRON_EXPRESSION,
+    CONF_DAILY_PRICE_FILE,
+    CONF_DAILY_REFRESH_BUDGET,
+    CONF_JITTER_MINUTES,
     CONF_PRICE_STALE_HOURS,
+    CONF_RESULT_FRESHNESS_SECONDS,
+    CONF_SHARED_REFRESH,
+    CONF_FAST_STARTUP,
     CONF_STATION_ID,
     DEFAULT_CRON_EXPRESSION,
+    DEFAULT_DAILY_REFRESH_BUDGET,
+    DEFAULT_JITTER_MINUTES,
     DEFAULT_PRICE_STALE_HOURS,
+    DEFAULT_RESULT_FRESHNESS_SECONDS,
 )
 
 
@@ -56,7 +70,13 @@ def _make_response_error(status: int) -> aiohttp.ClientResponseError:
 
 def test_validate_station_success(monkeypatch):
     hass_mock = AsyncMock()
-    fetch_mock = AsyncMock(return_value={"id": "1234", "name": "Test Station"})
+    priorities: list[RequestPriority] = []
+
+    async def fetch(hass: Any, station_id: str) -> dict[str, str]:
+        priorities.append(api._REQUEST_PRIORITY.get())
+        return {"id": "1234", "name": "Test Station"}
+
+    fetch_mock = AsyncMock(side_effect=fetch)
     monkeypatch.setattr(
         "custom_components.osservaprezzi_carburanti.config_flow.fetch_station_data",
         fetch_mock,
@@ -65,6 +85,7 @@ def test_validate_station_success(monkeypatch):
     result = asyncio.run(_validate_station(hass_mock, " 1234 "))
     assert result == {"name": "Test Station"}
     fetch_mock.assert_awaited_once_with(hass_mock, "1234")
+    assert priorities == [RequestPriority.INTERACTIVE]
 
 
 def test_validate_station_invalid_payload(monkeypatch):
@@ -516,6 +537,9 @@ def _registry_manager(
             is_stale=stale,
         )
     )
+    manager.async_registry_index = AsyncMock(
+        side_effect=lambda snapshot, name, builder: builder(snapshot.stations)
+    )
     return manager
 
 
@@ -667,6 +691,42 @@ def test_config_flow_area_reports_no_results_and_registry_error(
     assert result["errors"] == {"base": "registry_unavailable"}
 
 
+def test_config_flow_area_suggests_close_registry_values(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    flow = _make_config_flow(monkeypatch)
+    manager = _registry_manager(
+        (
+            {
+                "id": "123",
+                "name": "Station",
+                "brand": "Agip",
+                "municipality": "Reggio di Calabria",
+                "province": "RC",
+            },
+        )
+    )
+    monkeypatch.setattr(
+        "custom_components.osservaprezzi_carburanti.config_flow.get_shared_csv_manager",
+        lambda hass: manager,
+    )
+
+    result = asyncio.run(
+        flow.async_step_area(
+            {
+                CONF_MUNICIPALITY: "Reggio Calbria",
+                CONF_TEXT_FILTER: "Agp",
+            }
+        )
+    )
+
+    assert result["errors"] == {"base": "no_stations_did_you_mean"}
+    assert result["description_placeholders"] == {
+        "suggestions": "Reggio di Calabria, Agip"
+    }
+    assert manager.async_registry_index.await_args.args[1] == "registry_vocabulary"
+
+
 def test_config_flow_area_reports_invalid_filter_input(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -774,7 +834,7 @@ def test_config_flow_reconfigure_errors(
 
 def _make_options_flow(options: dict[str, Any] | None = None) -> OptionsFlowHandler:
     handler = object.__new__(OptionsFlowHandler)
-    handler.config_entry = MagicMock(title="Station")
+    handler.config_entry = MagicMock(title="Station", entry_id="entry_1")
     handler.options = options or {}
     handler.async_create_entry = MagicMock(
         side_effect=lambda **kwargs: {"type": "create_entry", **kwargs}
@@ -817,10 +877,48 @@ def test_options_flow_valid_cron(monkeypatch: pytest.MonkeyPatch) -> None:
         "data": {
             CONF_CRON_EXPRESSION: "0 6 * * *",
             CONF_PRICE_STALE_HOURS: DEFAULT_PRICE_STALE_HOURS,
+            CONF_JITTER_MINUTES: DEFAULT_JITTER_MINUTES,
+            CONF_SHARED_REFRESH: False,
+            CONF_FAST_STARTUP: False,
+            CONF_DAILY_PRICE_FILE: False,
+            CONF_ADAPTIVE_REFRESH: False,
+            CONF_DAILY_REFRESH_BUDGET: DEFAULT_DAILY_REFRESH_BUDGET,
+            CONF_RESULT_FRESHNESS_SECONDS: DEFAULT_RESULT_FRESHNESS_SECONDS,
         },
     }
 
 
+def test_options_flow_enables_shared_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = _make_options_flow({CONF_SHARED_REFRESH: True})
+    monkeypatch.setattr(
+        "custom_components.osservaprezzi_carburanti.config_flow.validate_cron_expression",
+        lambda cron_expr: True,
+    )
+
+    form = asyncio.run(handler.async_step_init())
+    result = asyncio.run(
+        handler.async_step_init(
+            {
+                CONF_CRON_EXPRESSION: DEFAULT_CRON_EXPRESSION,
+                CONF_SHARED_REFRESH: True,
+                CONF_FAST_STARTUP: True,
+                CONF_DAILY_PRICE_FILE: True,
+                CONF_ADAPTIVE_REFRESH: True,
+                CONF_DAILY_REFRESH_BUDGET: "6",
+                CONF_RESULT_FRESHNESS_SECONDS: "0",
+            }
+        )
+    )
+
+    assert form["type"] == "form"
+    assert result["data"][CONF_SHARED_REFRESH] is True
+    assert result["data"][CONF_FAST_STARTUP] is True
+    assert result["data"][CONF_DAILY_PRICE_FILE] is True
+    assert result["data"][CONF_ADAPTIVE_REFRESH] is True
+    assert result["data"][CONF_DAILY_REFRESH_BUDGET] == 6
+    assert result["data"][CONF_RESULT_FRESHNESS_SECONDS] == 0
+
+
 def test_options_flow_invalid_cron(monkeypatch: pytest.MonkeyPatch) -> None:
     handler = _make_options_flow()
     monkeypatch.setattr(
@@ -850,6 +948,88 @@ def test_options_flow_invalid_stale_threshold(stale_hours: Any) -> None:
     assert result["errors"] == {"base": "invalid_stale_hours"}
 
 
+@pytest.mark.parametrize("jitter_minutes", [7, "bad"])
+def test_options_flow_invalid_jitter_window(jitter_minutes: Any) -> None:
+    handler = _make_options_flow()
+
+    result = asyncio.run(
+        handler.async_step_init(
+            {
+                CONF_CRON_EXPRESSION: DEFAULT_CRON_EXPRESSION,
+                CONF_JITTER_MINUTES: jitter_minutes,
+            }
+        )
+    )
+
+    assert result["errors"] == {"base": "invalid_jitter_minutes"}
+
+
+@pytest.mark.parametrize("budget", [0, 5, None])
+def test_options_flow_invalid_refresh_budget(budget: Any) -> None:
+    handler = _make_options_flow()
+
+    result = asyncio.run(
+        handler.async_step_init(
+            {
+                CONF_CRON_EXPRESSION: DEFAULT_CRON_EXPRESSION,
+                CONF_DAILY_REFRESH_BUDGET: budget,
+            }
+        )
+    )
+
+    assert result["errors"] == {"base": "invalid_refresh_budget"}
+
+
+
+def test_options_flow_invalid_result_freshness() -> None:
+    handler = _make_options_flow()
+
+    result = asyncio.run(
+        handler.async_step_init(
+            {CONF_CRON_EXPRESSION: DEFAULT_CRON_EXPRESSION, CONF_RESULT_FRESHNESS_SECONDS: 5}
+        )
+    )
+
+    assert result["errors"] == {"base": "invalid_result_freshness"}
+
+
+def test_options_flow_previews_the_jittered_next_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = _make_options_flow({CONF_JITTER_MINUTES: 30})
+    calls = []
+
+    def get_next_run_time(cron_expr: str, **kwargs: Any) -> datetime:
+        calls.append((cron_expr, kwargs))
+        return datetime(2026, 1, 1, 8, 47, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(
+        "custom_components.osservaprezzi_carburanti.config_flow.get_next_run_time",
+        get_next_run_time,
+    )
+    monkeypatch.setattr(
+        "custom_components.osservaprezzi_carburanti.config_flow.validate_cron_expression",
+        lambda cron_expr: True,
+    )
+
+    form = asyncio.run(handler.async_step_init())
+    result = asyncio.run(
+        handler.async_step_init(
+            {CONF_CRON_EXPRESSION: DEFAULT_CRON_EXPRESSION, CONF_JITTER_MINUTES: "0"}
+        )
+    )
+
+    assert form["description_placeholders"] == {"next_run": "2026-01-01T08:47:00+00:00"}
+    assert calls == [
+        (
+            DEFAULT_CRON_EXPRESSION,
+            {
+                "jitter_seed": "entry_1",
+                "jitter_window": timedelta(minutes=30),
+            },
+        )
+    ]
+    assert result["data"][CONF_JITTER_MINUTES] == 0
+
+
 def test_options_flow_keeps_supported_stale_threshold(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import sys
-from datetime import datetime, timezone
+from dataclasses import replace
+from datetime import datetime, time, timezone
 from types import SimpleNamespace
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock
@@ -19,7 +20,19 @@ from custom_components.osservaprezzi_carburanti.coordinator import (
 )
 from custom_components.osservaprezzi_carburanti import coordinator as coordinator_module
 from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID
-from custom_components.osservaprezzi_carburanti.api import InvalidStationPayloadError
+from custom_components.osservaprezzi_carburanti.api import (
+    InvalidStationPayloadError,
+    StationResponse,
+)
+from custom_components.osservaprezzi_carburanti.circuit_breaker import CircuitOpenError
+from custom_components.osservaprezzi_carburanti.models import (
+    FuelPayload,
+    ScheduleDay,
+    StationData,
+    StationPayload,
+    freeze_service,
+)
+from custom_components.osservaprezzi_carburanti.refresh_timing import RefreshTiming
 
 
 def _make_coordinator() -> CarburantiDataUpdateCoordinator:
@@ -29,9 +42,76 @@ def _make_coordinator() -> CarburantiDataUpdateCoordinator:
     coordinator.config_entry = MagicMock(data={CONF_STATION_ID: "123"})
     coordinator.csv_manager = MagicMock()
     coordinator.data = None
+    coordinator.last_fetch_stats = {}
+    coordinator._payload_fingerprint = None
+    coordinator._body_fingerprint = None
+    coordinator._retries_used = 0
+    coordinator._retry_at = None
+    coordinator._unsub_retry = None
+    coordinator._last_error = None
+    coordinator.data_changes = None
+    coordinator._published_data = None
+    coordinator._published_state = None
+    coordinator.data_is_restored = False
+    coordinator.restored_at = None
+    coordinator.refresh_timing = RefreshTiming()
+    coordinator._store = MagicMock()
     return coordinator
 
 
+class _RetryTimers:
+    """Captures retries scheduled with async_call_later."""
+
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+        self.actions: list[Any] = []
+        self.cancelled = 0
+
+    def call_later(self, hass: Any, delay: float, action: Any) -> Any:
+        self.delays.append(delay)
+        self.actions.append(action)
+
+        def _cancel() -> None:
+            self.cancelled += 1
+
+        return _cancel
+
+
+@pytest.fixture
+def retry_timers(monkeypatch: pytest.MonkeyPatch) -> _RetryTimers:
+    timers = _RetryTimers()
+    monkeypatch.setattr(coordinator_module, "async_call_later", timers.call_later)
+    monkeypatch.setattr(coordinator_module.random, "uniform", lambda low, high: high)
+    return timers
+
+
+def _payload(data: dict[str, Any]) -> StationPayload:
+    """Build a station payload from partial API data, skipping validation."""
+    values = StationPayload._attributes(data)
+    values["fuels"] = tuple(FuelPayload.from_api(fuel) for fuel in data.get("fuels", ()))
+    values["opening_hours"] = tuple(
+        ScheduleDay.from_api(day) for day in data.get("orariapertura", ())
+    )
+    values["services"] = tuple(freeze_service(service) for service in data.get("services", ()))
+    return StationPayload(**values)
+
+
+def _station_response(
+    data: dict[str, Any],
+    *,
+    revision: str = "r1",
+    unchanged: bool = False,
+) -> StationResponse:
+    """Create a station response as returned by the API helper."""
+    return StationResponse(
+        data=_payload(data),
+        revision=revision,
+        unchanged=unchanged,
+        bytes_received=0 if unchanged else 100,
+        bytes_saved=100 if unchanged else 0,
+    )
+
+
 @pytest.fixture(autouse=True)
 def real_datetime_helpers(monkeypatch: pytest.MonkeyPatch) -> None:
     """Replace mocked Home Assistant datetime helpers with deterministic functions."""
@@ -48,6 +128,11 @@ def real_datetime_helpers(monkeypatch: pytest.MonkeyPatch) -> None:
         "now",
         lambda: datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc),
     )
+    monkeypatch.setattr(
+        coordinator_module.dt_util,
+        "utcnow",
+        lambda: datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc),
+    )
 
 
 def _make_response_error(
@@ -98,12 +183,10 @@ class TestTransientErrors:
 class TestStationProcessing:
     def test_get_station_coordinates_from_csv(self) -> None:
         coordinator = _make_coordinator()
-        coordinator.csv_manager.get_station_by_id.return_value = {
-            "latitude": "45.1",
-            "longitude": "9.2",
-        }
 
-        result = coordinator._get_station_coordinates("123")
+        result = coordinator._get_station_coordinates(
+            "123", {"latitude": "45.1", "longitude": "9.2"}
+        )
 
         assert result == {"latitude": 45.1, "longitude": 9.2, "source": "csv"}
 
@@ -122,9 +205,8 @@ class TestStationProcessing:
         csv_station: dict[str, Any] | None,
     ) -> None:
         coordinator = _make_coordinator()
-        coordinator.csv_manager.get_station_by_id.return_value = csv_station
 
-        assert coordinator._get_station_coordinates(station_id) is None
+        assert coordinator._get_station_coordinates(station_id, csv_station) is None
 
     @pytest.mark.parametrize(
         ("value", "expected"),
@@ -150,11 +232,11 @@ class TestStationProcessing:
         )
         monkeypatch.setattr(coordinator_module.dt_util, "now", lambda: next(times))
 
-        def payload(price: float, *, include_gasolio: bool = False) -> dict[str, Any]:
+        def payload(price: float, *, include_gasolio: bool = False) -> StationPayload:
             fuels = [{"name": "Benzina", "isSelf": True, "price": price}]
             if include_gasolio:
                 fuels.append({"name": "Gasolio", "isSelf": True, "price": 1.6})
-            return {"id": 123, "fuels": fuels}
+            return _payload({"id": 123, "fuels": fuels})
 
         coordinator.data = coordinator._process_station_data(payload(1.7))
         assert coordinator.data["fuels"]["Benzina_self"]["previous_price"] is None
@@ -193,15 +275,17 @@ class TestStationProcessing:
             "municipality": "Milano",
             "province": "MI",
         }
-        coordinator.data = {
-            "fuels": {
-                "Benzina_self": {
-                    "price": 1.7,
-                    "previous_price": None,
-                    "price_changed_at": None,
+        coordinator.data = StationData.from_dict(
+            {
+                "fuels": {
+                    "Benzina_self": {
+                        "price": 1.7,
+                        "previous_price": None,
+                        "price_changed_at": None,
+                    }
                 }
             }
-        }
+        )
         payload = {
             "id": 123,
             "name": "Station",
@@ -212,8 +296,15 @@ class TestStationProcessing:
             "phoneNumber": "123",
             "email": "a@example.test",
             "website": "https://example.test",
-            "services": [{"name": "bar"}],
-            "orariapertura": [{"giorno": "Lunedi"}],
+            "services": ["1"],
+            "orariapertura": [
+                {
+                    "giornoSettimanaId": 1,
+                    "flagOrarioContinuato": True,
+                    "oraAperturaOrarioContinuato": "7.30",
+                    "oraChiusuraOrarioContinuato": "19:00",
+                },
+            ],
             "fuels": [
                 {
                     "name": "Benzina",
@@ -228,7 +319,9 @@ class TestStationProcessing:
             ],
         }
 
-        result = coordinator._process_station_data(payload)
+        result = coordinator._process_station_data(_payload(payload))
+
+        coordinator.csv_manager.get_station_by_id.assert_called_once_with("123")
 
         assert result["station_info"] == {
             "id": 123,
@@ -248,8 +341,16 @@ class TestStationProcessing:
             "province": "MI",
             "coordinate_source": "csv",
         }
-        assert result["services"] == [{"name": "bar"}]
-        assert result["opening_hours"] == [{"giorno": "Lunedi"}]
+        assert result.service_ids == frozenset({"1"})
+        assert result.opening_hours == (
+            ScheduleDay(
+                weekday=1,
+                continuous=True,
+                continuous_open=time(7, 30),
+                continuous_close=time(19, 0),
+            ),
+        )
+        assert result["opening_hours"][0]["oraAperturaOrarioContinuato"] == "07:30"
         assert result["fuels"]["Benzina_self"]["previous_price"] == 1.7
         assert result["fuels"]["Benzina_self"]["price_changed_at"] == result["last_update"]
         assert result["fuels"]["Benzina_self"]["last_update"] == "2025-03-01T10:11:12+00:00"
@@ -257,6 +358,71 @@ class TestStationProcessing:
         assert result["fuels"]["Unknown_servito"]["price"] == 2.0
 
 
+    def test_apply_zone_prices_updates_fuels_and_keeps_station_details(self) -> None:
+        coordinator = _make_coordinator()
+        coordinator.async_set_updated_data = MagicMock()
+
+        assert coordinator.async_apply_zone_prices({"id": 123, "fuels": []}) is False
+
+        previous = StationData.from_dict(
+            {
+                "station_info": {"id": 123, "name": "Station"},
+                "services": [{"id": "1"}],
+                "opening_hours": [{"giornoSettimanaId": 1}],
+                "fuels": {
+                    "Benzina_self": {
+                        "price": 1.8,
+                        "validity_date": "2025-02-28T08:00:00+00:00",
+                        "service_area_id": 9,
+                        "previous_price": 1.9,
+                        "price_changed_at": "2025-02-27T08:00:00+00:00",
+                    }
+                },
+                "last_update": "2025-02-28T12:00:00+00:00",
+            }
+        )
+        coordinator.data = previous
+
+        assert coordinator.async_apply_zone_prices(
+            {
+                "id": 123,
+                "insertDate": "2025-03-01T07:30:00+01:00",
+                "fuels": [
+                    {"name": "Benzina", "price": 1.75, "fuelId": 1, "isSelf": True},
+                    {"name": "Gasolio", "price": 1.7, "fuelId": 2, "isSelf": False},
+                ],
+            }
+        ) is True
+
+        data = coordinator.async_set_updated_data.call_args.args[0]
+        assert data.station_info is previous.station_info
+        assert data.services is previous.services
+        assert data.opening_hours is previous.opening_hours
+        assert data["last_update"] == "2025-03-01T12:00:00+00:00"
+        assert data["fuels"] == {
+            "Benzina_self": {
+                "price": 1.75,
+                "last_update": "2025-03-01T07:30:00+01:00",
+                "validity_date": "2025-02-28T08:00:00+00:00",
+                "fuel_id": 1,
+                "is_self": True,
+                "service_area_id": 9,
+                "previous_price": 1.8,
+                "price_changed_at": "2025-03-01T12:00:00+00:00",
+            },
+            "Gasolio_servito": {
+                "price": 1.7,
+                "last_update": "2025-03-01T07:30:00+01:00",
+                "validity_date": None,
+                "fuel_id": 2,
+                "is_self": False,
+                "service_area_id": None,
+                "previous_price": None,
+                "price_changed_at": None,
+            },
+        }
+
+
 class TestCoordinatorUpdates:
     def test_constructor_uses_injected_csv_manager(self) -> None:
         csv_manager = MagicMock()
@@ -292,9 +458,9 @@ class TestCoordinatorUpdates:
         coordinator = _make_coordinator()
         processed = {"station_info": {"id": "123"}}
         coordinator._process_station_data = MagicMock(return_value=processed)
-        fetch_mock = AsyncMock(return_value={"id": "123"})
+        fetch_mock = AsyncMock(return_value=_station_response({"id": "123"}))
         monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
+            "custom_components.osservaprezzi_carburanti.coordinator.async_fetch_station",
             fetch_mock,
         )
 
@@ -302,7 +468,76 @@ class TestCoordinatorUpdates:
 
         assert result == processed
         fetch_mock.assert_awaited_once_with(coordinator.hass, "123")
-        coordinator._process_station_data.assert_called_once_with({"id": "123"})
+        coordinator._process_station_data.assert_called_once_with(StationPayload(id="123"))
+        assert coordinator.last_fetch_stats == {
+            "unchanged": False,
+            "processing_skipped": False,
+            "bytes_received": 100,
+            "bytes_saved": 0,
+        }
+
+    def test_unchanged_payload_skips_processing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        coordinator = _make_coordinator()
+        coordinator.csv_manager.registry_generation = 1
+        coordinator._process_station_data = MagicMock(
+            side_effect=lambda data: StationData(last_update="old")
+        )
+        fetch_mock = AsyncMock(return_value=_station_response({"id": "123"}))
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
+
+        def refresh() -> StationData:
+            coordinator.data = asyncio.run(coordinator._async_fetch_station_data())
+            return coordinator.data
+
+        refresh()
+        fetch_mock.return_value = _station_response({"id": "123"}, unchanged=True)
+        assert refresh() == StationData(last_update="2025-03-01T12:00:00+00:00")
+        assert coordinator._process_station_data.call_count == 1
+        assert coordinator.last_fetch_stats == {
+            "unchanged": True,
+            "processing_skipped": True,
+            "bytes_received": 0,
+            "bytes_saved": 100,
+        }
+
+        coordinator.csv_manager.registry_generation = 2
+        refresh()
+        assert coordinator._process_station_data.call_count == 2
+
+        # A new body with the same normalized payload is not processed again.
+        fetch_mock.return_value = _station_response({"id": "123"}, revision="r2")
+        refresh()
+        assert coordinator._process_station_data.call_count == 2
+        assert coordinator.last_fetch_stats["processing_skipped"] is True
+
+        fetch_mock.return_value = _station_response({"id": "123", "name": "New"}, revision="r3")
+        refresh()
+        assert coordinator._process_station_data.call_count == 3
+
+        coordinator.async_set_updated_data = MagicMock()
+        coordinator.async_apply_zone_prices({"fuels": []})
+        refresh()
+        assert coordinator._process_station_data.call_count == 4
+
+    def test_payload_fingerprint_ignores_key_order_and_reuses_body_revision(self) -> None:
+        coordinator = _make_coordinator()
+        first = coordinator._fingerprint_payload(
+            _station_response({"id": 1, "fuels": [{"price": 1.7, "isSelf": True}]})
+        )
+        reordered = coordinator._fingerprint_payload(
+            _station_response(
+                {"fuels": [{"isSelf": True, "price": 1.7}], "id": 1}, revision="r2"
+            )
+        )
+        changed = coordinator._fingerprint_payload(
+            _station_response({"id": 1, "fuels": [{"price": 1.69, "isSelf": True}]}, revision="r3")
+        )
+        # The revision matches, so the cached fingerprint is returned as is.
+        cached = coordinator._fingerprint_payload(_station_response({}, revision="r3"))
+
+        assert first == reordered
+        assert changed != first
+        assert cached == changed
 
     def test_async_fetch_station_data_404_raises_update_failed(
         self,
@@ -310,100 +545,358 @@ class TestCoordinatorUpdates:
     ) -> None:
         coordinator = _make_coordinator()
         monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
+            "custom_components.osservaprezzi_carburanti.coordinator.async_fetch_station",
             AsyncMock(side_effect=_make_response_error(404)),
         )
 
         with pytest.raises(Exception, match="not found"):
             asyncio.run(coordinator._async_fetch_station_data())
 
-    def test_async_fetch_station_data_retries_response_error_then_succeeds(
+    def test_failed_fetch_schedules_a_retry_instead_of_waiting(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
     ) -> None:
         coordinator = _make_coordinator()
         coordinator._process_station_data = MagicMock(return_value={"ok": True})
-        fetch_mock = AsyncMock(side_effect=[_make_response_error(500), {"id": "123"}])
-        sleep_mock = AsyncMock()
-        monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
-            fetch_mock,
-        )
-        monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.asyncio.sleep",
-            sleep_mock,
+        coordinator.async_request_refresh = AsyncMock()
+        fetch_mock = AsyncMock(
+            side_effect=[_make_response_error(500), _station_response({"id": "123"})]
         )
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
+
+        with pytest.raises(Exception, match="Error fetching station data"):
+            asyncio.run(coordinator._async_fetch_station_data())
+        assert retry_timers.delays == [36.0]
+        assert coordinator.retry_status() == {
+            "pending": True,
+            "retries_used": 1,
+            "max_retries": len(coordinator_module.RETRY_DELAYS),
+            "next_retry_at": "2025-03-01T12:00:36+00:00",
+            "last_error": "HTTP 500",
+        }
+
+        asyncio.run(retry_timers.actions[0](datetime(2025, 3, 1, 12, 0, 36)))
+        coordinator.async_request_refresh.assert_awaited_once()
+        assert coordinator.retry_status()["pending"] is False
 
         assert asyncio.run(coordinator._async_fetch_station_data()) == {"ok": True}
-        assert fetch_mock.await_count == 2
-        sleep_mock.assert_awaited_once()
+        assert coordinator.retry_status()["retries_used"] == 0
+        assert coordinator.retry_status()["last_error"] is None
 
-    def test_async_fetch_station_data_retries_then_keeps_last_data(
+    def test_failed_fetch_keeps_last_data_and_honours_retry_after(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
     ) -> None:
         coordinator = _make_coordinator()
         coordinator.data = {"last": "known"}
-        monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
-            AsyncMock(side_effect=aiohttp.ClientError("temporary")),
-        )
-        monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.asyncio.sleep",
-            AsyncMock(),
+        fetch_mock = AsyncMock(
+            side_effect=[
+                aiohttp.ClientError("temporary"),
+                _make_response_error(429, {"Retry-After": "300"}),
+            ]
         )
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
 
-        result = asyncio.run(coordinator._async_fetch_station_data())
+        assert asyncio.run(coordinator._async_fetch_station_data()) == {"last": "known"}
+        assert asyncio.run(coordinator._async_fetch_station_data()) == {"last": "known"}
 
-        assert result == {"last": "known"}
+        assert fetch_mock.await_count == 2
+        assert retry_timers.delays == [36.0, 360.0]
+        # Rescheduling replaces the pending retry.
+        assert retry_timers.cancelled == 1
+        assert coordinator.retry_status()["last_error"] == "HTTP 429"
 
-    def test_invalid_payload_exhausts_retries_on_initial_refresh(
+    def test_pending_retry_keeps_the_update_successful(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
     ) -> None:
         coordinator = _make_coordinator()
         coordinator.csv_manager.is_data_available.return_value = True
-        fetch_mock = AsyncMock(side_effect=InvalidStationPayloadError("invalid structure"))
-        monkeypatch.setattr(coordinator_module, "fetch_station_data", fetch_mock)
-        monkeypatch.setattr(coordinator_module.asyncio, "sleep", AsyncMock())
-
-        with pytest.raises(Exception, match="Error fetching station data"):
-            asyncio.run(coordinator._async_update_data())
+        coordinator.data = {"last": "known"}
+        monkeypatch.setattr(
+            coordinator_module,
+            "async_fetch_station",
+            AsyncMock(side_effect=_make_response_error(503)),
+        )
 
-        assert fetch_mock.await_count == len(coordinator_module.RETRY_DELAYS) + 1
+        # Returning instead of raising UpdateFailed keeps last_update_success True.
+        assert asyncio.run(coordinator._async_update_data()) == {"last": "known"}
+        assert coordinator.retry_status()["pending"] is True
+        assert coordinator.retry_status()["last_error"] == "HTTP 503"
 
-    def test_invalid_payload_keeps_last_data_after_retries(
+    def test_invalid_payload_fails_initial_refresh_immediately(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
     ) -> None:
         coordinator = _make_coordinator()
-        coordinator.data = {"last": "known"}
         coordinator.csv_manager.is_data_available.return_value = True
         fetch_mock = AsyncMock(side_effect=InvalidStationPayloadError("invalid structure"))
-        monkeypatch.setattr(coordinator_module, "fetch_station_data", fetch_mock)
-        monkeypatch.setattr(coordinator_module.asyncio, "sleep", AsyncMock())
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
 
-        result = asyncio.run(coordinator._async_update_data())
+        with pytest.raises(Exception, match="Error fetching station data"):
+            asyncio.run(coordinator._async_update_data())
 
-        assert result == {"last": "known"}
-        assert fetch_mock.await_count == len(coordinator_module.RETRY_DELAYS) + 1
+        fetch_mock.assert_awaited_once()
+        assert coordinator.retry_status()["last_error"] == "InvalidStationPayloadError"
 
-    def test_async_fetch_station_data_exhausts_retries(
+    def test_retries_stop_after_the_last_attempt(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
     ) -> None:
         coordinator = _make_coordinator()
         monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
+            coordinator_module,
+            "async_fetch_station",
             AsyncMock(side_effect=asyncio.TimeoutError()),
         )
-        monkeypatch.setattr(
-            "custom_components.osservaprezzi_carburanti.coordinator.asyncio.sleep",
-            AsyncMock(),
-        )
 
+        for _ in range(len(coordinator_module.RETRY_DELAYS) + 1):
+            with pytest.raises(Exception, match="Error fetching station data"):
+                asyncio.run(coordinator._async_fetch_station_data())
+
+        assert retry_timers.delays == [36.0, 72.0, 144.0]
+        assert coordinator.retry_status()["retries_used"] == 0
+        assert coordinator.retry_status()["last_error"] == "TimeoutError"
+
+    def test_not_found_and_shutdown_cancel_a_pending_retry(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        retry_timers: _RetryTimers,
+    ) -> None:
+        coordinator = _make_coordinator()
+        fetch_mock = AsyncMock(side_effect=asyncio.TimeoutError())
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
+
+        with pytest.raises(Exception, match="Error fetching station data"):
+            asyncio.run(coordinator._async_fetch_station_data())
+        fetch_mock.side_effect = _make_response_error(404)
+        with pytest.raises(Exception, match="not found"):
+            asyncio.run(coordinator._async_fetch_station_data())
+        assert retry_timers.cancelled == 1
+
+        fetch_mock.side_effect = asyncio.TimeoutError()
         with pytest.raises(Exception, match="Error fetching station data"):
             asyncio.run(coordinator._async_fetch_station_data())
+        asyncio.run(coordinator.async_shutdown())
+        assert retry_timers.cancelled == 2
+        assert coordinator.retry_status()["pending"] is False
+
+    def test_open_circuit_keeps_last_data_without_retrying(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        coordinator = _make_coordinator()
+        fetch_mock = AsyncMock(side_effect=CircuitOpenError("down"))
+        sleep_mock = AsyncMock()
+        monkeypatch.setattr(coordinator_module, "async_fetch_station", fetch_mock)
+        monkeypatch.setattr(coordinator_module.asyncio, "sleep", sleep_mock)
+
+        with pytest.raises(Exception, match="down"):
+            asyncio.run(coordinator._async_fetch_station_data())
+        coordinator.data = {"last": "known"}
+        assert asyncio.run(coordinator._async_fetch_station_data()) == {"last": "known"}
+
+        assert fetch_mock.await_count == 2
+        sleep_mock.assert_not_awaited()
+
+    def test_batch_results_are_published_to_the_station_coordinator(
+        self, retry_timers: _RetryTimers
+    ) -> None:
+        coordinator = _make_coordinator()
+        coordinator.async_set_updated_data = MagicMock()
+        coordinator.async_set_update_error = MagicMock()
+        coordinator.csv_manager.get_station_by_id.return_value = None
+
+        assert coordinator.async_apply_station_response(
+            _station_response({"id": 123, "name": "Station", "fuels": []})
+        )
+        coordinator.async_apply_station_error(asyncio.TimeoutError())
+
+        data = coordinator.async_set_updated_data.call_args.args[0]
+        assert data["station_info"]["name"] == "Station"
+        assert "Error fetching station data" in str(
+            coordinator.async_set_update_error.call_args.args[0]
+        )
+        # Transient batch failures use the entry's own retry schedule.
+        assert retry_timers.delays == [36.0]
+
+        coordinator.data = data
+        coordinator.async_apply_station_error(CircuitOpenError("down"))
+        coordinator.async_apply_station_error(asyncio.TimeoutError())
+        assert coordinator.async_set_updated_data.call_count == 3
+        assert retry_timers.delays == [36.0, 72.0]
+        coordinator.async_apply_station_error(_make_response_error(404))
+        assert coordinator.async_set_update_error.call_count == 2
+        assert coordinator.retry_status()["pending"] is False
+
+    def test_malformed_batch_payloads_are_published_as_errors(self) -> None:
+        coordinator = _make_coordinator()
+        coordinator.async_set_updated_data = MagicMock()
+        coordinator.async_set_update_error = MagicMock()
+        coordinator._process_station_response = MagicMock(side_effect=ValueError("bad"))
+
+        assert coordinator.async_apply_station_response(MagicMock()) is False
+
+        coordinator.async_set_updated_data.assert_not_called()
+        assert "Error processing station data: bad" in str(
+            coordinator.async_set_update_error.call_args.args[0]
+        )
+
+    def test_listener_updates_record_per_key_changes(self) -> None:
+        coordinator = _make_coordinator()
+        coordinator.last_update_success = True
+        first = {
+            "station_info": {"name": "Station", "brand": "Brand"},
+            "fuels": {"gasolio_self": {"price": 1.7}, "benzina_self": {"price": 1.8}},
+            "services": ["1"],
+            "opening_hours": [],
+            "last_update": "2026-06-01T08:00:00+02:00",
+        }
+
+        coordinator.data = StationData.from_dict(first)
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes is None
+        assert coordinator.has_changes(frozenset({"services"})) is True
+
+        coordinator.data = StationData.from_dict(
+            {
+                **first,
+                "station_info": {"name": "Station", "brand": "Other"},
+                "fuels": {"gasolio_self": {"price": 1.69}, "gpl_self": {"price": 0.8}},
+                "last_update": "2026-06-01T09:00:00+02:00",
+            }
+        )
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes == {
+            "station_info.brand",
+            "fuels.gasolio_self",
+            "fuels.benzina_self",
+            "fuels.gpl_self",
+        }
+        assert coordinator.has_changes(frozenset({"services", "opening_hours"})) is False
+
+        coordinator.data = replace(coordinator.data, services=frozenset({"1", "8"}))
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes == {"services"}
+
+        coordinator.data = replace(coordinator.data, opening_hours=(ScheduleDay(h24=True),))
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes == {"opening_hours"}
+
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes == frozenset()
+
+        # Availability changes affect every entity.
+        coordinator.last_update_success = False
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes is None
+        coordinator.data = None
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes is None
+
+    def test_restored_data_is_marked_and_live_changes_are_persisted(self) -> None:
+        coordinator = _make_coordinator()
+        coordinator.last_update_success = True
+        coordinator.csv_manager.get_station_by_id.return_value = None
+        coordinator.async_set_updated_data = MagicMock()
+        stored_data = {
+            "station_info": {"id": 123},
+            "fuels": {"Benzina_self": {"price": 1.8, "previous_price": 1.85}},
+            "services": [],
+            "opening_hours": [],
+        }
+        coordinator._store.async_load = AsyncMock(
+            side_effect=[
+                coordinator_module.HomeAssistantError("corrupt"),
+                None,
+                {"station_id": "other", "data": stored_data},
+                {"station_id": "123", "data": {"fuels": {"Benzina_self": 1.8}}},
+                {
+                    "station_id": "123",
+                    "saved_at": "2025-03-01T06:00:00+00:00",
+                    "data": stored_data,
+                    "refresh_timing": ["2025-02-28T07:10:00+00:00", "bad"],
+                },
+            ]
+        )
+
+        assert [asyncio.run(coordinator.async_restore_state()) for _ in range(4)] == [
+            False,
+            False,
+            False,
+            False,
+        ]
+        assert coordinator.data is None
+        assert asyncio.run(coordinator.async_restore_state()) is True
+        assert coordinator.data == StationData.from_dict(stored_data)
+        assert coordinator.data.fuels["Benzina_self"].previous_price == 1.85
+        assert coordinator.data_is_restored is True
+        assert coordinator.restored_at == "2025-03-01T06:00:00+00:00"
+
+        # Restored data is shown but not written back.
+        coordinator.async_update_listeners()
+        coordinator._store.async_delay_save.assert_not_called()
+
+        coordinator.data = coordinator._process_station_response(
+            _station_response(
+                {"id": 123, "fuels": [{"name": "Benzina", "isSelf": True, "price": 1.8}]}
+            )
+        )
+        assert coordinator.data_is_restored is False
+        assert coordinator.data["fuels"]["Benzina_self"]["previous_price"] == 1.85
+        coordinator.async_update_listeners()
+        assert coordinator.data_changes is None
+        save, delay = coordinator._store.async_delay_save.call_args.args
+        assert delay == coordinator_module.STATE_SAVE_DELAY_SECONDS
+        assert save() == {
+            "station_id": "123",
+            "saved_at": "2025-03-01T12:00:00+00:00",
+            "data": coordinator.data.as_dict(),
+            "refresh_timing": ["2025-02-28T07:10:00+00:00"],
+        }
+        assert StationData.from_dict(save()["data"]) == coordinator.data
+
+        # Unchanged refreshes are not persisted again.
+        coordinator.async_update_listeners()
+        assert coordinator._store.async_delay_save.call_count == 1
+
+    def test_placeholder_data_uses_registry_details(self) -> None:
+        coordinator = _make_coordinator()
+        coordinator.csv_manager.get_station_by_id.return_value = {
+            "name": "Registry name",
+            "address": "Via Roma 1",
+            "brand": "Brand",
+            "latitude": "45.1",
+            "longitude": "9.2",
+        }
+
+        coordinator.async_set_placeholder_data()
+
+        assert coordinator.data_is_restored is True
+        assert coordinator.data["station_info"]["id"] == "123"
+        assert coordinator.data["station_info"]["name"] == "Registry name"
+        assert coordinator.data["station_info"]["latitude"] == 45.1
+        assert coordinator.data["fuels"] == {}
+        assert coordinator.data.services == ()
+
+    def test_removing_an_entry_removes_its_stored_data(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        store = MagicMock(async_remove=AsyncMock())
+        store_class = MagicMock(return_value=store)
+        monkeypatch.setattr(coordinator_module, "Store", store_class)
+
+        asyncio.run(coordinator_module.async_remove_stored_state("hass", "entry_1"))
+
+        store_class.assert_called_once_with(
+            "hass", coordinator_module.STATE_STORAGE_VERSION, f"{coordinator_module.DOMAIN}.entry_1"
+        )
+        store.async_remove.assert_awaited_once()
 
     def test_async_force_csv_update_propagates_success(self) -> None:
         coordinator = _make_coordinator()
@@ -96,3 +96,36 @@ def test_get_next_run_time_without_cronsim(monkeypatch: pytest.MonkeyPatch) -> N
 
     with pytest.raises(ImportError, match="cronsim is required"):
         cron_helper.get_next_run_time("0 * * * *")
+
+
+def test_jitter_offset_is_deterministic_and_spread_across_the_window() -> None:
+    window = timedelta(minutes=10)
+    offsets = [cron_helper.get_jitter_offset(f"entry_{index}", window) for index in range(100)]
+
+    assert offsets == [
+        cron_helper.get_jitter_offset(f"entry_{index}", window) for index in range(100)
+    ]
+    assert all(timedelta(0) <= offset < window for offset in offsets)
+    assert len(set(offsets)) > 90
+    # Every minute of the window gets some of the entries.
+    assert {int(offset.total_seconds()) // 60 for offset in offsets} == set(range(10))
+    assert cron_helper.get_jitter_offset("entry_1", timedelta(0)) == timedelta(0)
+
+
+def test_get_next_run_time_applies_the_capped_jitter_offset(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    base = datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(
+        cron_helper,
+        "iter_run_times",
+        lambda cron_expr, base_time=None: iter(
+            base + timedelta(minutes=5 * step) for step in range(1, 4)
+        ),
+    )
+    run = base + timedelta(minutes=5)
+
+    assert cron_helper.get_next_run_time("*/5 * * * *", base) == run
+    assert cron_helper.get_next_run_time(
+        "*/5 * * * *", base, jitter_seed="entry_1", jitter_window=timedelta(minutes=10)
+    ) == run + cron_helper.get_jitter_offset("entry_1", timedelta(minutes=5))
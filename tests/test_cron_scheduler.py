@@ -0,0 +1,258 @@
+"""Tests for the shared cron scheduler."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti import cron_scheduler
+from custom_components.osservaprezzi_carburanti.const import DOMAIN
+from custom_components.osservaprezzi_carburanti.cron_helper import get_jitter_offset
+from custom_components.osservaprezzi_carburanti.cron_scheduler import (
+    CRON_SCHEDULER_DATA_KEY,
+    CronScheduler,
+    async_remove_cron_scheduler,
+    get_cron_scheduler,
+)
+
+_START = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+_PERIODS = {"hourly": timedelta(hours=1), "half_hourly": timedelta(minutes=30)}
+
+
+class _Timers:
+    """Records armed timers and their cancellations."""
+
+    def __init__(self) -> None:
+        self.armed: list[tuple[Any, datetime]] = []
+        self.cancelled = 0
+
+    def track(self, hass: Any, action: Any, when: datetime) -> Any:
+        self.armed.append((action, when))
+
+        def _cancel() -> None:
+            self.cancelled += 1
+
+        return _cancel
+
+
+@pytest.fixture
+def timers(monkeypatch: pytest.MonkeyPatch) -> _Timers:
+    fake = _Timers()
+    monkeypatch.setattr(cron_scheduler, "async_track_point_in_utc_time", fake.track)
+    monkeypatch.setattr(cron_scheduler.dt_util, "as_utc", lambda value: value)
+    return fake
+
+
+@pytest.fixture
+def iterators(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace cron iterators with fixed periods and record each one created."""
+    created: list[str] = []
+
+    def iter_run_times(cron: str) -> Any:
+        created.append(cron)
+        return (_START + _PERIODS[cron] * step for step in count(1))
+
+    monkeypatch.setattr(cron_scheduler, "iter_run_times", iter_run_times)
+    return created
+
+
+@pytest.fixture
+def coordinator_factory(make_coordinator: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a factory of coordinators recording their refresh requests."""
+
+    def _make(entry_id: str, refreshes: list[str] | None = None) -> Any:
+        async def async_request_refresh() -> None:
+            if refreshes is not None:
+                refreshes.append(entry_id)
+            if entry_id == "broken":
+                raise RuntimeError("boom")
+
+        return make_coordinator(entry_id, async_request_refresh=async_request_refresh)
+
+    return _make
+
+
+def test_entries_with_one_expression_share_a_group_timer_and_handler_call(
+    timers: _Timers, iterators: list[str], hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    scheduler = CronScheduler(hass)
+    handler = MagicMock()
+    coordinators = [coordinator_factory(f"entry_{index}") for index in range(100)]
+
+    for coordinator in coordinators:
+        scheduler.async_add(coordinator, "half_hourly", handler)
+
+    assert iterators == ["half_hourly"]
+    assert [when for _, when in timers.armed] == [_START + timedelta(minutes=30)]
+
+    fire, when = timers.armed[-1]
+    fire(when)
+
+    handler.assert_called_once_with(coordinators)
+    assert iterators == ["half_hourly"]
+    assert timers.armed[-1][1] == _START + timedelta(hours=1)
+    assert scheduler.next_run("entry_0") == _START + timedelta(hours=1)
+    assert scheduler.status()["groups"] == [
+        {
+            "cron_expression": "half_hourly",
+            "jitter_window_seconds": 0,
+            "entries": 100,
+            "pending": 0,
+            "next_run": (_START + timedelta(hours=1)).isoformat(),
+            "fired": 1,
+        }
+    ]
+
+
+def test_groups_fire_separately_and_skip_missed_runs(
+    timers: _Timers,
+    iterators: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    hass: MagicMock,
+    coordinator_factory: Callable[..., Any],
+) -> None:
+    start_cycle = MagicMock()
+    monkeypatch.setattr(cron_scheduler, "start_response_cache_cycle", start_cycle)
+    scheduler = CronScheduler(hass)
+    first, second = MagicMock(), MagicMock()
+    scheduler.async_add(coordinator_factory("entry_1"), "half_hourly", first)
+    scheduler.async_add(coordinator_factory("entry_2"), "hourly", second)
+    remove_third = scheduler.async_add(coordinator_factory("entry_3"), "hourly", first)
+
+    fire, _ = timers.armed[-1]
+    # The timer fired late, after three half-hourly runs were due.
+    fire(_START + timedelta(hours=1, minutes=40))
+
+    assert first.call_count == 2
+    second.assert_called_once()
+    # Runs starting in one timer call share one response cache cycle.
+    start_cycle.assert_called_once_with()
+    assert scheduler.next_run("entry_1") == _START + timedelta(hours=2)
+    assert scheduler.next_run("entry_2") == _START + timedelta(hours=2)
+
+    remove_third()
+    remove_third()
+    scheduler.async_remove("entry_2")
+    assert [group["cron_expression"] for group in scheduler.status()["groups"]] == [
+        "half_hourly"
+    ]
+    assert scheduler.next_run("entry_2") is None
+
+    # Adding an entry again moves it to its new group.
+    scheduler.async_add(coordinator_factory("entry_1"), "hourly", first)
+    assert [group["cron_expression"] for group in scheduler.status()["groups"]] == ["hourly"]
+    assert iterators == ["half_hourly", "hourly", "hourly"]
+
+
+def test_group_requests_are_spread_across_the_jitter_window(
+    timers: _Timers, iterators: list[str], hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    scheduler = CronScheduler(hass)
+    calls: list[tuple[datetime, list[str]]] = []
+    clock = [_START]
+
+    def handler(coordinators: list[Any]) -> None:
+        calls.append(
+            (clock[0], [coordinator.config_entry.entry_id for coordinator in coordinators])
+        )
+
+    entry_ids = [f"entry_{index}" for index in range(5)]
+    for entry_id in entry_ids:
+        scheduler.async_add(coordinator_factory(entry_id), "hourly", handler, timedelta(minutes=10))
+    # The window of a half-hourly group is capped at the 30 minutes between runs.
+    scheduler.async_add(coordinator_factory("capped"), "half_hourly", handler, timedelta(hours=2))
+    scheduler.async_add(coordinator_factory("removed"), "hourly", handler, timedelta(minutes=10))
+    offsets = {
+        entry_id: get_jitter_offset(entry_id, timedelta(minutes=10)) for entry_id in entry_ids
+    }
+    capped = get_jitter_offset("capped", timedelta(minutes=30))
+    run = _START + timedelta(hours=1)
+    assert scheduler.next_run("entry_0") == run + offsets["entry_0"]
+
+    fire, when = timers.armed[-1]
+    # Runs start at the cron time, and each entry is due at its own offset.
+    assert when == _START + timedelta(minutes=30)
+    while when < run + timedelta(minutes=10):
+        clock[0] = when
+        fire(when)
+        if when == run:
+            # Every entry of the run is pending at its own offset.
+            scheduler.async_remove("removed")
+            assert scheduler.next_run("entry_1") == run + offsets["entry_1"]
+            assert scheduler.status()["groups"][1]["pending"] == 5
+        fire, when = timers.armed[-1]
+
+    expected = [(_START + timedelta(minutes=30) + capped, ["capped"])]
+    expected += sorted((run + offset, [entry_id]) for entry_id, offset in offsets.items())
+    assert calls == expected
+    assert scheduler.next_run("entry_1") == run + timedelta(hours=1) + offsets["entry_1"]
+    assert scheduler.status()["groups"][1] == {
+        "cron_expression": "hourly",
+        "jitter_window_seconds": 600,
+        "entries": 5,
+        "pending": 0,
+        "next_run": (run + timedelta(hours=1)).isoformat(),
+        "fired": 1,
+    }
+
+
+def test_default_handler_refreshes_a_group_in_one_task(
+    timers: _Timers,
+    iterators: list[str],
+    caplog: pytest.LogCaptureFixture,
+    hass: MagicMock,
+    coordinator_factory: Callable[..., Any],
+) -> None:
+    refreshes: list[str] = []
+
+    async def run() -> None:
+        scheduler = get_cron_scheduler(hass)
+        assert get_cron_scheduler(hass) is scheduler
+        for entry_id in ("entry_1", "broken", "entry_2"):
+            scheduler.async_add(coordinator_factory(entry_id, refreshes), "hourly")
+        fire, when = timers.armed[-1]
+        fire(when)
+        assert scheduler.status()["running_refreshes"] == 1
+        await asyncio.gather(*scheduler._tasks)
+
+    asyncio.run(run())
+
+    assert refreshes == ["entry_1", "broken", "entry_2"]
+    hass.async_create_background_task.assert_called_once()
+    assert "Scheduled refresh of broken failed: boom" in caplog.text
+
+
+def test_shutdown_cancels_timer_and_running_refreshes(
+    timers: _Timers, iterators: list[str], hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    release = asyncio.Event()
+
+    async def run() -> asyncio.Task[None]:
+        scheduler = get_cron_scheduler(hass)
+        coordinator = coordinator_factory("entry_1")
+
+        async def blocked_refresh() -> None:
+            await release.wait()
+
+        coordinator.async_request_refresh = blocked_refresh
+        scheduler.async_add(coordinator, "hourly")
+        scheduler.async_add(coordinator_factory("entry_2"), "hourly")
+        fire, _ = timers.armed[-1]
+        fire(_START + timedelta(hours=1))
+        (task,) = scheduler._tasks
+        async_remove_cron_scheduler(hass)
+        async_remove_cron_scheduler(hass)
+        await asyncio.gather(task, return_exceptions=True)
+        assert scheduler.status() == {"next_run": None, "groups": [], "running_refreshes": 0}
+        return task
+
+    task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert timers.cancelled == 1
+    assert CRON_SCHEDULER_DATA_KEY not in hass.data[DOMAIN]
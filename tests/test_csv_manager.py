@@ -6,6 +6,7 @@ import json
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
@@ -42,6 +43,10 @@ def _parse_csv_lines(csv_manager, lines):
     return success
 
 
+def _use_session(csv_manager, session):
+    csv_manager.http_client = SimpleNamespace(session=session)
+
+
 class FakeCSVResponse:
     """Async response context for CSV download tests."""
 
@@ -317,6 +322,7 @@ class TestCSVCacheValidation:
             {"version": "2.0", "stations": {}, "csv_separator": 1},
             {"version": "2.0", "stations": {}, "csv_etag": 1},
             {"version": "2.0", "stations": {}, "csv_last_modified": 1},
+            {"version": "2.0", "stations": {}, "registry_generation": 1},
         ],
     )
     def test_load_cache_rejects_invalid_shapes_without_partial_state(self, tmp_path, payload):
@@ -359,10 +365,15 @@ class TestCSVCacheValidation:
         )
 
         assert asyncio.run(csv_manager.async_load_cached_data()) is True
-        assert hass.async_add_executor_job.call_args.args == (
+        assert hass.async_add_executor_job.call_args_list[0].args == (
             csv_module._load_json_file_sync,
             str(tmp_path / "cache.json"),
         )
+        # Caches without a persisted generation hash their stations off the loop.
+        assert hass.async_add_executor_job.call_args.args == (
+            csv_module.registry_generation_of,
+            {},
+        )
 
     def test_parse_cached_datetime_variants(self, csv_manager, monkeypatch):
         fixed_now = datetime(2026, 6, 1, tzinfo=timezone.utc)
@@ -550,9 +561,9 @@ class TestCSVCacheValidation:
         storage = tmp_path / ".storage"
         storage.mkdir()
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(status=200, text="\n".join(PIPE_CSV_LINES))
-        )
+        ))
         monkeypatch.setattr(
             csv_module.dt_util,
             "now",
@@ -606,7 +617,7 @@ class TestCSVCacheValidation:
         hass.config.path.return_value = str(tmp_path / "unused")
         hass.async_add_executor_job.side_effect = _run_in_executor
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(FakeCSVResponse(status=304))
+        _use_session(csv_manager, FakeCSVSession(FakeCSVResponse(status=304)))
         monkeypatch.setattr(csv_module.dt_util, "now", lambda: now)
 
         assert asyncio.run(csv_manager.async_update_csv_data()) is True
@@ -616,7 +627,7 @@ class TestCSVCacheValidation:
         hass = MagicMock()
         hass.config.path.return_value = str(tmp_path / "unused")
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(FakeCSVResponse(status=304))
+        _use_session(csv_manager, FakeCSVSession(FakeCSVResponse(status=304)))
         csv_manager._async_save_cache_data = AsyncMock(return_value=False)
 
         assert asyncio.run(csv_manager.async_update_csv_data()) is False
@@ -638,7 +649,7 @@ class TestCSVCacheValidation:
         hass = MagicMock()
         hass.config.path.return_value = str(tmp_path / "unused")
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = ClearingSession(FakeCSVResponse(status=304))
+        _use_session(csv_manager, ClearingSession(FakeCSVResponse(status=304)))
 
         assert asyncio.run(csv_manager.async_update_csv_data()) is False
 
@@ -646,7 +657,7 @@ class TestCSVCacheValidation:
         hass = MagicMock()
         hass.config.path.return_value = str(tmp_path / "unused")
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(FakeCSVResponse(status=500))
+        _use_session(csv_manager, FakeCSVSession(FakeCSVResponse(status=500)))
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is False
 
@@ -658,7 +669,7 @@ class TestCSVCacheValidation:
         csv_manager = CSVStationManager(hass)
         existing = '{"stations": {"existing": {"id": "existing"}}}'
         Path(csv_manager._cache_path).write_text(existing, encoding="utf-8")
-        csv_manager.session = FakeCSVSession(FakeCSVResponse(status=200, text="bad"))
+        _use_session(csv_manager, FakeCSVSession(FakeCSVResponse(status=200, text="bad")))
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is False
         assert Path(csv_manager._cache_path).read_text(encoding="utf-8") == existing
@@ -675,13 +686,13 @@ class TestCSVCacheValidation:
         csv_manager._csv_last_modified = "yesterday"
         original_content = "known-good-csv"
         (tmp_path / "stations.csv").write_text(original_content, encoding="utf-8")
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(
                 status=200,
                 text="<html>\n<body>Service unavailable</body>",
                 headers={"ETag": '"new"', "Last-Modified": "today"},
             )
-        )
+        ))
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is False
         assert csv_manager._stations_cache == {"existing": {"id": "existing"}}
@@ -700,9 +711,9 @@ class TestCSVCacheValidation:
         hass.config.path.return_value = str(tmp_path / "unused")
         hass.async_add_executor_job.side_effect = parse_and_clear
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(status=200, text="\n".join(PIPE_CSV_LINES))
-        )
+        ))
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is False
 
@@ -723,9 +734,9 @@ class TestCSVCacheValidation:
         hass.config.path.return_value = str(tmp_path / "unused")
         hass.async_add_executor_job.side_effect = parse_and_refresh
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(status=200, text="\n".join(PIPE_CSV_LINES))
-        )
+        ))
         monkeypatch.setattr(csv_module.dt_util, "now", lambda: next(now_values))
 
         assert asyncio.run(csv_manager.async_update_csv_data()) is True
@@ -735,7 +746,7 @@ class TestCSVCacheValidation:
         hass = MagicMock()
         hass.config.path.return_value = str(tmp_path / "unused")
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(aiohttp.ClientError("boom"))
+        _use_session(csv_manager, FakeCSVSession(aiohttp.ClientError("boom")))
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is False
 
@@ -765,13 +776,13 @@ class TestCSVCacheValidation:
         hass.async_add_executor_job.side_effect = _run_in_executor
         (tmp_path / ".storage").mkdir()
         csv_manager = CSVStationManager(hass)
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(
                 status=200,
                 text="\n".join(PIPE_CSV_LINES),
                 headers={"ETag": '"abc"', "Last-Modified": "today"},
             )
-        )
+        ))
         monkeypatch.setattr(csv_module.dt_util, "now", lambda: now)
 
         assert asyncio.run(csv_manager.async_update_csv_data(force_update=True)) is True
@@ -834,6 +845,57 @@ class TestCSVCacheValidation:
         with pytest.raises(TypeError):
             snapshot.stations[0]["name"] = "Changed"
 
+    def test_ensure_registry_reuses_snapshot_until_stations_change(
+        self, csv_manager, monkeypatch
+    ):
+        now = datetime(2026, 7, 28, 8, 0, tzinfo=timezone.utc)
+        csv_manager._set_stations_cache({"123": {"id": "123"}}, "first")
+        csv_manager._last_update = now
+        csv_manager.async_initialize = AsyncMock(return_value=True)
+        monkeypatch.setattr(csv_module.dt_util, "now", lambda: now)
+
+        first = asyncio.run(csv_manager.async_ensure_registry())
+        second = asyncio.run(csv_manager.async_ensure_registry())
+        csv_manager._set_stations_cache({"456": {"id": "456"}}, "second")
+        third = asyncio.run(csv_manager.async_ensure_registry())
+
+        assert first.generation == second.generation == "first"
+        assert second.stations is first.stations
+        assert third.generation == "second"
+        assert [station["id"] for station in third.stations] == ["456"]
+
+    def test_registry_index_is_built_once_per_generation(self, csv_manager, monkeypatch):
+        now = datetime(2026, 7, 28, 8, 0, tzinfo=timezone.utc)
+        csv_manager._set_stations_cache({"123": {"id": "123"}}, "first")
+        csv_manager._last_update = now
+        csv_manager.async_initialize = AsyncMock(return_value=True)
+        monkeypatch.setattr(csv_module.dt_util, "now", lambda: now)
+        builder = MagicMock(side_effect=lambda stations: len(stations))
+
+        async def _exercise():
+            snapshot = await csv_manager.async_ensure_registry()
+            first = await csv_manager.async_registry_index(snapshot, "count", builder)
+            second = await csv_manager.async_registry_index(snapshot, "count", builder)
+            csv_manager._set_stations_cache({"1": {"id": "1"}, "2": {"id": "2"}}, "second")
+            stale = await csv_manager.async_registry_index(snapshot, "count", builder)
+            fresh_snapshot = await csv_manager.async_ensure_registry()
+            fresh = await csv_manager.async_registry_index(fresh_snapshot, "count", builder)
+            return first, second, stale, fresh
+
+        assert asyncio.run(_exercise()) == (1, 1, 1, 2)
+        assert builder.call_count == 3
+        assert csv_manager._registry_indexes == {"count": ("second", 2)}
+
+    def test_clear_cache_starts_new_registry_generation(self, csv_manager):
+        csv_manager._set_stations_cache({"123": {"id": "123"}}, "first")
+        csv_manager._registry_indexes["area"] = ("first", object())
+
+        assert asyncio.run(csv_manager.async_clear_cache()) is True
+
+        assert csv_manager._registry_generation == ""
+        assert csv_manager._registry_indexes == {}
+        assert csv_manager._stations_cache == {}
+
     def test_ensure_registry_can_use_stale_cache(self, csv_manager, monkeypatch):
         now = datetime(2026, 7, 28, 8, 0, tzinfo=timezone.utc)
         csv_manager._stations_cache = {
@@ -873,6 +935,7 @@ class TestCSVCacheValidation:
         assert csv_manager.registry_status() == {
             "initialized": True,
             "station_count": 1,
+            "generation": "",
             "last_update": "2026-06-01T23:00:00+00:00",
             "is_stale": False,
             "separator": ";",
@@ -895,6 +958,7 @@ class TestCSVCacheValidation:
         assert status["is_stale"] is True
         assert status["has_etag"] is False
         assert status["has_last_modified"] is False
+        assert csv_manager.registry_generation == status["generation"] == ""
 
     def test_get_shared_csv_manager_reuses_domain_owner(self):
         hass = MagicMock()
@@ -969,9 +1033,9 @@ class TestCSVCacheValidation:
         csv_manager._cache_path = str(tmp_path / "cache.json")
         csv_manager._stations_cache = {"existing": {"id": "existing"}}
         csv_manager._last_update = datetime(2026, 5, 1, tzinfo=timezone.utc)
-        csv_manager.session = FakeCSVSession(
+        _use_session(csv_manager, FakeCSVSession(
             FakeCSVResponse(status=200, text="\n".join(PIPE_CSV_LINES))
-        )
+        ))
         monkeypatch.setattr(csv_module.dt_util, "now", lambda: now)
         monkeypatch.setattr(
             csv_module, "_write_json_file_atomic_sync", MagicMock(side_effect=OSError("full"))
@@ -1021,7 +1085,7 @@ class TestCSVCacheValidation:
                 def get(self, *args, **kwargs):
                     return FakeResponse()
 
-            csv_manager.session = FakeSession()
+            _use_session(csv_manager, FakeSession())
 
             update_task = asyncio.create_task(csv_manager.async_update_csv_data(force_update=True))
             await asyncio.wait_for(text_started.wait(), timeout=1)
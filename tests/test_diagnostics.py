@@ -10,24 +10,46 @@ from custom_components.osservaprezzi_carburanti.const import (
     DOMAIN,
 )
 from custom_components.osservaprezzi_carburanti import diagnostics
+from custom_components.osservaprezzi_carburanti.models import StationData
+from custom_components.osservaprezzi_carburanti.batch_coordinator import (
+    BATCH_COORDINATOR_DATA_KEY,
+    StationBatchCoordinator,
+)
+from custom_components.osservaprezzi_carburanti.cron_scheduler import (
+    CRON_SCHEDULER_DATA_KEY,
+    CronScheduler,
+)
+from custom_components.osservaprezzi_carburanti.startup import (
+    STARTUP_QUEUE_DATA_KEY,
+    StartupRefreshQueue,
+)
 
 
 class _Coordinator:
     """Minimal coordinator accepted by diagnostics."""
 
     def __init__(self) -> None:
-        self.data = {
-            "station_info": {
-                "name": "Private station",
-                "address": "Private address",
-                "latitude": 41.9,
-                "longitude": 12.5,
-            },
-            "fuels": {"benzina_self": {"price": 1.8}},
-            "services": [{"id": 1}],
-            "opening_hours": [{"giornoSettimanaId": 1}],
-        }
+        self.data = StationData.from_dict(
+            {
+                "station_info": {
+                    "name": "Private station",
+                    "address": "Private address",
+                    "latitude": 41.9,
+                    "longitude": 12.5,
+                },
+                "fuels": {"benzina_self": {"price": 1.8}},
+                "services": [{"id": 1}],
+                "opening_hours": [{"giornoSettimanaId": 1}],
+            }
+        )
         self.last_update_success = True
+        self.last_fetch_stats = {"unchanged": True, "bytes_saved": 512}
+        self.retry_status = lambda: {"pending": True, "retries_used": 1}
+        self.data_is_restored = True
+        self.restored_at = "2026-06-01T06:00:00+00:00"
+        self.refresh_timing = SimpleNamespace(
+            status=lambda: {"observations": 3, "last_observed": "2026-06-01T07:10:00+00:00"}
+        )
         self.csv_manager = SimpleNamespace(
             registry_status=lambda: {
                 "initialized": True,
@@ -64,13 +86,65 @@ def test_diagnostics_redacts_station_and_omits_location(monkeypatch) -> None:
         "fuel_count": 1,
         "service_count": 1,
         "opening_hours_count": 1,
+        "last_fetch": {"unchanged": True, "bytes_saved": 512},
+        "retry": {"pending": True, "retries_used": 1},
+        "data_restored": True,
+        "restored_at": "2026-06-01T06:00:00+00:00",
+        "refresh_timing": {
+            "observations": 3,
+            "last_observed": "2026-06-01T07:10:00+00:00",
+        },
     }
+    assert set(result["api_response_cache"]) >= {"requests", "bytes_saved"}
+    assert result["http_client"] is None
+    assert result["batch_refresh"] is None
+    assert result["cron_scheduler"] is None
+    assert result["daily_prices"] is None
+    assert result["startup"] is None
+    assert result["api_circuit_breaker"]["state"] in {"closed", "open", "half_open"}
+    assert "total" in result["api_request_metrics"]["phases_seconds"]
     assert result["registry"]["station_count"] == 100
     assert "station_info" not in result
     assert "latitude" not in str(result)
     assert "Private" not in str(result)
 
 
+def test_diagnostics_reports_shared_batch_refresh(monkeypatch) -> None:
+    monkeypatch.setattr(diagnostics, "CarburantiDataUpdateCoordinator", _Coordinator)
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": {"coordinator": _Coordinator()}}})
+    scheduler = CronScheduler(hass)
+    hass.data[DOMAIN][CRON_SCHEDULER_DATA_KEY] = scheduler
+    hass.data[DOMAIN][BATCH_COORDINATOR_DATA_KEY] = StationBatchCoordinator(hass, scheduler)
+
+    result = asyncio.run(
+        diagnostics.async_get_config_entry_diagnostics(hass, _entry())
+    )
+
+    assert result["batch_refresh"] == {
+        "members": 0,
+        "next_run": None,
+        "running": False,
+        "batches": 0,
+        "last_batch": None,
+    }
+    assert result["cron_scheduler"] == {"next_run": None, "groups": [], "running_refreshes": 0}
+
+
+def test_diagnostics_reports_startup_timing(monkeypatch) -> None:
+    monkeypatch.setattr(diagnostics, "CarburantiDataUpdateCoordinator", _Coordinator)
+    hass = SimpleNamespace(data={DOMAIN: {"entry-1": {"coordinator": _Coordinator()}}})
+    queue = StartupRefreshQueue(hass, concurrency=2, interval=1.0)
+    queue.record_setup("entry-1", "refreshed", 0.0)
+    hass.data[DOMAIN][STARTUP_QUEUE_DATA_KEY] = queue
+
+    result = asyncio.run(
+        diagnostics.async_get_config_entry_diagnostics(hass, _entry())
+    )
+
+    assert result["startup"]["modes"] == {"refreshed": 1}
+    assert result["startup"]["entry"]["mode"] == "refreshed"
+
+
 def test_diagnostics_handles_unloaded_entry() -> None:
     hass = SimpleNamespace(data={})
 
@@ -87,14 +161,10 @@ def test_diagnostics_handles_unloaded_entry() -> None:
     }
 
 
-def test_diagnostics_handles_unexpected_payload_shapes(monkeypatch) -> None:
+def test_diagnostics_counts_empty_station_data(monkeypatch) -> None:
     monkeypatch.setattr(diagnostics, "CarburantiDataUpdateCoordinator", _Coordinator)
     coordinator = _Coordinator()
-    coordinator.data = {
-        "fuels": [],
-        "services": {},
-        "opening_hours": {},
-    }
+    coordinator.data = StationData()
     hass = SimpleNamespace(
         data={DOMAIN: {"entry-1": {"coordinator": coordinator}}}
     )
@@ -1,9 +1,26 @@
 """Tests for local nearby-station discovery."""
 from __future__ import annotations
 
+import base64
+import json
+import random
+
+import pytest
+
 from custom_components.osservaprezzi_carburanti.discovery import (
+    AreaSearchIndex,
+    NearbyOrigin,
+    NearbySearchIndex,
+    RegistryVocabularyIndex,
+    VocabularySuggestion,
+    _edit_distance,
+    _SymmetricDeleteDictionary,
+    _haversine_distance_km,
+    decode_search_cursor,
+    encode_search_cursor,
     find_nearby_stations,
     find_stations_by_area,
+    plan_zone_queries,
 )
 
 
@@ -303,3 +320,330 @@ def test_area_candidate_uses_id_as_missing_name_and_normalizes_empty_metadata()
 
     assert candidates[0].name == "42"
     assert candidates[0].brand is None
+
+
+def _province_stations() -> list[dict[str, object]]:
+    return [
+        {"id": str(station_id), "name": f"Station {station_id % 4}", "province": "RM"}
+        for station_id in range(1, 11)
+    ] + [
+        {"id": "beta", "name": "Station 1", "province": "RM"},
+        {"id": "99", "name": "Station 0", "province": "MI"},
+        {"id": None, "name": "Missing", "province": "RM"},
+    ]
+
+
+def test_area_index_pages_match_unpaged_search_order() -> None:
+    stations = _province_stations()
+    index = AreaSearchIndex(stations)
+    expected = find_stations_by_area(stations, municipality="", province="rm", limit=50)
+
+    collected = []
+    after = None
+    while True:
+        page = index.search(municipality="", province="rm", limit=3, after=after)
+        collected.extend(page.candidates)
+        if page.next_key is None:
+            break
+        after = page.next_key
+
+    assert len(index) == 12
+    assert collected == list(expected)
+    assert [candidate.station_id for candidate in collected] == [
+        "4", "8", "1", "5", "9", "beta", "2", "6", "10", "3", "7",
+    ]
+
+
+def test_area_index_applies_all_filters_and_reports_last_page() -> None:
+    index = AreaSearchIndex(
+        [
+            {
+                "id": "1",
+                "name": "Alfa",
+                "brand": "Blu",
+                "municipality": "Città di Castello",
+                "province": "PG",
+                "station_type": "Stradale",
+            },
+            {
+                "id": "2",
+                "name": "Beta",
+                "municipality": "Citta di Castello",
+                "province": "PG",
+                "station_type": "Stradale",
+            },
+            {
+                "id": "3",
+                "name": "Blu nautico",
+                "municipality": "Citta di Castello",
+                "province": "PG",
+                "station_type": "Impianto nautico",
+            },
+            {
+                "id": "4",
+                "name": "Blu",
+                "municipality": "Perugia",
+                "province": "PG",
+                "station_type": "Stradale",
+            },
+            {
+                "id": "5",
+                "name": "Blu",
+                "municipality": "Citta di Castello",
+                "province": "TR",
+                "station_type": "Stradale",
+            },
+        ]
+    )
+
+    page = index.search(
+        municipality="citta di castello",
+        province="PG",
+        text_filter="blu",
+        station_type="strada",
+        limit=1,
+    )
+
+    assert [candidate.station_id for candidate in page.candidates] == ["1"]
+    assert page.next_key is None
+
+
+def test_area_index_requires_a_filter_and_valid_limit() -> None:
+    index = AreaSearchIndex(_province_stations())
+
+    assert index.search(municipality="", limit=20).candidates == ()
+    assert index.search(municipality="", province="RM", limit=0).next_key is None
+
+
+@pytest.mark.parametrize(
+    "key",
+    [("station città", (0, 42)), ("station", (1, "beta"))],
+)
+def test_search_cursor_round_trips(key) -> None:
+    cursor = encode_search_cursor("5f2c9e01d4a7b3c8", key)
+
+    assert "=" not in cursor
+    assert decode_search_cursor(cursor) == ("5f2c9e01d4a7b3c8", key)
+
+
+def _raw_cursor(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "%%%",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        _raw_cursor("not-a-list"),
+        _raw_cursor(["g", "name", 0]),
+        # Generations are registry content hashes, not counters.
+        _raw_cursor([1, "name", 0, 1]),
+        _raw_cursor([True, "name", 0, 1]),
+        _raw_cursor(["g", 2, 0, 1]),
+        _raw_cursor(["g", "name", 0, "1"]),
+        _raw_cursor(["g", "name", 0, False]),
+        _raw_cursor(["g", "name", 1, 1]),
+        _raw_cursor(["g", "name", 2, "x"]),
+    ],
+)
+def test_search_cursor_rejects_malformed_values(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
+
+
+def _random_stations(count: int, seed: int) -> list[dict[str, object]]:
+    generator = random.Random(seed)
+    return [
+        {
+            "id": str(station_id),
+            "name": f"Station {generator.randint(0, 20)}",
+            "brand": generator.choice(["Eni", "Q8", "IP"]),
+            "station_type": generator.choice(["Stradale", "Autostradale"]),
+            "latitude": generator.uniform(41.0, 43.0),
+            "longitude": generator.uniform(11.5, 13.5),
+        }
+        for station_id in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_nearby_index_matches_linear_search(seed: int) -> None:
+    stations = _random_stations(400, seed)
+    index = NearbySearchIndex(stations)
+    generator = random.Random(seed * 100)
+    origins = [
+        NearbyOrigin(
+            latitude=generator.uniform(41.0, 43.0),
+            longitude=generator.uniform(11.5, 13.5),
+            radius_km=generator.choice([2, 5, 10, 20, 50]),
+            limit=generator.choice([1, 5, 20]),
+        )
+        for _ in range(12)
+    ]
+
+    results = index.search_many(origins, text_filter="eni", station_type="auto")
+
+    assert len(results) == len(origins)
+    for origin, candidates in zip(origins, results):
+        assert candidates == find_nearby_stations(
+            stations,
+            latitude=origin.latitude,
+            longitude=origin.longitude,
+            radius_km=origin.radius_km,
+            limit=origin.limit,
+            text_filter="eni",
+            station_type="auto",
+        )
+
+
+def test_nearby_index_wraps_the_antimeridian_and_covers_poles() -> None:
+    stations = [
+        {"id": "1", "name": "East", "latitude": 0.0, "longitude": 179.99},
+        {"id": "2", "name": "West", "latitude": 0.0, "longitude": -179.99},
+        {"id": "3", "name": "Pole", "latitude": 89.99, "longitude": 45.0},
+        {"id": "4", "name": "No coordinates", "latitude": None, "longitude": 1.0},
+        {"id": "", "name": "No ID", "latitude": 0.0, "longitude": 179.99},
+    ]
+    index = NearbySearchIndex(stations)
+
+    east = index.search(NearbyOrigin(0.0, 179.995, 5, 20))
+    west = index.search(NearbyOrigin(0.0, -179.995, 5, 20))
+    pole = index.search(NearbyOrigin(89.995, -135.0, 5, 20))
+    wide = index.search(NearbyOrigin(89.0, 0.0, 200, 20))
+
+    assert [candidate.station_id for candidate in east] == ["1", "2"]
+    assert [candidate.station_id for candidate in west] == ["2", "1"]
+    assert [candidate.station_id for candidate in pole] == ["3"]
+    assert [candidate.station_id for candidate in wide] == ["3"]
+
+
+def test_nearby_index_rejects_invalid_origins() -> None:
+    index = NearbySearchIndex(_random_stations(20, 4))
+
+    assert index.search_many(
+        [
+            NearbyOrigin(91, 12.5, 5, 20),
+            NearbyOrigin(41.9, 181, 5, 20),
+            NearbyOrigin(41.9, 12.5, 0, 20),
+            NearbyOrigin(41.9, 12.5, True, 20),
+            NearbyOrigin(41.9, 12.5, 5, 0),
+        ]
+    ) == ((), (), (), (), ())
+
+
+def test_vocabulary_suggests_close_municipalities_provinces_and_brands() -> None:
+    stations = [
+        {"municipality": "Reggio di Calabria", "province": "RC", "brand": "Agip Eni"},
+        {"municipality": "Reggio di Calabria", "province": "RC", "brand": "Agip"},
+        {"municipality": "REGGIO DI CALABRIA", "province": "RC", "brand": "Agip"},
+        {"municipality": "Reggio nell'Emilia", "province": "RE", "brand": "Q8"},
+        {"municipality": "Roma", "province": "RM", "brand": "Q8"},
+        {"municipality": "Rima", "province": "VC", "brand": None},
+        {"municipality": "  ", "province": None},
+    ]
+    index = RegistryVocabularyIndex(stations)
+
+    assert index.suggest(
+        municipality="Reggio Calbria",
+        province="RX",
+        brand="Agp",
+    ) == {
+        "municipality": (
+            VocabularySuggestion("Reggio di Calabria", 1, 3),
+        ),
+        "brand": (
+            VocabularySuggestion("Agip", 1, 2),
+            VocabularySuggestion("Agip Eni", 1, 1),
+        ),
+    }
+    assert index.suggest(municipality="Rmoa") == {
+        "municipality": (VocabularySuggestion("Roma", 1, 1),)
+    }
+    assert index.suggest(municipality="Reggio", limit=1) == {
+        "municipality": (VocabularySuggestion("Reggio di Calabria", 0, 3),)
+    }
+    assert index.suggest(municipality="Roma") == {}
+    assert index.suggest(municipality="Reggio Xyzzyx") == {}
+    assert index.suggest(municipality="Reggio Roma") == {}
+    assert index.suggest(municipality="!!", province="", brand=None) == {}
+    assert index.suggest(municipality="Rma", limit=0) == {}
+
+
+def test_symmetric_delete_lookup_matches_brute_force() -> None:
+    generator = random.Random(7)
+    alphabet = "abcde"
+    words = {
+        "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 11)))
+        for _ in range(300)
+    }
+    dictionary = _SymmetricDeleteDictionary(words)
+
+    for _ in range(200):
+        query = "".join(
+            generator.choice(alphabet) for _ in range(generator.randint(1, 11))
+        )
+        for max_distance in (0, 1, 2):
+            expected = {
+                word: distance
+                for word in words
+                if (distance := _edit_distance(query, word, max_distance)) is not None
+            }
+            assert dictionary.lookup(query, max_distance) == expected
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "limit", "expected"),
+    [
+        ("roma", "roma", 2, 0),
+        ("roma", "rmoa", 2, 1),
+        ("calabria", "calbria", 2, 1),
+        ("agip", "ip", 2, 2),
+        ("agip", "q8", 2, None),
+        ("abcdef", "badcfe", 2, None),
+        ("a", "abcd", 2, None),
+    ],
+)
+def test_edit_distance_is_bounded(
+    first: str, second: str, limit: int, expected: int | None
+) -> None:
+    assert _edit_distance(first, second, limit) == expected
+
+
+def test_plan_zone_queries_clusters_nearby_stations() -> None:
+    coordinates = {
+        "1": (41.9000, 12.5000),
+        "2": (41.9100, 12.5000),
+        "3": (41.9200, 12.5000),
+        "10": (45.4642, 9.1900),
+    }
+
+    queries = plan_zone_queries(coordinates, max_radius_km=5)
+
+    assert [query.station_ids for query in queries] == [("1", "2", "3"), ("10",)]
+    assert queries[0].latitude == 41.91
+    assert queries[0].radius_km == 1.3
+    assert queries[1].radius_km == 0.1
+    assert plan_zone_queries(coordinates, max_radius_km=0) == ()
+    assert plan_zone_queries({}, max_radius_km=5) == ()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_plan_zone_queries_covers_every_station_within_its_radius(seed: int) -> None:
+    generator = random.Random(seed)
+    coordinates = {
+        str(station_id): (generator.uniform(41.0, 42.0), generator.uniform(12.0, 13.0))
+        for station_id in range(40)
+    }
+
+    queries = plan_zone_queries(coordinates, max_radius_km=10)
+
+    assigned = [station_id for query in queries for station_id in query.station_ids]
+    assert sorted(assigned) == sorted(coordinates)
+    assert len(queries) < len(coordinates)
+    for query in queries:
+        assert query.radius_km <= 10
+        for station_id in query.station_ids:
+            assert _haversine_distance_km(
+                query.latitude, query.longitude, *coordinates[station_id]
+            ) <= query.radius_km
@@ -0,0 +1,165 @@
+"""Tests for the fake Osservaprezzi server and the load-test harness."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType, SimpleNamespace
+from typing import Any
+
+import aiohttp
+import pytest
+
+from custom_components.osservaprezzi_carburanti import api
+from custom_components.osservaprezzi_carburanti.const import BASE_URL
+from custom_components.osservaprezzi_carburanti.http_client import async_get_session
+
+SCRIPTS = Path(__file__).parents[1] / "scripts"
+
+
+def _load_script(name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their annotations through sys.modules.
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def fake() -> ModuleType:
+    """Load the fake server script without running its CLI."""
+    return _load_script("fake_osservaprezzi")
+
+
+@pytest.fixture(scope="module")
+def load_test() -> ModuleType:
+    """Load the load-test script without running its CLI."""
+    return _load_script("load_test")
+
+
+@pytest.fixture(autouse=True)
+def isolated_api_state(
+    monkeypatch: pytest.MonkeyPatch, load_test: ModuleType
+) -> Iterator[None]:
+    """Run against fresh API state and restore the shared state afterwards."""
+    for name in ("BASE_URL", "_RATE_LIMITER", "_CIRCUIT_BREAKER", "_REQUEST_METRICS"):
+        monkeypatch.setattr(api, name, getattr(api, name))
+    load_test.reset_integration_state(1000, 1000)
+    yield
+    load_test.reset_integration_state(1000, 1000)
+
+
+def _hass() -> Any:
+    return SimpleNamespace(data={}, bus=SimpleNamespace(async_listen_once=lambda *_: None))
+
+
+def test_fake_server_replays_fixtures_and_revalidates(fake: ModuleType) -> None:
+    async def run() -> list[Any]:
+        server = fake.FakeOsservaprezziServer(synthetic_stations=3)
+        await server.start()
+        api.BASE_URL = server.api_url
+        hass = _hass()
+        try:
+            first = await api.async_fetch_station(hass, "54233", max_age=0)
+            second = await api.async_fetch_station(hass, "54233", max_age=0)
+            synthetic = await api.fetch_station_data(hass, "900002", max_age=0)
+            zone = await api.fetch_zone_prices(hass, 41.8947, 12.49348, 0.5)
+            session = api.async_get_session(hass)
+            async with session.get(server.csv_url) as response:
+                registry = await response.text()
+            with pytest.raises(aiohttp.ClientResponseError) as missing:
+                await api.fetch_station_data(hass, "1", max_age=0)
+        finally:
+            await async_get_session(hass).close()
+            await server.stop()
+        return [first, second, synthetic, zone, registry, missing.value.status, server]
+
+    first, second, synthetic, zone, registry, missing, server = asyncio.run(run())
+
+    assert first.data["name"] == "UNION - BORGHESANO LUCCHESE"
+    assert second.unchanged and second.bytes_received == 0
+    assert synthetic["fuels"][0]["serviceAreaId"] == 900002
+    assert "54233" in zone
+    assert registry.startswith("Estrazione del 2026-06-05\nidImpianto|")
+    assert "\n900002|SYNTHETIC S.R.L.|" in registry
+    assert missing == 404
+    assert server.responses == {"200": 4, "304": 1, "404": 1}
+
+
+def test_fake_server_injects_throttling_errors_and_hangs(fake: ModuleType) -> None:
+    async def run() -> list[Any]:
+        faults = fake.FaultProfile(latency=0.01, jitter=0.01, hang_seconds=1)
+        server = fake.FakeOsservaprezziServer(faults=faults)
+        await server.start()
+        api.BASE_URL = server.api_url
+        hass = _hass()
+        errors: list[Any] = []
+        try:
+            for rates in (
+                {"throttle_rate": 1.0, "retry_after": None},
+                {"server_error_rate": 1.0},
+                {"hang_rate": 1.0},
+            ):
+                server.faults = fake.FaultProfile(hang_seconds=1, **rates)
+                with pytest.raises((aiohttp.ClientError, asyncio.TimeoutError)) as err:
+                    await api.async_fetch_station(hass, "54233", timeout=0.1, max_age=0)
+                errors.append(err.value)
+        finally:
+            await async_get_session(hass).close()
+            await server.stop()
+        return [errors, server]
+
+    errors, server = asyncio.run(run())
+
+    assert [getattr(err, "status", None) for err in errors[:2]] == [429, 503]
+    assert isinstance(errors[2], asyncio.TimeoutError)
+    assert server.responses["hung"] == 1
+    assert api.rate_limiter_status()["throttle_events"] == 1
+    assert api.circuit_breaker_status()["consecutive_failures"] == 2
+
+
+def test_load_test_reports_throughput_tail_latency_and_outcomes(
+    fake: ModuleType, load_test: ModuleType
+) -> None:
+    async def run() -> Any:
+        faults = fake.FaultProfile(latency=0.001, server_error_rate=0.05, price_change_rate=0.5)
+        server = fake.FakeOsservaprezziServer(synthetic_stations=200, faults=faults, seed=7)
+        await server.start()
+        # Two config entries share the first station.
+        station_ids = ["900000"] + [str(station_id) for station_id in server.synthetic_ids(200)]
+        try:
+            return await load_test.run_load_test(
+                server.api_url, station_ids, rounds=2, rate=1000, burst=1000
+            )
+        finally:
+            await server.stop()
+
+    report = asyncio.run(run()).as_dict()
+
+    assert report["entries"] == 201
+    assert report["refreshes"] == 402
+    assert report["refreshes_per_second"] > 0
+    latency = report["latency_seconds"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert report["outcomes"]["ok"] + report["outcomes"].get("503", 0) == 402
+    integration = report["integration"]
+    assert integration["http_client"]["connections_reused"] > 0
+    assert integration["response_cache"]["not_modified"] > 0
+    assert integration["request_metrics"]["requests"] < 402
+    assert api.BASE_URL == BASE_URL
+
+
+def test_load_test_report_without_samples(load_test: ModuleType) -> None:
+    report = load_test.LoadTestReport(entries=0, rounds=1, elapsed_seconds=0.0)
+
+    assert report.as_dict()["latency_seconds"] == {
+        "p50": None,
+        "p95": None,
+        "p99": None,
+        "max": None,
+    }
+    assert report.as_dict()["refreshes_per_second"] is None
@@ -0,0 +1,110 @@
+"""Tests for the integration-owned HTTP client."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.osservaprezzi_carburanti import http_client
+from custom_components.osservaprezzi_carburanti.const import DOMAIN
+from custom_components.osservaprezzi_carburanti.metrics import RequestTiming
+
+
+def _hass() -> SimpleNamespace:
+    return SimpleNamespace(data={})
+
+
+async def _ok(request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+def test_http_client_traces_requests_and_connection_reuse() -> None:
+    hass = _hass()
+
+    async def run() -> dict:
+        app = web.Application()
+        app.router.add_get("/", _ok)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        client = http_client.get_http_client(hass)
+        try:
+            assert http_client.get_http_client(hass) is client
+            assert client.status()["open"] is False
+            session = http_client.async_get_session(hass)
+            assert http_client.async_get_session(hass) is session
+            timings = [RequestTiming() for _ in range(3)]
+            for timing in timings:
+                async with session.get(
+                    f"http://127.0.0.1:{port}/", trace_request_ctx=timing
+                ) as response:
+                    assert await response.text() == "ok"
+            assert timings[0].connect > 0
+            assert timings[1].connect == 0
+            assert all(timing.time_to_first_byte > 0 for timing in timings)
+            return client.status()
+        finally:
+            await client.session.close()
+            await runner.cleanup()
+
+    status = asyncio.run(run())
+
+    assert hass.data[DOMAIN][http_client.HTTP_CLIENT_DATA_KEY] is not None
+    assert status["open"] is True
+    assert status["requests"] == 3
+    assert status["connections_created"] == 1
+    assert status["connections_reused"] == 2
+    assert status["reuse_ratio"] == 0.667
+
+
+def test_http_client_creates_session_through_home_assistant_and_reopens() -> None:
+    hass = _hass()
+    sessions = [MagicMock(closed=False), MagicMock(closed=False)]
+    create = MagicMock(side_effect=sessions)
+
+    with patch.object(http_client, "async_create_clientsession", create):
+        client = http_client.get_http_client(hass)
+        assert client.session is sessions[0]
+        assert client.session is sessions[0]
+        # Home Assistant closed the session, for example on shutdown.
+        sessions[0].closed = True
+        assert client.status()["open"] is False
+        assert client.session is sessions[1]
+
+    assert create.call_count == 2
+    assert create.call_args.args == (hass,)
+    (trace_config,) = create.call_args.kwargs["trace_configs"]
+    assert isinstance(trace_config, aiohttp.TraceConfig)
+    assert client.status() == {
+        "open": True,
+        "requests": 0,
+        "connections_created": 0,
+        "connections_reused": 0,
+        "dns_cache_hits": 0,
+        "dns_cache_misses": 0,
+        "reuse_ratio": None,
+    }
+
+
+def test_removing_the_http_client_closes_its_session() -> None:
+    hass = SimpleNamespace(data={}, async_create_background_task=MagicMock())
+    session = MagicMock(closed=False)
+
+    with patch.object(http_client, "async_create_clientsession", return_value=session):
+        client = http_client.get_http_client(hass)
+        assert client.session is session
+    http_client.async_remove_http_client(hass)
+    http_client.async_remove_http_client(hass)
+
+    assert http_client.HTTP_CLIENT_DATA_KEY not in hass.data[DOMAIN]
+    session.close.assert_called_once_with()
+    hass.async_create_background_task.assert_called_once()
+    assert client.status()["open"] is False
+    # A client that never opened a session has nothing to close.
+    http_client.get_http_client(hass).async_shutdown()
+    hass.async_create_background_task.assert_called_once()
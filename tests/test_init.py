@@ -3,21 +3,52 @@ from __future__ import annotations
 
 import asyncio
 import importlib
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from itertools import count
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
 
+from custom_components.osservaprezzi_carburanti import api, cron_scheduler, refresh_timing
 from custom_components.osservaprezzi_carburanti.csv_manager import (
+    CSVStationManager,
     RegistrySnapshot,
     RegistryUnavailableError,
+    registry_generation_of,
 )
+from custom_components.osservaprezzi_carburanti.http_client import (
+    HTTP_CLIENT_DATA_KEY,
+    HttpClient,
+)
+from custom_components.osservaprezzi_carburanti.models import StationData
+from custom_components.osservaprezzi_carburanti.rate_limiter import RequestPriority
+from custom_components.osservaprezzi_carburanti.refresh_timing import RefreshTiming
 
 
 init_module = importlib.import_module("custom_components.osservaprezzi_carburanti")
 
 
+def _patch_cron_timer(monkeypatch) -> list:
+    """Run cron schedules daily from 2026-01-01 and capture the scheduler's timers."""
+    callbacks = []
+
+    def fake_track(hass, callback, when):
+        callbacks.append(callback)
+        return lambda: None
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(
+        cron_scheduler,
+        "iter_run_times",
+        lambda cron: (start + timedelta(days=day) for day in count()),
+    )
+    monkeypatch.setattr(cron_scheduler, "async_track_point_in_utc_time", fake_track)
+    monkeypatch.setattr(cron_scheduler.dt_util, "as_utc", lambda value: value)
+    return callbacks
+
+
 class FakeCSVManager:
     """Small async fake for service handler tests."""
 
@@ -70,6 +101,7 @@ class FakeCoordinator:
         )
         self.force_update_calls = 0
         self.refresh_calls = 0
+        self.refresh_priorities: list[RequestPriority] = []
         self.first_refresh_calls = 0
         self.shutdown_calls = 0
         self.update_result = update_result
@@ -82,6 +114,26 @@ class FakeCoordinator:
             else SimpleNamespace(data={init_module.CONF_STATION_ID: ""})
         )
         self.raise_first_refresh = False
+        self.debouncer_cooling_down = False
+        self.last_update_success = True
+        self.last_exception: BaseException | None = None
+        self.restore_result = False
+        self.placeholder_calls = 0
+        self.refresh_timing = RefreshTiming()
+        self.listeners: list = []
+
+    def async_add_listener(self, update_callback) -> object:
+        """Track coordinator listeners."""
+        self.listeners.append(update_callback)
+        return lambda: self.listeners.remove(update_callback)
+
+    async def async_restore_state(self) -> bool:
+        """Return whether persisted data was restored."""
+        return self.restore_result
+
+    def async_set_placeholder_data(self) -> None:
+        """Track placeholder data."""
+        self.placeholder_calls += 1
 
     async def async_config_entry_first_refresh(self) -> None:
         """Track first refresh calls."""
@@ -101,10 +153,18 @@ class FakeCoordinator:
         return self.update_result
 
     async def async_request_refresh(self) -> None:
-        """Track coordinator refresh calls."""
+        """Refresh unless the debouncer is cooling down, like Home Assistant."""
+        if self.debouncer_cooling_down:
+            return
+        self.debouncer_cooling_down = True
+        await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Track fetches, recording failures instead of raising them."""
         self.refresh_calls += 1
-        if self.refresh_error is not None:
-            raise self.refresh_error
+        self.refresh_priorities.append(api._REQUEST_PRIORITY.get())
+        self.last_update_success = self.refresh_error is None
+        self.last_exception = self.refresh_error
 
 
 class FakeEntityRegistry:
@@ -125,6 +185,16 @@ class FakeEntityRegistry:
         self.removed.append(entity_id)
 
 
+def _registry_manager(snapshot: RegistrySnapshot) -> MagicMock:
+    """Return a registry manager fake that builds indexes synchronously."""
+    manager = MagicMock()
+    manager.async_ensure_registry = AsyncMock(return_value=snapshot)
+    manager.async_registry_index = AsyncMock(
+        side_effect=lambda snapshot, name, builder: builder(snapshot.stations)
+    )
+    return manager
+
+
 def _build_hass_with_services() -> tuple[MagicMock, dict[str, object]]:
     hass = MagicMock()
     registered_services: dict[str, object] = {}
@@ -149,10 +219,14 @@ def test_force_csv_update_service_updates_shared_csv_once(monkeypatch) -> None:
     }
 
     init_module._async_register_services(hass)
-    asyncio.run(registered_services[init_module.SERVICE_FORCE_CSV_UPDATE](SimpleNamespace()))
+    result = asyncio.run(
+        registered_services[init_module.SERVICE_FORCE_CSV_UPDATE](SimpleNamespace())
+    )
 
     assert first.force_update_calls == 1
     assert second.force_update_calls == 0
+    assert [station["entry_id"] for station in result["stations"]] == ["entry_1", "entry_2"]
+    assert (result["refreshed_count"], result["failed_count"]) == (2, 0)
     assert second.csv_manager.load_calls == 0
     assert first.refresh_calls == 1
     assert second.refresh_calls == 1
@@ -236,8 +310,9 @@ def test_clear_cache_service_clears_shared_csv_once(monkeypatch) -> None:
     }
 
     init_module._async_register_services(hass)
-    asyncio.run(registered_services[init_module.SERVICE_CLEAR_CACHE](SimpleNamespace()))
+    result = asyncio.run(registered_services[init_module.SERVICE_CLEAR_CACHE](SimpleNamespace()))
 
+    assert result["refreshed_count"] == 2
     assert first.csv_manager.clear_calls == 1
     assert second.csv_manager.clear_calls == 0
     assert first.csv_manager.initialize_calls == 1
@@ -337,13 +412,17 @@ def test_clear_cache_service_refreshes_all_with_shared_manager(monkeypatch) -> N
     assert second.refresh_calls == 1
 
 
-def test_async_setup_registers_global_services_without_entries() -> None:
+def test_async_setup_registers_global_services_without_entries(monkeypatch) -> None:
+    configure_rate_limit = MagicMock()
+    monkeypatch.setattr(init_module, "configure_rate_limit", configure_rate_limit)
     hass, registered_services = _build_hass_with_services()
     hass.data = {}
 
     result = asyncio.run(init_module.async_setup(hass, {}))
 
     assert result is True
+    # Without configuration.yaml settings the limiter keeps the 2-second pace.
+    configure_rate_limit.assert_called_once_with(0.5, 2)
     assert init_module.SERVICE_FORCE_CSV_UPDATE in registered_services
     assert init_module.SERVICE_CLEAR_CACHE in registered_services
     assert init_module.SERVICE_COMPARE_STATIONS in registered_services
@@ -351,6 +430,23 @@ def test_async_setup_registers_global_services_without_entries() -> None:
     assert init_module.SERVICE_SEARCH_REGISTRY in registered_services
 
 
+def test_async_setup_applies_the_integration_wide_rate_limit(monkeypatch) -> None:
+    configure_rate_limit = MagicMock()
+    monkeypatch.setattr(init_module, "configure_rate_limit", configure_rate_limit)
+    hass, _ = _build_hass_with_services()
+    hass.data = {}
+    config = {
+        init_module.DOMAIN: {
+            init_module.CONF_RATE_LIMIT_PER_MINUTE: 120,
+            init_module.CONF_RATE_LIMIT_BURST: 4,
+        }
+    }
+
+    assert asyncio.run(init_module.async_setup(hass, config)) is True
+
+    configure_rate_limit.assert_called_once_with(2.0, 4)
+
+
 def test_register_services_is_idempotent() -> None:
     hass, registered_services = _build_hass_with_services()
     hass.data = {init_module._SERVICES_REGISTERED: True}
@@ -429,6 +525,77 @@ def test_force_csv_update_attempts_all_refreshes_before_raising(monkeypatch) ->
     assert [first.refresh_calls, second.refresh_calls, third.refresh_calls] == [1, 1, 1]
 
 
+def test_bulk_refresh_runs_concurrently_within_budget_and_reports_outcomes(
+    monkeypatch,
+) -> None:
+    class UpdateFailed(Exception):
+        """Stands in for Home Assistant's UpdateFailed."""
+
+    class SlowCoordinator(FakeCoordinator):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def async_refresh(self) -> None:
+            cls = type(self)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            for _ in range(3):
+                await asyncio.sleep(0)
+            cls.in_flight -= 1
+            await super().async_refresh()
+
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
+    # The concurrency follows the configured burst of the rate limiter.
+    monkeypatch.setattr(init_module, "rate_limit_burst", lambda: 3)
+    hass, registered_services = _build_hass_with_services()
+    coordinators = {}
+    for index in range(10):
+        coordinator = SlowCoordinator(
+            refresh_error=RuntimeError("private data") if index == 3 else None
+        )
+        coordinator.config_entry = SimpleNamespace(data={init_module.CONF_STATION_ID: str(index)})
+        coordinators[f"entry_{index}"] = {"coordinator": coordinator}
+    # Home Assistant records a failed update without raising it.
+    coordinators["entry_5"]["coordinator"].refresh_error = UpdateFailed("private data")
+    hass.data = {init_module.DOMAIN: coordinators}
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_REFRESH_PRICES]
+
+    result = asyncio.run(handler(SimpleNamespace(data={}, return_response=True)))
+
+    assert SlowCoordinator.max_in_flight == 3
+    assert result["refreshed_station_ids"] == ["0", "1", "2", "4", "6", "7", "8", "9"]
+    assert (result["refreshed_count"], result["failed_count"]) == (8, 2)
+    failed = [station for station in result["stations"] if station["outcome"] == "failed"]
+    assert [(station["station_id"], station["error"]) for station in failed] == [
+        ("3", "RuntimeError"),
+        ("5", "UpdateFailed"),
+    ]
+    assert "private data" not in str(result)
+
+    with pytest.raises(init_module.HomeAssistantError, match=r"2 station refresh\(es\) failed"):
+        asyncio.run(handler(SimpleNamespace(data={})))
+
+
+def test_bulk_refresh_fetches_again_within_the_debouncer_cooldown(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
+    hass, registered_services = _build_hass_with_services()
+    coordinator = FakeCoordinator()
+    coordinator.config_entry = SimpleNamespace(data={init_module.CONF_STATION_ID: "1"})
+    hass.data = {init_module.DOMAIN: {"entry_1": {"coordinator": coordinator}}}
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_REFRESH_PRICES]
+
+    asyncio.run(handler(SimpleNamespace(data={}, return_response=True)))
+    coordinator.debouncer_cooling_down = True
+    coordinator.refresh_error = RuntimeError("down")
+    result = asyncio.run(handler(SimpleNamespace(data={}, return_response=True)))
+
+    assert coordinator.refresh_calls == 2
+    assert [station["outcome"] for station in result["stations"]] == ["failed"]
+    assert result["stations"][0]["error"] == "RuntimeError"
+
+
 def test_force_csv_update_propagates_cancellation(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     hass, registered_services = _build_hass_with_services()
@@ -444,25 +611,27 @@ def test_compare_stations_service_returns_station_payload(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     hass, registered_services = _build_hass_with_services()
     first = FakeCoordinator()
-    first.data = {
-        "station_info": {
-            "id": "123",
-            "nomeImpianto": "Station Display",
-            "brand": "Brand",
-            "address": "Street",
-        },
-        "fuels": {
-            "benzina_self": {
-                "price": 1.8,
-                "previous_price": 1.7,
-                "price_changed_at": "2026-06-01T08:00:00+02:00",
-                "is_self": True,
-                "last_update": "2026-06-01T08:00:00+02:00",
-            }
-        },
-    }
+    first.data = StationData.from_dict(
+        {
+            "station_info": {
+                "id": "123",
+                "nomeImpianto": "Station Display",
+                "brand": "Brand",
+                "address": "Street",
+            },
+            "fuels": {
+                "benzina_self": {
+                    "price": 1.8,
+                    "previous_price": 1.7,
+                    "price_changed_at": "2026-06-01T08:00:00+02:00",
+                    "is_self": True,
+                    "last_update": "2026-06-01T08:00:00+02:00",
+                }
+            },
+        }
+    )
     second = FakeCoordinator()
-    second.data = {}
+    second.data = None
     hass.data = {
         init_module.DOMAIN: {
             "entry_1": {"coordinator": first},
@@ -514,22 +683,87 @@ def test_refresh_prices_service_supports_all_and_station_subset(monkeypatch) ->
             SimpleNamespace(data={})
         )
     )
-    assert result == {
-        "refreshed_station_ids": ["123", "456"],
-        "refreshed_count": 2,
-    }
+    assert result["refreshed_station_ids"] == ["123", "456"]
+    assert result["refreshed_count"] == 2
+    assert result["failed_count"] == 0
+    assert [
+        (station["entry_id"], station["station_id"], station["outcome"])
+        for station in result["stations"]
+    ] == [("entry_1", "123", "refreshed"), ("entry_2", "456", "refreshed")]
+    assert all(station["latency_ms"] >= 0 for station in result["stations"])
 
     result = asyncio.run(
         registered_services[init_module.SERVICE_REFRESH_PRICES](
             SimpleNamespace(data={"station_ids": [" 456 ", "", "missing"]})
         )
     )
-    assert result == {
-        "refreshed_station_ids": ["456"],
-        "refreshed_count": 1,
-    }
+    assert result["refreshed_station_ids"] == ["456"]
+    assert result["refreshed_count"] == 1
     assert first.refresh_calls == 1
     assert second.refresh_calls == 2
+    assert set(second.refresh_priorities) == {RequestPriority.SERVICE}
+
+
+def test_refresh_prices_service_uses_zone_search_with_fallback(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
+    hass, registered_services = _build_hass_with_services()
+    first = FakeCoordinator()
+    first.config_entry = SimpleNamespace(data={init_module.CONF_STATION_ID: "123"})
+    second = FakeCoordinator()
+    second.config_entry = SimpleNamespace(data={init_module.CONF_STATION_ID: "456"})
+    hass.data = {
+        init_module.DOMAIN: {
+            "entry_1": {"coordinator": first},
+            "entry_2": {"coordinator": second},
+        }
+    }
+    zone_refresh = AsyncMock(
+        side_effect=[
+            SimpleNamespace(
+                query_count=1,
+                failed_query_count=0,
+                refreshed=[("entry_1", first)],
+                fallback=[("entry_2", second)],
+            ),
+            SimpleNamespace(
+                query_count=1,
+                failed_query_count=0,
+                refreshed=[("entry_1", first), ("entry_2", second)],
+                fallback=[],
+            ),
+        ]
+    )
+    monkeypatch.setattr(init_module, "async_refresh_from_zones", zone_refresh)
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_REFRESH_PRICES]
+
+    result = asyncio.run(handler(SimpleNamespace(data={"use_zone_search": True})))
+
+    assert result == {
+        "refreshed_station_ids": ["123", "456"],
+        "refreshed_count": 2,
+        "failed_count": 0,
+        "stations": [
+            {
+                "entry_id": "entry_2",
+                "station_id": "456",
+                "outcome": "refreshed",
+                "latency_ms": result["stations"][0]["latency_ms"],
+            }
+        ],
+        "zone_search": {
+            "query_count": 1,
+            "failed_query_count": 0,
+            "zone_refreshed_count": 1,
+            "fallback_count": 1,
+        },
+    }
+    assert (first.refresh_calls, second.refresh_calls) == (0, 1)
+
+    result = asyncio.run(handler(SimpleNamespace(data={"use_zone_search": True})))
+
+    assert result["zone_search"]["fallback_count"] == 0
+    assert (first.refresh_calls, second.refresh_calls) == (0, 1)
 
 
 def test_refresh_prices_service_rejects_unknown_station(monkeypatch) -> None:
@@ -569,9 +803,8 @@ def test_search_registry_service_returns_public_matches(monkeypatch) -> None:
             "entry_1": {"coordinator": coordinator},
         }
     }
-    manager = MagicMock()
-    manager.async_ensure_registry = AsyncMock(
-        return_value=RegistrySnapshot(
+    manager = _registry_manager(
+        RegistrySnapshot(
             stations=(
                 {
                     "id": "123",
@@ -618,6 +851,8 @@ def test_search_registry_service_returns_public_matches(monkeypatch) -> None:
             }
         ],
         "result_count": 1,
+        "suggestions": {},
+        "next_cursor": None,
         "registry_updated": "2026-07-28T00:00:00+00:00",
         "registry_is_stale": True,
     }
@@ -632,9 +867,8 @@ def test_search_registry_service_handles_missing_timestamp_and_error(
     hass.async_add_executor_job = AsyncMock(
         side_effect=lambda function, *args: function(*args)
     )
-    manager = MagicMock()
-    manager.async_ensure_registry = AsyncMock(
-        return_value=RegistrySnapshot(
+    manager = _registry_manager(
+        RegistrySnapshot(
             stations=(),
             updated_at=None,
             is_stale=False,
@@ -662,10 +896,266 @@ def test_search_registry_service_handles_missing_timestamp_and_error(
         )
 
 
+def test_search_registry_service_pages_with_generation_bound_cursor(monkeypatch) -> None:
+    hass, registered_services = _build_hass_with_services()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    snapshot = RegistrySnapshot(
+        stations=tuple(
+            {"id": str(station_id), "name": f"Station {station_id}", "province": "RM"}
+            for station_id in range(1, 6)
+        ),
+        updated_at=None,
+        is_stale=False,
+        generation="5f2c9e01d4a7b3c8",
+    )
+    manager = _registry_manager(snapshot)
+    monkeypatch.setattr(init_module, "get_shared_csv_manager", lambda hass: manager)
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_SEARCH_REGISTRY]
+
+    first = asyncio.run(handler(SimpleNamespace(data={"province": "RM", "limit": 2})))
+    second = asyncio.run(
+        handler(
+            SimpleNamespace(
+                data={"province": "RM", "limit": 2, "cursor": first["next_cursor"]}
+            )
+        )
+    )
+    third = asyncio.run(
+        handler(
+            SimpleNamespace(
+                data={"province": "RM", "limit": 2, "cursor": second["next_cursor"]}
+            )
+        )
+    )
+
+    assert [item["station_id"] for item in first["results"]] == ["1", "2"]
+    assert [item["station_id"] for item in second["results"]] == ["3", "4"]
+    assert [item["station_id"] for item in third["results"]] == ["5"]
+    assert third["next_cursor"] is None
+    assert manager.async_registry_index.await_args.args[1] == "area_search"
+
+    manager.async_ensure_registry = AsyncMock(
+        return_value=RegistrySnapshot(
+            stations=snapshot.stations,
+            updated_at=None,
+            is_stale=False,
+            generation="0b8d41c7e2f96a35",
+        )
+    )
+    with pytest.raises(init_module.HomeAssistantError, match="registry changed"):
+        asyncio.run(
+            handler(SimpleNamespace(data={"province": "RM", "cursor": first["next_cursor"]}))
+        )
+    with pytest.raises(init_module.HomeAssistantError, match="cursor is invalid"):
+        asyncio.run(handler(SimpleNamespace(data={"province": "RM", "cursor": "%%%"})))
+
+
+def test_search_registry_cursor_survives_restart_until_registry_changes(
+    monkeypatch, tmp_path
+) -> None:
+    hass, registered_services = _build_hass_with_services()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    (tmp_path / ".storage").mkdir()
+    stations = {
+        str(station_id): {"id": str(station_id), "name": f"Station {station_id}", "province": "RM"}
+        for station_id in range(1, 6)
+    }
+    managers: list[CSVStationManager] = []
+
+    def _restart(stations: dict[str, dict[str, Any]] | None = None) -> None:
+        manager = CSVStationManager(hass)
+        if stations is None:
+            assert asyncio.run(manager.async_load_cached_data()) is True
+        else:
+            manager._set_stations_cache(stations, registry_generation_of(stations))
+            assert asyncio.run(manager.async_save_cached_data()) is True
+        manager._initialized = True
+        managers.append(manager)
+
+    monkeypatch.setattr(init_module, "get_shared_csv_manager", lambda hass: managers[-1])
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_SEARCH_REGISTRY]
+
+    _restart(stations)
+    first = asyncio.run(handler(SimpleNamespace(data={"province": "RM", "limit": 2})))
+    cursor_request = SimpleNamespace(
+        data={"province": "RM", "limit": 2, "cursor": first["next_cursor"]}
+    )
+
+    # The same registry restored from storage keeps honouring the cursor.
+    _restart()
+    second = asyncio.run(handler(cursor_request))
+    assert [item["station_id"] for item in second["results"]] == ["3", "4"]
+
+    # A registry that changed before the restart rejects it.
+    del stations["2"]
+    _restart(stations)
+    _restart()
+    with pytest.raises(init_module.HomeAssistantError, match="registry changed"):
+        asyncio.run(handler(cursor_request))
+
+
+def test_search_registry_service_suggests_values_when_nothing_matches(
+    monkeypatch,
+) -> None:
+    hass, registered_services = _build_hass_with_services()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    manager = _registry_manager(
+        RegistrySnapshot(
+            stations=(
+                {"id": "1", "name": "A", "brand": "Agip", "municipality": "Reggio di Calabria"},
+                {"id": "2", "name": "B", "brand": "Agip", "municipality": "Reggio di Calabria"},
+            ),
+            updated_at=None,
+            is_stale=False,
+        )
+    )
+    monkeypatch.setattr(init_module, "get_shared_csv_manager", lambda hass: manager)
+    init_module._async_register_services(hass)
+
+    result = asyncio.run(
+        registered_services[init_module.SERVICE_SEARCH_REGISTRY](
+            SimpleNamespace(data={"municipality": "Reggio Calbria", "query": "Agp"})
+        )
+    )
+
+    assert result["results"] == []
+    assert result["suggestions"] == {
+        "municipality": [
+            {"value": "Reggio di Calabria", "distance": 1, "station_count": 2}
+        ],
+        "brand": [{"value": "Agip", "distance": 1, "station_count": 2}],
+    }
+    assert manager.async_registry_index.await_args.args[1] == "registry_vocabulary"
+
+
+def test_search_nearby_service_answers_each_origin(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
+    hass, registered_services = _build_hass_with_services()
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    coordinator = FakeCoordinator()
+    coordinator.config_entry = SimpleNamespace(data={init_module.CONF_STATION_ID: "2"})
+    hass.data = {init_module.DOMAIN: {"entry_1": {"coordinator": coordinator}}}
+    manager = _registry_manager(
+        RegistrySnapshot(
+            stations=(
+                {"id": "1", "name": "Milano", "brand": "Eni", "latitude": 45.4642, "longitude": 9.19},
+                {"id": "2", "name": "Roma", "brand": "Eni", "latitude": 41.9028, "longitude": 12.4964},
+                {"id": "3", "name": "Roma Q8", "brand": "Q8", "latitude": 41.9029, "longitude": 12.4964},
+            ),
+            updated_at=datetime(2026, 7, 28, tzinfo=timezone.utc),
+            is_stale=False,
+        )
+    )
+    monkeypatch.setattr(init_module, "get_shared_csv_manager", lambda hass: manager)
+    init_module._async_register_services(hass)
+
+    result = asyncio.run(
+        registered_services[init_module.SERVICE_SEARCH_NEARBY](
+            SimpleNamespace(
+                data={
+                    "query": "eni",
+                    "origins": [
+                        {"id": "north", "latitude": 45.4642, "longitude": 9.19, "radius_km": 2},
+                        {"latitude": "41.9028", "longitude": "12.4964", "limit": 5},
+                    ],
+                }
+            )
+        )
+    )
+
+    assert result == {
+        "origins": [
+            {
+                "id": "north",
+                "results": [
+                    {
+                        "station_id": "1",
+                        "name": "Milano",
+                        "brand": "Eni",
+                        "address": None,
+                        "municipality": None,
+                        "province": None,
+                        "station_type": None,
+                        "configured": False,
+                        "distance_km": 0.0,
+                    }
+                ],
+                "result_count": 1,
+            },
+            {
+                "id": "1",
+                "results": [
+                    {
+                        "station_id": "2",
+                        "name": "Roma",
+                        "brand": "Eni",
+                        "address": None,
+                        "municipality": None,
+                        "province": None,
+                        "station_type": None,
+                        "configured": True,
+                        "distance_km": 0.0,
+                    }
+                ],
+                "result_count": 1,
+            },
+        ],
+        "origin_count": 2,
+        "registry_updated": "2026-07-28T00:00:00+00:00",
+        "registry_is_stale": False,
+    }
+    assert manager.async_registry_index.await_args.args[1] == "nearby_search"
+
+
+def test_search_nearby_service_reports_invalid_origins_and_registry_errors(
+    monkeypatch,
+) -> None:
+    hass, registered_services = _build_hass_with_services()
+    hass.data = {}
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    manager = _registry_manager(
+        RegistrySnapshot(stations=(), updated_at=None, is_stale=True)
+    )
+    monkeypatch.setattr(init_module, "get_shared_csv_manager", lambda hass: manager)
+    init_module._async_register_services(hass)
+    handler = registered_services[init_module.SERVICE_SEARCH_NEARBY]
+
+    for data in ({}, {"origins": [{"latitude": 41.9}]}, {"origins": ["x"]}):
+        with pytest.raises(init_module.HomeAssistantError, match="latitude and longitude"):
+            asyncio.run(handler(SimpleNamespace(data=data)))
+
+    result = asyncio.run(
+        handler(SimpleNamespace(data={"origins": [{"latitude": 41.9, "longitude": 12.5}]}))
+    )
+    assert result["origins"] == [{"id": "0", "results": [], "result_count": 0}]
+    assert result["registry_updated"] is None
+
+    manager.async_ensure_registry = AsyncMock(side_effect=RegistryUnavailableError("offline"))
+    with pytest.raises(init_module.HomeAssistantError, match="registry is unavailable"):
+        asyncio.run(
+            handler(SimpleNamespace(data={"origins": [{"latitude": 41.9, "longitude": 12.5}]}))
+        )
+
+
 def test_setup_entry_registers_services_after_last_entry_unload(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", lambda *args: lambda: None)
+    _patch_cron_timer(monkeypatch)
     monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
     monkeypatch.setattr(
         init_module.er,
@@ -698,8 +1188,7 @@ def test_setup_entry_registers_services_after_last_entry_unload(monkeypatch) ->
 def test_two_entries_share_one_manager_and_registry_timer(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     monkeypatch.setattr(init_module, "CSVStationManager", FakeCSVManager)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", lambda *args: lambda: None)
+    _patch_cron_timer(monkeypatch)
     registry_listener = MagicMock()
     track_registry = MagicMock(return_value=registry_listener)
     monkeypatch.setattr(init_module, "async_track_time_interval", track_registry)
@@ -709,21 +1198,33 @@ def test_two_entries_share_one_manager_and_registry_timer(monkeypatch) -> None:
     hass.data = {}
     hass.config_entries.async_forward_entry_setups = AsyncMock()
 
-    def make_entry(entry_id: str) -> SimpleNamespace:
+    configure_result_freshness = MagicMock()
+    monkeypatch.setattr(init_module, "configure_result_freshness", configure_result_freshness)
+    forget_station = MagicMock()
+    monkeypatch.setattr(init_module, "forget_station", forget_station)
+
+    def make_entry(entry_id: str, options: dict[str, int]) -> SimpleNamespace:
         return SimpleNamespace(
             entry_id=entry_id,
             title=entry_id,
             unique_id=entry_id,
             data={"station_id": entry_id},
-            options={},
+            options=options,
             async_on_unload=MagicMock(),
             add_update_listener=MagicMock(return_value=lambda: None),
         )
 
-    first = make_entry("entry_1")
-    second = make_entry("entry_2")
+    first = make_entry("entry_1", {init_module.CONF_RESULT_FRESHNESS_SECONDS: 30})
+    second = make_entry("entry_2", {init_module.CONF_RESULT_FRESHNESS_SECONDS: 0})
+    # A third entry of the first station keeps its cached responses.
+    third = make_entry("entry_3", {})
+    third.data = first.data
+    hass.config_entries.async_entries = MagicMock(return_value=[first, second, third])
     assert asyncio.run(init_module.async_setup_entry(hass, first)) is True
     assert asyncio.run(init_module.async_setup_entry(hass, second)) is True
+    # The shared response reuse follows the shortest window of the loaded entries.
+    assert configure_result_freshness.call_args_list == [((30,),), ((0,),)]
+    assert asyncio.run(init_module.async_setup_entry(hass, third)) is True
 
     domain_data = hass.data[init_module.DOMAIN]
     shared_manager = domain_data[init_module._CSV_MANAGER]
@@ -737,13 +1238,23 @@ def test_two_entries_share_one_manager_and_registry_timer(monkeypatch) -> None:
 
     hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
     assert asyncio.run(init_module.async_unload_entry(hass, second)) is True
+    configure_result_freshness.assert_called_with(10)
+    forget_station.assert_called_once_with("entry_2")
+    assert asyncio.run(init_module.async_unload_entry(hass, third)) is True
+    forget_station.assert_called_once_with("entry_2")
     registry_listener.assert_not_called()
     assert domain_data[init_module._CSV_MANAGER] is shared_manager
 
+    http_client = MagicMock(spec=HttpClient)
+    domain_data[HTTP_CLIENT_DATA_KEY] = http_client
     assert asyncio.run(init_module.async_unload_entry(hass, first)) is True
+    configure_result_freshness.assert_called_with(10)
+    forget_station.assert_called_with("entry_1")
     registry_listener.assert_called_once()
     assert init_module._CSV_MANAGER not in domain_data
     assert init_module._CSV_UPDATE_LISTENER not in domain_data
+    assert HTTP_CLIENT_DATA_KEY not in domain_data
+    http_client.async_shutdown.assert_called_once_with()
 
 
 def test_setup_entry_adds_registry_timer_to_manager_created_by_config_flow(
@@ -751,8 +1262,7 @@ def test_setup_entry_adds_registry_timer_to_manager_created_by_config_flow(
 ) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     monkeypatch.setattr(init_module, "CSVStationManager", FakeCSVManager)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", lambda *args: lambda: None)
+    _patch_cron_timer(monkeypatch)
     registry_listener = MagicMock()
     track_registry = MagicMock(return_value=registry_listener)
     monkeypatch.setattr(init_module, "async_track_time_interval", track_registry)
@@ -957,23 +1467,67 @@ def test_platforms_include_sensor_and_binary_sensor() -> None:
     assert init_module.PLATFORMS == ["sensor", "binary_sensor"]
 
 
-def test_setup_entry_scheduled_refresh_reschedules(monkeypatch) -> None:
+def test_setup_entry_schedules_refreshes_with_the_shared_cron_scheduler(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
-    monkeypatch.setattr(
-        init_module.er,
-        "async_get",
-        lambda hass: FakeEntityRegistry({}),
+    monkeypatch.setattr(init_module.er, "async_get", lambda hass: FakeEntityRegistry({}))
+    monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
+    callbacks = _patch_cron_timer(monkeypatch)
+    hass, _ = _build_hass_with_services()
+    hass.data = {}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    hass.async_create_background_task = MagicMock(
+        side_effect=lambda coro, name: asyncio.ensure_future(coro)
     )
-    callbacks = []
+    entries = [
+        SimpleNamespace(
+            entry_id=entry_id,
+            title=entry_id,
+            unique_id=entry_id,
+            options={init_module.CONF_JITTER_MINUTES: 0},
+            async_on_unload=MagicMock(),
+            add_update_listener=MagicMock(return_value=lambda: None),
+        )
+        for entry_id in ("entry_1", "entry_2")
+    ]
+
+    async def run() -> tuple[cron_scheduler.CronScheduler, list[FakeCoordinator]]:
+        for entry in entries:
+            assert await init_module.async_setup_entry(hass, entry) is True
+        domain_data = hass.data[init_module.DOMAIN]
+        coordinators = [domain_data[entry.entry_id]["coordinator"] for entry in entries]
+        scheduler = domain_data[cron_scheduler.CRON_SCHEDULER_DATA_KEY]
+        callbacks[-1](datetime(2026, 1, 1, tzinfo=timezone.utc))
+        await asyncio.gather(*scheduler._tasks)
+        assert await init_module.async_unload_entry(hass, entries[0]) is True
+        return scheduler, coordinators
+
+    scheduler, coordinators = asyncio.run(run())
+
+    # Both entries share one timer and one refresh task.
+    assert len(callbacks) == 2
+    hass.async_create_background_task.assert_called_once()
+    assert [coordinator.refresh_calls for coordinator in coordinators] == [1, 1]
+    assert scheduler.status()["groups"] == [
+        {
+            "cron_expression": init_module.DEFAULT_CRON_EXPRESSION,
+            "jitter_window_seconds": 0,
+            "entries": 1,
+            "pending": 0,
+            "next_run": "2026-01-02T00:00:00+00:00",
+            "fired": 1,
+        }
+    ]
 
-    def fake_track(hass, callback, when):
-        callbacks.append(callback)
-        return lambda: None
 
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", fake_track)
+def test_setup_entry_joins_shared_batch_refresh(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
+    monkeypatch.setattr(init_module.er, "async_get", lambda hass: FakeEntityRegistry({}))
     monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
-    monkeypatch.setattr(init_module.dt_util, "as_utc", lambda value: value)
+    callbacks = _patch_cron_timer(monkeypatch)
+    remove = MagicMock()
+    batch = SimpleNamespace(async_add=MagicMock(return_value=remove))
+    monkeypatch.setattr(init_module, "get_batch_coordinator", lambda hass: batch)
     hass, _ = _build_hass_with_services()
     hass.data = {}
     hass.config_entries.async_forward_entry_setups = AsyncMock()
@@ -981,40 +1535,37 @@ def test_setup_entry_scheduled_refresh_reschedules(monkeypatch) -> None:
         entry_id="entry_1",
         title="Test Station",
         unique_id="station_1",
-        options={},
+        options={
+            init_module.CONF_SHARED_REFRESH: True,
+            init_module.CONF_CRON_EXPRESSION: "0 6 * * *",
+            init_module.CONF_JITTER_MINUTES: 5,
+        },
         async_on_unload=MagicMock(),
         add_update_listener=MagicMock(return_value=lambda: None),
     )
 
     assert asyncio.run(init_module.async_setup_entry(hass, entry)) is True
-    coordinator = hass.data[init_module.DOMAIN]["entry_1"]["coordinator"]
-    asyncio.run(callbacks[0](datetime(2026, 1, 1)))
-
-    assert coordinator.refresh_calls == 1
-    assert len(callbacks) == 2
-
+    entry_data = hass.data[init_module.DOMAIN]["entry_1"]
+    batch.async_add.assert_called_once_with(
+        entry_data["coordinator"], "0 6 * * *", jitter_window=timedelta(minutes=5)
+    )
+    assert entry_data["listener"] is remove
+    assert callbacks == []
 
-def test_scheduled_refresh_does_not_rearm_after_unload(monkeypatch) -> None:
-    started = asyncio.Event()
-    release = asyncio.Event()
+    batch.async_add.side_effect = ValueError("bad cron")
+    hass.data = {}
+    assert asyncio.run(init_module.async_setup_entry(hass, entry)) is False
+    assert "entry_1" not in hass.data[init_module.DOMAIN]
 
-    class BlockingCoordinator(FakeCoordinator):
-        async def async_request_refresh(self) -> None:
-            self.refresh_calls += 1
-            started.set()
-            await release.wait()
 
-    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", BlockingCoordinator)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
+def test_setup_entry_hands_scheduled_refreshes_to_the_daily_price_file(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     monkeypatch.setattr(init_module.er, "async_get", lambda hass: FakeEntityRegistry({}))
-    callbacks = []
-
-    def fake_track(hass, callback, when):
-        callbacks.append(callback)
-        return lambda: None
-
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", fake_track)
-    monkeypatch.setattr(init_module.dt_util, "as_utc", lambda value: value)
+    monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
+    callbacks = _patch_cron_timer(monkeypatch)
+    remove = MagicMock()
+    prices = SimpleNamespace(async_add=MagicMock(return_value=remove))
+    monkeypatch.setattr(init_module, "get_price_csv_manager", lambda hass: prices)
     hass, _ = _build_hass_with_services()
     hass.data = {}
     hass.config_entries.async_forward_entry_setups = AsyncMock()
@@ -1022,45 +1573,33 @@ def test_scheduled_refresh_does_not_rearm_after_unload(monkeypatch) -> None:
         entry_id="entry_1",
         title="Test Station",
         unique_id="station_1",
-        options={},
+        options={
+            init_module.CONF_DAILY_PRICE_FILE: True,
+            init_module.CONF_SHARED_REFRESH: True,
+            init_module.CONF_JITTER_MINUTES: 0,
+        },
         async_on_unload=MagicMock(),
         add_update_listener=MagicMock(return_value=lambda: None),
     )
 
-    async def run_race() -> None:
-        assert await init_module.async_setup_entry(hass, entry) is True
-        refresh = asyncio.create_task(callbacks[0](datetime(2026, 1, 1)))
-        await started.wait()
-        hass.data[init_module.DOMAIN].pop(entry.entry_id)
-        release.set()
-        await refresh
-
-    asyncio.run(run_race())
-
-    assert len(callbacks) == 1
-
+    assert asyncio.run(init_module.async_setup_entry(hass, entry)) is True
 
-def test_old_scheduled_refresh_does_not_overwrite_reload_listener(monkeypatch) -> None:
-    started = asyncio.Event()
-    release = asyncio.Event()
+    entry_data = hass.data[init_module.DOMAIN]["entry_1"]
+    prices.async_add.assert_called_once_with(
+        entry_data["coordinator"], init_module.DEFAULT_CRON_EXPRESSION, jitter_window=timedelta(0)
+    )
+    assert entry_data["listener"] is remove
+    assert callbacks == []
 
-    class BlockingCoordinator(FakeCoordinator):
-        async def async_request_refresh(self) -> None:
-            self.refresh_calls += 1
-            started.set()
-            await release.wait()
 
-    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", BlockingCoordinator)
-    monkeypatch.setattr(init_module, "get_next_run_time", lambda cron: datetime(2026, 1, 1))
+def test_setup_entry_follows_the_learned_refresh_plan(monkeypatch) -> None:
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
     monkeypatch.setattr(init_module.er, "async_get", lambda hass: FakeEntityRegistry({}))
-    callbacks = []
-
-    def fake_track(hass, callback, when):
-        callbacks.append(callback)
-        return lambda: None
-
-    monkeypatch.setattr(init_module, "async_track_point_in_utc_time", fake_track)
-    monkeypatch.setattr(init_module.dt_util, "as_utc", lambda value: value)
+    monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
+    _patch_cron_timer(monkeypatch)
+    now = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(refresh_timing.dt_util, "as_local", lambda value: value)
+    monkeypatch.setattr(refresh_timing.dt_util, "now", lambda: now)
     hass, _ = _build_hass_with_services()
     hass.data = {}
     hass.config_entries.async_forward_entry_setups = AsyncMock()
@@ -1068,33 +1607,128 @@ def test_old_scheduled_refresh_does_not_overwrite_reload_listener(monkeypatch) -
         entry_id="entry_1",
         title="Test Station",
         unique_id="station_1",
-        options={},
+        options={
+            init_module.CONF_JITTER_MINUTES: 0,
+            init_module.CONF_ADAPTIVE_REFRESH: True,
+            init_module.CONF_DAILY_REFRESH_BUDGET: 1,
+        },
         async_on_unload=MagicMock(),
         add_update_listener=MagicMock(return_value=lambda: None),
     )
-    replacement = FakeCoordinator()
-    replacement_listener = MagicMock()
-
-    async def run_race() -> None:
-        assert await init_module.async_setup_entry(hass, entry) is True
-        refresh = asyncio.create_task(callbacks[0](datetime(2026, 1, 1)))
-        await started.wait()
-        hass.data[init_module.DOMAIN][entry.entry_id] = {
-            "coordinator": replacement,
-            "listener": replacement_listener,
-        }
-        release.set()
-        await refresh
 
-    asyncio.run(run_race())
+    assert asyncio.run(init_module.async_setup_entry(hass, entry)) is True
+    domain_data = hass.data[init_module.DOMAIN]
+    coordinator = domain_data["entry_1"]["coordinator"]
+    scheduler = domain_data[cron_scheduler.CRON_SCHEDULER_DATA_KEY]
+
+    def labels() -> list[str]:
+        return [group["cron_expression"] for group in scheduler.status()["groups"]]
+
+    def notify() -> None:
+        for listener in list(coordinator.listeners):
+            listener()
+
+    # Until publication windows are learned, the cron expression applies.
+    assert labels() == [init_module.DEFAULT_CRON_EXPRESSION]
+    notify()
+    assert labels() == [init_module.DEFAULT_CRON_EXPRESSION]
+
+    coordinator.refresh_timing = RefreshTiming(
+        [
+            datetime(2025, 12, 30, 7, 5, tzinfo=timezone.utc),
+            datetime(2025, 12, 31, 7, 20, tzinfo=timezone.utc),
+            datetime(2025, 12, 31, 13, 0, tzinfo=timezone.utc),
+        ]
+    )
+    notify()
+    assert labels() == ["adaptive 07:35"]
+    assert scheduler.next_run("entry_1") == datetime(2026, 1, 2, 7, 35, tzinfo=timezone.utc)
+
+    coordinator.refresh_timing = RefreshTiming()
+    notify()
+    assert labels() == [init_module.DEFAULT_CRON_EXPRESSION]
+
+    domain_data["entry_1"]["listener"]()
+    assert labels() == []
+    assert coordinator.listeners == []
+
 
-    assert len(callbacks) == 1
-    assert hass.data[init_module.DOMAIN][entry.entry_id]["listener"] is replacement_listener
+def test_setup_entry_queues_first_refresh_for_restored_and_fast_entries(monkeypatch) -> None:
+    class RestoringCoordinator(FakeCoordinator):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.restore_result = args[1].entry_id == "restored"
+
+    monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", RestoringCoordinator)
+    monkeypatch.setattr(init_module.er, "async_get", lambda hass: FakeEntityRegistry({}))
+    monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
+    _patch_cron_timer(monkeypatch)
+    cancel = MagicMock()
+    queue = SimpleNamespace(async_add=MagicMock(return_value=cancel), record_setup=MagicMock())
+    monkeypatch.setattr(init_module, "get_startup_queue", lambda hass: queue)
+    hass, _ = _build_hass_with_services()
+    hass.data = {}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    csv_manager = FakeCSVManager()
+    csv_manager.is_data_available = lambda: False
+    hass.data[init_module.DOMAIN] = {init_module._CSV_MANAGER: csv_manager}
+    monkeypatch.setattr(init_module, "CSVStationManager", FakeCSVManager)
+
+    def _entry(entry_id: str, options: dict[str, object]) -> SimpleNamespace:
+        return SimpleNamespace(
+            entry_id=entry_id,
+            title=entry_id,
+            unique_id=entry_id,
+            data={init_module.CONF_STATION_ID: "1"},
+            options=options,
+            async_on_unload=MagicMock(),
+            add_update_listener=MagicMock(return_value=lambda: None),
+        )
+
+    entries = [
+        _entry("restored", {}),
+        _entry("fast", {init_module.CONF_FAST_STARTUP: True}),
+        _entry("blocking", {}),
+    ]
+    for entry in entries:
+        assert asyncio.run(init_module.async_setup_entry(hass, entry)) is True
+
+    coordinators = {
+        entry.entry_id: hass.data[init_module.DOMAIN][entry.entry_id]["coordinator"]
+        for entry in entries
+    }
+    assert {key: value.first_refresh_calls for key, value in coordinators.items()} == {
+        "restored": 0,
+        "fast": 0,
+        "blocking": 1,
+    }
+    assert coordinators["fast"].placeholder_calls == 1
+    assert coordinators["restored"].placeholder_calls == 0
+    assert csv_manager.load_calls == 1
+    assert [call.args[0] for call in queue.async_add.call_args_list] == [
+        coordinators["restored"],
+        coordinators["fast"],
+    ]
+    entries[0].async_on_unload.assert_any_call(cancel)
+    assert [call.args[:2] for call in queue.record_setup.call_args_list] == [
+        ("restored", "restored"),
+        ("fast", "placeholder"),
+        ("blocking", "refreshed"),
+    ]
+
+
+def test_remove_entry_deletes_stored_data(monkeypatch) -> None:
+    remove = AsyncMock()
+    monkeypatch.setattr(init_module, "async_remove_stored_state", remove)
+
+    asyncio.run(init_module.async_remove_entry("hass", SimpleNamespace(entry_id="entry_1")))
+
+    remove.assert_awaited_once_with("hass", "entry_1")
 
 
 def test_setup_entry_returns_false_when_cron_schedule_fails(monkeypatch) -> None:
     monkeypatch.setattr(init_module, "CarburantiDataUpdateCoordinator", FakeCoordinator)
-    monkeypatch.setattr(init_module, "get_next_run_time", MagicMock(side_effect=ValueError("bad")))
+    monkeypatch.setattr(cron_scheduler, "iter_run_times", MagicMock(side_effect=ValueError("bad")))
     monkeypatch.setattr(init_module, "async_track_time_interval", lambda *args: lambda: None)
     hass, _ = _build_hass_with_services()
     hass.data = {}
@@ -1134,21 +1768,56 @@ def test_setup_entry_shuts_down_on_first_refresh_not_ready(monkeypatch) -> None:
     assert created[0].shutdown_calls == 1
 
 
-def test_migrate_entry_version_one_removes_config_type() -> None:
+def _migration_hass() -> MagicMock:
     hass = MagicMock()
-    entry = SimpleNamespace(version=1, data={"station_id": "123", "config_type": "old"})
+
+    def update_entry(entry: SimpleNamespace, **changes: Any) -> None:
+        for key, value in changes.items():
+            setattr(entry, key, value)
+
+    hass.config_entries.async_update_entry.side_effect = update_entry
+    return hass
+
+
+def test_migrate_entry_version_one_removes_config_type() -> None:
+    hass = _migration_hass()
+    entry = SimpleNamespace(
+        version=1, data={"station_id": "123", "config_type": "old"}, options={}
+    )
 
     assert asyncio.run(init_module.async_migrate_entry(hass, entry)) is True
-    hass.config_entries.async_update_entry.assert_called_once_with(
+    assert hass.config_entries.async_update_entry.call_args_list[0] == call(
         entry,
         data={"station_id": "123"},
         version=2,
     )
+    assert entry.version == 3
+    assert entry.data == {"station_id": "123"}
+
+
+def test_migrate_entry_version_two_keeps_refreshing_at_the_cron_time() -> None:
+    hass = _migration_hass()
+    entry = SimpleNamespace(
+        version=2, data={"station_id": "123"}, options={"cron_expression": "0 8 * * *"}
+    )
+
+    assert asyncio.run(init_module.async_migrate_entry(hass, entry)) is True
+    hass.config_entries.async_update_entry.assert_called_once_with(
+        entry,
+        options={"jitter_minutes": 0, "cron_expression": "0 8 * * *"},
+        version=3,
+    )
+
+    # A window chosen before the migration is kept.
+    entry = SimpleNamespace(version=2, data={}, options={"jitter_minutes": 15})
+    asyncio.run(init_module.async_migrate_entry(hass, entry))
+    assert entry.options == {"jitter_minutes": 15}
+    assert entry.version == 3
 
 
 def test_migrate_entry_current_version_is_noop() -> None:
     hass = MagicMock()
-    entry = SimpleNamespace(version=2, data={"station_id": "123"})
+    entry = SimpleNamespace(version=3, data={"station_id": "123"})
 
     assert asyncio.run(init_module.async_migrate_entry(hass, entry)) is True
     hass.config_entries.async_update_entry.assert_not_called()
@@ -1177,6 +1846,7 @@ def test_unload_entry_removes_listener_coordinator_and_services() -> None:
     hass.services.async_remove.assert_any_call(init_module.DOMAIN, init_module.SERVICE_COMPARE_STATIONS)
     hass.services.async_remove.assert_any_call(init_module.DOMAIN, init_module.SERVICE_REFRESH_PRICES)
     hass.services.async_remove.assert_any_call(init_module.DOMAIN, init_module.SERVICE_SEARCH_REGISTRY)
+    hass.services.async_remove.assert_any_call(init_module.DOMAIN, init_module.SERVICE_SEARCH_NEARBY)
     assert init_module._SERVICES_REGISTERED not in hass.data
 
 
@@ -26,7 +26,7 @@ pytestmark = pytest.mark.skipif(
 def test_live_station_api_shape_is_compatible(monkeypatch: pytest.MonkeyPatch) -> None:
     async def _run() -> None:
         async with aiohttp.ClientSession() as session:
-            monkeypatch.setattr(api, "async_get_clientsession", MagicMock(return_value=session))
+            monkeypatch.setattr(api, "async_get_session", MagicMock(return_value=session))
             payload = await fetch_station_data(MagicMock(), KNOWN_STATION_ID, timeout=20)
 
         assert payload["id"] == int(KNOWN_STATION_ID)
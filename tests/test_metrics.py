@@ -0,0 +1,53 @@
+"""Tests for station request timing metrics."""
+from __future__ import annotations
+
+from custom_components.osservaprezzi_carburanti.metrics import (
+    RequestMetrics,
+    RequestTiming,
+    RollingHistogram,
+)
+
+
+def test_rolling_histogram_keeps_the_latest_window() -> None:
+    histogram = RollingHistogram(4)
+    assert histogram.summary()["p50"] is None
+
+    for value in (9.0, 0.02, 0.3, 0.3, 40.0):
+        histogram.add(value)
+
+    summary = histogram.summary()
+    assert summary["count"] == 4
+    assert summary["p50"] == 0.3
+    assert summary["p95"] == 40.0
+    assert summary["max"] == 40.0
+    assert summary["buckets"]["le_0.01"] == 0
+    assert summary["buckets"]["le_0.05"] == 1
+    assert summary["buckets"]["le_0.5"] == 3
+    assert summary["buckets"]["le_30"] == 3
+    assert summary["buckets"]["le_inf"] == 4
+
+
+def test_request_metrics_count_outcomes_and_phases() -> None:
+    metrics = RequestMetrics(10)
+    timing = RequestTiming(
+        queue_wait=0.5, connect=0.1, time_to_first_byte=0.2, download=0.05, normalize=0.01
+    )
+
+    metrics.record(200, timing)
+    metrics.record(404, RequestTiming())
+    metrics.record("timeout")
+
+    status = metrics.status()
+    assert status["window"] == 10
+    assert status["requests"] == 3
+    assert status["by_outcome"] == {"200": 1, "404": 1, "timeout": 1}
+    assert set(status["phases_seconds"]) == {
+        "queue_wait",
+        "connect",
+        "time_to_first_byte",
+        "download",
+        "normalize",
+        "total",
+    }
+    assert status["phases_seconds"]["total"]["max"] == 0.86
+    assert status["phases_seconds"]["queue_wait"]["count"] == 2
@@ -0,0 +1,126 @@
+"""Tests for the processed station data models."""
+from __future__ import annotations
+
+from dataclasses import FrozenInstanceError
+from datetime import time
+from types import MappingProxyType
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti.models import (
+    FuelQuote,
+    ScheduleDay,
+    StationData,
+    StationInfo,
+    _get_available_service_ids,
+    _parse_time,
+    freeze_service,
+)
+
+
+def _station_dict():
+    return {
+        "station_info": {"id": 123, "nomeImpianto": "Plant", "phoneNumber": "06 123"},
+        "fuels": {"benzina_self": {"price": 1.8, "previous_price": 1.9}},
+        "services": [{"id": 8}, "1", {"name": "no id"}],
+        "opening_hours": [
+            {
+                "giornoSettimanaId": 1,
+                "oraAperturaMattina": "7.00",
+                "oraChiusuraMattina": "12",
+                "oraAperturaPomeriggio": "15:00",
+            }
+        ],
+        "last_update": "2026-06-01T08:00:00+02:00",
+    }
+
+
+class TestModels:
+    def test_models_are_slotted_and_immutable(self):
+        data = StationData.from_dict(_station_dict())
+
+        for model in (data, data.station_info, data.fuels["benzina_self"], data.opening_hours[0]):
+            assert not hasattr(model, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            data.last_update = None  # type: ignore[misc]
+        assert isinstance(data.fuels, MappingProxyType)
+
+    def test_attributes_are_typed_and_preparsed(self):
+        data = StationData.from_dict(_station_dict())
+
+        assert data.station_info.display_name == "Plant"
+        assert data.station_info.phone_number == "06 123"
+        assert StationInfo(name="Station").display_name == "Station"
+        assert data.fuels["benzina_self"].previous_price == 1.9
+        assert data.service_ids == frozenset({"1", "8"})
+        day = data.opening_hours[0]
+        assert (day.weekday, day.continuous) == (1, False)
+        # The afternoon has no closing time, so only the morning is complete.
+        assert day.intervals == ((time(7, 0), time(12, 0)),)
+
+    def test_mapping_view_uses_payload_keys(self):
+        data = StationData.from_dict(_station_dict())
+
+        assert data["station_info"]["nomeImpianto"] == "Plant"
+        assert data["station_info"].get("missing") is None
+        assert data["fuels"]["benzina_self"] == FuelQuote(price=1.8, previous_price=1.9)
+        assert data["opening_hours"][0]["oraAperturaMattina"] == "07:00"
+        assert list(data) == ["station_info", "fuels", "services", "opening_hours", "last_update"]
+        with pytest.raises(KeyError):
+            data["orariapertura"]
+
+    def test_service_items_are_frozen_and_key_order_free(self):
+        first = StationData(services=(freeze_service({"id": 1, "description": "Bar"}),))
+        second = StationData(services=(freeze_service({"description": "Bar", "id": 1}),))
+
+        assert repr(first.services) == repr(second.services)
+        assert first == second
+        assert first.service_ids == frozenset({"1"})
+        with pytest.raises(TypeError):
+            first.services[0]["id"] = 2  # type: ignore[index]
+
+    def test_as_dict_round_trips(self):
+        data = StationData.from_dict(_station_dict())
+        plain = data.as_dict()
+
+        # Services keep the shape of the payload items.
+        assert plain["services"] == [{"id": 8}, "1", {"name": "no id"}]
+        assert plain["opening_hours"][0]["oraChiusuraMattina"] == "12:00"
+        assert plain["fuels"]["benzina_self"]["price"] == 1.8
+        assert StationData.from_dict(plain) == data
+        assert ScheduleDay.from_api(plain["opening_hours"][0]) == data.opening_hours[0]
+
+
+class TestParseTime:
+    def test_hh_mm_format(self):
+        assert _parse_time("07:30") == time(7, 30)
+
+    def test_hh_mm_format_midnight(self):
+        assert _parse_time("00:00") == time(0, 0)
+
+    def test_hh_dot_mm_format(self):
+        assert _parse_time("07.30") == time(7, 30)
+
+    def test_hh_dot_mm_format_24(self):
+        assert _parse_time("24.00") == time(0, 0)
+
+    def test_hh_only_format(self):
+        assert _parse_time("7") == time(7, 0)
+
+    def test_hh_only_format_24(self):
+        assert _parse_time("24") == time(0, 0)
+
+    def test_none_returns_none(self):
+        assert _parse_time(None) is None
+
+    def test_empty_string_returns_none(self):
+        assert _parse_time("") is None
+
+    def test_invalid_returns_none(self):
+        assert _parse_time("abc") is None
+
+
+class TestGetAvailableServiceIds:
+    def test_normalizes_mixed_service_payloads(self):
+        services = [{"id": 1}, "2", 3, {"id": "4"}, {"other": "ignored"}]
+        assert _get_available_service_ids(services) == {"1", "2", "3", "4"}
@@ -0,0 +1,439 @@
+"""Tests for the daily price file manager."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.osservaprezzi_carburanti import price_csv_manager as price_module
+from custom_components.osservaprezzi_carburanti.const import DOMAIN
+from custom_components.osservaprezzi_carburanti.price_csv_manager import (
+    PRICE_CSV_MANAGER_DATA_KEY,
+    PriceCSVManager,
+    async_remove_price_csv_manager,
+    get_price_csv_manager,
+)
+
+_NOW = datetime(2026, 2, 11, 8, 30, tzinfo=timezone.utc)
+_EXTRACTED_AT = "2026-02-11T08:00:00+01:00"
+
+PIPE_PRICE_LINES = [
+    "Estrazione del 2026-02-11",
+    "idImpianto|descCarburante|prezzo|isSelf|dtComu",
+    "12345|Benzina|1.829|1|11/02/2026 07:10:00",
+    "12345|Gasolio|1,739|0|10/02/2026 20:39:56",
+    "67890|Blue Süper|1.999|1|bad date",
+    "67890|Metano|bad|1|11/02/2026 06:00:00",
+    "|Benzina|1.8|1|11/02/2026 06:00:00",
+    "12345||1.8|1|11/02/2026 06:00:00",
+    "",
+    "12345",
+]
+
+
+async def _run_in_executor(func, *args):
+    return func(*args)
+
+
+class FakePriceResponse:
+    """Async response context streaming a body in small chunks."""
+
+    def __init__(self, status: int = 200, body: bytes = b"", headers=None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+        self.content = SimpleNamespace(iter_chunked=self._iter_chunked)
+
+    async def __aenter__(self) -> FakePriceResponse:
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+    async def _iter_chunked(self, size: int):
+        # Small chunks split lines and multi-byte characters across chunks.
+        for start in range(0, len(self._body), 7):
+            yield self._body[start : start + 7]
+
+
+class FakePriceSession:
+    """Session fake returning queued responses or raising an exception."""
+
+    def __init__(self, *responses: Any) -> None:
+        self.responses = list(responses)
+        self.calls: list[dict[str, Any]] = []
+
+    def get(self, url: str, **kwargs: Any) -> FakePriceResponse:
+        self.calls.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[datetime]:
+    now = [_NOW]
+    monkeypatch.setattr(price_module.dt_util, "now", lambda: now[0])
+    monkeypatch.setattr(price_module.dt_util, "utcnow", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def hass(hass: MagicMock, tmp_path: Path) -> MagicMock:
+    """Extend the shared hass mock with a config directory and an executor."""
+    hass.config.path.side_effect = lambda *parts: str(tmp_path / parts[-1])
+    hass.async_add_executor_job.side_effect = _run_in_executor
+    return hass
+
+
+@pytest.fixture
+def coordinator_factory(make_coordinator: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a factory of station coordinators with a last refresh time."""
+
+    def _make(
+        station_id: str,
+        last_update: str | None = "2026-02-10T08:30:00+01:00",
+        applied: bool = True,
+        refresh_error: Exception | None = None,
+    ) -> Any:
+        coordinator = make_coordinator(
+            f"entry_{station_id}",
+            station_id,
+            data=None if last_update is None else SimpleNamespace(last_update=last_update),
+            async_apply_zone_prices=MagicMock(return_value=applied),
+            last_update_success=True,
+            last_exception=None,
+        )
+
+        async def async_refresh() -> None:
+            # Like a coordinator, record a failed fetch rather than raising it.
+            coordinator.last_update_success = refresh_error is None
+            coordinator.last_exception = refresh_error
+
+        coordinator.async_refresh = AsyncMock(side_effect=async_refresh)
+        return coordinator
+
+    return _make
+
+
+@pytest.fixture
+def manager_factory(
+    hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> Callable[..., tuple[PriceCSVManager, FakePriceSession]]:
+    """Return a factory of price managers downloading the given responses."""
+
+    def _make(
+        *responses: Any, stations: tuple[str, ...] = ("12345", "67890")
+    ) -> tuple[PriceCSVManager, FakePriceSession]:
+        manager = PriceCSVManager(hass, MagicMock())
+        session = FakePriceSession(*responses)
+        manager.http_client = SimpleNamespace(session=session)
+        for station_id in stations:
+            manager.async_add(coordinator_factory(station_id), "0 9 * * *")
+        return manager, session
+
+    return _make
+
+
+def _body(lines: list[str], separator: str = "|") -> bytes:
+    return "\r\n".join(line.replace("|", separator) for line in lines).encode()
+
+
+@pytest.mark.parametrize("separator", ["|", ";"])
+def test_download_streams_prices_and_revalidates_them(
+    tmp_path: Path, clock: list[datetime], separator: str, manager_factory: Callable[..., Any]
+) -> None:
+    manager, session = manager_factory(
+        FakePriceResponse(
+            body=_body(PIPE_PRICE_LINES, separator),
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 11 Feb 2026 07:00:00 GMT"},
+        ),
+        FakePriceResponse(status=304),
+    )
+
+    assert asyncio.run(manager.async_update_prices()) is True
+
+    assert manager.get_station_prices("12345") == {
+        "fuels": [
+            {
+                "name": "Benzina",
+                "price": 1.829,
+                "isSelf": True,
+                "insertDate": "2026-02-11T07:10:00+01:00",
+            },
+            {
+                "name": "Gasolio",
+                "price": 1.739,
+                "isSelf": False,
+                "insertDate": "2026-02-10T20:39:56+01:00",
+            },
+        ]
+    }
+    assert manager.get_station_prices("67890") == {
+        "fuels": [{"name": "Blue Süper", "price": 1.999, "isSelf": True, "insertDate": None}]
+    }
+    assert manager.get_station_prices("99999") is None
+    cache = json.loads((tmp_path / f"{DOMAIN}_prices.json").read_text(encoding="utf-8"))
+    assert cache["extracted_at"] == _EXTRACTED_AT
+    assert cache["csv_separator"] == separator
+    assert cache["stations"]["12345"][0] == [
+        "Benzina",
+        1.829,
+        True,
+        "2026-02-11T07:10:00+01:00",
+    ]
+    assert "If-None-Match" not in session.calls[0]["headers"]
+
+    # A recent check is not repeated; a later one revalidates the file.
+    assert asyncio.run(manager.async_update_prices()) is True
+    assert len(session.calls) == 1
+    clock[0] = _NOW + timedelta(hours=2)
+    assert asyncio.run(manager.async_update_prices()) is True
+    assert session.calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert session.calls[1]["headers"]["If-Modified-Since"] == "Wed, 11 Feb 2026 07:00:00 GMT"
+    assert manager.status() == {
+        "members": 2,
+        "station_count": 2,
+        "extracted_at": _EXTRACTED_AT,
+        "last_update": _NOW.isoformat(),
+        "last_check": (_NOW + timedelta(hours=2)).isoformat(),
+        "separator": separator,
+        "has_etag": True,
+        "has_last_modified": True,
+        "running_refreshes": 0,
+        "last_refresh": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        FakePriceResponse(status=503),
+        aiohttp.ClientError("down"),
+        FakePriceResponse(body=b""),
+        FakePriceResponse(body=_body(["Estrazione del 2026-02-11", "idImpianto|prezzo"])),
+        FakePriceResponse(body=_body(PIPE_PRICE_LINES[:2])),
+    ],
+)
+def test_unusable_downloads_keep_previous_prices(
+    clock: list[datetime], response: Any, manager_factory: Callable[..., Any]
+) -> None:
+    manager, _ = manager_factory(response)
+
+    assert asyncio.run(manager.async_update_prices(force_update=True)) is False
+
+    assert manager.status()["station_count"] == 0
+    assert manager.status()["last_check"] is None
+
+
+def test_failed_cache_write_keeps_previous_prices(
+    clock: list[datetime], monkeypatch: pytest.MonkeyPatch, manager_factory: Callable[..., Any]
+) -> None:
+    manager, _ = manager_factory(FakePriceResponse(body=_body(PIPE_PRICE_LINES)))
+    monkeypatch.setattr(
+        price_module, "_write_json_file_atomic_sync", MagicMock(side_effect=OSError("full"))
+    )
+
+    assert asyncio.run(manager.async_update_prices()) is False
+    assert manager.get_station_prices("12345") is None
+
+
+@pytest.mark.parametrize("first_line", ["Estrazione", "Estrazione del 2026-13-40"])
+def test_files_without_extraction_date_are_not_used(
+    clock: list[datetime],
+    first_line: str,
+    caplog: pytest.LogCaptureFixture,
+    manager_factory: Callable[..., Any],
+) -> None:
+    manager, _ = manager_factory(
+        FakePriceResponse(body=_body([first_line, *PIPE_PRICE_LINES[1:3]]))
+    )
+
+    assert asyncio.run(manager.async_update_prices()) is False
+
+    assert manager.status()["extracted_at"] is None
+    assert manager.get_station_prices("12345") is None
+    assert "missing extraction date" in caplog.text
+
+
+def test_only_member_prices_are_kept_and_new_members_download_again(
+    tmp_path: Path,
+    clock: list[datetime],
+    coordinator_factory: Callable[..., Any],
+    manager_factory: Callable[..., Any],
+) -> None:
+    manager, session = manager_factory(
+        FakePriceResponse(body=_body(PIPE_PRICE_LINES), headers={"ETag": '"v1"'}),
+        FakePriceResponse(body=_body(PIPE_PRICE_LINES), headers={"ETag": '"v1"'}),
+        stations=("12345", "99999"),
+    )
+
+    assert asyncio.run(manager.async_update_prices()) is True
+
+    assert manager.get_station_prices("67890") is None
+    cache = json.loads((tmp_path / f"{DOMAIN}_prices.json").read_text(encoding="utf-8"))
+    assert list(cache["stations"]) == ["12345"]
+    assert cache["station_ids"] == ["12345", "99999"]
+
+    # A departed member needs no download; a new one skips the check interval.
+    manager.async_remove("entry_99999")
+    manager.async_remove("entry_99999")
+    assert asyncio.run(manager.async_update_prices()) is True
+    assert len(session.calls) == 1
+    remove = manager.async_add(coordinator_factory("67890"), "0 9 * * *")
+    assert asyncio.run(manager.async_update_prices()) is True
+
+    assert "If-None-Match" not in session.calls[1]["headers"]
+    assert manager.get_station_prices("67890") is not None
+    assert manager.status()["members"] == 2
+    remove()
+    manager._scheduler.async_remove.assert_called_with("entry_67890")
+
+
+def test_parser_skips_non_member_rows_before_converting_them() -> None:
+    parser = price_module._PriceCSVParser(frozenset({"12345"}))
+
+    parser.feed("\n".join(PIPE_PRICE_LINES))
+    parser.close()
+
+    assert list(parser.prices) == ["12345"]
+    assert len(parser.prices["12345"]) == 2
+    # Only the unusable member rows count; the unparsable price of a
+    # non-member is never converted.
+    assert (parser.rows, parser.skipped) == (7, 2)
+
+
+def test_cached_prices_are_loaded_once_before_revalidation(
+    clock: list[datetime], manager_factory: Callable[..., Any]
+) -> None:
+    first, _ = manager_factory(
+        FakePriceResponse(body=_body(PIPE_PRICE_LINES), headers={"ETag": '"v1"'})
+    )
+    asyncio.run(first.async_update_prices())
+    clock[0] = _NOW + timedelta(hours=2)
+    manager, session = manager_factory(FakePriceResponse(status=304))
+
+    assert asyncio.run(manager.async_update_prices()) is True
+
+    assert session.calls[0]["headers"]["If-None-Match"] == '"v1"'
+    assert manager.get_station_prices("12345") == first.get_station_prices("12345")
+    assert manager.status()["extracted_at"] == _EXTRACTED_AT
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        json.dumps({"version": "0.1", "stations": {}}),
+        json.dumps({"version": "1.1", "stations": []}),
+        json.dumps({"version": "1.1", "stations": {"1": [["Benzina", 1.8]]}}),
+        json.dumps({"version": "1.1", "stations": {}}),
+        json.dumps({"version": "1.1", "station_ids": [], "stations": {}}),
+        None,
+    ],
+)
+def test_unusable_caches_wait_for_a_download(
+    tmp_path: Path, clock: list[datetime], content: str | None, manager_factory: Callable[..., Any]
+) -> None:
+    if content is not None:
+        (tmp_path / f"{DOMAIN}_prices.json").write_text(content, encoding="utf-8")
+    manager, _ = manager_factory(FakePriceResponse(status=304))
+
+    assert asyncio.run(manager.async_update_prices()) is True
+
+    assert manager.status()["extracted_at"] is None
+    assert manager.has_prices_newer_than(None) is False
+
+
+def test_prices_are_newer_when_extracted_after_the_last_refresh(
+    clock: list[datetime], manager_factory: Callable[..., Any]
+) -> None:
+    manager, _ = manager_factory(FakePriceResponse(body=_body(PIPE_PRICE_LINES)))
+    asyncio.run(manager.async_update_prices())
+
+    assert manager.has_prices_newer_than(None) is True
+    assert manager.has_prices_newer_than("not a date") is True
+    assert manager.has_prices_newer_than("2026-02-10T08:30:00+01:00") is True
+    assert manager.has_prices_newer_than("2026-02-11T07:59:00") is True
+    assert manager.has_prices_newer_than("2026-02-11T08:00:00+01:00") is False
+    assert manager.has_prices_newer_than("2026-02-11T10:00:00+00:00") is False
+
+
+def test_due_stations_refresh_from_the_file_or_the_station_api(
+    clock: list[datetime],
+    caplog: pytest.LogCaptureFixture,
+    coordinator_factory: Callable[..., Any],
+    manager_factory: Callable[..., Any],
+) -> None:
+    manager, session = manager_factory(FakePriceResponse(body=_body(PIPE_PRICE_LINES)))
+    from_file = coordinator_factory("12345")
+    # Refreshed from the API after the extraction, as an intra-day refresh.
+    refreshed_later = coordinator_factory("12345", last_update="2026-02-11T09:00:00+01:00")
+    missing = coordinator_factory("99999", refresh_error=RuntimeError("boom"))
+    # A coordinator that fails records the error rather than raising it.
+    without_data = coordinator_factory("12345", last_update=None)
+    not_applied = coordinator_factory("67890", applied=False)
+    coordinators = [from_file, refreshed_later, missing, without_data, not_applied]
+
+    async def run() -> None:
+        manager.async_queue(coordinators)
+        assert manager.status()["running_refreshes"] == 1
+        await asyncio.gather(*manager._tasks)
+
+    asyncio.run(run())
+
+    assert len(session.calls) == 1
+    from_file.async_apply_zone_prices.assert_called_once_with(
+        manager.get_station_prices("12345")
+    )
+    from_file.async_refresh.assert_not_awaited()
+    for coordinator in coordinators[1:]:
+        coordinator.async_refresh.assert_awaited_once()
+    refreshed_later.async_apply_zone_prices.assert_not_called()
+    assert manager.status()["last_refresh"] == {
+        "started_at": _NOW.isoformat(),
+        "duration_seconds": manager.status()["last_refresh"]["duration_seconds"],
+        "stations": 5,
+        "from_file": 1,
+        "from_api": 4,
+        "failed": 1,
+    }
+    assert "Refresh of entry_99999 from the station API failed: boom" in caplog.text
+
+
+def test_shared_manager_cancels_running_refreshes_on_removal(
+    clock: list[datetime], hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    release = asyncio.Event()
+
+    async def run() -> asyncio.Task[None]:
+        manager = get_price_csv_manager(hass)
+        assert get_price_csv_manager(hass) is manager
+        manager.http_client = SimpleNamespace(session=FakePriceSession(FakePriceResponse(503)))
+        coordinator = coordinator_factory("12345")
+        coordinator.async_refresh = AsyncMock(side_effect=release.wait)
+        manager._scheduler = MagicMock()
+        manager.async_add(coordinator, "0 9 * * *")
+        manager.async_queue([coordinator])
+        (task,) = manager._tasks
+        await asyncio.sleep(0)
+        async_remove_price_csv_manager(hass)
+        async_remove_price_csv_manager(hass)
+        await asyncio.gather(task, return_exceptions=True)
+        assert manager.status()["running_refreshes"] == 0
+        assert manager.status()["members"] == 0
+        return task
+
+    task = asyncio.run(run())
+
+    assert task.cancelled()
+    assert PRICE_CSV_MANAGER_DATA_KEY not in hass.data[DOMAIN]
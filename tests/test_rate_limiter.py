@@ -0,0 +1,299 @@
+"""Tests for the adaptive station API rate limiter."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti import rate_limiter
+from custom_components.osservaprezzi_carburanti.rate_limiter import (
+    RequestPriority,
+    TokenBucketRateLimiter,
+    parse_retry_after,
+)
+
+_REAL_SLEEP = asyncio.sleep
+
+
+class _Clock:
+    """Monotonic clock advanced only by the fake sleep."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+        await _REAL_SLEEP(0)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+def test_limiter_allows_a_burst_then_paces_requests(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(2, 3, min_rate=0.5)
+
+    async def run() -> list[float]:
+        return [await limiter.acquire() for _ in range(5)]
+
+    assert asyncio.run(run()) == [0, 0, 0, 0.5, 0.5]
+    assert clock.sleeps == [0.5, 0.5]
+    assert limiter.status()["available_tokens"] == 0
+    assert limiter.status()["total_wait_seconds"] == 1.0
+
+
+def test_limiter_backs_off_on_throttle_and_recovers_gradually(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(2, 2, min_rate=0.5, recovery_fraction=0.25)
+
+    limiter.record_throttle(retry_after=10)
+    assert limiter.rate == 1
+    assert limiter.status()["wait_seconds"] == 10
+    assert asyncio.run(limiter.acquire()) == 10
+
+    limiter.record_throttle()
+    limiter.record_throttle()
+    assert limiter.rate == 0.5
+    assert limiter.status()["throttle_events"] == 3
+    assert limiter.status()["wait_seconds"] == 2
+
+    for expected in (1.0, 1.5, 2.0, 2.0):
+        limiter.record_success()
+        assert limiter.rate == expected
+
+    clock.now += 30
+    status = limiter.status()
+    assert status.pop("lanes")["scheduled"] == {
+        "queued": 0,
+        "granted": 1,
+        "last_wait_seconds": 10.0,
+        "max_wait_seconds": 10.0,
+        "average_wait_seconds": 10.0,
+    }
+    assert status == {
+        "rate_per_second": 2.0,
+        "configured_rate_per_second": 2.0,
+        "burst": 2,
+        "available_tokens": 2.0,
+        "wait_seconds": 0.0,
+        "last_wait_seconds": 10.0,
+        "total_wait_seconds": 10.0,
+        "throttle_events": 3,
+        "seconds_since_throttle": 30.0,
+    }
+
+
+def test_limiter_rechecks_the_rate_after_a_throttle_during_a_wait(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.25)
+
+    async def run() -> float:
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.record_throttle(retry_after=5)
+        return await waiter
+
+    assert asyncio.run(run()) == 6
+    assert limiter.status()["seconds_since_throttle"] == 5.0
+
+
+def test_limiter_serves_higher_priority_lanes_first(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.5, starvation_seconds=30)
+    order: list[str] = []
+
+    async def request(name: str, priority: RequestPriority) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def run() -> None:
+        await limiter.acquire()
+        # scheduled-0 starts first and waits for a token while the rest queue.
+        await asyncio.gather(
+            *(request(f"scheduled-{index}", RequestPriority.SCHEDULED) for index in range(3)),
+            request("service", RequestPriority.SERVICE),
+            request("interactive", RequestPriority.INTERACTIVE),
+        )
+
+    asyncio.run(run())
+
+    assert order == ["scheduled-0", "interactive", "service", "scheduled-1", "scheduled-2"]
+    lanes = limiter.status()["lanes"]
+    assert lanes["interactive"]["granted"] == 1
+    assert lanes["interactive"]["last_wait_seconds"] == 1.0
+    assert lanes["scheduled"]["max_wait_seconds"] == 4.0
+    assert lanes["scheduled"]["average_wait_seconds"] == 2.0
+
+
+def test_limiter_serves_starving_requests_before_newer_ones(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.5, starvation_seconds=2.5)
+    order: list[str] = []
+
+    async def request(name: str, priority: RequestPriority) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def run() -> None:
+        await limiter.acquire()
+        await asyncio.gather(
+            request("interactive-0", RequestPriority.INTERACTIVE),
+            request("scheduled", RequestPriority.SCHEDULED),
+            *(
+                request(f"interactive-{index}", RequestPriority.INTERACTIVE)
+                for index in range(1, 5)
+            ),
+        )
+
+    asyncio.run(run())
+
+    assert order == [
+        "interactive-0",
+        "interactive-1",
+        "interactive-2",
+        "interactive-3",
+        "scheduled",
+        "interactive-4",
+    ]
+
+
+def test_limiter_raises_the_lane_of_a_keyed_waiter(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.5)
+    order: list[str] = []
+
+    async def request(name: str, priority: RequestPriority, key: str | None = None) -> None:
+        await limiter.acquire(priority, key=key)
+        order.append(name)
+
+    async def run() -> None:
+        await limiter.acquire()
+        requests = [
+            asyncio.create_task(request("scheduled-0", RequestPriority.SCHEDULED)),
+            asyncio.create_task(request("interactive-0", RequestPriority.INTERACTIVE)),
+            asyncio.create_task(request("scheduled-1", RequestPriority.SCHEDULED)),
+            asyncio.create_task(request("joined", RequestPriority.SCHEDULED, "joined")),
+            asyncio.create_task(request("interactive-1", RequestPriority.INTERACTIVE)),
+        ]
+        await _REAL_SLEEP(0)
+        assert limiter.raise_priority("joined", RequestPriority.INTERACTIVE) is True
+        assert limiter.raise_priority("joined", RequestPriority.SERVICE) is False
+        assert limiter.raise_priority("unknown", RequestPriority.INTERACTIVE) is False
+        await asyncio.gather(*requests)
+
+    asyncio.run(run())
+
+    # The raised request keeps its place in time within its new lane.
+    assert order == ["scheduled-0", "interactive-0", "joined", "interactive-1", "scheduled-1"]
+    assert limiter.status()["lanes"]["interactive"]["granted"] == 3
+    assert limiter._keyed_waiters == {}
+
+
+def test_limiter_forgets_cancelled_waiters(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.5)
+
+    async def run() -> list[bool]:
+        await limiter.acquire()
+        holder = asyncio.create_task(limiter.acquire())
+        queued = asyncio.create_task(limiter.acquire(RequestPriority.SERVICE))
+        handed_over = asyncio.create_task(limiter.acquire(RequestPriority.INTERACTIVE))
+        await _REAL_SLEEP(0)
+        assert limiter.status()["lanes"]["service"]["queued"] == 1
+
+        # Cancel one waiter while queued and one right after the bucket is handed to it.
+        queued.cancel()
+        limiter._release()
+        handed_over.cancel()
+        await asyncio.gather(holder, queued, handed_over, return_exceptions=True)
+        assert limiter.status()["lanes"]["service"]["queued"] == 0
+        await asyncio.wait_for(limiter.acquire(), 10)
+        return [task.cancelled() for task in (queued, handed_over)]
+
+    assert asyncio.run(run()) == [True, True]
+
+
+def test_limiter_drops_waiters_cancelled_in_the_queue(
+    clock: _Clock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    limiter = TokenBucketRateLimiter(1, 1, min_rate=0.5)
+
+    async def run() -> None:
+        gate = asyncio.Event()
+
+        async def gated_sleep(delay: float) -> None:
+            clock.now += delay
+            await gate.wait()
+
+        await limiter.acquire()
+        monkeypatch.setattr(rate_limiter.asyncio, "sleep", gated_sleep)
+        holder = asyncio.create_task(limiter.acquire())
+        waiter = asyncio.create_task(limiter.acquire(RequestPriority.SERVICE))
+        await _REAL_SLEEP(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.status()["lanes"]["service"]["queued"] == 0
+        gate.set()
+        assert await holder == 1
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("kwargs"),
+    [
+        {"rate": 0, "burst": 1, "min_rate": 0.1},
+        {"rate": 1, "burst": 0, "min_rate": 0.1},
+        {"rate": 1, "burst": 1, "min_rate": 2},
+        {"rate": 1, "burst": 1, "min_rate": 0.1, "backoff_factor": 1},
+        {"rate": 1, "burst": 1, "min_rate": 0.1, "recovery_fraction": 0},
+        {"rate": 1, "burst": 1, "min_rate": 0.1, "starvation_seconds": 0},
+    ],
+)
+def test_limiter_rejects_invalid_settings(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(**kwargs)  # type: ignore[arg-type]
+
+
+def test_limiter_applies_a_new_rate_and_burst(clock: _Clock) -> None:
+    limiter = TokenBucketRateLimiter(2, 4, min_rate=0.5)
+
+    limiter.configure(1, 2)
+    assert limiter.status()["rate_per_second"] == 1
+    assert limiter.status()["burst"] == limiter.burst == 2
+    assert limiter.status()["available_tokens"] == 2
+
+    # A backed-off rate is not raised by a looser limit.
+    limiter.record_throttle()
+    limiter.configure(4, 2)
+    assert limiter.rate == 0.5
+    assert limiter.status()["configured_rate_per_second"] == 4
+    limiter.configure(0.5, 2)
+    assert limiter.rate == 0.5
+
+    with pytest.raises(ValueError):
+        limiter.configure(0.1, 2)
+    with pytest.raises(ValueError):
+        limiter.configure(1, 0)
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates() -> None:
+    future = datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    assert parse_retry_after("12", 300) == 12
+    assert parse_retry_after("-3", 300) == 0
+    assert parse_retry_after("900", 300) == 300
+    assert 55 < parse_retry_after(format_datetime(future, usegmt=True), 300) <= 60
+    assert 55 < parse_retry_after(
+        future.strftime("%a, %d %b %Y %H:%M:%S"), 300
+    ) <= 60
+    assert parse_retry_after(None, 300) is None
+    assert parse_retry_after("nan", 300) is None
+    assert parse_retry_after("soon", 300) is None
@@ -1,6 +1,7 @@
 """Regression tests using saved real MIMIT/Osservaprezzi payload snapshots."""
 from __future__ import annotations
 
+import importlib.util
 import json
 import sys
 from datetime import datetime, timezone
@@ -110,3 +111,21 @@ def test_real_station_payload_snapshot_maps_expected_coordinator_output() -> Non
     }
     assert processed["fuels"]["Gasolio_self"]["price"] == 1.898
     assert processed["opening_hours"][0]["flagChiusura"] is True
+
+
+def test_normalize_benchmark_runs_on_the_real_payload() -> None:
+    path = Path(__file__).parents[1] / "scripts" / "benchmark_normalize.py"
+    spec = importlib.util.spec_from_file_location("benchmark_normalize", path)
+    assert spec is not None and spec.loader is not None
+    benchmark = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their annotations through sys.modules.
+    sys.modules["benchmark_normalize"] = benchmark
+    spec.loader.exec_module(benchmark)
+
+    report = benchmark.run_benchmark(iterations=2, repeat=1).as_dict()
+
+    assert report["iterations"] == 2
+    assert report["total_us"] == pytest.approx(
+        report["normalize_us"] + report["fingerprint_us"] + report["process_us"], abs=0.02
+    )
+    assert min(report["normalize_us"], report["fingerprint_us"], report["process_us"]) > 0
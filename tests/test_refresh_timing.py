@@ -0,0 +1,115 @@
+"""Tests for refresh times learned from price publication times."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti import refresh_timing
+from custom_components.osservaprezzi_carburanti.models import FuelQuote
+from custom_components.osservaprezzi_carburanti.refresh_timing import (
+    RefreshTiming,
+    describe_plan,
+    iter_planned_run_times,
+)
+
+_NOW = datetime(2026, 3, 10, 18, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def utc_local_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(refresh_timing.dt_util, "as_local", lambda value: value)
+    monkeypatch.setattr(refresh_timing.dt_util, "now", lambda: _NOW)
+
+
+def _published(days_ago: int, hour: int, minute: int) -> datetime:
+    day = _NOW - timedelta(days=days_ago)
+    return day.replace(hour=hour, minute=minute)
+
+
+def test_observe_records_distinct_recent_publication_times() -> None:
+    timing = RefreshTiming([_NOW - timedelta(days=40)])
+    fuels = [
+        FuelQuote(last_update="2026-03-10T07:10:00"),
+        # Fuels updated together are one observation.
+        FuelQuote(last_update="2026-03-10T07:10:00+00:00"),
+        FuelQuote(price_changed_at="2026-03-09T13:02:00+00:00"),
+        FuelQuote(last_update="2026-03-11T07:00:00+00:00"),
+        FuelQuote(last_update="not a date"),
+        FuelQuote(),
+    ]
+
+    assert timing.observe(fuels, _NOW) is True
+    assert timing.observe(fuels, _NOW) is False
+    assert timing.as_list() == [
+        "2026-03-09T13:02:00+00:00",
+        "2026-03-10T07:10:00+00:00",
+    ]
+    assert timing.status() == {
+        "observations": 2,
+        "last_observed": "2026-03-10T07:10:00+00:00",
+    }
+    assert RefreshTiming().status() == {"observations": 0, "last_observed": None}
+
+
+def test_observe_keeps_the_latest_observations() -> None:
+    timing = RefreshTiming()
+    fuels = [
+        FuelQuote(last_update=(_NOW - timedelta(minutes=minutes)).isoformat())
+        for minutes in range(250)
+    ]
+
+    timing.observe(fuels, _NOW)
+
+    assert len(timing.observed) == 200
+    assert timing.observed[-1] == _NOW
+
+
+def test_plan_refreshes_after_the_busiest_windows_within_budget() -> None:
+    timing = RefreshTiming(
+        sorted(
+            [
+                _published(1, 7, 5),
+                _published(2, 7, 20),
+                _published(3, 7, 12),
+                _published(1, 13, 0),
+                _published(2, 13, 10),
+                _published(1, 23, 50),
+                _published(2, 23, 55),
+                # A single publication is not a window yet.
+                _published(1, 18, 0),
+            ]
+        )
+    )
+
+    assert timing.plan(1) == (time(7, 35),)
+    # Equally busy windows are taken earliest first; late ones wrap past midnight.
+    assert timing.plan(2) == (time(7, 35), time(13, 25))
+    assert timing.plan(8) == (time(0, 10), time(7, 35), time(13, 25))
+    assert timing.plan(0) == ()
+    assert RefreshTiming([_published(1, 7, 5)]).plan(3) == ()
+
+
+def test_history_round_trips_through_its_persisted_form() -> None:
+    timing = RefreshTiming([_published(2, 7, 5), _published(1, 7, 5)])
+
+    restored = RefreshTiming.from_list([*timing.as_list(), "bad", None, ""])
+
+    assert restored == timing
+    assert RefreshTiming.from_list(None) == RefreshTiming()
+
+
+def test_planned_run_times_follow_the_plan_every_day() -> None:
+    plan = (time(7, 35), time(19, 0))
+
+    assert describe_plan(plan) == "adaptive 07:35,19:00"
+    assert list(islice(iter_planned_run_times(plan), 3)) == [
+        datetime(2026, 3, 10, 19, 0, tzinfo=timezone.utc),
+        datetime(2026, 3, 11, 7, 35, tzinfo=timezone.utc),
+        datetime(2026, 3, 11, 19, 0, tzinfo=timezone.utc),
+    ]
+    base = datetime(2026, 3, 10, 7, 35, tzinfo=timezone.utc)
+    assert next(iter_planned_run_times(plan, base)) == base.replace(hour=19, minute=0)
+    with pytest.raises(ValueError):
+        iter_planned_run_times(())
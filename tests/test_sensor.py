@@ -12,14 +12,13 @@ sys.path.insert(0, ".")
 from custom_components.osservaprezzi_carburanti.entity import (
     _compute_easter,
     _find_schedule_for_day,
-    _get_available_service_ids,
     _has_valid_opening_hours,
     _is_italian_holiday,
     _is_schedule_open,
-    _parse_time,
     _schedule_intervals_for_date,
     HOLIDAY_SCHEDULE_ID,
 )
+from custom_components.osservaprezzi_carburanti.models import ScheduleDay, StationData
 from custom_components.osservaprezzi_carburanti.sensor import (
     _get_fuel_icon,
     _price_metadata,
@@ -32,9 +31,12 @@ from custom_components.osservaprezzi_carburanti.sensor import (
 from custom_components.osservaprezzi_carburanti import entity as entity_module
 from custom_components.osservaprezzi_carburanti import sensor as sensor_module
 from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID, DOMAIN
+from custom_components.osservaprezzi_carburanti.coordinator import (
+    CarburantiDataUpdateCoordinator,
+)
 
 
-def _sample_station_data():
+def _sample_station_dict():
     return {
         "fuels": {
             "gasolio_self": {
@@ -72,6 +74,14 @@ def _sample_station_data():
     }
 
 
+def _sample_station_data():
+    return StationData.from_dict(_sample_station_dict())
+
+
+def _schedule(opening_hours):
+    return tuple(ScheduleDay.from_api(day) for day in opening_hours)
+
+
 class TestEntitySetupRegression:
     def test_setup_entry_creates_only_sensor_entities_and_unique_ids(self):
         listeners = []
@@ -126,18 +136,22 @@ class TestEntitySetupRegression:
             lambda entities, update_before_add=False: batches.append(list(entities)),
         ))
         initial_ids = {entity._attr_unique_id for entity in batches[0]}
-        coordinator.data["fuels"]["gpl_self"] = {"price": 0.799}
-        coordinator.data["fuels"]["malformed"] = {"price": 1.0}
-        coordinator.data["station_info"]["company"] = "Example Srl"
+        raw = _sample_station_dict()
+        raw["fuels"]["gpl_self"] = {"price": 0.799}
+        raw["fuels"]["malformed"] = {"price": 1.0}
+        raw["station_info"]["company"] = "Example Srl"
+        coordinator.data = StationData.from_dict(raw)
         listeners[0]()
         assert {entity._attr_unique_id for entity in batches[-1]} == {
             "12345_gpl_self", "12345_company",
         }
         batch_count = len(batches)
         listeners[0]()
-        del coordinator.data["fuels"]["gpl_self"]
+        del raw["fuels"]["gpl_self"]
+        coordinator.data = StationData.from_dict(raw)
         listeners[0]()
-        coordinator.data["fuels"]["gpl_self"] = {"price": 0.8}
+        raw["fuels"]["gpl_self"] = {"price": 0.8}
+        coordinator.data = StationData.from_dict(raw)
         listeners[0]()
         assert len(batches) == batch_count
         assert initial_ids.isdisjoint({"12345_gpl_self", "12345_company"})
@@ -156,11 +170,12 @@ class TestEntitySetupRegression:
         assert entity.extra_state_attributes["fuel_type_name"] == "Gasolio"
         assert entity.extra_state_attributes["is_self_service"] is True
         assert entity.extra_state_attributes["station_brand"] == "Brand X"
+        assert entity.extra_state_attributes["data_restored"] is False
         assert entity.device_info["identifiers"] == {(DOMAIN, "12345")}
         assert entity.device_info["name"] == "Alpha Fuel"
 
     def test_base_entity_falls_back_to_station_id_for_device_name(self):
-        coordinator = SimpleNamespace(data={"station_info": {}}, hass=SimpleNamespace())
+        coordinator = SimpleNamespace(data=StationData(), hass=SimpleNamespace())
         entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
 
         entity = StationLocationSensor(coordinator, entry)
@@ -176,13 +191,14 @@ class TestEntitySetupRegression:
         assert entity.native_value is None
         assert entity.extra_state_attributes == {}
 
-        coordinator.data = {"fuels": {}, "station_info": {}}
+        coordinator.data = StationData()
+        assert entity.native_value is None
         assert entity.extra_state_attributes == {}
 
     def test_info_and_location_sensor_properties(self):
         coordinator = SimpleNamespace(data=_sample_station_data(), hass=SimpleNamespace())
         entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
-        info = StationInfoSensor(coordinator, entry, "brand", "Marchio", "mdi:tag")
+        info = StationInfoSensor(coordinator, entry, "brand", "brand", "Marchio", "mdi:tag")
         location = StationLocationSensor(coordinator, entry)
 
         assert info._attr_name == "Marchio"
@@ -201,7 +217,7 @@ class TestEntitySetupRegression:
 
     def test_location_sensor_unavailable_without_coordinates(self):
         coordinator = SimpleNamespace(
-            data={"station_info": {"name": "Station"}},
+            data=StationData.from_dict({"station_info": {"name": "Station"}}),
             hass=SimpleNamespace(),
         )
         entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
@@ -211,6 +227,57 @@ class TestEntitySetupRegression:
         assert entity.native_value == "Station"
         assert entity.available is False
 
+    def test_entities_write_state_only_for_keys_they_render(self, monkeypatch):
+        updated_at = datetime(2026, 6, 1, 8, 0, tzinfo=timezone.utc)
+        clock = {"now": updated_at + timedelta(hours=1)}
+        monkeypatch.setattr(sensor_module.dt_util, "parse_datetime", lambda value: updated_at)
+        monkeypatch.setattr(sensor_module.dt_util, "now", lambda: clock["now"])
+        coordinator = SimpleNamespace(data=_sample_station_data(), hass=SimpleNamespace())
+        coordinator.has_changes = lambda keys: CarburantiDataUpdateCoordinator.has_changes(
+            coordinator, keys
+        )
+        entry = SimpleNamespace(data={CONF_STATION_ID: "12345"})
+        entities = {
+            "fuel": OsservaprezziStationSensor(coordinator, entry, "benzina_servito"),
+            "info": StationInfoSensor(
+                coordinator, entry, "phoneNumber", "phone_number", "Telefono", "mdi:phone"
+            ),
+            "location": StationLocationSensor(coordinator, entry),
+            "next_change": StationNextChangeSensor(coordinator, entry),
+        }
+        writes = []
+        for name, entity in entities.items():
+            entity.async_write_ha_state = lambda name=name: writes.append(name)
+
+        def update(changes):
+            coordinator.data_changes = changes
+            writes.clear()
+            for entity in entities.values():
+                entity._handle_coordinator_update()
+            return sorted(writes)
+
+        assert update(None) == ["fuel", "info", "location", "next_change"]
+        assert update(frozenset()) == []
+        assert update(frozenset({"fuels.gasolio_self", "services"})) == []
+        assert update(frozenset({"fuels.benzina_servito"})) == ["fuel"]
+        assert update(frozenset({"station_info.brand"})) == ["fuel", "location"]
+        assert update(frozenset({"station_info.phoneNumber"})) == ["info"]
+        assert update(frozenset({"station_info.latitude", "opening_hours"})) == [
+            "location",
+            "next_change",
+        ]
+
+        # A price that aged or crossed the staleness threshold is written without a
+        # payload change.
+        entities = {"fuel": OsservaprezziStationSensor(coordinator, entry, "gasolio_self")}
+        entities["fuel"].async_write_ha_state = lambda: writes.append("fuel")
+        entities["fuel"]._written_price_age = (60, True)
+        assert update(frozenset()) == ["fuel"]
+        assert update(frozenset()) == []
+        clock["now"] += timedelta(minutes=5)
+        assert update(frozenset()) == ["fuel"]
+        assert entities["fuel"]._written_price_age == (65, False)
+
     def test_schedule_tick_uses_thread_safe_state_update(self):
         entity = StationNextChangeSensor.__new__(StationNextChangeSensor)
         calls = []
@@ -244,35 +311,6 @@ class TestEntitySetupRegression:
         assert calls[-1] == "removed"
 
 
-class TestParseTime:
-    def test_hh_mm_format(self):
-        assert _parse_time("07:30") == time(7, 30)
-
-    def test_hh_mm_format_midnight(self):
-        assert _parse_time("00:00") == time(0, 0)
-
-    def test_hh_dot_mm_format(self):
-        assert _parse_time("07.30") == time(7, 30)
-
-    def test_hh_dot_mm_format_24(self):
-        assert _parse_time("24.00") == time(0, 0)
-
-    def test_hh_only_format(self):
-        assert _parse_time("7") == time(7, 0)
-
-    def test_hh_only_format_24(self):
-        assert _parse_time("24") == time(0, 0)
-
-    def test_none_returns_none(self):
-        assert _parse_time(None) is None
-
-    def test_empty_string_returns_none(self):
-        assert _parse_time("") is None
-
-    def test_invalid_returns_none(self):
-        assert _parse_time("abc") is None
-
-
 class TestComputeEaster:
     def test_easter_2024(self):
         assert _compute_easter(2024) == date(2024, 3, 31)
@@ -338,7 +376,7 @@ class TestIsScheduleOpen:
             "oraAperturaOrarioContinuato": "08:00",
             "oraChiusuraOrarioContinuato": "20:00",
         }
-        assert _is_schedule_open(schedule, time(12, 0)) is True
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(12, 0)) is True
 
     def test_continuous_hours_closed(self):
         schedule = {
@@ -346,7 +384,7 @@ class TestIsScheduleOpen:
             "oraAperturaOrarioContinuato": "08:00",
             "oraChiusuraOrarioContinuato": "20:00",
         }
-        assert _is_schedule_open(schedule, time(21, 0)) is False
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(21, 0)) is False
 
     def test_split_hours_morning_open(self):
         schedule = {
@@ -356,7 +394,7 @@ class TestIsScheduleOpen:
             "oraAperturaPomeriggio": "15:00",
             "oraChiusuraPomeriggio": "19:00",
         }
-        assert _is_schedule_open(schedule, time(9, 0)) is True
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(9, 0)) is True
 
     def test_split_hours_afternoon_open(self):
         schedule = {
@@ -366,7 +404,7 @@ class TestIsScheduleOpen:
             "oraAperturaPomeriggio": "15:00",
             "oraChiusuraPomeriggio": "19:00",
         }
-        assert _is_schedule_open(schedule, time(16, 0)) is True
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(16, 0)) is True
 
     def test_split_hours_closed_gap(self):
         schedule = {
@@ -376,7 +414,7 @@ class TestIsScheduleOpen:
             "oraAperturaPomeriggio": "15:00",
             "oraChiusuraPomeriggio": "19:00",
         }
-        assert _is_schedule_open(schedule, time(13, 30)) is False
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(13, 30)) is False
 
     def test_overnight_open(self):
         schedule = {
@@ -384,7 +422,7 @@ class TestIsScheduleOpen:
             "oraAperturaOrarioContinuato": "22:00",
             "oraChiusuraOrarioContinuato": "06:00",
         }
-        assert _is_schedule_open(schedule, time(23, 0)) is True
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(23, 0)) is True
 
     def test_overnight_open_after_midnight(self):
         schedule = {
@@ -392,7 +430,7 @@ class TestIsScheduleOpen:
             "oraAperturaOrarioContinuato": "22:00",
             "oraChiusuraOrarioContinuato": "06:00",
         }
-        assert _is_schedule_open(schedule, time(3, 0)) is True
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(3, 0)) is True
 
     def test_overnight_closed(self):
         schedule = {
@@ -400,10 +438,10 @@ class TestIsScheduleOpen:
             "oraAperturaOrarioContinuato": "22:00",
             "oraChiusuraOrarioContinuato": "06:00",
         }
-        assert _is_schedule_open(schedule, time(15, 0)) is False
+        assert _is_schedule_open(ScheduleDay.from_api(schedule), time(15, 0)) is False
 
     def test_continuous_hours_missing_time_is_closed(self):
-        assert _is_schedule_open({"flagOrarioContinuato": True}, time(12, 0)) is False
+        assert _is_schedule_open(ScheduleDay(continuous=True), time(12, 0)) is False
 
 
 class TestScheduleIntervals:
@@ -415,7 +453,9 @@ class TestScheduleIntervals:
             "oraChiusuraOrarioContinuato": "02:00",
         }
 
-        assert _schedule_intervals_for_date(schedule, date(2025, 3, 29), timezone) == [
+        assert _schedule_intervals_for_date(
+            ScheduleDay.from_api(schedule), date(2025, 3, 29), timezone
+        ) == [
             (
                 datetime(2025, 3, 29, 22, 0, tzinfo=timezone),
                 datetime(2025, 3, 30, 2, 0, tzinfo=timezone),
@@ -425,7 +465,7 @@ class TestScheduleIntervals:
     def test_h24_respects_dst_local_midnights(self):
         timezone = ZoneInfo("Europe/Rome")
         [(opens_at, closes_at)] = _schedule_intervals_for_date(
-            {"flagH24": True}, date(2025, 3, 30), timezone
+            ScheduleDay(h24=True), date(2025, 3, 30), timezone
         )
 
         assert opens_at == datetime(2025, 3, 30, 0, 0, tzinfo=timezone)
@@ -434,10 +474,12 @@ class TestScheduleIntervals:
 
     def test_incomplete_interval_is_ignored(self):
         assert _schedule_intervals_for_date(
-            {
-                "flagOrarioContinuato": True,
-                "oraAperturaOrarioContinuato": "08:00",
-            },
+            ScheduleDay.from_api(
+                {
+                    "flagOrarioContinuato": True,
+                    "oraAperturaOrarioContinuato": "08:00",
+                }
+            ),
             date(2025, 3, 30),
             ZoneInfo("Europe/Rome"),
         ) == []
@@ -449,7 +491,7 @@ class TestFindScheduleForDay:
             {"giornoSettimanaId": 1},
             {"giornoSettimanaId": 2},
         ]
-        result = _find_schedule_for_day(opening_hours, 1, date(2025, 3, 17))
+        result = _find_schedule_for_day(_schedule(opening_hours), 1, date(2025, 3, 17))
         assert result is not None
         assert result["giornoSettimanaId"] == 1
 
@@ -457,7 +499,7 @@ class TestFindScheduleForDay:
         opening_hours = [
             {"giornoSettimanaId": 1},
         ]
-        result = _find_schedule_for_day(opening_hours, 5, date(2025, 3, 17))
+        result = _find_schedule_for_day(_schedule(opening_hours), 5, date(2025, 3, 17))
         assert result is None
 
     def test_uses_holiday_schedule_on_holiday(self):
@@ -466,7 +508,7 @@ class TestFindScheduleForDay:
             {"giornoSettimanaId": HOLIDAY_SCHEDULE_ID, "flagOrarioContinuato": True,
              "oraAperturaOrarioContinuato": "08:00", "oraChiusuraOrarioContinuato": "13:00"},
         ]
-        result = _find_schedule_for_day(opening_hours, 1, date(2025, 1, 1))
+        result = _find_schedule_for_day(_schedule(opening_hours), 1, date(2025, 1, 1))
         assert result is not None
         assert result["giornoSettimanaId"] == HOLIDAY_SCHEDULE_ID
 
@@ -476,7 +518,7 @@ class TestFindScheduleForDay:
              "oraAperturaOrarioContinuato": "08:00", "oraChiusuraOrarioContinuato": "20:00"},
             {"giornoSettimanaId": HOLIDAY_SCHEDULE_ID, "flagChiusura": True},
         ]
-        result = _find_schedule_for_day(opening_hours, 1, date(2025, 3, 17))
+        result = _find_schedule_for_day(_schedule(opening_hours), 1, date(2025, 3, 17))
         assert result is not None
         assert result["giornoSettimanaId"] == 1
 
@@ -487,57 +529,57 @@ class TestHasValidOpeningHours:
         assert _has_valid_opening_hours(None) is False
 
     def test_no_opening_hours_key(self):
-        assert _has_valid_opening_hours({"fuels": {}}) is False
+        assert _has_valid_opening_hours(StationData.from_dict({"fuels": {}})) is False
 
     def test_empty_opening_hours(self):
-        assert _has_valid_opening_hours({"opening_hours": []}) is False
+        assert _has_valid_opening_hours(StationData.from_dict({"opening_hours": []})) is False
 
     def test_h24(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{"flagH24": True}]
-        }) is True
+        })) is True
 
     def test_non_communicated_hours_are_not_valid(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{"flagNonComunicato": True, "flagH24": True}]
-        }) is False
+        })) is False
 
     def test_continuous_hours(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{
                 "flagOrarioContinuato": True,
                 "oraAperturaOrarioContinuato": "08:00",
                 "oraChiusuraOrarioContinuato": "20:00",
             }]
-        }) is True
+        })) is True
 
     def test_split_hours(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{
                 "oraAperturaMattina": "07:00",
                 "oraChiusuraMattina": "12:00",
                 "oraAperturaPomeriggio": "15:00",
                 "oraChiusuraPomeriggio": "19:00",
             }]
-        }) is True
+        })) is True
 
     def test_all_closed(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{"flagChiusura": True}]
-        }) is False
+        })) is False
 
     def test_no_valid_times(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{}]
-        }) is False
+        })) is False
 
     def test_continuous_hours_missing_close_is_not_valid(self):
-        assert _has_valid_opening_hours({
+        assert _has_valid_opening_hours(StationData.from_dict({
             "opening_hours": [{
                 "flagOrarioContinuato": True,
                 "oraAperturaOrarioContinuato": "08:00",
             }]
-        }) is False
+        })) is False
 
 
 class TestGetFuelIcon:
@@ -649,12 +691,6 @@ class TestPriceMetadata:
         assert result["price_is_stale"] is False
 
 
-class TestGetAvailableServiceIds:
-    def test_normalizes_mixed_service_payloads(self):
-        services = [{"id": 1}, "2", 3, {"id": "4"}, {"other": "ignored"}]
-        assert _get_available_service_ids(services) == {"1", "2", "3", "4"}
-
-
 class TestNextChangeH24:
     def test_h24_only_today_closes_at_next_closed_midnight(self, monkeypatch):
         sensor = StationNextChangeSensor.__new__(StationNextChangeSensor)
@@ -662,7 +698,7 @@ class TestNextChangeH24:
             {"giornoSettimanaId": 1, "flagH24": True},
             {"giornoSettimanaId": 2, "flagChiusura": True},
         ]
-        sensor.coordinator = SimpleNamespace(data={"opening_hours": opening_hours})
+        sensor.coordinator = SimpleNamespace(data=StationData.from_dict({"opening_hours": opening_hours}))
         fixed_now = datetime(2025, 3, 17, 12, 0)
 
         import custom_components.osservaprezzi_carburanti.sensor as sensor_module
@@ -680,7 +716,7 @@ class TestNextChangeH24:
             {"giornoSettimanaId": weekday, "flagH24": True}
             for weekday in range(1, 8)
         ]
-        sensor.coordinator = SimpleNamespace(data={"opening_hours": opening_hours})
+        sensor.coordinator = SimpleNamespace(data=StationData.from_dict({"opening_hours": opening_hours}))
         fixed_now = datetime(2025, 3, 17, 12, 0)
 
         import custom_components.osservaprezzi_carburanti.sensor as sensor_module
@@ -696,7 +732,7 @@ class TestNextChangeH24:
 class TestNextChangeSensor:
     def _sensor(self, opening_hours):
         sensor = StationNextChangeSensor.__new__(StationNextChangeSensor)
-        sensor.coordinator = SimpleNamespace(data={"opening_hours": opening_hours})
+        sensor.coordinator = SimpleNamespace(data=StationData.from_dict({"opening_hours": opening_hours}))
         return sensor
 
     def test_no_schedule(self):
@@ -0,0 +1,131 @@
+"""Tests for the startup refresh queue."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.osservaprezzi_carburanti import startup
+from custom_components.osservaprezzi_carburanti.const import DOMAIN
+from custom_components.osservaprezzi_carburanti.startup import (
+    STARTUP_QUEUE_DATA_KEY,
+    StartupRefreshQueue,
+    async_remove_startup_queue,
+    get_startup_queue,
+)
+
+
+class _Started:
+    """Captures the callback registered with async_at_started."""
+
+    def __init__(self) -> None:
+        self.callbacks: list[Any] = []
+        self.cancelled = 0
+
+    def at_started(self, hass: Any, action: Any) -> Any:
+        self.callbacks.append(action)
+
+        def _cancel() -> None:
+            self.cancelled += 1
+
+        return _cancel
+
+
+@pytest.fixture
+def started(monkeypatch: pytest.MonkeyPatch) -> _Started:
+    fake = _Started()
+    monkeypatch.setattr(startup, "async_at_started", fake.at_started)
+    return fake
+
+
+@pytest.fixture
+def coordinator_factory(make_coordinator: Callable[..., Any]) -> Callable[..., Any]:
+    """Return a factory of coordinators recording when their refresh runs."""
+
+    def _make(entry_id: str, events: list[str], success: bool = True) -> Any:
+        async def async_refresh() -> None:
+            events.append(f"start {entry_id}")
+            await asyncio.sleep(0)
+            events.append(f"end {entry_id}")
+
+        return make_coordinator(
+            entry_id, last_update_success=success, async_refresh=async_refresh
+        )
+
+    return _make
+
+
+def test_queue_waits_for_startup_then_paces_refreshes(
+    started: _Started, hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    events: list[str] = []
+    queue = StartupRefreshQueue(hass, concurrency=1, interval=0.02)
+
+    async def run() -> dict[str, Any]:
+        queue.async_add(coordinator_factory("entry_1", events))
+        queue.async_add(coordinator_factory("entry_2", events, success=False))
+        queue.record_setup("entry_1", "restored", 0.0)
+        queue.record_setup("entry_2", "placeholder", 0.0)
+        await asyncio.sleep(0)
+        before = queue.status("entry_1")
+        assert events == []
+        assert len(started.callbacks) == 1
+
+        started.callbacks[0](hass)
+        await asyncio.gather(*queue._tasks.values())
+        return before
+
+    before = asyncio.run(run())
+
+    assert before["started"] is False
+    assert before["queued"] == 2
+    assert events == ["start entry_1", "end entry_1", "start entry_2", "end entry_2"]
+    status = queue.status("entry_2")
+    assert status["started"] is True
+    assert (status["queued"], status["running"], status["completed"]) == (0, 0, 2)
+    assert status["failed"] == 1
+    assert status["modes"] == {"placeholder": 1, "restored": 1}
+    assert status["setup_seconds"]["count"] == 2
+    # The second refresh waited for the first one and the pacing interval.
+    assert status["queue_wait_seconds"]["max"] >= 0.02
+    assert status["refresh_seconds"]["count"] == 2
+    assert status["entry"]["mode"] == "placeholder"
+    assert status["entry"]["success"] is False
+    assert queue.status()["entry"] is None
+    assert queue._tasks == {}
+
+
+def test_queue_cancels_refreshes_of_unloaded_entries(
+    started: _Started, hass: MagicMock, coordinator_factory: Callable[..., Any]
+) -> None:
+    events: list[str] = []
+
+    async def run() -> list[asyncio.Task[None]]:
+        queue = get_startup_queue(hass)
+        assert get_startup_queue(hass) is queue
+        cancel = queue.async_add(coordinator_factory("entry_1", events))
+        queue.async_add(coordinator_factory("entry_2", events))
+        tasks = list(queue._tasks.values())
+        cancel()
+        assert queue.status()["queued"] == 1
+        async_remove_startup_queue(hass)
+        async_remove_startup_queue(hass)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return tasks
+
+    tasks = asyncio.run(run())
+
+    assert all(task.cancelled() for task in tasks)
+    assert events == []
+    assert started.cancelled == 1
+    assert STARTUP_QUEUE_DATA_KEY not in hass.data[DOMAIN]
+
+
+def test_empty_queue_reports_no_timings(hass: MagicMock) -> None:
+    status = StartupRefreshQueue(hass, concurrency=2, interval=1.0).status("entry_1")
+
+    assert status["setup_seconds"] == {"count": 0, "average": None, "max": None}
+    assert status["entry"] is None
@@ -0,0 +1,73 @@
+"""Tests for the zone-search batch refresh."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.osservaprezzi_carburanti import zone_refresh
+from custom_components.osservaprezzi_carburanti.const import CONF_STATION_ID
+
+_REGISTRY = {
+    "1": {"latitude": "41.9000", "longitude": "12.5000"},
+    "2": {"latitude": 41.9100, "longitude": 12.5000},
+    "3": {"latitude": 45.4642, "longitude": 9.1900},
+    "4": {"latitude": None, "longitude": 9.19},
+    "5": {"latitude": 95.0, "longitude": 9.19},
+}
+
+
+def _coordinator(station_id: str, *, data: Any = True, applies: bool = True) -> Any:
+    csv_manager = MagicMock()
+    csv_manager.get_station_by_id.side_effect = _REGISTRY.get
+    return SimpleNamespace(
+        config_entry=SimpleNamespace(data={CONF_STATION_ID: station_id}),
+        data={"fuels": {}} if data else None,
+        csv_manager=csv_manager,
+        async_apply_zone_prices=MagicMock(return_value=applies),
+    )
+
+
+def test_zone_refresh_fans_out_results_and_falls_back_per_station(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda function, *args: function(*args)
+    )
+    fetch = AsyncMock(
+        side_effect=[
+            {"1": {"id": 1, "fuels": []}, "2": {"id": 2, "fuels": []}},
+            aiohttp.ClientError("boom"),
+        ]
+    )
+    monkeypatch.setattr(zone_refresh, "fetch_zone_prices", fetch)
+    items = [
+        ("entry_1", _coordinator("1")),
+        ("entry_2", _coordinator("2", applies=False)),
+        ("entry_3", _coordinator("3")),
+        ("entry_4", _coordinator("4")),
+        ("entry_5", _coordinator("5")),
+        ("entry_6", _coordinator("6")),
+        ("entry_7", _coordinator("1", data=False)),
+    ]
+
+    result = asyncio.run(zone_refresh.async_refresh_from_zones(hass, items))
+
+    assert result.query_count == 2
+    assert result.failed_query_count == 1
+    assert [entry_id for entry_id, _ in result.refreshed] == ["entry_1"]
+    assert sorted(entry_id for entry_id, _ in result.fallback) == [
+        "entry_2",
+        "entry_3",
+        "entry_4",
+        "entry_5",
+        "entry_6",
+        "entry_7",
+    ]
+    items[0][1].async_apply_zone_prices.assert_called_once_with({"id": 1, "fuels": []})
+    assert fetch.await_args_list[0].args[1:3] == (41.905, 12.5)
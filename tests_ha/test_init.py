@@ -14,6 +14,7 @@ from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.osservaprezzi_carburanti import async_setup
+from custom_components.osservaprezzi_carburanti.api import StationResponse
 from custom_components.osservaprezzi_carburanti.const import (
     CONF_STATION_ID,
     DOMAIN,
@@ -24,6 +25,7 @@ from custom_components.osservaprezzi_carburanti.const import (
     SERVICE_SEARCH_REGISTRY,
 )
 from custom_components.osservaprezzi_carburanti.csv_manager import CSVStationManager
+from custom_components.osservaprezzi_carburanti.models import StationData
 
 STATION_ID = "54233"
 
@@ -61,9 +63,17 @@ def _station_payload(station_id: str = STATION_ID) -> dict[str, Any]:
 
 async def test_config_entry_lifecycle_and_services(hass: HomeAssistant, monkeypatch) -> None:
     """Exercise setup, entities, services, reload, and final unload in real HA."""
-    fetch_station_data = AsyncMock(side_effect=lambda hass, station_id: _station_payload(station_id))
+    fetch_station_data = AsyncMock(
+        side_effect=lambda hass, station_id: StationResponse(
+            data=_station_payload(station_id),
+            revision=str(station_id),
+            unchanged=False,
+            bytes_received=0,
+            bytes_saved=0,
+        )
+    )
     monkeypatch.setattr(
-        "custom_components.osservaprezzi_carburanti.coordinator.fetch_station_data",
+        "custom_components.osservaprezzi_carburanti.coordinator.async_fetch_station",
         fetch_station_data,
     )
     monkeypatch.setattr(CSVStationManager, "is_data_available", lambda self: False)
@@ -95,7 +105,7 @@ async def test_config_entry_lifecycle_and_services(hass: HomeAssistant, monkeypa
     assert service_entity_id is not None and hass.states.get(service_entity_id).state == "on"
 
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    refreshed_data = deepcopy(coordinator.data)
+    refreshed_data = coordinator.data.as_dict()
     refreshed_data["fuels"]["Gasolio_self"] = {
         "price": 1.689,
         "last_update": "2026-06-06T18:15:30Z",
@@ -103,7 +113,7 @@ async def test_config_entry_lifecycle_and_services(hass: HomeAssistant, monkeypa
     }
     refreshed_data["station_info"]["phoneNumber"] = "+39 06 000000"
     refreshed_data["services"].append({"id": 8})
-    coordinator.async_set_updated_data(refreshed_data)
+    coordinator.async_set_updated_data(StationData.from_dict(refreshed_data))
     await hass.async_block_till_done()
     gasolio_entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{STATION_ID}_Gasolio_self")
     phone_entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{STATION_ID}_phoneNumber")
@@ -113,7 +123,7 @@ async def test_config_entry_lifecycle_and_services(hass: HomeAssistant, monkeypa
     assert wifi_entity_id is not None and hass.states.get(wifi_entity_id).state == "on"
     dynamic_entity_ids = {gasolio_entity_id, phone_entity_id, wifi_entity_id}
 
-    coordinator.async_set_updated_data(refreshed_data)
+    coordinator.async_set_updated_data(StationData.from_dict(refreshed_data))
     await hass.async_block_till_done()
     assert {entity.entity_id for entity in registry.entities.values()
             if entity.config_entry_id == entry.entry_id}.issuperset(dynamic_entity_ids)
@@ -121,8 +131,8 @@ async def test_config_entry_lifecycle_and_services(hass: HomeAssistant, monkeypa
     del disappeared_data["fuels"]["Gasolio_self"]
     disappeared_data["station_info"].pop("phoneNumber")
     disappeared_data["services"] = [{"id": 1}]
-    coordinator.async_set_updated_data(disappeared_data)
-    coordinator.async_set_updated_data(refreshed_data)
+    coordinator.async_set_updated_data(StationData.from_dict(disappeared_data))
+    coordinator.async_set_updated_data(StationData.from_dict(refreshed_data))
     await hass.async_block_till_done()
     assert all(registry.async_get(entity_id) is not None for entity_id in dynamic_entity_ids)
 